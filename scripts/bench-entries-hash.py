@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# Author: PB & Claude
+# Maintainer: PB
+# Original date: 2026.10.16
+# License: (c) HRDAG, 2025, GPL-2 or newer
+#
+# ------
+# scripts/bench-entries-hash.py
+
+"""
+Time metadata generation: full entries_hash vs after a few changes.
+
+Builds a synthetic manifest, then times generate_metadata with the legacy
+(version 1) scheme, the first version 2 computation, and version 2 again
+after changing a handful of entries, which only rehashes those entries.
+
+Usage:
+    uv run python scripts/bench-entries-hash.py [--entries 500000] [--changes 100]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from dsg.data.entries_hash import LEGACY_VERSION, compute_entries_hash  # noqa: E402
+from dsg.data.manifest import FileRef, Manifest  # noqa: E402
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--entries", type=int, default=500_000)
+    parser.add_argument("--changes", type=int, default=100)
+    args = parser.parse_args()
+
+    paths = [f"input/batch{i // 1000:05d}/file{i:08d}.csv" for i in range(args.entries)]
+    manifest = Manifest(entries={
+        path: FileRef(type="file", path=path, user="alice@example.org", filesize=1000 + i,
+                      mtime=f"2025-06-{1 + i % 28:02d}T12:{i % 60:02d}:00-07:00",
+                      hash=f"{i * 2654435761 % 2**64:016x}")
+        for i, path in enumerate(paths)})
+
+    legacy = timed(lambda: compute_entries_hash(
+        (record for _, record in manifest.entries.records()), LEGACY_VERSION))
+    first = timed(lambda: manifest.generate_metadata(snapshot_id="s1"))
+    step = max(1, args.entries // args.changes)
+    for path in paths[::step][:args.changes]:
+        manifest.entries[path].hash = "00000000000000ff"
+    again = timed(lambda: manifest.generate_metadata(snapshot_id="s2"))
+
+    print(f"{args.entries} entries, {args.changes} changed")
+    print(f"legacy full hash        {legacy * 1e3:>10.1f} ms")
+    print(f"v2 first computation    {first * 1e3:>10.1f} ms")
+    print(f"v2 after changes        {again * 1e3:>10.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# Author: PB & Claude
+# Maintainer: PB
+# Original date: 2026.10.16
+# License: (c) HRDAG, 2025, GPL-2 or newer
+#
+# ------
+# scripts/bench-history-diff.py
+
+"""
+Time diff_manifests on two large archived snapshots and report peak memory.
+
+Writes two lz4 JSON archives of --entries files (streamed, in reverse path
+order so the diff has to sort them), with --changes files modified, removed,
+added and moved between them, then times diff_manifests and prints the
+change counts and the process's peak RSS. --load instead loads both snapshots
+whole with Manifest.from_compressed, for comparison (run it as a separate
+process: peak RSS only grows).
+
+Usage:
+    uv run python scripts/bench-history-diff.py [--entries 2000000] [--changes 1000] [--load]
+"""
+
+import argparse
+import resource
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--entries", type=int, default=2_000_000)
+    parser.add_argument("--changes", type=int, default=1000)
+    parser.add_argument("--load", action="store_true")
+    parser.add_argument("--src", type=Path, default=Path(__file__).parent.parent / "src")
+    args = parser.parse_args()
+    sys.path.insert(0, str(args.src))
+
+    from dsg.core.history import diff_manifests
+    from dsg.data.manifest import Manifest
+    from dsg.data.manifest_stream import ManifestWriter, open_manifest_file
+
+    def record(i: int, tag: str = "") -> dict:
+        rel_path = f"input/batch{i // 1000:05d}/{tag}file{i:08d}.csv"
+        return {"type": "file", "path": rel_path, "user": "alice@example.org", "filesize": 1000 + i,
+                "mtime": "2025-06-01T12:00:00-07:00", "hash": f"{i * 2654435761 % 2**64:016x}"}
+
+    def write(path: Path, new: bool) -> None:
+        c = args.changes
+        with open_manifest_file(path, "wb") as stream:
+            writer = ManifestWriter(stream)
+            for i in reversed(range(args.entries)):
+                if new and i < c:
+                    continue  # removed
+                if new and i < 2 * c:
+                    writer.write({**record(i), "filesize": 1, "hash": "0" * 16})  # modified
+                elif new and i < 3 * c:
+                    writer.write(record(i, "moved-"))  # moved
+                else:
+                    writer.write(record(i))
+            if new:
+                for i in range(args.entries, args.entries + c):
+                    writer.write(record(i))  # added
+            writer.finish({"snapshot_id": "s2" if new else "s1", "created_at": "2025-06-01T12:00:00-07:00",
+                           "entry_count": writer.entry_count, "entries_hash": writer.entries_hash})
+
+    with tempfile.TemporaryDirectory() as tmp:
+        old_path, new_path = Path(tmp) / "s1-sync.json.lz4", Path(tmp) / "s2-sync.json.lz4"
+        write(old_path, new=False)
+        write(new_path, new=True)
+
+        start = time.perf_counter()
+        if args.load:
+            old, new = Manifest.from_compressed(old_path), Manifest.from_compressed(new_path)
+            print(f"loaded {len(old.entries)} + {len(new.entries)} entries", end="")
+        else:
+            counts = Counter(change.change for change in diff_manifests(old_path, new_path))
+            print(f"{dict(sorted(counts.items()))}", end="")
+        elapsed = time.perf_counter() - start
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f" in {elapsed:.2f} s, peak RSS {peak_mb:.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
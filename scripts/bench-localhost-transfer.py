@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# Author: PB & Claude
+# Maintainer: PB
+# Original date: 2026.10.16
+# License: (c) HRDAG, 2025, GPL-2 or newer
+#
+# ------
+# scripts/bench-localhost-transfer.py
+
+"""
+Compare localhost upload throughput with and without zero-copy transfers.
+
+Uploads a set of large files through a real Transaction (ClientFilesystem,
+XFSFilesystem staging, LocalhostTransport). The streamed run copies through
+Python into a temp dir and moves the result; the zero-copy run reflinks or
+copies in-kernel straight into the destination. Put --work on the filesystem
+you care about (reflinks need XFS/Btrfs, block cloning needs OpenZFS >= 2.2).
+
+Usage:
+    uv run python scripts/bench-localhost-transfer.py [--files 8] [--mb 256] [--work DIR]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from dsg.core.transaction_coordinator import Transaction  # noqa: E402
+from dsg.storage.client import ClientFilesystem  # noqa: E402
+from dsg.storage.io_transports import LocalhostTransport  # noqa: E402
+from dsg.storage.remote import XFSFilesystem  # noqa: E402
+
+
+def build_tree(root: Path, n_files: int, mb: int) -> list[str]:
+    block = os.urandom(1024 * 1024)
+    (root / "input").mkdir(parents=True)
+    (root / ".dsg").mkdir()
+    rel_paths = []
+    for i in range(n_files):
+        rel_path = f"input/big{i:03d}.bin"
+        with open(root / rel_path, 'wb') as f:
+            for _ in range(mb):
+                f.write(block)
+        rel_paths.append(rel_path)
+    return rel_paths
+
+
+def time_upload(label: str, work: Path, root: Path, rel_paths: list[str], zero_copy: bool,
+                total_bytes: int) -> None:
+    repo = work / f"repo-{label}"
+    repo.mkdir()
+    transport = LocalhostTransport(work / f"transfers-{label}", zero_copy=zero_copy)
+    tx = Transaction(ClientFilesystem(root), XFSFilesystem(str(repo)), transport)
+
+    start = time.perf_counter()
+    with tx:
+        tx.upload_files(rel_paths)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<10} {total_bytes / 2**20:>9.0f} MiB  {elapsed:8.2f}s  "
+          f"{total_bytes / 2**20 / elapsed:9.1f} MiB/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--files", type=int, default=8)
+    parser.add_argument("--mb", type=int, default=256, help="MiB per file")
+    parser.add_argument("--work", type=Path, default=None, help="directory to run in")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(dir=args.work) as tmp:
+        work = Path(tmp)
+        root = work / "project"
+        rel_paths = build_tree(root, args.files, args.mb)
+        total_bytes = args.files * args.mb * 2**20
+        time_upload("streamed", work, root, rel_paths, False, total_bytes)
+        time_upload("zero-copy", work, root, rel_paths, True, total_bytes)
+
+
+if __name__ == "__main__":
+    main()
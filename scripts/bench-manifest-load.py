@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# Author: PB & Claude
+# Maintainer: PB
+# Original date: 2026.10.16
+# License: (c) HRDAG, 2025, GPL-2 or newer
+#
+# ------
+# scripts/bench-manifest-load.py
+
+"""
+Compare validated and trusted manifest loads, in entries per second.
+
+Builds a synthetic manifest (files plus some symlinks) with metadata, writes it
+with Manifest.to_json, then times Manifest.from_bytes on the same bytes with
+per-entry validation and with trusted=True (one bulk entries_hash check, no
+per-entry validation). JSON parsing is included in both timings.
+
+Usage:
+    uv run python scripts/bench-manifest-load.py [--entries 200000] [--repeat 3]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from dsg.data.manifest import FileRef, LinkRef, Manifest  # noqa: E402
+
+
+def build_manifest(n_entries: int) -> Manifest:
+    entries = {}
+    for i in range(n_entries):
+        rel_path = f"input/batch{i // 1000:05d}/file{i:08d}.csv"
+        if i % 50 == 49:
+            entries[rel_path] = LinkRef(type="link", path=rel_path, user="alice@example.org",
+                                        reference=f"file{i - 1:08d}.csv")
+        else:
+            entries[rel_path] = FileRef(
+                type="file", path=rel_path, user="alice@example.org", filesize=1000 + i,
+                mtime=f"2025-06-{1 + i % 28:02d}T12:{i % 60:02d}:00-07:00",
+                hash=f"{i * 2654435761 % 2**64:016x}")
+    manifest = Manifest(entries=entries)
+    manifest.generate_metadata(snapshot_id="s1", user_id="alice@example.org")
+    return manifest
+
+
+def best_rate(json_bytes: bytes, n_entries: int, trusted: bool, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        loaded = Manifest.from_bytes(json_bytes, trusted=trusted)
+        best = min(best, time.perf_counter() - start)
+        assert len(loaded.entries) == n_entries
+    return n_entries / best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--entries", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "last-sync.json"
+        build_manifest(args.entries).to_json(path)
+        json_bytes = path.read_bytes()
+
+    validated = best_rate(json_bytes, args.entries, False, args.repeat)
+    trusted = best_rate(json_bytes, args.entries, True, args.repeat)
+    print(f"{args.entries} entries, {len(json_bytes) / 2**20:.1f} MiB of JSON")
+    print(f"validated  {validated:>12,.0f} entries/s")
+    print(f"trusted    {trusted:>12,.0f} entries/s  ({trusted / validated:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
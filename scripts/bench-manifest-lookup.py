@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# Author: PB & Claude
+# Maintainer: PB
+# Original date: 2026.10.16
+# License: (c) HRDAG, 2025, GPL-2 or newer
+#
+# ------
+# scripts/bench-manifest-lookup.py
+
+"""
+Time a single-path lookup in a JSON manifest vs the binary indexed format.
+
+Writes the same synthetic manifest with to_json and to_binary, then times
+looking up one path: Manifest.from_json(...).entries[path] against
+ManifestIndex.open(...).get(path), plus a prefix scan of one directory.
+
+Usage:
+    uv run python scripts/bench-manifest-lookup.py [--entries 200000] [--repeat 5]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from dsg.data.manifest import FileRef, Manifest  # noqa: E402
+from dsg.data.manifest_binary import ManifestIndex  # noqa: E402
+
+
+def build_manifest(n_entries: int) -> Manifest:
+    entries = {}
+    for i in range(n_entries):
+        rel_path = f"input/batch{i // 1000:05d}/file{i:08d}.csv"
+        entries[rel_path] = FileRef(
+            type="file", path=rel_path, user="alice@example.org", filesize=1000 + i,
+            mtime=f"2025-06-{1 + i % 28:02d}T12:{i % 60:02d}:00-07:00",
+            hash=f"{i * 2654435761 % 2**64:016x}")
+    manifest = Manifest(entries=entries)
+    manifest.generate_metadata(snapshot_id="s1", user_id="alice@example.org")
+    return manifest
+
+
+def best_time(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--entries", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    target = f"input/batch{args.entries // 2000:05d}/file{args.entries // 2:08d}.csv"
+    prefix = f"input/batch{args.entries // 2000:05d}/"
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path, bin_path = Path(tmp) / "m.json", Path(tmp) / "m.bin"
+        manifest = build_manifest(args.entries)
+        manifest.to_json(json_path)
+        manifest.to_binary(bin_path)
+
+        def json_lookup():
+            assert Manifest.from_json(json_path, trusted=True).entries[target].path == target
+
+        def binary_lookup():
+            with ManifestIndex.open(bin_path) as index:
+                assert index.get(target).path == target
+
+        def binary_scan():
+            with ManifestIndex.open(bin_path) as index:
+                assert sum(1 for _ in index.scan_prefix(prefix)) > 0
+
+        json_s = best_time(json_lookup, args.repeat)
+        binary_s = best_time(binary_lookup, args.repeat)
+        scan_s = best_time(binary_scan, args.repeat)
+        print(f"{args.entries} entries: JSON {json_path.stat().st_size / 2**20:.1f} MiB, "
+              f"binary {bin_path.stat().st_size / 2**20:.1f} MiB")
+        print(f"lookup via from_json     {json_s * 1e3:>10.2f} ms")
+        print(f"lookup via ManifestIndex {binary_s * 1e3:>10.3f} ms  ({json_s / binary_s:,.0f}x)")
+        print(f"prefix scan (1 dir)      {scan_s * 1e3:>10.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# Author: PB & Claude
+# Maintainer: PB
+# Original date: 2026.10.16
+# License: (c) HRDAG, 2025, GPL-2 or newer
+#
+# ------
+# scripts/bench-manifest-memory.py
+
+"""
+Measure manifest load time and resident memory at several sizes.
+
+Writes a synthetic last-sync.json per size, then loads it with Manifest.from_json
+(columnar ManifestEntries) and, for comparison, as an OrderedDict holding one
+validated FileRef per entry (the previous representation). Memory is what
+tracemalloc sees still allocated after the load; the parsed JSON is freed by
+then in both cases. Each measurement runs in a fresh process.
+
+Usage:
+    uv run python scripts/bench-manifest-memory.py [--sizes 100000 1000000 5000000]
+"""
+
+import argparse
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import OrderedDict
+from pathlib import Path
+
+import orjson
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from dsg.data.manifest import FileRef, Manifest  # noqa: E402
+
+
+def write_manifest(path: Path, n_entries: int) -> None:
+    users = ["alice@example.org", "bob@example.org", "carol@example.org"]
+    entries = {}
+    for i in range(n_entries):
+        rel_path = f"input/batch{i // 1000:05d}/file{i:08d}.csv"
+        entries[rel_path] = {
+            "type": "file", "path": rel_path, "user": users[i % len(users)],
+            "filesize": 1000 + i, "mtime": f"2025-06-{1 + i % 28:02d}T12:{i % 60:02d}:00-07:00",
+            "hash": f"{i * 2654435761 % 2**64:016x}",
+        }
+    path.write_bytes(orjson.dumps({"entries": entries}))
+
+
+def measure(path: Path, mode: str) -> None:
+    tracemalloc.start()
+    start = time.perf_counter()
+    if mode == "columnar":
+        loaded = Manifest.from_json(path)
+    else:
+        data = orjson.loads(path.read_bytes())
+        loaded = OrderedDict(
+            (rel_path, FileRef.model_validate(entry)) for rel_path, entry in data["entries"].items())
+        del data
+    elapsed = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    print(f"{mode},{elapsed:.3f},{current},{peak},{len(loaded.entries if mode == 'columnar' else loaded)}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000, 5_000_000])
+    parser.add_argument("--measure", nargs=2, metavar=("PATH", "MODE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        measure(Path(args.measure[0]), args.measure[1])
+        return
+
+    print(f"{'entries':>9} {'layout':<9} {'load s':>8} {'kept MiB':>9} {'peak MiB':>9} {'B/entry':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_entries in args.sizes:
+            path = Path(tmp) / f"manifest-{n_entries}.json"
+            write_manifest(path, n_entries)
+            for mode in ("columnar", "pydantic"):
+                out = subprocess.run(
+                    [sys.executable, __file__, "--measure", str(path), mode],
+                    check=True, capture_output=True, text=True).stdout.strip().splitlines()[-1]
+                _, elapsed, current, peak, _ = out.split(",")
+                print(f"{n_entries:>9} {mode:<9} {float(elapsed):>8.2f} {int(current) / 2**20:>9.1f} "
+                      f"{int(peak) / 2**20:>9.1f} {int(current) / n_entries:>8.0f}")
+            path.unlink()
+
+
+if __name__ == "__main__":
+    main()
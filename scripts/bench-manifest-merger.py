@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# Author: PB & Claude
+# Maintainer: PB
+# Original date: 2026.10.16
+# License: (c) HRDAG, 2025, GPL-2 or newer
+#
+# ------
+# scripts/bench-manifest-merger.py
+
+"""
+Time ManifestMerger on large, mostly identical local/cache/remote manifests.
+
+Builds three manifests of --entries files spread over directories of 1000,
+changes the first --changes of them locally and the last --changes remotely
+(or, with --scatter, files spread evenly over every directory), then times the
+merger (hash recovery has nothing to do: every local entry already carries
+its hash). Pass --src to time another checkout's implementation, e.g. the
+previous commit in a git worktree, and compare the printed state counts.
+--no-recovery stubs out local hash recovery to time the comparison alone.
+
+Usage:
+    uv run python scripts/bench-manifest-merger.py [--entries 1000000] [--changes 100] [--src PATH] [--no-recovery] [--scatter]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+from types import SimpleNamespace
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--entries", type=int, default=1_000_000)
+    parser.add_argument("--changes", type=int, default=100)
+    parser.add_argument("--src", type=Path, default=Path(__file__).parent.parent / "src")
+    parser.add_argument("--no-recovery", action="store_true")
+    parser.add_argument("--scatter", action="store_true")
+    args = parser.parse_args()
+    sys.path.insert(0, str(args.src))
+
+    from dsg.data.manifest import FileRef, Manifest
+    from dsg.data.manifest_merger import ManifestMerger
+    if args.no_recovery:
+        Manifest.recover_or_compute_metadata = lambda self, *a, **kw: None
+
+    def build(changed: set[int], tag: str) -> Manifest:
+        entries = {}
+        for i in range(args.entries):
+            rel_path = f"input/batch{i // 1000:05d}/file{i:08d}.csv"
+            digest = i * 2654435761 % 2**64
+            if i in changed:
+                digest ^= hash(tag) % 2**64
+            entries[rel_path] = FileRef(
+                type="file", path=rel_path, user="alice@example.org", filesize=1000 + i,
+                mtime="2025-06-01T12:00:00-07:00", hash=f"{digest:016x}")
+        return Manifest(entries=entries)
+
+    if args.scatter:
+        step = max(1, args.entries // (2 * args.changes + 1))
+        changed = list(range(0, args.entries, step))
+    else:
+        changed = list(range(args.changes)) + list(range(args.entries - args.changes, args.entries))
+    local = build(set(changed[:args.changes]), "local")
+    cache = build(set(), "cache")
+    remote = build(set(changed[args.changes:2 * args.changes]), "remote")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        config = SimpleNamespace(user=SimpleNamespace(user_id="alice@example.org", hash_workers=1),
+                                 project_root=Path(tmp))
+        start = time.perf_counter()
+        merger = ManifestMerger(local, cache, remote, config)
+        elapsed = time.perf_counter() - start
+
+    counts = Counter(state.name for state in merger.get_sync_states().values())
+    print(f"{args.entries} entries, {args.changes} local + {args.changes} remote changes: {elapsed:.2f} s")
+    for name, count in sorted(counts.items()):
+        print(f"  {name:<22} {count}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# Author: PB & Claude
+# Maintainer: PB
+# Original date: 2026.10.16
+# License: (c) HRDAG, 2025, GPL-2 or newer
+#
+# ------
+# scripts/bench-manifest-stream.py
+
+"""
+Compare peak memory of whole-document and streaming archive loads.
+
+Writes a synthetic .json.lz4 archive with Manifest.to_compressed, then loads it
+in a fresh process either the old way (decompress everything, orjson.loads,
+Manifest.from_bytes) or with Manifest.from_compressed, which streams entries
+through ManifestReader. Reports tracemalloc's peak and the load time.
+
+Usage:
+    uv run python scripts/bench-manifest-stream.py [--entries 500000]
+"""
+
+import argparse
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import lz4.frame
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from dsg.data.manifest import FileRef, Manifest  # noqa: E402
+
+
+def write_archive(path: Path, n_entries: int) -> None:
+    entries = {}
+    for i in range(n_entries):
+        rel_path = f"input/batch{i // 1000:05d}/file{i:08d}.csv"
+        entries[rel_path] = FileRef(
+            type="file", path=rel_path, user="alice@example.org", filesize=1000 + i,
+            mtime=f"2025-06-{1 + i % 28:02d}T12:{i % 60:02d}:00-07:00",
+            hash=f"{i * 2654435761 % 2**64:016x}")
+    manifest = Manifest(entries=entries)
+    manifest.generate_metadata(snapshot_id="s1", user_id="alice@example.org")
+    manifest.to_compressed(path)
+
+
+def measure(path: Path, mode: str) -> None:
+    tracemalloc.start()
+    start = time.perf_counter()
+    if mode == "whole":
+        loaded = Manifest.from_bytes(lz4.frame.decompress(path.read_bytes()), trusted=True)
+    else:
+        loaded = Manifest.from_compressed(path, trusted=True)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    print(f"{elapsed:.3f},{peak},{len(loaded.entries)}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--entries", type=int, default=500_000)
+    parser.add_argument("--measure", nargs=2, metavar=("PATH", "MODE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        measure(Path(args.measure[0]), args.measure[1])
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "s1-sync.json.lz4"
+        write_archive(path, args.entries)
+        print(f"{args.entries} entries, {path.stat().st_size / 2**20:.1f} MiB compressed")
+        for mode in ("whole", "streaming"):
+            out = subprocess.run([sys.executable, __file__, "--measure", str(path), mode],
+                                 check=True, capture_output=True, text=True).stdout.strip().splitlines()[-1]
+            elapsed, peak, _ = out.split(",")
+            print(f"{mode:<10} {float(elapsed):>7.2f} s  peak {int(peak) / 2**20:>8.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# Author: PB & Claude
+# Maintainer: PB
+# Original date: 2026.10.16
+# License: (c) HRDAG, 2025, GPL-2 or newer
+#
+# ------
+# scripts/bench-scan-logging.py
+
+"""
+Measure per-file scanner cost with and without a DEBUG log sink.
+
+With per-file tracing off (the default), configuring a DEBUG file sink should
+not change the per-file cost: the scanner logs only aggregated summaries. The
+traced run (DSG_TRACE=scanner) is shown for comparison.
+
+Usage:
+    uv run python scripts/bench-scan-logging.py [--files 20000] [--repeat 3]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from loguru import logger  # noqa: E402
+
+from dsg.core.scanner import scan_directory_no_cfg  # noqa: E402
+from dsg.system.logging_setup import TRACE_ENV_VAR  # noqa: E402
+
+
+def build_tree(root: Path, n_files: int) -> None:
+    per_dir = 200
+    for i in range(n_files):
+        d = root / "input" / f"d{i // per_dir:04d}"
+        if i % per_dir == 0:
+            d.mkdir(parents=True)
+        (d / f"f{i:07d}.csv").write_text("x")
+
+
+def time_scan(root: Path, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        scan_directory_no_cfg(root)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_case(label: str, root: Path, n_files: int, repeat: int, log_file: Path = None,
+             trace: bool = False) -> None:
+    logger.remove()
+    if log_file is not None:
+        logger.add(log_file, level="DEBUG", enqueue=True)
+    if trace:
+        os.environ[TRACE_ENV_VAR] = "scanner"
+    else:
+        os.environ.pop(TRACE_ENV_VAR, None)
+
+    elapsed = time_scan(root, repeat)
+    logger.complete()
+    print(f"{label:<28} {n_files:>9} files  {elapsed:7.3f}s  {elapsed / n_files * 1e6:7.2f} us/file")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--files", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = Path(tmp)
+        for n_files in (args.files // 10, args.files):
+            root = tmp_path / f"tree-{n_files}"
+            build_tree(root, n_files)
+            log_file = tmp_path / f"bench-{n_files}.log"
+            run_case("no sinks", root, n_files, args.repeat)
+            run_case("DEBUG file sink", root, n_files, args.repeat, log_file)
+            run_case("DEBUG file sink + trace", root, n_files, args.repeat, log_file, trace=True)
+    logger.remove()
+
+
+if __name__ == "__main__":
+    main()
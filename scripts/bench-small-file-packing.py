@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# Author: PB & Claude
+# Maintainer: PB
+# Original date: 2026.10.16
+# License: (c) HRDAG, 2025, GPL-2 or newer
+#
+# ------
+# scripts/bench-small-file-packing.py
+
+"""
+Compare upload throughput (files/second) of packed and per-file transfers.
+
+Uploads a tree of small files through a real Transaction (ClientFilesystem,
+XFSFilesystem staging, LocalhostTransport), once with small-file packing and
+once with packing disabled. --latency-ms adds a fixed delay to every transport
+call to approximate the per-file round trip of an SSH/SFTP link.
+
+Usage:
+    uv run python scripts/bench-small-file-packing.py [--files 20000] [--size 4096]
+        [--latency-ms 0] [--workers 4] [--batch-files 1000]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from dsg.core.transaction_coordinator import PackPolicy, Transaction  # noqa: E402
+from dsg.storage.client import ClientFilesystem  # noqa: E402
+from dsg.storage.io_transports import LocalhostTransport  # noqa: E402
+from dsg.storage.remote import XFSFilesystem  # noqa: E402
+
+
+class DelayedTransport(LocalhostTransport):
+    """LocalhostTransport with a fixed per-call delay standing in for network latency"""
+
+    def __init__(self, temp_dir: Path, latency: float):
+        super().__init__(temp_dir)
+        self.latency = latency
+
+    def transfer_to_remote(self, content_stream):
+        time.sleep(self.latency)
+        return super().transfer_to_remote(content_stream)
+
+
+def build_tree(root: Path, n_files: int, size: int) -> list[str]:
+    payload = b"x" * size
+    rel_paths = []
+    for i in range(n_files):
+        rel_path = f"input/d{i // 500:04d}/f{i:07d}.csv"
+        path = root / rel_path
+        if i % 500 == 0:
+            path.parent.mkdir(parents=True)
+        path.write_bytes(payload)
+        rel_paths.append(rel_path)
+    (root / ".dsg").mkdir()
+    return rel_paths
+
+
+def time_upload(label: str, work: Path, root: Path, rel_paths: list[str], policy: PackPolicy,
+                workers: int, latency: float) -> None:
+    repo = work / f"repo-{label}"
+    repo.mkdir()
+    transport = DelayedTransport(work / f"transfers-{label}", latency)
+    tx = Transaction(ClientFilesystem(root), XFSFilesystem(str(repo)), transport,
+                     transfer_workers=workers, pack_policy=policy)
+
+    start = time.perf_counter()
+    with tx:
+        tx.upload_files(rel_paths)
+    elapsed = time.perf_counter() - start
+    n = len(rel_paths)
+    print(f"{label:<10} {n:>8} files  {elapsed:8.2f}s  {n / elapsed:10.0f} files/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--files", type=int, default=20000)
+    parser.add_argument("--size", type=int, default=4096, help="bytes per file")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--batch-files", type=int, default=1000)
+    args = parser.parse_args()
+
+    latency = args.latency_ms / 1000
+    with tempfile.TemporaryDirectory() as tmp:
+        work = Path(tmp)
+        root = work / "project"
+        rel_paths = build_tree(root, args.files, args.size)
+        time_upload("per-file", work, root, rel_paths, PackPolicy(threshold_bytes=0),
+                    args.workers, latency)
+        time_upload("packed", work, root, rel_paths,
+                    PackPolicy(threshold_bytes=max(args.size + 1, 64 * 1024),
+                               batch_files=args.batch_files),
+                    args.workers, latency)
+
+
+if __name__ == "__main__":
+    main()
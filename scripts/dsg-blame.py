@@ -19,12 +19,15 @@ Requirements:
 
 import argparse
 import json
+import os
 from pathlib import Path
 import re
 import lz4.frame
-from collections import defaultdict
+from collections import defaultdict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import TypeAlias, Dict, List, Optional
+from itertools import islice
+from typing import TypeAlias, Dict, Iterator, List, Optional
 
 # Rich library for improved console output
 try:
@@ -43,6 +46,9 @@ SnapshotId: TypeAlias = str
 PathStr: TypeAlias = str
 FileHistoryDict: TypeAlias = Dict[PathStr, "FileHistory"]
 
+# Snapshots decompressed and parsed ahead of the one being processed
+DEFAULT_WORKERS = min(4, os.cpu_count() or 1)
+
 
 class EventType:
     ADD = "add"
@@ -252,13 +258,65 @@ def process_snapshot_data(
     return current_snapshot_paths, user
 
 
-def track_file_history(archive_dir: Path, current_snapshot_path: Optional[Path] = None) -> FileHistoryDict:
+def load_snapshot(file_path: Path) -> dict:
+    """
+    Load one snapshot, keeping only what process_snapshot_data reads.
+    
+    Runs in a worker thread: decompression and parsing dominate, and the
+    slimmed result (metadata plus file path -> hash) is what stays resident.
+    """
+    if file_path.suffix == ".lz4":
+        snapshot_data = decompress_and_parse_json(file_path)
+    else:
+        with open(file_path, 'rb') as f:
+            snapshot_data = json.loads(f.read())
+    return {
+        "metadata": get_snapshot_metadata(snapshot_data),
+        "entries": {
+            path: {"type": "file", "hash": entry.get("hash", "")}
+            for path, entry in get_file_entries(snapshot_data).items()
+        },
+    }
+
+
+def load_snapshots_in_order(
+    file_paths: List[Path],
+    workers: int = DEFAULT_WORKERS
+) -> Iterator[Future]:
+    """
+    Yield a future per snapshot, in order, loading up to `workers` snapshots ahead.
+    
+    Only `workers` snapshots are loading or waiting at a time, so memory
+    does not grow with the number of snapshots.
+    """
+    remaining = iter(file_paths)
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        pending = deque(pool.submit(load_snapshot, path) for path in islice(remaining, max(1, workers)))
+        try:
+            while pending:
+                future = pending.popleft()
+                future.exception()  # wait for it before starting the next load
+                next_path = next(remaining, None)
+                if next_path is not None:
+                    pending.append(pool.submit(load_snapshot, next_path))
+                yield future
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def track_file_history(
+    archive_dir: Path,
+    current_snapshot_path: Optional[Path] = None,
+    workers: int = DEFAULT_WORKERS
+) -> FileHistoryDict:
     """
     Analyze archived snapshot data to track file history.
     
     Args:
         archive_dir: Path to directory containing archived snapshots
         current_snapshot_path: Path to the current snapshot's last-sync.json
+        workers: Snapshots to decompress and parse in parallel, ahead of processing
         
     Returns:
         Dictionary mapping file paths to their history
@@ -266,9 +324,6 @@ def track_file_history(archive_dir: Path, current_snapshot_path: Optional[Path]
     # Dictionary to map paths to their history
     file_histories: FileHistoryDict = {}
     
-    # Track files present in each snapshot
-    files_by_snapshot: Dict[SnapshotId, set[PathStr]] = {}
-    
     # Parse snapshots in order
     archive_files: List[tuple[int, Path]] = []
     for file_path in archive_dir.glob("s*-sync.json.lz4"):
@@ -277,6 +332,14 @@ def track_file_history(archive_dir: Path, current_snapshot_path: Optional[Path]
     
     # Sort by snapshot number (ascending)
     archive_files.sort()
+    snapshots = [(str(snapshot_num), file_path, False) for snapshot_num, file_path in archive_files]
+    
+    # The current snapshot's last-sync.json comes last, if provided
+    if current_snapshot_path and current_snapshot_path.exists():
+        # Determine the snapshot number from the path (s30 -> 30)
+        current_snapshot_match = re.search(r's(\d+)', str(current_snapshot_path))
+        if current_snapshot_match:
+            snapshots.append((current_snapshot_match.group(1), current_snapshot_path, True))
     
     # Track files present in the previous snapshot to detect deletions
     previous_snapshot_paths: set[PathStr] = set()
@@ -286,63 +349,33 @@ def track_file_history(archive_dir: Path, current_snapshot_path: Optional[Path]
     else:
         print(f"Processing {len(archive_files)} archive files...")
     
-    # Process each snapshot in chronological order
-    for snapshot_num, file_path in archive_files:
-        snapshot_id = str(snapshot_num)
-        
+    # Process each snapshot in chronological order while the next ones load
+    loaded = load_snapshots_in_order([file_path for _, file_path, _ in snapshots], workers)
+    for (snapshot_id, file_path, is_current), future in zip(snapshots, loaded):
+        label = "current snapshot" if is_current else "snapshot"
         if RICH_AVAILABLE and console:
-            console.print(f"Processing snapshot [bold blue]s{snapshot_id}[/]...")
+            console.print(f"Processing {label} [bold blue]s{snapshot_id}[/]...")
         else:
-            print(f"Processing snapshot s{snapshot_id}...")
-        
-        # Load and parse snapshot data
-        snapshot_data = decompress_and_parse_json(file_path)
-        
-        # Process the snapshot data
-        current_snapshot_paths, user = process_snapshot_data(
-            snapshot_data, 
-            snapshot_id, 
-            file_histories, 
-            previous_snapshot_paths
-        )
+            print(f"Processing {label} s{snapshot_id}...")
         
-        # Update for next iteration
-        files_by_snapshot[snapshot_id] = current_snapshot_paths
-        previous_snapshot_paths = current_snapshot_paths
-        # previous_snapshot_id = snapshot_id  # Not used currently
-    
-    # Process the current snapshot's last-sync.json if provided
-    if current_snapshot_path and current_snapshot_path.exists():
         try:
-            # Determine the snapshot number from the path (s30 -> 30)
-            current_snapshot_match = re.search(r's(\d+)', str(current_snapshot_path))
-            if current_snapshot_match:
-                current_snapshot_id = current_snapshot_match.group(1)
-                
-                if RICH_AVAILABLE and console:
-                    console.print(f"Processing current snapshot [bold blue]s{current_snapshot_id}[/]...")
-                else:
-                    print(f"Processing current snapshot s{current_snapshot_id}...")
-                
-                # Load and parse the current snapshot's last-sync.json
-                with open(current_snapshot_path, 'rb') as f:
-                    current_snapshot_data = json.loads(f.read())
-                
-                # Process the current snapshot data
-                current_snapshot_paths, _ = process_snapshot_data(
-                    current_snapshot_data,
-                    current_snapshot_id,
-                    file_histories,
-                    previous_snapshot_paths
-                )
-                
-                # Update files_by_snapshot
-                files_by_snapshot[current_snapshot_id] = current_snapshot_paths
+            snapshot_data = future.result()
         except Exception as e:
+            if not is_current:
+                raise
             if RICH_AVAILABLE and console:
                 console.print(f"[bold red]Error processing current snapshot:[/] {e}")
             else:
                 print(f"Error processing current snapshot: {e}")
+            continue
+        
+        # Process the snapshot data; only the previous snapshot's paths are kept
+        previous_snapshot_paths, _ = process_snapshot_data(
+            snapshot_data, 
+            snapshot_id, 
+            file_histories, 
+            previous_snapshot_paths
+        )
     
     return file_histories
 
@@ -591,6 +624,12 @@ def parse_args():
         action="store_true",
         help="Show verbose information including file hashes and timestamps"
     )
+    parser.add_argument(
+        "--workers", "-w",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f"Snapshots to decompress in parallel (default: {DEFAULT_WORKERS})"
+    )
     return parser.parse_args()
 
 
@@ -690,7 +729,7 @@ def main() -> int:
             print(f"Will also analyze: {current_last_sync}")
     
     # Track file history from both archive and current snapshot
-    file_histories = track_file_history(archive_dir, current_last_sync)
+    file_histories = track_file_history(archive_dir, current_last_sync, args.workers)
     
     # Apply path filter if specified
     if args.path_filter:
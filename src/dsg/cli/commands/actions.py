@@ -9,7 +9,7 @@
 """
 Action command handlers - state-changing commands.
 
-Handles: init, clone, sync, snapmount, snapfetch, clean
+Handles: init, clone, sync, snapmount, snapfetch, clean, compact-cache, rebuild-history-index
 """
 
 from typing import Any
@@ -18,6 +18,7 @@ from rich.console import Console
 
 from dsg.config.manager import Config
 from dsg.core.lifecycle import init_repository, sync_repository, clone_repository
+from dsg.core.snapfetch import STDOUT, fetch_snapshot_file, snapshot_file_path
 
 
 def init(
@@ -304,26 +305,36 @@ def snapfetch(
 ) -> dict[str, Any]:
     """Fetch a single file from a snapshot.
     
+    Streams the file out of the remote's .zfs/snapshot/<id>/ directory and
+    checks it against the snapshot's manifest as it goes (see
+    dsg.core.snapfetch). Writing to stdout ("-") prints nothing else, so the
+    output can be piped.
+    
     Args:
         console: Rich console for output
         config: Repository configuration
         dry_run: Show what would be fetched without making changes
         force: Overwrite existing output file
-        normalize: Fix invalid filenames automatically
+        normalize: Not used for snapfetch
         verbose: Show detailed fetch information
         quiet: Suppress output
         **operation_params: Operation-specific parameters:
             - num: Snapshot number to fetch from (1=latest)
+            - snapshot: Snapshot id to fetch from, e.g. s3 (overrides num)
             - file: File to fetch from snapshot
-            - output: Output file path
+            - output: Output file path, or "-" for stdout
+            - byte_range: Only fetch bytes START-END (inclusive) or START-
         
     Returns:
         Snapfetch result object for JSON output
     """
     # Extract operation-specific parameters
     num = operation_params.get('num', 1)
+    snapshot = operation_params.get('snapshot')
     file = operation_params.get('file', 'example.txt')
     output = operation_params.get('output')
+    byte_range = operation_params.get('byte_range')
+    quiet = quiet or output == STDOUT
     
     if dry_run:
         return {
@@ -331,30 +342,48 @@ def snapfetch(
             'operation': 'snapfetch',
             'config': config,
             'snapshot_num': num,
+            'snapshot_id': snapshot,
             'file': file,
-            'output': output
+            'output': output,
+            'byte_range': byte_range
         }
     
     if not quiet:
-        console.print(f"[dim]Fetching {file} from snapshot {num}...[/dim]")
+        snapshot_desc = snapshot or ("the latest snapshot" if num == 1 else f"snapshot {num} back")
+        console.print(f"[dim]Fetching {file} from {snapshot_desc}...[/dim]")
     
-    # TODO: Implement actual snapfetch functionality
-    # This is a placeholder for now
-    result = {
+    fetched = fetch_snapshot_file(config, file, snapshot_id=snapshot, num=num, output=output,
+                                  byte_range=byte_range, force=force)
+    
+    if not quiet:
+        console.print(f"[green]✓[/green] Fetched {fetched.bytes_written:,} bytes of {file}"
+                      f" from {fetched.snapshot_id} to {fetched.output}")
+        if fetched.verified:
+            console.print(f"  Verified xxh3 {fetched.actual_hash}")
+        elif byte_range:
+            console.print("  [dim]Partial read: size checked, hash not verified[/dim]")
+        else:
+            console.print("  [yellow]No hash in the snapshot's manifest: size checked only[/yellow]")
+        if verbose:
+            console.print(f"  Remote path: {snapshot_file_path(fetched.snapshot_id, file)}")
+    
+    return {
         'operation': 'snapfetch',
-        'status': 'placeholder_success',
-        'message': 'Snapfetch operation placeholder - implementation needed',
+        'status': 'success',
         'config': config,
         'snapshot_num': num,
+        'snapshot_id': fetched.snapshot_id,
         'file': file,
-        'output': output,
+        'output': fetched.output,
+        'byte_range': byte_range,
+        'start': fetched.start,
+        'bytes_written': fetched.bytes_written,
+        'file_size': fetched.file_size,
+        'expected_hash': fetched.expected_hash,
+        'actual_hash': fetched.actual_hash,
+        'verified': fetched.verified,
         'force': force
     }
-    
-    if not quiet:
-        console.print("[green]Snapfetch operation completed (placeholder)[/green]")
-    
-    return result
 
 
 def clean(
@@ -576,4 +605,102 @@ def clean(
         'target': target,
         'dry_run': False,
         'errors': errors
-    }
\ No newline at end of file
+    }
+
+
+def compact_cache(
+    console: Console,
+    config: Config,
+    dry_run: bool = False,
+    force: bool = False,
+    normalize: bool = False,
+    verbose: bool = False,
+    quiet: bool = False,
+    **operation_params
+) -> dict[str, Any]:
+    """Drop hash cache entries for files that were removed or changed.
+    
+    The cache in .dsg/cache/hash-cache.json only grows during scans; entries
+    for deleted or rewritten files linger until compacted. Deleting the cache
+    outright (`dsg clean --target cache`) is always safe as well.
+    
+    Args:
+        console: Rich console for output
+        config: Repository configuration
+        dry_run: Not used for compact-cache
+        force: Not used for compact-cache
+        normalize: Not used for compact-cache
+        verbose: Show cache statistics
+        quiet: Suppress output
+    
+    Returns:
+        Compaction result for JSON output
+    """
+    from dsg.core.hash_cache import HashCache
+    
+    cache = HashCache.load(config.project_root)
+    entries_before = len(cache)
+    removed = cache.compact()
+    cache.save()
+    
+    if not quiet:
+        console.print(f"[green]✓[/green] Compacted hash cache: removed {removed} stale entries, kept {len(cache)}")
+        if verbose:
+            console.print(f"  Cache file: {cache.cache_path}")
+    
+    return {
+        'operation': 'compact-cache',
+        'status': 'success',
+        'cache_path': str(cache.cache_path),
+        'entries_before': entries_before,
+        'entries_removed': removed,
+        'entries_kept': len(cache)
+    }
+
+
+def rebuild_history_index(
+    console: Console,
+    config: Config,
+    dry_run: bool = False,
+    force: bool = False,
+    normalize: bool = False,
+    verbose: bool = False,
+    quiet: bool = False,
+    **operation_params
+) -> dict[str, Any]:
+    """Recreate the history index from every archived snapshot.
+    
+    Each sync extends the index in .dsg/cache/history-index.sqlite3, but only
+    while it describes all earlier snapshots; in a fresh clone, after the
+    cache is cleaned, or after a sync by an older dsg, blame falls back to
+    reading every archive until the index is rebuilt.
+    
+    Args:
+        console: Rich console for output
+        config: Repository configuration
+        dry_run: Not used for rebuild-history-index
+        force: Not used for rebuild-history-index
+        normalize: Not used for rebuild-history-index
+        verbose: Show the index location
+        quiet: Suppress output
+    
+    Returns:
+        Rebuild result for JSON output
+    """
+    from dsg.core.history import rebuild_history_index as rebuild
+    from dsg.core.history_index import HISTORY_INDEX_RELPATH
+    
+    snapshots = rebuild(config)
+    index_path = config.project_root / HISTORY_INDEX_RELPATH
+    
+    if not quiet:
+        console.print(f"[green]✓[/green] Rebuilt history index from {snapshots} snapshots")
+        if verbose:
+            console.print(f"  Index file: {index_path}")
+    
+    return {
+        'operation': 'rebuild-history-index',
+        'status': 'success',
+        'index_path': str(index_path),
+        'snapshots_indexed': snapshots
+    }
@@ -9,18 +9,24 @@
 """
 Info command handlers - read-only information commands.
 
-Handles: status, log, blame, list-files, validate-*
+Handles: status, log, blame, diff, list-files, validate-*
 """
 
+import sys
+from collections import Counter
 from typing import Any, Optional
 from pathlib import Path
 
+import orjson
+
 from rich.console import Console
+from rich.markup import escape
 
 from dsg.config.manager import Config
 from dsg.core.operations import get_sync_status, list_directory
-from dsg.core.history import get_repository_log, get_file_blame
+from dsg.core.history import get_repository_log, get_file_blame, diff_snapshots
 from dsg.system.display import display_sync_status
+from dsg.system.progress import HashProgressReporter
 # Note: Backend connectivity checks removed - using new transaction system
 # Simple ValidationResult replacement for placeholder validation functions
 from dataclasses import dataclass, field
@@ -59,7 +65,8 @@ def status(
     console: Console, 
     config: Config, 
     verbose: bool = False, 
-    quiet: bool = False
+    quiet: bool = False,
+    metadata_only: bool = False
 ) -> dict[str, Any]:
     """Show sync status by comparing local files with last sync.
     
@@ -68,6 +75,7 @@ def status(
         config: Loaded configuration
         verbose: Show detailed output
         quiet: Minimize output
+        metadata_only: Don't hash changed files; compare them by size and mtime
         
     Returns:
         Status result object for JSON output
@@ -75,11 +83,13 @@ def status(
     if not quiet:
         console.print("[dim]Checking sync status...[/dim]")
     
-    # Get the actual sync status (always includes remote now)
-    sync_status = get_sync_status(config, verbose=verbose)
+    # Get the actual sync status (always includes remote now); Ctrl-C stops hashing
+    with HashProgressReporter(console, quiet=quiet) as report:
+        sync_status = get_sync_status(config, verbose=verbose, metadata_only=metadata_only,
+                                      progress=report)
     
     # Display the results
-    display_sync_status(console, sync_status, quiet=quiet)
+    display_sync_status(console, sync_status, quiet=quiet, verbose=verbose)
     
     # Return simple, clean result for JSON output
     return {
@@ -165,6 +175,78 @@ def blame(
     }
 
 
+_CHANGE_MARKERS = {
+    "added": "[green]A[/green]",
+    "removed": "[red]D[/red]",
+    "modified": "[yellow]M[/yellow]",
+    "moved": "[cyan]R[/cyan]",
+}
+
+
+def diff(
+    console: Console,
+    config: Config,
+    from_snapshot: str,
+    to_snapshot: str,
+    prefix: str = "",
+    detect_moves: bool = True,
+    ndjson: bool = False,
+    verbose: bool = False,
+    quiet: bool = False
+) -> dict[str, Any]:
+    """Show what changed between two snapshots.
+    
+    Changes are printed as they stream out of the comparison, so the
+    result only carries counts: with --ndjson each change is written to
+    stdout as one JSON object per line instead of the table.
+    
+    Args:
+        console: Rich console for output
+        config: Loaded configuration
+        from_snapshot: Older snapshot id
+        to_snapshot: Newer snapshot id
+        prefix: Only compare paths starting with this prefix
+        detect_moves: Report removed and added files with the same hash as moves
+        ndjson: Write changes as newline-delimited JSON
+        verbose: Show hashes of changed files
+        quiet: Minimize output
+        
+    Returns:
+        Diff summary for JSON output
+    """
+    counts: Counter[str] = Counter()
+    size_delta = 0
+    for change in diff_snapshots(config, from_snapshot, to_snapshot, prefix=prefix, detect_moves=detect_moves):
+        counts[change.change] += 1
+        size_delta += change.size_delta
+        if ndjson:
+            sys.stdout.write(orjson.dumps(change.__dict__).decode() + "\n")
+        elif not quiet:
+            line = f"{_CHANGE_MARKERS[change.change]} {escape(change.path)}"
+            if change.old_path:
+                line = f"{_CHANGE_MARKERS[change.change]} {escape(change.old_path)} -> {escape(change.path)}"
+            if change.size_delta:
+                line += f" [dim]({change.size_delta:+,} bytes)[/dim]"
+            if verbose and (change.old_hash or change.new_hash):
+                line += f" [dim]{change.old_hash or '-'} -> {change.new_hash or '-'}[/dim]"
+            console.print(line, highlight=False)
+    
+    if not quiet and not ndjson:
+        summary = ", ".join(f"{counts[kind]} {kind}" for kind in _CHANGE_MARKERS if counts[kind])
+        console.print(f"{from_snapshot}..{to_snapshot}: {summary or 'no changes'}"
+                      f" ({size_delta:+,} bytes)")
+    
+    return {
+        'config': config,
+        'from_snapshot': from_snapshot,
+        'to_snapshot': to_snapshot,
+        'prefix': prefix,
+        'counts': {kind: counts[kind] for kind in _CHANGE_MARKERS},
+        'size_delta': size_delta,
+        'total_changes': sum(counts.values())
+    }
+
+
 def list_files(
     console: Console,
     config: Config,
@@ -45,8 +45,9 @@ app = typer.Typer(
 
 [bold blue]Setup:[/bold blue] init, clone, list-repos
 [bold green]Core Operations:[/bold green] list-files, status, sync
-[bold magenta]History:[/bold magenta] log, blame, snapmount, snapfetch
+[bold magenta]History:[/bold magenta] log, blame, diff, snapmount, snapfetch
 [bold red]Validation:[/bold red] validate-config, validate-file, validate-snapshot, validate-chain
+[bold red]Maintenance:[/bold red] clean, compact-cache, rebuild-history-index
 """,
     rich_markup_mode="rich"
 )
@@ -103,13 +104,15 @@ def list_repos_command(
 
 @app.command()
 def status(
+    metadata_only: bool = typer.Option(False, "--metadata-only", help="Compare changed files by size and mtime instead of hashing them"),
     verbose: bool = typer.Option(False, "--verbose", "-v", help="Show detailed debugging information"),
     quiet: bool = typer.Option(False, "--quiet", "-q", help="Suppress output"),
     to_json: bool = typer.Option(False, "--json", help="Output results as JSON")
 ) -> Any:
     """[bold green]Core Operations[/bold green]: Show sync status by comparing local files with last sync."""
     decorated_handler = info_command_pattern(
-        lambda console, config, verbose, quiet: info_commands.status(console, config, verbose, quiet)
+        lambda console, config, verbose, quiet: info_commands.status(
+            console, config, verbose, quiet, metadata_only=metadata_only)
     )
     return decorated_handler(verbose=verbose, quiet=quiet, to_json=to_json)
 
@@ -156,6 +159,31 @@ def blame(
     return decorated_handler(verbose=verbose, quiet=quiet, to_json=to_json)
 
 
+@app.command()
+def diff(
+    from_snapshot: str = typer.Argument(..., help="Older snapshot (e.g. s3)"),
+    to_snapshot: str = typer.Argument(..., help="Newer snapshot (e.g. s7)"),
+    prefix: str = typer.Option("", "--prefix", "-p", help="Only compare paths starting with this prefix"),
+    no_moves: bool = typer.Option(False, "--no-moves", help="Report moved files as removed and added"),
+    ndjson: bool = typer.Option(False, "--ndjson", help="Write changes as newline-delimited JSON"),
+    verbose: bool = typer.Option(False, "--verbose", "-v", help="Show hashes of changed files"),
+    quiet: bool = typer.Option(False, "--quiet", "-q", help="Suppress output"),
+    to_json: bool = typer.Option(False, "--json", help="Output results as JSON")
+) -> Any:
+    """[bold magenta]History[/bold magenta]: Show files changed between two snapshots."""
+    if to_json and ndjson:
+        # Both would be written to stdout, the JSON document after the NDJSON lines
+        raise typer.BadParameter("--json cannot be used with --ndjson")
+    decorated_handler = info_command_pattern(
+        lambda console, config, verbose, quiet: info_commands.diff(
+            console, config, from_snapshot, to_snapshot,
+            prefix=prefix, detect_moves=not no_moves, ndjson=ndjson,
+            verbose=verbose, quiet=quiet
+        )
+    )
+    return decorated_handler(verbose=verbose, quiet=quiet, to_json=to_json)
+
+
 @app.command(name="validate-config")
 def validate_config_command(
     check_backend: bool = typer.Option(True, "--backend/--no-backend", help="Test backend connectivity"),
@@ -355,11 +383,53 @@ def clean(
     )
 
 
+@app.command(name="compact-cache")
+def compact_cache_command(
+    verbose: bool = typer.Option(False, "--verbose", "-v", help="Show hash cache statistics"),
+    quiet: bool = typer.Option(False, "--quiet", "-q", help="Suppress output"),
+    to_json: bool = typer.Option(False, "--json", help="Output results as JSON")
+) -> Any:
+    """[bold red]Maintenance[/bold red]: Drop stale entries from the local file hash cache."""
+    decorated_handler = operation_command_pattern(command_type=COMMAND_TYPE_MAINTENANCE)(
+        lambda console, config, dry_run, force, normalize, verbose, quiet: action_commands.compact_cache(
+            console, config,
+            dry_run=dry_run, force=force,
+            verbose=verbose, quiet=quiet
+        )
+    )
+    return decorated_handler(
+        dry_run=False, force=False, normalize=False,
+        verbose=verbose, quiet=quiet, to_json=to_json
+    )
+
+
+@app.command(name="rebuild-history-index")
+def rebuild_history_index_command(
+    verbose: bool = typer.Option(False, "--verbose", "-v", help="Show the index location"),
+    quiet: bool = typer.Option(False, "--quiet", "-q", help="Suppress output"),
+    to_json: bool = typer.Option(False, "--json", help="Output results as JSON")
+) -> Any:
+    """[bold red]Maintenance[/bold red]: Recreate the per-file history index used by blame."""
+    decorated_handler = operation_command_pattern(command_type=COMMAND_TYPE_MAINTENANCE)(
+        lambda console, config, dry_run, force, normalize, verbose, quiet: action_commands.rebuild_history_index(
+            console, config,
+            dry_run=dry_run, force=force,
+            verbose=verbose, quiet=quiet
+        )
+    )
+    return decorated_handler(
+        dry_run=False, force=False, normalize=False,
+        verbose=verbose, quiet=quiet, to_json=to_json
+    )
+
+
 @app.command()
 def snapfetch(
     num: int = typer.Option(1, "--num", "-n", help="Snapshot number to fetch from (1=latest)"),
+    snapshot: Optional[str] = typer.Option(None, "--snapshot", "-s", help="Snapshot id to fetch from, e.g. s3 (overrides --num)"),
     file: str = typer.Argument(..., help="File to fetch from snapshot"),
-    output: Optional[str] = typer.Option(None, "--output", "-o", help="Output file path"),
+    output: Optional[str] = typer.Option(None, "--output", "-o", help="Output file path, or - for stdout (default: the file's name)"),
+    byte_range: Optional[str] = typer.Option(None, "--range", "-r", help="Only fetch bytes START-END (inclusive) or START-"),
     dry_run: bool = typer.Option(False, "--dry-run", help="Show what would be fetched without making changes"),
     force: bool = typer.Option(False, "--force", help="Overwrite existing output file"),
     normalize: bool = typer.Option(False, "--normalize", help="Fix invalid filenames automatically"),
@@ -368,12 +438,15 @@ def snapfetch(
     to_json: bool = typer.Option(False, "--json", help="Output results as JSON")
 ) -> Any:
     """[bold magenta]History[/bold magenta]: Fetch a specific file from a repository snapshot."""
+    if to_json and output == "-":
+        # Both would be written to stdout, the JSON after the file's bytes
+        raise typer.BadParameter("--json cannot be used with --output - (the file is written to stdout)")
     decorated_handler = operation_command_pattern(command_type=COMMAND_TYPE_REPOSITORY)(
         lambda console, config, dry_run, force, normalize, verbose, quiet: action_commands.snapfetch(
             console, config,
             dry_run=dry_run, force=force, normalize=normalize,
             verbose=verbose, quiet=quiet,
-            num=num, file=file, output=output
+            num=num, snapshot=snapshot, file=file, output=output, byte_range=byte_range
         )
     )
     return decorated_handler(
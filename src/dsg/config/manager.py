@@ -435,6 +435,12 @@ class UserConfig(BaseModel):
     # Conflict resolution settings
     backup_on_conflict: bool = Field(default=True, description="Create backup files during conflict resolution")
 
+    # Performance settings
+    hash_workers: Optional[int] = Field(default=None, ge=1, description="Concurrent file hashing threads (default: min(8, CPUs))")
+    transfer_workers: Optional[int] = Field(default=None, ge=1, description="Concurrent file transfers per sync (default: min(8, 2 x CPUs))")
+    pack_threshold_bytes: Optional[int] = Field(default=None, ge=0, description="Upload files smaller than this in packed batches; 0 disables (default: 64 KiB)")
+    pack_batch_files: Optional[int] = Field(default=None, ge=1, description="Maximum files per packed upload (default: 1000)")
+
     # Optional security configs
     ssh: Optional[SSHUserConfig] = None
     rclone: Optional[RcloneUserConfig] = None
@@ -0,0 +1,250 @@
+# Author: PB & Claude
+# Maintainer: PB
+# Original date: 2026.10.16
+# License: (c) HRDAG, 2025, GPL-2 or newer
+#
+# ------
+# src/dsg/core/hash_cache.py
+
+"""
+Persistent stat-keyed hash cache.
+
+Hashing every data file after every sync is the dominant cost on large
+repositories. This cache remembers the xxh3 hash of each file together with
+the stat tuple (device, inode, size, mtime_ns, ctime_ns) observed when the
+hash was computed. A later lookup is a hit only when the file's current stat
+tuple is identical, so any write, truncate, rename-over or chmod/chown forces
+a rehash.
+
+Invalidation rules:
+- Any difference in the stat tuple is a miss; the entry is replaced.
+- "Racy" files whose mtime falls inside RACY_WINDOW_NS of the session start
+  are hashed but never stored, since a second write landing in the same
+  timestamp tick would be invisible to the stat comparison.
+- A cache written by a different HASH_CACHE_VERSION, or one that fails to
+  parse, is discarded wholesale.
+- `dsg clean --target cache` deletes the cache file entirely.
+
+The cache lives at .dsg/cache/hash-cache.json and is keyed by the
+project-relative POSIX path. `compact()` drops entries whose files are gone
+or have changed on disk; `dsg compact-cache` runs it from the CLI. Lookups
+and stores are locked so one cache can be shared by the hashing worker pool.
+"""
+
+from __future__ import annotations
+
+import os
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path, PurePosixPath
+from typing import Callable, Final, Optional
+
+import loguru
+import orjson
+
+logger = loguru.logger
+
+HASH_CACHE_VERSION: Final[int] = 1
+HASH_CACHE_RELPATH: Final[str] = ".dsg/cache/hash-cache.json"
+
+# Coarse filesystems (FAT, some NFS exports) report 2s mtime granularity
+RACY_WINDOW_NS: Final[int] = 2_000_000_000
+
+StatKey = tuple[int, int, int, int, int]
+
+
+def stat_key(st: os.stat_result) -> StatKey:
+    """Build the (device, inode, size, mtime_ns, ctime_ns) key for a stat result."""
+    return (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns, st.st_ctime_ns)
+
+
+@dataclass
+class HashCacheStats:
+    """Hit/miss counters for a hash cache session."""
+    hits: int = 0
+    misses: int = 0
+    stale: int = 0  # misses where an entry existed but the stat tuple changed
+    racy: int = 0  # hashes not stored because the file was modified too recently
+    compacted: int = 0
+
+    @property
+    def lookups(self) -> int:
+        return self.hits + self.misses
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from the cache"""
+        if self.lookups > 0:
+            return self.hits / self.lookups
+        return 0.0
+
+
+class HashCache:
+    """Persistent mapping of relative path -> (stat key, hash)"""
+
+    def __init__(self, project_root: Path, cache_path: Optional[Path] = None):
+        self.project_root = project_root
+        self.cache_path = cache_path or project_root / HASH_CACHE_RELPATH
+        self.stats = HashCacheStats()
+        self._entries: dict[str, tuple[StatKey, str]] = {}
+        self._dirty = False
+        self._session_start_ns = time.time_ns()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, project_root: Path, cache_path: Optional[Path] = None) -> HashCache:
+        """Load the cache from disk, starting empty if it is missing or unusable."""
+        cache = cls(project_root, cache_path)
+        if not cache.cache_path.exists():
+            logger.debug(f"No hash cache at {cache.cache_path}, starting empty")
+            return cache
+
+        try:
+            data = orjson.loads(cache.cache_path.read_bytes())
+        except (OSError, orjson.JSONDecodeError) as e:
+            logger.warning(f"Discarding unreadable hash cache {cache.cache_path}: {e}")
+            return cache
+
+        if not isinstance(data, dict) or data.get("version") != HASH_CACHE_VERSION:
+            logger.debug(f"Discarding hash cache with incompatible version: {cache.cache_path}")
+            return cache
+
+        for rel_path, row in data.get("entries", {}).items():
+            if isinstance(row, list) and len(row) == 6:
+                cache._entries[rel_path] = (tuple(row[:5]), row[5])
+        logger.debug(f"Loaded hash cache with {len(cache._entries)} entries")
+        return cache
+
+    @classmethod
+    def for_project(cls, project_root: Path) -> Optional[HashCache]:
+        """Open the cache for an initialized project, or None if there is no .dsg/ yet."""
+        if not (project_root / ".dsg").is_dir():
+            return None
+        return cls.load(project_root)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, rel_path: str) -> bool:
+        return rel_path in self._entries
+
+    def _relative_key(self, full_path: Path) -> Optional[str]:
+        try:
+            return str(PurePosixPath(full_path.relative_to(self.project_root)))
+        except ValueError:
+            return None
+
+    def lookup(self, rel_path: str, st: os.stat_result) -> Optional[str]:
+        """Return the cached hash if the file's stat tuple is unchanged."""
+        with self._lock:
+            cached = self._entries.get(rel_path)
+            if cached is not None and cached[0] == stat_key(st):
+                self.stats.hits += 1
+                return cached[1]
+
+            self.stats.misses += 1
+            if cached is not None:
+                self.stats.stale += 1
+            return None
+
+    def recorded(self, rel_path: str) -> Optional[tuple[StatKey, str]]:
+        """The stat key and hash stored for a path, without checking the file"""
+        with self._lock:
+            return self._entries.get(rel_path)
+
+    def _is_racy(self, st: os.stat_result) -> bool:
+        return st.st_mtime_ns >= self._session_start_ns - RACY_WINDOW_NS
+
+    def store(self, rel_path: str, st: os.stat_result, file_hash: str) -> None:
+        """Record a freshly computed hash, unless the file is too new to trust."""
+        if self._is_racy(st):
+            with self._lock:
+                self.stats.racy += 1
+            self.invalidate(rel_path)
+            return
+        with self._lock:
+            self._entries[rel_path] = (stat_key(st), file_hash)
+            self._dirty = True
+
+    def invalidate(self, rel_path: str) -> None:
+        """Forget any cached hash for a path"""
+        with self._lock:
+            if self._entries.pop(rel_path, None) is not None:
+                self._dirty = True
+
+    def get_or_compute(self, full_path: Path, compute: Callable[[Path], str]) -> str:
+        """Return the hash for full_path, calling compute() only on a cache miss."""
+        rel_path = self._relative_key(full_path)
+        if rel_path is None:
+            return compute(full_path)
+
+        st = full_path.stat()
+        cached = self.lookup(rel_path, st)
+        if cached is not None:
+            return cached
+
+        file_hash = compute(full_path)
+        # Re-stat so a write racing with the read is never cached under the old key
+        after = full_path.stat()
+        if stat_key(after) == stat_key(st):
+            self.store(rel_path, after, file_hash)
+        else:
+            self.invalidate(rel_path)
+        return file_hash
+
+    def compact(self) -> int:
+        """Drop entries for files that are gone or no longer match their stat key.
+
+        Returns:
+            Number of entries removed
+        """
+        removed = 0
+        for rel_path, (key, _) in list(self._entries.items()):
+            try:
+                current = stat_key((self.project_root / rel_path).stat(follow_symlinks=False))
+            except OSError:
+                current = None
+            if current != key:
+                del self._entries[rel_path]
+                removed += 1
+
+        if removed:
+            self._dirty = True
+        self.stats.compacted += removed
+        logger.debug(f"Compacted hash cache: removed {removed}, kept {len(self._entries)}")
+        return removed
+
+    def save(self, force: bool = False) -> None:
+        """Atomically write the cache to disk if it changed."""
+        with self._lock:
+            if not (self._dirty or force):
+                return
+            data = {
+                "version": HASH_CACHE_VERSION,
+                "entries": {
+                    rel_path: [*key, file_hash]
+                    for rel_path, (key, file_hash) in self._entries.items()
+                },
+            }
+
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_name = tempfile.mkstemp(prefix=".hash-cache-", dir=self.cache_path.parent)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(orjson.dumps(data))
+            os.replace(temp_name, self.cache_path)
+        except Exception:
+            Path(temp_name).unlink(missing_ok=True)
+            raise
+
+        self._dirty = False
+        logger.debug(
+            f"Saved hash cache ({len(self._entries)} entries): "
+            f"{self.stats.hits} hits, {self.stats.misses} misses, "
+            f"{self.stats.stale} stale, {self.stats.racy} racy"
+        )
+
+
+# done.
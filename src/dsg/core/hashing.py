@@ -0,0 +1,194 @@
+# Author: PB & Claude
+# Maintainer: PB
+# Original date: 2026.10.16
+# License: (c) HRDAG, 2025, GPL-2 or newer
+#
+# ------
+# src/dsg/core/hashing.py
+
+"""
+Bounded worker-pool file hashing.
+
+The scanner, compute_hashes_for_manifest and Manifest.recover_or_compute_metadata
+all funnel their hashing through hash_files(). xxhash releases the GIL while
+digesting, so a small thread pool keeps several reads in flight and uses far
+more of an NVMe array or ZFS pool than a single reader can.
+
+Scheduling:
+- Files smaller than SMALL_FILE_BYTES are packed into batches (bounded by
+  SMALL_BATCH_FILES and SMALL_BATCH_BYTES) and submitted first, so a tree of
+  tiny files is never stuck queueing behind a multi-GB file.
+- Larger files are submitted one per task, biggest first, which keeps the
+  tail of the run short when a few huge files dominate.
+
+Results are returned keyed by path; callers assign them in manifest order, so
+the output is identical regardless of worker count or completion order.
+
+Long runs can report progress (files done out of files to hash, called from
+the calling thread) and be cancelled: setting the cancel event, or a
+KeyboardInterrupt in the calling thread, drops the queued batches, lets each
+worker stop after its current file, and raises OperationCancelled (or lets the
+KeyboardInterrupt through) once the pool has drained.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Final, Iterable, Optional
+
+import loguru
+import xxhash
+
+from dsg.core.hash_cache import HashCache
+from dsg.system.exceptions import OperationCancelled
+
+logger = loguru.logger
+
+DEFAULT_HASH_WORKERS: Final[int] = min(8, os.cpu_count() or 1)
+HASH_CHUNK_BYTES: Final[int] = 1024 * 1024
+SMALL_FILE_BYTES: Final[int] = 1024 * 1024
+SMALL_BATCH_FILES: Final[int] = 256
+SMALL_BATCH_BYTES: Final[int] = 16 * 1024 * 1024
+
+
+def hash_file_contents(path: Path) -> str:
+    """Read a file and return its xxh3_64 hex digest"""
+    h = xxhash.xxh3_64()
+    buf = bytearray(HASH_CHUNK_BYTES)
+    view = memoryview(buf)
+    with open(path, 'rb', buffering=0) as f:
+        while n := f.readinto(buf):
+            h.update(view[:n])
+    return h.hexdigest()
+
+
+def resolve_hash_workers(workers: Optional[int]) -> int:
+    """Return a usable worker count, falling back to DEFAULT_HASH_WORKERS"""
+    if workers is None:
+        return DEFAULT_HASH_WORKERS
+    return max(1, workers)
+
+
+@dataclass
+class HashResults:
+    """Outcome of hashing a set of files"""
+    hashes: dict[Path, str] = field(default_factory=dict)
+    errors: dict[Path, Exception] = field(default_factory=dict)
+
+
+def _plan_batches(sized: list[tuple[Path, int]]) -> list[list[Path]]:
+    """Group small files into batches and give each large file its own task."""
+    small = [(p, s) for p, s in sized if s < SMALL_FILE_BYTES]
+    large = sorted((ps for ps in sized if ps[1] >= SMALL_FILE_BYTES),
+                   key=lambda ps: ps[1], reverse=True)
+
+    batches: list[list[Path]] = []
+    current: list[Path] = []
+    current_bytes = 0
+    for path, size in small:
+        if current and (len(current) >= SMALL_BATCH_FILES
+                        or current_bytes + size > SMALL_BATCH_BYTES):
+            batches.append(current)
+            current, current_bytes = [], 0
+        current.append(path)
+        current_bytes += size
+    if current:
+        batches.append(current)
+
+    batches.extend([path] for path, _ in large)
+    return batches
+
+
+ProgressCallback = Callable[[int, int], None]
+
+
+def _hash_batch(paths: list[Path], hash_cache: Optional[HashCache],
+                cancel: Optional[threading.Event] = None,
+                progress: Optional[ProgressCallback] = None) -> HashResults:
+    results = HashResults()
+    for done, path in enumerate(paths):
+        if cancel is not None and cancel.is_set():
+            break
+        if progress is not None:
+            progress(done, len(paths))
+        try:
+            if hash_cache is not None:
+                results.hashes[path] = hash_cache.get_or_compute(path, hash_file_contents)
+            else:
+                results.hashes[path] = hash_file_contents(path)
+        except Exception as e:
+            results.errors[path] = e
+    return results
+
+
+def hash_files(paths: Iterable[Path], hash_cache: Optional[HashCache] = None,
+               workers: Optional[int] = None,
+               progress: Optional[ProgressCallback] = None,
+               cancel: Optional[threading.Event] = None) -> HashResults:
+    """
+    Hash many files with a bounded thread pool.
+
+    Args:
+        paths: Files to hash; duplicates are hashed once
+        hash_cache: Optional HashCache shared by all workers
+        workers: Maximum concurrent readers (defaults to DEFAULT_HASH_WORKERS)
+        progress: Optional callback(files_done, files_total), called in this thread
+        cancel: Optional event; once set, hashing stops and OperationCancelled is raised
+
+    Returns:
+        HashResults with a hash or an exception for every input path
+    """
+    unique = list(dict.fromkeys(paths))
+    total = len(unique)
+    workers = resolve_hash_workers(workers)
+    if workers == 1 or total <= 1:
+        results = _hash_batch(unique, hash_cache, cancel, progress)
+        _check_cancelled(cancel, results, total)
+        if progress is not None:
+            progress(total, total)
+        return results
+
+    results = HashResults()
+    sized: list[tuple[Path, int]] = []
+    for path in unique:
+        try:
+            sized.append((path, path.stat().st_size))
+        except OSError as e:
+            results.errors[path] = e
+
+    batches = _plan_batches(sized)
+    logger.debug(f"Hashing {len(sized)} files in {len(batches)} batches with {workers} workers")
+    stop = cancel if cancel is not None else threading.Event()
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="dsg-hash")
+    try:
+        futures = [pool.submit(_hash_batch, batch, hash_cache, stop) for batch in batches]
+        if progress is not None:
+            progress(len(results.errors), total)
+        for future in as_completed(futures):
+            batch_results = future.result()
+            results.hashes.update(batch_results.hashes)
+            results.errors.update(batch_results.errors)
+            if progress is not None:
+                progress(len(results.hashes) + len(results.errors), total)
+            if stop.is_set():
+                break
+    except BaseException:
+        stop.set()
+        raise
+    finally:
+        pool.shutdown(wait=True, cancel_futures=stop.is_set())
+    _check_cancelled(cancel, results, total)
+    return results
+
+
+def _check_cancelled(cancel: Optional[threading.Event], results: HashResults, total: int) -> None:
+    if cancel is not None and cancel.is_set():
+        done = len(results.hashes) + len(results.errors)
+        raise OperationCancelled(f"Hashing cancelled after {done} of {total} files")
+
+
+# done.
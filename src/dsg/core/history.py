@@ -6,16 +6,29 @@
 # ------
 # src/dsg/history.py
 
+import os
 import re
+import sqlite3
+import time
+from collections import deque
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from itertools import islice
 from pathlib import Path
-from typing import Optional, Iterator
+from typing import Optional, Iterator, TypeVar
 from dataclasses import dataclass, field, fields
 
 import loguru
+import orjson
+from pydantic import TypeAdapter
 
-from dsg.data.manifest import Manifest, ManifestMetadata, FileRef, parse_manifest_timestamp
+from dsg.data.manifest import Manifest, ManifestEntry, ManifestMetadata, FileRef, LinkRef, parse_manifest_timestamp
+from dsg.data.manifest_binary import MAGIC as BINARY_MAGIC, ManifestIndex, is_binary_manifest
+from dsg.data.manifest_store import ManifestEntries
+from dsg.data.manifest_stream import ManifestReader, open_manifest_file, sorted_records
 from dsg.config.manager import Config
+from dsg.core.history_index import HistoryIndex, sources_stamp
 from dsg.data.manifest_comparison import (
     ManifestComparator,
     TemporalSyncState,
@@ -27,6 +40,49 @@ logger = loguru.logger
 # Type alias for manifest loading return type
 ManifestWithMetadata = Optional[tuple[Manifest, ManifestMetadata]]
 
+_entry_adapter = TypeAdapter(ManifestEntry)
+
+T = TypeVar("T")
+
+# Snapshots loaded ahead of the one being compared. Decompression (lz4, gzip)
+# and most of the parsing run outside the interpreter, so a few threads
+# overlap them; each loaded snapshot is held until its turn, which bounds memory.
+DEFAULT_HISTORY_WORKERS = min(4, os.cpu_count() or 1)
+FULL_MANIFEST_WORKERS = 2
+
+
+def load_in_order(load: Callable[[Path], T], paths: Sequence[Path],
+                  workers: int = DEFAULT_HISTORY_WORKERS) -> Iterator[T]:
+    """Yield load(path) for each path in order, loading up to `workers` ahead in a thread pool
+
+    At most `workers` results are loading or waiting at any time, however
+    long the history; a consumer comparing pairwise holds two more. Stopping
+    early cancels the loads not yet started.
+    """
+    if workers <= 1 or len(paths) <= 1:
+        yield from map(load, paths)
+        return
+    remaining = iter(paths)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="dsg-history") as pool:
+        pending = deque(pool.submit(load, path) for path in islice(remaining, workers))
+        try:
+            while pending:
+                result = pending.popleft().result()
+                next_path = next(remaining, None)
+                if next_path is not None:
+                    pending.append(pool.submit(load, next_path))
+                yield result
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def _latest_snapshot_id(recorded: dict[str, dict]) -> Optional[str]:
+    """Highest-numbered snapshot id (s1, s2, ...), as lifecycle determines the current snapshot"""
+    numbered = [(int(snapshot_id[1:]), snapshot_id) for snapshot_id in recorded
+                if snapshot_id.startswith("s") and snapshot_id[1:].isdigit()]
+    return max(numbered)[1] if numbered else None
+
 
 def _compare_datetimes_normalized(dt1: datetime, dt2: datetime) -> bool:
     """Compare two datetimes, normalizing timezone info if needed."""
@@ -82,10 +138,105 @@ class BlameEntry(BaseEntry):
     snapshot_message: Optional[str] = field(default=None)
 
 
+@dataclass
+class SnapshotChange:
+    change: str  # "added", "removed", "modified", "moved"
+    path: str
+    old_path: Optional[str] = field(default=None)  # moved: where the file was
+    old_size: Optional[int] = field(default=None)
+    new_size: Optional[int] = field(default=None)
+    old_hash: Optional[str] = field(default=None)
+    new_hash: Optional[str] = field(default=None)
+    size_delta: int = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.size_delta = (self.new_size or 0) - (self.old_size or 0)
+
+
+def _entry_view(path: str, record: dict) -> ManifestEntry:
+    """FileRef/LinkRef over a stored entry dict, for ManifestComparator's equality"""
+    if record.get("type") == "link":
+        return LinkRef._view({"user": "", **record, "path": path})
+    return FileRef._view({"user": "", "hash": "", **record, "path": path})
+
+
+def _change(kind: str, path: str, before: Optional[dict], after: Optional[dict],
+            old_path: Optional[str] = None) -> SnapshotChange:
+    return SnapshotChange(
+        change=kind, path=path, old_path=old_path,
+        old_size=before.get("filesize") if before else None,
+        new_size=after.get("filesize") if after else None,
+        old_hash=(before.get("hash") or None) if before else None,
+        new_hash=(after.get("hash") or None) if after else None)
+
+
+def _merge_join(old: Iterator[tuple[str, dict]],
+                new: Iterator[tuple[str, dict]]) -> Iterator[tuple[str, Optional[dict], Optional[dict]]]:
+    """(path, old entry, new entry) over two path-sorted streams; None where a side lacks the path"""
+    old_path, old_record = next(old, (None, None))
+    new_path, new_record = next(new, (None, None))
+    while old_path is not None or new_path is not None:
+        if new_path is None or (old_path is not None and old_path < new_path):
+            yield old_path, old_record, None
+            old_path, old_record = next(old, (None, None))
+        elif old_path is None or new_path < old_path:
+            yield new_path, None, new_record
+            new_path, new_record = next(new, (None, None))
+        else:
+            yield old_path, old_record, new_record
+            old_path, old_record = next(old, (None, None))
+            new_path, new_record = next(new, (None, None))
+
+
+def diff_manifests(old_manifest: Path, new_manifest: Path, prefix: str = "",
+                   detect_moves: bool = True) -> Iterator[SnapshotChange]:
+    """Stream the changes from one manifest file to another.
+
+    Both manifests are read in path order (sorted_records) and merge-joined,
+    so memory does not grow with their size. Entries present in both are
+    compared as ManifestComparator.classify_2way does (entry __eq__: hashes
+    when both have one, else size and mtime; link targets).
+
+    Changes come in path order. With detect_moves, removed and added files
+    that have a hash are held back instead and, once both manifests are
+    read, paired by hash into moves; the rest follow as removed/added. That
+    holds memory proportional to the hashed adds and removes, not to the
+    manifests.
+    """
+    removed_by_hash: dict[str, list[tuple[str, dict]]] = {}
+    added_by_hash: dict[str, list[tuple[str, dict]]] = {}
+
+    for path, before, after in _merge_join(sorted_records(old_manifest, prefix),
+                                           sorted_records(new_manifest, prefix)):
+        if before is not None and after is not None:
+            if before != after and _entry_view(path, before) != _entry_view(path, after):
+                yield _change("modified", path, before, after)
+        elif detect_moves and (before or after).get("type") == "file" and (before or after).get("hash"):
+            held = removed_by_hash if after is None else added_by_hash
+            held.setdefault((before or after)["hash"], []).append((path, before or after))
+        elif after is None:
+            yield _change("removed", path, before, None)
+        else:
+            yield _change("added", path, None, after)
+
+    leftovers = []
+    for file_hash, removed in removed_by_hash.items():
+        added = added_by_hash.pop(file_hash, [])
+        for (old_path, before), (path, after) in zip(removed, added):
+            yield _change("moved", path, before, after, old_path=old_path)
+        leftovers.extend(_change("removed", path, before, None) for path, before in removed[len(added):])
+        leftovers.extend(_change("added", path, None, after) for path, after in added[len(removed):])
+    for added in added_by_hash.values():
+        leftovers.extend(_change("added", path, None, after) for path, after in added)
+    leftovers.sort(key=lambda change: change.path)
+    yield from leftovers
+
+
 class HistoryWalker:
 
-    def __init__(self, project_root: Path):
+    def __init__(self, project_root: Path, workers: int = DEFAULT_HISTORY_WORKERS):
         self.project_root = project_root
+        self.workers = workers
         self.dsg_dir = project_root / ".dsg"
         self.archive_dir = self.dsg_dir / "archive"
         self.current_manifest_path = self.dsg_dir / "last-sync.json"
@@ -132,7 +283,7 @@ class HistoryWalker:
     def _load_manifest_from_archive(self, archive_path: Path) -> ManifestWithMetadata:
         """Load manifest and metadata from compressed archive file."""
         try:
-            manifest = Manifest.from_compressed(archive_path)
+            manifest = Manifest.from_compressed(archive_path, trusted=True)
             if manifest.metadata:
                 return manifest, manifest.metadata
             else:
@@ -149,7 +300,7 @@ class HistoryWalker:
                 logger.debug("No current manifest found")
                 return None
 
-            manifest = Manifest.from_json(self.current_manifest_path)
+            manifest = Manifest.from_json(self.current_manifest_path, trusted=True)
             return manifest, manifest.metadata
 
         except Exception as e:
@@ -167,30 +318,108 @@ class HistoryWalker:
             if since_dt is None:
                 logger.warning(f"Invalid since date format: {since}")
 
-        current_result = self._load_current_manifest()
-        if current_result:
-            _, metadata = current_result
-            entry = self._metadata_to_log_entry(metadata)
+        for metadata in self._metadata_newest_first():
+            if limit and count >= limit:
+                break
 
+            entry = self._metadata_to_log_entry(metadata)
             if self._matches_filters(entry, since_dt, author):
                 yield entry
                 count += 1
-                if limit and count >= limit:
-                    return
 
+    def snapshot_manifest_path(self, snapshot_id: str) -> Path:
+        """The manifest file of a snapshot: its archive, or last-sync.json for the current one"""
         archive_files = self.get_archive_files()
+        for _, archive_path in archive_files:
+            if self._archive_snapshot_id(archive_path) == snapshot_id:
+                return archive_path
+        if self.current_manifest_path.exists():
+            current_id = _latest_snapshot_id(self._recorded_metadata())
+            if current_id != snapshot_id:
+                metadata = self._load_metadata(self.current_manifest_path)
+                current_id = metadata.snapshot_id if metadata else None
+            if current_id == snapshot_id:
+                return self.current_manifest_path
+        raise ValueError(f"Snapshot {snapshot_id} not found in {self.archive_dir} or {self.current_manifest_path}")
+
+    def _metadata_newest_first(self) -> Iterator[ManifestMetadata]:
+        """Each snapshot's metadata, newest first, without reading entries where possible.
+
+        Every sync records the new snapshot's metadata in sync-messages.json,
+        so the metadata comes from there. A snapshot missing from it (legacy
+        format, hand-made archives) falls back to reading its manifest, which
+        stops at the metadata if that comes first.
+        """
+        recorded = self._recorded_metadata()
+        archive_files = self.get_archive_files()
+        archived_ids = {self._archive_snapshot_id(archive_path) for _, archive_path in archive_files}
+
+        if self.current_manifest_path.exists():
+            # The current snapshot is the latest recorded one, unless that was already archived
+            current_id = _latest_snapshot_id(recorded)
+            metadata = None
+            if current_id is not None and current_id not in archived_ids:
+                metadata = self._validate_recorded(recorded, current_id)
+            if metadata is None:
+                metadata = self._load_metadata(self.current_manifest_path)
+            if metadata is not None:
+                yield metadata
+
         for _, archive_path in reversed(archive_files):
-            if limit and count >= limit:
-                break
+            metadata = self._validate_recorded(recorded, self._archive_snapshot_id(archive_path))
+            if metadata is None:
+                metadata = self._load_metadata(archive_path)
+            if metadata is not None:
+                yield metadata
+
+    def _recorded_metadata(self) -> dict[str, dict]:
+        """Snapshot metadata by snapshot id from sync-messages.json (empty if unavailable)"""
+        sync_messages_path = self.dsg_dir / "sync-messages.json"
+        if not sync_messages_path.exists():
+            return {}
+        try:
+            snapshots = orjson.loads(sync_messages_path.read_bytes()).get("snapshots", {})
+        except Exception as e:
+            logger.warning(f"Could not read {sync_messages_path}: {e}")
+            return {}
+        return snapshots if isinstance(snapshots, dict) else {}
+
+    def _validate_recorded(self, recorded: dict[str, dict], snapshot_id: str) -> Optional[ManifestMetadata]:
+        if snapshot_id not in recorded:
+            return None
+        try:
+            return ManifestMetadata.model_validate(recorded[snapshot_id])
+        except Exception as e:
+            logger.debug(f"Ignoring recorded metadata for {snapshot_id}: {e}")
+            return None
 
-            result = self._load_manifest_from_archive(archive_path)
-            if result:
-                _, metadata = result
-                entry = self._metadata_to_log_entry(metadata)
+    @staticmethod
+    def _archive_snapshot_id(archive_path: Path) -> str:
+        """Snapshot id an archive was written under, e.g. s3 for s3-sync.json.lz4"""
+        return re.sub(r"(-sync)?\.json\.(gz|lz4)$", "", archive_path.name)
 
-                if self._matches_filters(entry, since_dt, author):
-                    yield entry
-                    count += 1
+    def _load_metadata(self, manifest_path: Path) -> Optional[ManifestMetadata]:
+        """Read just the metadata of a manifest, without building its entries."""
+        try:
+            with open_manifest_file(manifest_path) as stream:
+                if is_binary_manifest(stream.peek(len(BINARY_MAGIC))):
+                    with ManifestIndex(stream.read()) as index:
+                        metadata_data = index.metadata
+                else:
+                    reader = ManifestReader(stream)
+                    for _ in reader.entries():
+                        if reader.metadata is not None:
+                            break
+                    metadata_data = reader.metadata
+
+            if metadata_data is None:
+                logger.warning(f"No metadata found in {manifest_path}")
+                return None
+            return ManifestMetadata.model_validate(metadata_data)
+
+        except Exception as e:
+            logger.error(f"Failed to load {manifest_path}: {e}")
+            return None
 
     def _metadata_to_log_entry(self, metadata: ManifestMetadata) -> LogEntry:
         """Convert ManifestMetadata to LogEntry - LogEntry is a subset of ManifestMetadata fields."""
@@ -213,23 +442,92 @@ class HistoryWalker:
 
         return True
 
+    def _load_file_entry(self, manifest_path: Path, file_path: str) -> ManifestWithMetadata:
+        """Load one file's entry and the metadata from a manifest, streaming past the rest.
+
+        Returns a manifest holding just that entry (or none, if the file is
+        absent), so memory stays bounded however large the snapshot is.
+        """
+        try:
+            with open_manifest_file(manifest_path) as stream:
+                if is_binary_manifest(stream.peek(len(BINARY_MAGIC))):
+                    with ManifestIndex(stream.read()) as index:
+                        record, metadata_data = index.record(file_path), index.metadata
+                else:
+                    reader = ManifestReader(stream)
+                    record = None
+                    for path, entry_data in reader.entries():
+                        if path == file_path:
+                            record = entry_data
+                    metadata_data = reader.metadata
+
+            if metadata_data is None:
+                logger.warning(f"No metadata found in {manifest_path}")
+                return None
+            entries = ManifestEntries()
+            if record is not None:
+                entries[file_path] = _entry_adapter.validate_python(record)
+            return Manifest.model_construct(entries=entries), ManifestMetadata.model_validate(metadata_data)
+
+        except Exception as e:
+            logger.error(f"Failed to load {manifest_path}: {e}")
+            return None
+
+    def manifest_paths(self) -> list[Path]:
+        """Every snapshot's manifest file, oldest first: the archives, then last-sync.json"""
+        manifest_paths = [archive_path for _, archive_path in self.get_archive_files()]
+        if self.current_manifest_path.exists():
+            manifest_paths.append(self.current_manifest_path)
+        return manifest_paths
+
+    def _load_manifest(self, manifest_path: Path) -> ManifestWithMetadata:
+        if manifest_path == self.current_manifest_path:
+            return self._load_current_manifest()
+        return self._load_manifest_from_archive(manifest_path)
+
+    def rebuild_history_index(self) -> int:
+        """Recreate the history index from every snapshot; returns how many were indexed"""
+        manifest_paths = self.manifest_paths()
+        stamp = sources_stamp(manifest_paths)
+        # Whole manifests: load fewer ahead, as each may be large
+        loaded = load_in_order(self._load_manifest, manifest_paths, min(self.workers, FULL_MANIFEST_WORKERS))
+        with HistoryIndex.for_project(self.project_root) as index:
+            # Unreadable snapshots are skipped, as the walk in get_file_blame skips them
+            return index.rebuild((result for result in loaded if result is not None), stamp)
+
+    def _indexed_blame(self, file_path: str, manifest_paths: list[Path]) -> Optional[list[BlameEntry]]:
+        """Blame from the history index, or None if there is no current index"""
+        if not HistoryIndex.exists(self.project_root):
+            return None
+        try:
+            with HistoryIndex.for_project(self.project_root) as index:
+                if not index.is_current(manifest_paths):
+                    logger.debug("History index is stale; walking the manifests")
+                    return None
+                rows = index.file_events(file_path)
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Could not read history index: {e}")
+            return None
+        return [BlameEntry(snapshot_id=snapshot_id, created_at=created_at, created_by=created_by,
+                           event_type=event_type, file_hash=file_hash, snapshot_message=snapshot_message)
+                for snapshot_id, created_at, created_by, snapshot_message, event_type, file_hash in rows]
+
     def get_file_blame(self, file_path: str) -> list[BlameEntry]:
         """Get blame/change history for a specific file across all snapshots."""
+        manifest_paths = self.manifest_paths()
+        indexed = self._indexed_blame(file_path, manifest_paths)
+        if indexed is not None:
+            return indexed
+
         blame_entries = []
         previous_manifest = None
-        
-        manifests_to_process = []
-        
-        # Load all manifests
-        for _, archive_path in self.get_archive_files():
-            if result := self._load_manifest_from_archive(archive_path):
-                manifests_to_process.append(result)
-        
-        if current_result := self._load_current_manifest():
-            manifests_to_process.append(current_result)
-        
-        # Process chronologically
-        for manifest, metadata in manifests_to_process:
+
+        # Process chronologically, keeping only this file's entry from two snapshots
+        for result in load_in_order(lambda path: self._load_file_entry(path, file_path),
+                                    manifest_paths, self.workers):
+            if result is None:
+                continue
+            manifest, metadata = result
             if blame_entry := self._create_blame_entry_if_changed(
                 file_path, manifest, metadata, previous_manifest
             ):
@@ -279,20 +577,28 @@ class HistoryWalker:
 
 def get_repository_log(config: Config, limit: Optional[int] = None,
                        since: Optional[str] = None,
-                       author: Optional[str] = None) -> list[LogEntry]:
+                       author: Optional[str] = None,
+                       verbose: bool = False) -> list[LogEntry]:
     """Get repository history log with optional filtering.
 
+    Reads snapshot metadata only (see HistoryWalker._metadata_newest_first).
+
     Args:
         config: DSG configuration containing project root
         limit: Maximum number of entries to return
         since: Only show entries since this date (ISO format)
         author: Only show entries by this author
+        verbose: Log how long reading the history took
 
     Returns:
         List of LogEntry objects in reverse chronological order
     """
+    start = time.perf_counter()
     walker = HistoryWalker(config.project_root)
-    return list(walker.walk_history(limit=limit, since=since, author=author))
+    entries = list(walker.walk_history(limit=limit, since=since, author=author))
+    if verbose:
+        logger.info(f"Read {len(entries)} log entries in {time.perf_counter() - start:.3f}s")
+    return entries
 
 
 def get_file_blame(config: Config, file_path: str) -> list[BlameEntry]:
@@ -308,4 +614,40 @@ def get_file_blame(config: Config, file_path: str) -> list[BlameEntry]:
     walker = HistoryWalker(config.project_root)
     return walker.get_file_blame(file_path)
 
+
+def rebuild_history_index(config: Config) -> int:
+    """Recreate the history index used by blame.
+
+    Args:
+        config: DSG configuration containing project root
+
+    Returns:
+        Number of snapshots indexed
+    """
+    walker = HistoryWalker(config.project_root)
+    return walker.rebuild_history_index()
+
+
+def diff_snapshots(config: Config, from_snapshot: str, to_snapshot: str,
+                   prefix: str = "", detect_moves: bool = True) -> Iterator[SnapshotChange]:
+    """Compare two snapshots of the repository.
+
+    Args:
+        config: DSG configuration containing project root
+        from_snapshot: Older snapshot id, e.g. "s3"
+        to_snapshot: Newer snapshot id
+        prefix: Only compare paths starting with this prefix
+        detect_moves: Pair removed and added files with the same hash as moves
+
+    Returns:
+        Iterator of SnapshotChange (see diff_manifests for order and memory use)
+
+    Raises:
+        ValueError: If either snapshot is not in this repository's history
+    """
+    walker = HistoryWalker(config.project_root)
+    return diff_manifests(walker.snapshot_manifest_path(from_snapshot),
+                          walker.snapshot_manifest_path(to_snapshot),
+                          prefix=prefix, detect_moves=detect_moves)
+
 # done.
@@ -0,0 +1,188 @@
+# Author: PB & Claude
+# Maintainer: PB
+# Original date: 2026.10.16
+# License: (c) HRDAG, 2025, GPL-2 or newer
+#
+# ------
+# src/dsg/core/history_index.py
+
+"""
+Persistent per-file history index, so blame is a lookup instead of a walk.
+
+Blame compares one path across every snapshot: each archived manifest in
+.dsg/archive plus the current last-sync.json. Without an index that means
+decompressing and parsing every manifest. The index stores the result once,
+in SQLite at .dsg/cache/history-index.sqlite3:
+
+- snapshots: one row per snapshot, in history order (seq), with the
+  metadata blame reports
+- events: (path, seq, event, hash) for every add, modify and delete,
+  exactly as blame classifies them (entry __eq__ between consecutive
+  snapshots)
+
+The index is incrementally updated: each sync appends its snapshot by
+comparing the previous and new manifests, which are both in memory anyway,
+and skips identical subtrees (see manifest_tree). It records a stamp of the
+manifest files it describes (name, size and mtime of each). Blame uses the
+index only while the stamp still matches the files on disk. Otherwise, for
+example in a fresh clone, after `dsg clean --target cache`, or when a snapshot
+was written by an older dsg, it walks the manifests as before until
+`dsg rebuild-history-index` recreates the index.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import Final, Optional
+
+import loguru
+import orjson
+
+from dsg.data.manifest import FileRef, Manifest, ManifestMetadata
+from dsg.data.manifest_tree import DirectoryTree, compare_trees
+
+logger = loguru.logger
+
+HISTORY_INDEX_VERSION: Final[int] = 1
+HISTORY_INDEX_RELPATH: Final[str] = ".dsg/cache/history-index.sqlite3"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS snapshots (
+    seq INTEGER PRIMARY KEY,
+    snapshot_id TEXT NOT NULL,
+    created_at TEXT,
+    created_by TEXT,
+    snapshot_message TEXT
+);
+CREATE TABLE IF NOT EXISTS events (
+    path TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    event TEXT NOT NULL,
+    hash TEXT,
+    PRIMARY KEY (path, seq)
+) WITHOUT ROWID;
+"""
+
+
+def sources_stamp(manifest_paths: Iterable[Path]) -> str:
+    """Identify the manifest files the index describes, in history order"""
+    stamp = []
+    for path in manifest_paths:
+        st = os.stat(path)
+        stamp.append([path.name, st.st_size, st.st_mtime_ns])
+    return orjson.dumps(stamp).decode()
+
+
+def snapshot_events(previous: Optional[Manifest], current: Manifest) -> Iterator[tuple[str, str, Optional[str]]]:
+    """(path, event, hash) for each path blame would report between two consecutive snapshots"""
+    before_entries = previous.entries if previous is not None else {}
+    _, candidates = compare_trees([DirectoryTree(before_entries), DirectoryTree(current.entries)])
+    for path in sorted(candidates):
+        before = before_entries.get(path)
+        after = current.entries.get(path)
+        if before is None and after is None:  # pragma: no cover - candidates come from the manifests
+            continue
+        if before is None:
+            event = "add"
+        elif after is None:
+            event = "delete"
+        elif before != after:
+            event = "modify"
+        else:
+            continue
+        yield path, event, after.hash if isinstance(after, FileRef) else None
+
+
+class HistoryIndex:
+    """The history index of one project (see module docstring)"""
+
+    def __init__(self, db_path: Path):
+        self.db_path = db_path
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(db_path)
+        self._db.executescript(_SCHEMA)
+        if self._meta("version") != str(HISTORY_INDEX_VERSION):
+            self._reset()
+
+    @classmethod
+    def for_project(cls, project_root: Path) -> HistoryIndex:
+        return cls(project_root / HISTORY_INDEX_RELPATH)
+
+    @classmethod
+    def exists(cls, project_root: Path) -> bool:
+        return (project_root / HISTORY_INDEX_RELPATH).exists()
+
+    def close(self) -> None:
+        self._db.close()
+
+    def __enter__(self) -> HistoryIndex:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _meta(self, key: str) -> Optional[str]:
+        row = self._db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _reset(self) -> None:
+        with self._db:
+            self._db.execute("DELETE FROM events")
+            self._db.execute("DELETE FROM snapshots")
+            self._db.execute("DELETE FROM meta")
+            self._db.execute("INSERT INTO meta VALUES ('version', ?)", (str(HISTORY_INDEX_VERSION),))
+
+    def is_current(self, manifest_paths: Iterable[Path]) -> bool:
+        """True if the index describes exactly these manifest files"""
+        stamp = self._meta("stamp")
+        return stamp is not None and stamp == sources_stamp(manifest_paths)
+
+    def __len__(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM snapshots").fetchone()[0]
+
+    def add_snapshot(self, previous: Optional[Manifest], current: Manifest,
+                     metadata: ManifestMetadata, stamp: Optional[str] = None) -> None:
+        """Append a snapshot, with its events relative to the previous one
+
+        Passing the stamp of the manifest files including this snapshot
+        records it in the same transaction, so a failure leaves the index
+        stale (and unused) rather than half updated.
+        """
+        with self._db:
+            seq = self._db.execute("SELECT COALESCE(MAX(seq), 0) + 1 FROM snapshots").fetchone()[0]
+            self._db.execute(
+                "INSERT INTO snapshots VALUES (?, ?, ?, ?, ?)",
+                (seq, metadata.snapshot_id, metadata.created_at, metadata.created_by, metadata.snapshot_message))
+            self._db.executemany(
+                "INSERT INTO events VALUES (?, ?, ?, ?)",
+                ((path, seq, event, file_hash) for path, event, file_hash in snapshot_events(previous, current)))
+            if stamp is not None:
+                self._db.execute("INSERT OR REPLACE INTO meta VALUES ('stamp', ?)", (stamp,))
+
+    def rebuild(self, snapshots: Iterable[tuple[Manifest, ManifestMetadata]], stamp: str) -> int:
+        """Replace the contents with the given snapshots, in history order; returns how many"""
+        self._reset()
+        previous = None
+        count = 0
+        for manifest, metadata in snapshots:
+            self.add_snapshot(previous, manifest, metadata)
+            previous = manifest
+            count += 1
+        with self._db:
+            self._db.execute("INSERT OR REPLACE INTO meta VALUES ('stamp', ?)", (stamp,))
+        logger.debug(f"Rebuilt history index with {count} snapshots")
+        return count
+
+    def file_events(self, path: str) -> list[tuple]:
+        """(snapshot_id, created_at, created_by, snapshot_message, event, hash) rows for a path, oldest first"""
+        return self._db.execute(
+            "SELECT s.snapshot_id, s.created_at, s.created_by, s.snapshot_message, e.event, e.hash"
+            " FROM events e JOIN snapshots s ON s.seq = e.seq WHERE e.path = ? ORDER BY e.seq",
+            (path,)).fetchall()
+
+
+# done.
@@ -20,7 +20,7 @@ filesystem operations, and backend repository interactions.
 
 import datetime
 import importlib.metadata
-import os
+import sqlite3
 import tempfile
 from pathlib import Path
 from dataclasses import dataclass, field
@@ -28,7 +28,6 @@ from enum import Enum
 
 import loguru
 import orjson
-import lz4.frame
 
 from rich.console import Console
 
@@ -44,12 +43,14 @@ from dsg.config.manager import Config
 from dsg.storage.factory import create_backend
 from dsg.data.manifest import Manifest
 from dsg.core.operations import get_sync_status, SyncStatusResult
+from dsg.core.history import HistoryWalker
+from dsg.core.history_index import HistoryIndex, sources_stamp
 from dsg.core.scanner import scan_directory, scan_directory_no_cfg
 from dsg.system.display import display_sync_dry_run_preview, display_normalization_preview
 from dsg.data.filename_validation import fix_problematic_path
 from dsg.data.manifest_merger import SyncState
 from dsg.system.exceptions import SyncError, ValidationError
-from dsg.storage.transaction_factory import create_transaction, calculate_sync_plan
+from dsg.storage.transaction_factory import create_transaction, calculate_sync_plan, expected_transfer_hashes
 
 
 class SyncOperationType(Enum):
@@ -1023,7 +1024,7 @@ def _execute_sync_operations(config: Config, console: 'Console') -> None:
         config: DSG configuration
         console: Rich console for output
     """
-    from dsg.storage import create_transaction, calculate_sync_plan
+    from dsg.storage import create_transaction, calculate_sync_plan, expected_transfer_hashes
     from dsg.core.operations import get_sync_status
     
     logger = loguru.logger
@@ -1041,12 +1042,15 @@ def _execute_sync_operations(config: Config, console: 'Console') -> None:
     download_count = len(sync_plan.get('download_files', []))
     delete_local_count = len(sync_plan.get('delete_local', []))
     delete_remote_count = len(sync_plan.get('delete_remote', []))
+    move_count = len(sync_plan.get('move_remote', [])) + len(sync_plan.get('move_local', []))
     
     logger.debug(f"Sync plan: {upload_count} uploads, {download_count} downloads, "
-                f"{delete_local_count} local deletions, {delete_remote_count} remote deletions")
+                f"{delete_local_count} local deletions, {delete_remote_count} remote deletions, "
+                f"{move_count} moves")
     
     # Early return if nothing to sync
-    total_operations = upload_count + download_count + delete_local_count + delete_remote_count
+    total_operations = (upload_count + download_count + delete_local_count
+                        + delete_remote_count + move_count)
     if total_operations == 0:
         console.print("[green]✓ Everything up to date[/green]")
         return
@@ -1054,12 +1058,16 @@ def _execute_sync_operations(config: Config, console: 'Console') -> None:
     # Step 3: Execute sync operations atomically using transaction system
     console.print(f"[dim]Synchronizing {total_operations} changes...[/dim]")
     
+    expected_hashes = expected_transfer_hashes(sync_plan, status.local_manifest, status.remote_manifest)
+    # The snapshot _update_manifests_after_sync will record; ZFS names the commit after it
+    snapshot_id = _get_next_snapshot_id(config.project_root / ".dsg" / "sync-messages.json")
+    
     try:
-        with create_transaction(config) as tx:
-            tx.sync_files(sync_plan, console)
+        with create_transaction(config, snapshot_id=snapshot_id) as tx:
+            tx.sync_files(sync_plan, console, expected_hashes=expected_hashes)
         
         # Step 4: Update manifests and metadata after successful sync
-        _update_manifests_after_sync(config, console)
+        _update_manifests_after_sync(config, console, known_hashes=tx.downloaded_hashes)
         
         console.print("[green]✓ Sync completed successfully[/green]")
         
@@ -1073,7 +1081,8 @@ def _execute_sync_operations(config: Config, console: 'Console') -> None:
 
 
 
-def _archive_previous_snapshots(archive_dir: Path, snapshot_id: str, prev_manifest: Manifest | None = None) -> None:
+def _archive_previous_snapshots(archive_dir: Path, snapshot_id: str,
+                                prev_manifest: Manifest | None = None) -> Path | None:
     """
     Archive previous snapshot manifest with LZ4 compression.
     
@@ -1081,40 +1090,74 @@ def _archive_previous_snapshots(archive_dir: Path, snapshot_id: str, prev_manife
         archive_dir: Path to .dsg/archive directory
         snapshot_id: Current snapshot ID being created
         prev_manifest: Previous manifest to archive (if any)
+
+    Returns:
+        Path of the archive written, or None if nothing was archived
     """
     logger = loguru.logger
     
     if prev_manifest is None:
         logger.debug(f"No previous manifest to archive for snapshot {snapshot_id}")
-        return
+        return None
     
     try:
-        # Generate JSON for the previous manifest
-        with tempfile.NamedTemporaryFile(mode='w+', suffix='.json', delete=False) as temp_file:
-            prev_manifest.to_json(Path(temp_file.name), include_metadata=True)
-            temp_file.seek(0)
-            
-            # Read back as bytes for compression
-            with open(temp_file.name, 'rb') as f:
-                json_data = f.read()
-        
-        # Compress with LZ4
-        compressed_data = lz4.frame.compress(json_data)
-        
-        # Write to archive
+        # Stream the manifest straight into an LZ4 frame, one entry at a time
         prev_snapshot_id = prev_manifest.metadata.snapshot_id if prev_manifest.metadata else "unknown"
         archive_path = archive_dir / f"{prev_snapshot_id}-sync.json.lz4"
-        
-        with open(archive_path, 'wb') as f:
-            f.write(compressed_data)
+        prev_manifest.to_compressed(archive_path, include_metadata=True)
         
         logger.debug(f"Archived previous snapshot {prev_snapshot_id} to {archive_path}")
-        
-        # Clean up temp file
-        os.unlink(temp_file.name)
+        return archive_path
         
     except Exception as e:
         logger.warning(f"Failed to archive previous snapshot: {e}")
+        return None
+
+
+def _indexed_manifest_paths(walker: HistoryWalker) -> list[Path] | None:
+    """
+    Manifest files the history index describes, if it can be extended by this sync.
+
+    A repository without snapshots starts a new index; otherwise the index
+    must exist and be current, or it is left for `dsg rebuild-history-index`.
+    """
+    manifest_paths = walker.manifest_paths()
+    if not HistoryIndex.exists(walker.project_root):
+        return manifest_paths if not manifest_paths else None
+    try:
+        with HistoryIndex.for_project(walker.project_root) as index:
+            return manifest_paths if index.is_current(manifest_paths) else None
+    except (OSError, sqlite3.Error) as e:
+        loguru.logger.debug(f"Could not read history index: {e}")
+        return None
+
+
+def _extend_history_index(walker: HistoryWalker, indexed_paths: list[Path] | None,
+                          archive_path: Path | None, prev_manifest: Manifest | None,
+                          updated_manifest: Manifest) -> None:
+    """
+    Append the new snapshot to the history index, comparing it with the previous one.
+
+    Only when the index described every earlier snapshot and the snapshot
+    files changed exactly as expected (the previous last-sync.json archived,
+    the new one written). Otherwise the index stays stale and blame walks
+    the manifests. The index never fails a sync.
+    """
+    logger = loguru.logger
+    if indexed_paths is None or bool(indexed_paths) != (archive_path is not None):
+        return
+    expected = indexed_paths[:-1] + ([archive_path] if archive_path else []) + [walker.current_manifest_path]
+    manifest_paths = walker.manifest_paths()
+    if manifest_paths != expected:
+        logger.debug("Snapshot files changed unexpectedly; leaving history index stale")
+        return
+    try:
+        with HistoryIndex.for_project(walker.project_root) as index:
+            index.add_snapshot(prev_manifest, updated_manifest, updated_manifest.metadata,
+                               stamp=sources_stamp(manifest_paths))
+        logger.debug(f"History index extended with snapshot {updated_manifest.metadata.snapshot_id}")
+    except Exception as e:
+        logger.warning(f"Could not update history index: {e}")
 
 
 def _build_sync_messages_file(manifest: Manifest, dsg_dir: Path, snapshot_id: str) -> None:
@@ -1174,7 +1217,8 @@ def _build_sync_messages_file(manifest: Manifest, dsg_dir: Path, snapshot_id: st
     logger.debug(f"Updated sync-messages.json with snapshot {snapshot_id}")
 
 
-def _update_manifests_after_sync(config: Config, console: 'Console', operation_type: str = "sync") -> None:
+def _update_manifests_after_sync(config: Config, console: 'Console', operation_type: str = "sync",
+                                 known_hashes: dict[str, str] | None = None) -> None:
     """
     Complete metadata management after sync operations using migration architecture patterns.
     
@@ -1183,11 +1227,14 @@ def _update_manifests_after_sync(config: Config, console: 'Console', operation_t
     2. Archive previous snapshot (if any) with LZ4 compression
     3. Update sync-messages.json with snapshot chain
     4. Update remote and cache manifests atomically
+    5. Extend the history index used by blame
     
     Args:
         config: DSG configuration
         console: Rich console for output
         operation_type: Type of operation ("sync", "init", "clone") for logging
+        known_hashes: xxh3 digests of downloaded files, computed in transit by
+            the transaction; these files are not read again for the new manifest
     """
     logger = loguru.logger
     dsg_dir = config.project_root / ".dsg"
@@ -1198,14 +1245,15 @@ def _update_manifests_after_sync(config: Config, console: 'Console', operation_t
     prev_manifest = None
     if cache_path.exists():
         try:
-            prev_manifest = Manifest.from_json(cache_path)
+            prev_manifest = Manifest.from_json(cache_path, trusted=True)
             logger.debug(f"Loaded previous manifest with {len(prev_manifest.entries)} entries")
         except Exception as e:
             logger.warning(f"Could not load previous manifest: {e}")
     
     # Step 2: Generate new manifest with updated snapshot metadata
     logger.debug("Regenerating manifest after file transfers...")
-    scan_result = scan_directory(config, compute_hashes=True, include_dsg_files=False)
+    scan_result = scan_directory(config, compute_hashes=True, include_dsg_files=False,
+                                 known_hashes=known_hashes)
     updated_manifest = scan_result.manifest
     
     # Determine snapshot IDs
@@ -1233,11 +1281,16 @@ def _update_manifests_after_sync(config: Config, console: 'Console', operation_t
     
     logger.debug(f"New snapshot: {next_snapshot_id} (hash: {snapshot_hash})")
     
+    # The history index can only be extended if it describes the history so far
+    walker = HistoryWalker(config.project_root)
+    indexed_paths = _indexed_manifest_paths(walker)
+    
     # Step 3: Archive previous snapshot with LZ4 compression
+    archive_path = None
     if prev_manifest:
         archive_dir = dsg_dir / "archive"
         archive_dir.mkdir(exist_ok=True)
-        _archive_previous_snapshots(archive_dir, next_snapshot_id, prev_manifest)
+        archive_path = _archive_previous_snapshots(archive_dir, next_snapshot_id, prev_manifest)
     
     # Step 4: Update sync-messages.json with new snapshot
     _build_sync_messages_file(updated_manifest, dsg_dir, next_snapshot_id)
@@ -1275,6 +1328,9 @@ def _update_manifests_after_sync(config: Config, console: 'Console', operation_t
         logger.error(f"Failed to update cache manifest: {e}")
         console.print(f"[yellow]⚠[/yellow] Warning: Failed to update cache manifest: {e}")
     
+    # Step 7: Extend the history index with the new snapshot
+    _extend_history_index(walker, indexed_paths, archive_path, prev_manifest, updated_manifest)
+    
     logger.info(f"Complete metadata management finished for snapshot {next_snapshot_id}")
 
 
@@ -1993,7 +2049,8 @@ def sync_manifests(config: Config,
     sync_states = merger.get_sync_states()
     
     # 2. Calculate sync plan (same logic for all operations)  
-    sync_plan = calculate_sync_plan(type('MockStatus', (), {'sync_states': sync_states})(), config)
+    sync_plan = calculate_sync_plan(
+        type('MockStatus', (), {'sync_states': sync_states, 'moves': merger.get_moves()})(), config)
     
     # 3. Log operation strategy
     logger.info(f"Operation: {operation_type}")
@@ -2006,12 +2063,19 @@ def sync_manifests(config: Config,
         return _preview_sync_plan(sync_plan, operation_type, console)
     
     # 4. Execute with transaction system (same for all operations)
+    expected_hashes = expected_transfer_hashes(sync_plan, local_manifest, remote_manifest)
+    # A clone leaves the repository as it was, so only init and sync name a ZFS snapshot
+    snapshot_id = None
+    if operation_type != "clone":
+        snapshot_id = _get_next_snapshot_id(config.project_root / ".dsg" / "sync-messages.json")
+    
     try:
-        with create_transaction(config) as tx:
-            tx.sync_files(sync_plan, console)
+        with create_transaction(config, snapshot_id=snapshot_id) as tx:
+            tx.sync_files(sync_plan, console, expected_hashes=expected_hashes)
         
         # 5. Update manifests after successful sync
-        _update_manifests_after_sync(config, console, operation_type)
+        _update_manifests_after_sync(config, console, operation_type,
+                                     known_hashes=tx.downloaded_hashes)
         
         return _create_operation_result(sync_plan, operation_type)
         
@@ -2053,11 +2117,20 @@ def _preview_sync_plan(sync_plan: dict, operation_type: str, console: Console) -
         if len(sync_plan['delete_remote']) > 3:
             console.print(f"    ... and {len(sync_plan['delete_remote']) - 3} more")
     
+    moves = sync_plan.get('move_remote', []) + sync_plan.get('move_local', [])
+    if moves:
+        console.print(f"[cyan]→[/cyan] Would move {len(moves)} files without transferring data:")
+        for old_path, new_path in moves[:5]:  # Show first 5
+            console.print(f"    {old_path} → {new_path}")
+        if len(moves) > 5:
+            console.print(f"    ... and {len(moves) - 5} more")
+    
     total_operations = (
         len(sync_plan['upload_files']) + 
         len(sync_plan['download_files']) + 
         len(sync_plan['delete_local']) + 
-        len(sync_plan['delete_remote'])
+        len(sync_plan['delete_remote']) +
+        len(moves)
     )
     
     if total_operations == 0:
@@ -2071,7 +2144,8 @@ def _preview_sync_plan(sync_plan: dict, operation_type: str, console: Console) -
         'total_operations': total_operations,
         'upload_count': len(sync_plan['upload_files']),
         'download_count': len(sync_plan['download_files']),
-        'delete_count': len(sync_plan['delete_local']) + len(sync_plan['delete_remote'])
+        'delete_count': len(sync_plan['delete_local']) + len(sync_plan['delete_remote']),
+        'move_count': len(moves)
     }
 
 
@@ -2085,7 +2159,8 @@ def _create_operation_result(sync_plan: dict, operation_type: str) -> dict:
         'files_deleted': len(sync_plan['delete_local']) + len(sync_plan['delete_remote']),
         'upload_files': sync_plan['upload_files'],
         'download_files': sync_plan['download_files'],
-        'delete_files': sync_plan['delete_local'] + sync_plan['delete_remote']
+        'delete_files': sync_plan['delete_local'] + sync_plan['delete_remote'],
+        'files_moved': len(sync_plan.get('move_remote', [])) + len(sync_plan.get('move_local', []))
     }
 
 
@@ -2134,7 +2209,7 @@ def clone_repository(config: Config, source_url: str, dest_path: Path,
             temp_path = Path(temp_file.name)
         
         try:
-            remote_manifest = Manifest.from_json(temp_path)
+            remote_manifest = Manifest.from_json(temp_path, trusted=True)
             logger.debug(f"Retrieved remote manifest with {len(remote_manifest.entries)} files")
         finally:
             temp_path.unlink()  # Clean up temp file
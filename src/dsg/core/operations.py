@@ -6,22 +6,28 @@
 # ------
 # dsg/src/dsg/operations.py
 
+import threading
+import time
 import traceback
 from collections import OrderedDict
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path, PurePosixPath
-from typing import Optional
+from typing import Callable, Optional, TypeVar
 
 import loguru
 
 from dsg.storage.factory import create_backend
 from dsg.config.manager import Config
 from dsg.data.manifest import Manifest
-from dsg.data.manifest_merger import ManifestMerger, SyncState
+from dsg.data.manifest_merger import FileMove, ManifestMerger, SyncState, recover_local_metadata
+from dsg.core.remote_manifest_cache import fetch_remote_manifest
 from dsg.core.scanner import scan_directory, scan_directory_no_cfg, ScanResult
 
 logger = loguru.logger
 
+T = TypeVar("T")
+
 
 def list_directory(
     path: Path,
@@ -120,27 +126,120 @@ class SyncStatusResult:
     remote_manifest: Optional[Manifest]
     include_remote: bool
     warnings: list[dict[str, str]]
+    moves: list[FileMove] = field(default_factory=list)
+    metadata_only: bool = False
+    unhashed: list[str] = field(default_factory=list)  # possibly changed, compared by size and mtime
+    timings: dict[str, float] = field(default_factory=dict)  # seconds per stage, see get_sync_status
 
 
 def get_sync_status(
         config: Config,
         include_remote: bool = True,
-        verbose: bool = False) -> SyncStatusResult:
-    """Shared logic for both 'dsg status' and 'dsg sync --dry-run'."""
+        verbose: bool = False,
+        metadata_only: bool = False,
+        progress: Optional[Callable[[int, int], None]] = None,
+        cancel: Optional[threading.Event] = None) -> SyncStatusResult:
+    """Shared logic for both 'dsg status' and 'dsg sync --dry-run'.
+
+    Local files that don't match the last sync by metadata are hashed in a
+    separate stage before the comparison (see recover_local_metadata), which
+    reports to progress and stops with OperationCancelled once cancel is set.
+    With metadata_only they are not hashed and are classified by size and
+    mtime, so touched but unchanged files show as changed.
+
+    The remote manifest is fetched and parsed in a worker thread while the
+    local directory is scanned. The result's timings give seconds per stage:
+    scan, cache, remote (the fetch itself, overlapping scan and cache),
+    remote_wait (how long the fetch held things up after them; near zero
+    when the scan is the critical path), recover, merge and total.
+    """
     warnings = []
+    timings: dict[str, float] = {}
+    started = time.perf_counter()
 
     logger.debug(f"Starting get_sync_status with include_remote={include_remote}")
 
-    logger.debug(f"Scanning local directory: {config.project_root}")
-    scan_result = scan_directory(config, include_dsg_files=False)
-    local_manifest = scan_result.manifest
-    logger.debug(f"Local manifest loaded with {len(local_manifest.entries)} entries")
+    # The remote fetch is network-bound and independent of the local scan, so
+    # it runs in a worker thread while this thread walks the filesystem
+    pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="dsg-status")
+    try:
+        remote_future = pool.submit(_timed, _fetch_remote_manifest, config) if include_remote else None
+
+        stage = time.perf_counter()
+        logger.debug(f"Scanning local directory: {config.project_root}")
+        scan_result = scan_directory(config, include_dsg_files=False)
+        local_manifest = scan_result.manifest
+        timings["scan"] = time.perf_counter() - stage
+        logger.debug(f"Local manifest loaded with {len(local_manifest.entries)} entries")
+
+        if scan_result.validation_warnings:
+            # Preserve structured validation warnings instead of converting to strings
+            warnings.extend(scan_result.validation_warnings)
+            logger.debug(f"Added {len(scan_result.validation_warnings)} filename validation warnings")
+
+        stage = time.perf_counter()
+        cache_manifest = _load_cache_manifest(config, verbose, warnings)
+        timings["cache"] = time.perf_counter() - stage
+
+        if remote_future is not None:
+            stage = time.perf_counter()
+            (remote_manifest, remote_warning), timings["remote"] = remote_future.result()
+            timings["remote_wait"] = time.perf_counter() - stage
+            if remote_warning:
+                warnings.append(remote_warning)
+        else:
+            remote_manifest = Manifest(entries=OrderedDict())  # Empty manifest for 2-way comparison
+            logger.debug("Skipping remote manifest (include_remote=False)")
+    except BaseException:
+        # A local failure surfaces now, not once the remote fetch finishes or times out
+        pool.shutdown(wait=False, cancel_futures=True)
+        raise
+    pool.shutdown()
+
+    stage = time.perf_counter()
+    logger.debug(f"Recovering local metadata (metadata_only={metadata_only})...")
+    unrecovered = recover_local_metadata(local_manifest, cache_manifest, config,
+                                         metadata_only=metadata_only, progress=progress, cancel=cancel)
+    timings["recover"] = time.perf_counter() - stage
+    logger.debug(f"{len(unrecovered)} local files did not match the cache by metadata")
+
+    # Use ManifestMerger for comparison
+    logger.debug("Creating ManifestMerger...")
+    logger.debug(f"Local entries: {len(local_manifest.entries)}")
+    logger.debug(f"Cache entries: {len(cache_manifest.entries)}")
+    logger.debug(f"Remote entries: {len(remote_manifest.entries) if remote_manifest else 0}")
+
+    stage = time.perf_counter()
+    merger = ManifestMerger(local_manifest, cache_manifest, remote_manifest, config, recover=False)
+    timings["merge"] = time.perf_counter() - stage
+    timings["total"] = time.perf_counter() - started
+    logger.debug("ManifestMerger created successfully")
+    logger.debug(f"Total sync states: {len(merger.get_sync_states())}")
+    logger.debug("Status stage timings: " + ", ".join(f"{name}={seconds:.3f}s" for name, seconds in timings.items()))
+
+    return SyncStatusResult(
+        sync_states=merger.get_sync_states(),
+        local_manifest=local_manifest,
+        cache_manifest=cache_manifest,
+        remote_manifest=remote_manifest,
+        include_remote=include_remote,
+        warnings=warnings,
+        moves=merger.get_moves(),
+        metadata_only=metadata_only,
+        unhashed=unrecovered if metadata_only else [],
+        timings=timings,
+    )
+
+
+def _timed(func: Callable[..., T], *args) -> tuple[T, float]:
+    """Call func(*args) and return its result with the elapsed seconds"""
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
 
-    if scan_result.validation_warnings:
-        # Preserve structured validation warnings instead of converting to strings
-        warnings.extend(scan_result.validation_warnings)
-        logger.debug(f"Added {len(scan_result.validation_warnings)} filename validation warnings")
 
+def _load_cache_manifest(config: Config, verbose: bool, warnings: list) -> Manifest:
+    """Load .dsg/last-sync.json, or an empty manifest (with a warning) if there is none"""
     cache_path = config.project_root / ".dsg" / "last-sync.json"
     logger.debug(f"Loading cache manifest from: {cache_path}")
     logger.debug(f"Cache file exists: {cache_path.exists()}")
@@ -150,7 +249,7 @@ def get_sync_status(
     if cache_path.exists():
         try:
             logger.debug("Attempting to load cache manifest...")
-            cache_manifest = Manifest.from_json(cache_path)
+            cache_manifest = Manifest.from_json(cache_path, trusted=True)
             logger.debug(f"Cache manifest loaded successfully with {len(cache_manifest.entries)} entries")
             if cache_manifest.metadata:
                 logger.debug(f"Cache metadata: snapshot_id={cache_manifest.metadata.snapshot_id}")
@@ -163,48 +262,24 @@ def get_sync_status(
         warnings.append("No .dsg/last-sync.json found. Run 'dsg sync' first.")
         cache_manifest = Manifest(entries=OrderedDict())
         logger.debug("Using empty cache manifest")
-
-    remote_manifest = None
-    if include_remote:
-        logger.debug("Loading remote manifest...")
-        try:
-            backend = create_backend(config)
-            logger.debug(f"Backend created: {type(backend).__name__}")
-            remote_data = backend.read_file(".dsg/last-sync.json")
-            if remote_data:
-                logger.debug(f"Remote data received, size: {len(remote_data)} bytes")
-                remote_manifest = Manifest.from_bytes(remote_data)
-                logger.debug(f"Remote manifest loaded with {len(remote_manifest.entries)} entries")
-            else:
-                warnings.append("No remote manifest found.")
-                remote_manifest = Manifest(entries=OrderedDict())
-                logger.debug("No remote data received, using empty manifest")
-        except Exception as e:
-            warnings.append(f"Could not fetch remote manifest: {e}")
-            remote_manifest = Manifest(entries=OrderedDict())
-            logger.debug(f"Remote manifest loading failed: {e}")
-    else:
-        remote_manifest = Manifest(entries=OrderedDict())  # Empty manifest for 2-way comparison
-        logger.debug("Skipping remote manifest (include_remote=False)")
-
-    # Use ManifestMerger for comparison
-    logger.debug("Creating ManifestMerger...")
-    logger.debug(f"Local entries: {len(local_manifest.entries)}")
-    logger.debug(f"Cache entries: {len(cache_manifest.entries)}")
-    logger.debug(f"Remote entries: {len(remote_manifest.entries) if remote_manifest else 0}")
-
-    merger = ManifestMerger(local_manifest, cache_manifest, remote_manifest, config)
-    logger.debug("ManifestMerger created successfully")
-    logger.debug(f"Total sync states: {len(merger.get_sync_states())}")
-
-    return SyncStatusResult(
-        sync_states=merger.get_sync_states(),
-        local_manifest=local_manifest,
-        cache_manifest=cache_manifest,
-        remote_manifest=remote_manifest,
-        include_remote=include_remote,
-        warnings=warnings
-    )
+    return cache_manifest
+
+
+def _fetch_remote_manifest(config: Config) -> tuple[Manifest, Optional[str]]:
+    """Read and parse the remote last-sync.json (see remote_manifest_cache); an empty manifest and a warning on failure"""
+    logger.debug("Loading remote manifest...")
+    try:
+        backend = create_backend(config)
+        logger.debug(f"Backend created: {type(backend).__name__}")
+        remote_manifest = fetch_remote_manifest(backend, config.project_root)
+        if remote_manifest is not None:
+            logger.debug(f"Remote manifest loaded with {len(remote_manifest.entries)} entries")
+            return remote_manifest, None
+        logger.debug("No remote data received, using empty manifest")
+        return Manifest(entries=OrderedDict()), "No remote manifest found."
+    except Exception as e:
+        logger.debug(f"Remote manifest loading failed: {e}")
+        return Manifest(entries=OrderedDict()), f"Could not fetch remote manifest: {e}"
 
 
 # Sync functionality moved to lifecycle.py
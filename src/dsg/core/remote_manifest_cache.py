@@ -0,0 +1,168 @@
+# Author: PB & Claude
+# Maintainer: PB
+# Original date: 2026.10.16
+# License: (c) HRDAG, 2025, GPL-2 or newer
+#
+# ------
+# src/dsg/core/remote_manifest_cache.py
+
+"""
+Local cache of the remote last-sync.json, revalidated by a cheap probe.
+
+Every status and sync needs the remote manifest, but it only changes when
+someone syncs. The last copy fetched is kept at .dsg/cache/remote-last-sync.json
+with a sidecar (.dsg/cache/remote-last-sync.meta.json) recording the stamp it
+was fetched under: the remote file's size and mtime, an xxh3 of its last
+TAIL_BYTES, and the snapshot_id and entries_hash of the parsed manifest.
+
+Before downloading, Backend.probe_file stats the remote file and reads its
+tail in one round trip. The manifest's metadata (snapshot_id, entries_hash,
+timestamp) is written last, so the tail changes whenever a new snapshot is
+written, even one of the same size within the same mtime tick. When the
+probe matches the stamp, the cached copy is loaded instead; its metadata must
+still agree with the sidecar, or it is discarded and fetched again.
+
+A backend without a cheap probe, an unreadable or mismatched sidecar, or a
+remote file that changed between the probe and the download all fall back to
+the full fetch. `dsg clean --target cache` removes the cache with the rest of
+.dsg/cache.
+"""
+
+from __future__ import annotations
+
+import os
+import tempfile
+from pathlib import Path
+from typing import Final, Optional
+
+import loguru
+import orjson
+import xxhash
+
+from dsg.data.manifest import Manifest
+from dsg.storage.backends import Backend, FileProbe
+
+logger = loguru.logger
+
+REMOTE_MANIFEST_RELPATH: Final[str] = ".dsg/last-sync.json"
+REMOTE_CACHE_RELPATH: Final[str] = ".dsg/cache/remote-last-sync.json"
+REMOTE_SIDECAR_RELPATH: Final[str] = ".dsg/cache/remote-last-sync.meta.json"
+REMOTE_CACHE_VERSION: Final[int] = 1
+TAIL_BYTES: Final[int] = 4096
+
+
+def _stamp(probe: FileProbe) -> dict:
+    return {
+        "version": REMOTE_CACHE_VERSION,
+        "size": probe.size,
+        "mtime": probe.mtime,
+        "tail_xxh3": xxhash.xxh3_64_hexdigest(probe.tail),
+    }
+
+
+def _identity(manifest: Manifest) -> dict:
+    metadata = manifest.metadata
+    return {
+        "snapshot_id": metadata.snapshot_id if metadata else None,
+        "entries_hash": metadata.entries_hash if metadata else None,
+    }
+
+
+def _write_atomic(path: Path, content: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_name = tempfile.mkstemp(prefix=f".{path.name}-", dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(content)
+        os.replace(temp_name, path)
+    except Exception:
+        Path(temp_name).unlink(missing_ok=True)
+        raise
+
+
+class RemoteManifestCache:
+    """The cached remote manifest of one project"""
+
+    def __init__(self, project_root: Path):
+        self.cache_path = project_root / REMOTE_CACHE_RELPATH
+        self.sidecar_path = project_root / REMOTE_SIDECAR_RELPATH
+
+    def _sidecar(self) -> Optional[dict]:
+        try:
+            sidecar = orjson.loads(self.sidecar_path.read_bytes())
+        except (OSError, orjson.JSONDecodeError):
+            return None
+        if not isinstance(sidecar, dict) or sidecar.get("version") != REMOTE_CACHE_VERSION:
+            return None
+        return sidecar
+
+    def lookup(self, probe: FileProbe) -> Optional[Manifest]:
+        """The cached manifest if it was fetched under the same stamp, else None"""
+        sidecar = self._sidecar()
+        if sidecar is None or {key: sidecar.get(key) for key in _stamp(probe)} != _stamp(probe):
+            return None
+        try:
+            manifest = Manifest.from_json(self.cache_path, trusted=True)
+        except Exception as e:
+            logger.debug(f"Discarding unreadable remote manifest cache {self.cache_path}: {e}")
+            return None
+        if _identity(manifest) != {key: sidecar.get(key) for key in ("snapshot_id", "entries_hash")}:
+            logger.debug("Discarding remote manifest cache that disagrees with its sidecar")
+            return None
+        return manifest
+
+    def store(self, probe: FileProbe, data: bytes, manifest: Manifest) -> None:
+        """Keep data (already parsed into manifest) under the probe's stamp"""
+        # Sidecar last, and removed first: a crash in between leaves no sidecar, i.e. no cache
+        self.sidecar_path.unlink(missing_ok=True)
+        _write_atomic(self.cache_path, data)
+        _write_atomic(self.sidecar_path, orjson.dumps({**_stamp(probe), **_identity(manifest)}))
+
+
+def fetch_remote_manifest(backend: Backend, project_root: Optional[Path] = None,
+                          rel_path: str = REMOTE_MANIFEST_RELPATH) -> Optional[Manifest]:
+    """
+    Load the remote manifest, reusing the local cached copy when the remote is unchanged.
+
+    Args:
+        backend: Backend of the remote repository
+        project_root: Local project; without an initialized .dsg/ nothing is cached
+        rel_path: Manifest path in the remote repository
+
+    Returns:
+        The remote manifest, or None if the remote file is empty
+    """
+    cache = None
+    if project_root is not None and (project_root / ".dsg").is_dir():
+        cache = RemoteManifestCache(project_root)
+
+    probe = None
+    if cache is not None:
+        try:
+            probe = backend.probe_file(rel_path, TAIL_BYTES)
+        except FileNotFoundError:
+            raise
+        except Exception as e:
+            # The probe only saves a download; without it the manifest is fetched whole
+            logger.debug(f"Could not probe remote manifest, fetching it instead: {e}")
+    if probe is not None:
+        cached = cache.lookup(probe)
+        if cached is not None:
+            logger.debug(f"Remote manifest unchanged ({probe.size} bytes); using cached copy")
+            return cached
+
+    data = backend.read_file(rel_path)
+    if not data:
+        return None
+    manifest = Manifest.from_bytes(data, trusted=True)
+
+    # Only cache what the probe described; the file may have changed in between
+    if probe is not None and len(data) == probe.size and data.endswith(probe.tail):
+        try:
+            cache.store(probe, data, manifest)
+        except OSError as e:  # pragma: no cover
+            logger.debug(f"Could not cache remote manifest: {e}")  # the cache is an optimization
+    return manifest
+
+
+# done.
@@ -8,22 +8,25 @@
 from __future__ import annotations
 
 # Standard library imports
-from collections import OrderedDict
+from collections import Counter, OrderedDict
 from dataclasses import dataclass
 from datetime import datetime
+import os
 from pathlib import Path, PurePosixPath
-from typing import Optional, Final
+from typing import Iterator, Optional, Final
 import re
 
 # Third-party imports
 import loguru
 from pydantic import BaseModel
-import xxhash
 
 # Local DSG imports
 from dsg.config.manager import Config
+from dsg.core.hash_cache import HashCache
+from dsg.core.hashing import hash_file_contents, hash_files
 from dsg.data.manifest import Manifest, ManifestEntry, FileRef
 from dsg.data.filename_validation import validate_path
+from dsg.system.logging_setup import trace_enabled
 
 logger = loguru.logger
 
@@ -40,7 +43,7 @@ def generate_backup_suffix() -> str:
 @dataclass
 class ProcessedPath:
     """Structured representation of a processed file path during scanning."""
-    relative_path: Path
+    relative_path: PurePosixPath
     path_parts: tuple[str, ...]
     posix_path: PurePosixPath
     str_path: str
@@ -55,14 +58,11 @@ class PathClassification:
     should_include: bool
 
 
-def hash_file(path: Path) -> str:
-    """Calculate xxHash for a file"""
-    h = xxhash.xxh3_64()
-    with open(path, 'rb') as f:
-        # Read in chunks to handle large files
-        for chunk in iter(lambda: f.read(8192), b''):
-            h.update(chunk)
-    return h.hexdigest()
+def hash_file(path: Path, hash_cache: Optional[HashCache] = None) -> str:
+    """Calculate xxHash for a file, reusing a cached hash if its stat tuple is unchanged"""
+    if hash_cache is not None:
+        return hash_cache.get_or_compute(path, hash_file_contents)
+    return hash_file_contents(path)
 
 
 class ScanResult(BaseModel):
@@ -78,7 +78,9 @@ def manifest_from_scan_result(scan_result: ScanResult) -> Manifest:
 
 
 def scan_directory(cfg: Config, compute_hashes: bool = False, 
-                normalize_paths: bool = False, include_dsg_files: bool = True) -> ScanResult:
+                normalize_paths: bool = False, include_dsg_files: bool = True,
+                use_hash_cache: bool = True, hash_workers: Optional[int] = None,
+                known_hashes: Optional[dict[str, str]] = None) -> ScanResult:
     """
     Scan a directory using configuration from cfg.
 
@@ -87,11 +89,24 @@ def scan_directory(cfg: Config, compute_hashes: bool = False,
         compute_hashes: When True, calculates file hashes for all files in the manifest
         normalize_paths: When True, normalizes invalid paths during scanning
         include_dsg_files: When False, excludes .dsg/ metadata files from results
+        use_hash_cache: When True (and compute_hashes is set), reuse hashes from
+            .dsg/cache/hash-cache.json for files whose stat tuple is unchanged
+        hash_workers: Number of hashing threads; defaults to the user config's
+            hash_workers, then to DEFAULT_HASH_WORKERS
+        known_hashes: rel_path -> xxh3 for files the caller has just written
+            itself (e.g. hashed in transit during sync download); used instead
+            of reading those files again
     """
     # Use getattr to safely handle the user_id attribute
     user_id = getattr(cfg.user, 'user_id', None) if cfg.user else None
-        
-    return _scan_directory_internal(
+    if hash_workers is None and cfg.user:
+        hash_workers = getattr(cfg.user, 'hash_workers', None)
+
+    hash_cache = None
+    if compute_hashes and use_hash_cache:
+        hash_cache = HashCache.for_project(cfg.project_root)
+
+    result = _scan_directory_internal(
         root_path=cfg.project_root,
         data_dirs=cfg.project.data_dirs,
         ignored_exact=cfg.project.ignore._ignored_exact,
@@ -100,14 +115,32 @@ def scan_directory(cfg: Config, compute_hashes: bool = False,
         compute_hashes=compute_hashes,
         user_id=user_id,
         normalize_paths=normalize_paths,
-        include_dsg_files=include_dsg_files
+        include_dsg_files=include_dsg_files,
+        hash_cache=hash_cache,
+        hash_workers=hash_workers,
+        known_hashes=known_hashes
     )
 
+    if hash_cache is not None:
+        _save_hash_cache(hash_cache)
+    return result
+
+
+def _save_hash_cache(hash_cache: HashCache) -> None:
+    """Persist the hash cache; a failure here must never fail the scan."""
+    try:
+        hash_cache.save()
+    except OSError as e:  # pragma: no cover
+        logger.warning(f"Failed to save hash cache {hash_cache.cache_path}: {e}")
+
 
 def scan_directory_no_cfg(root_path: Path, compute_hashes: bool = False, 
                         user_id: Optional[str] = None, 
                         normalize_paths: bool = False,
                         include_dsg_files: bool = True,
+                        hash_cache: Optional[HashCache] = None,
+                        hash_workers: Optional[int] = None,
+                        known_hashes: Optional[dict[str, str]] = None,
                         **config_overrides) -> ScanResult:
     """
     Scan a directory using a minimal configuration created on the fly.
@@ -123,6 +156,9 @@ def scan_directory_no_cfg(root_path: Path, compute_hashes: bool = False,
         user_id: Optional user ID to attribute to new entries
         normalize_paths: When True, normalizes invalid paths during scanning
         include_dsg_files: When False, excludes .dsg/ metadata files from results
+        hash_cache: Optional HashCache consulted when compute_hashes is True
+        hash_workers: Number of hashing threads (defaults to DEFAULT_HASH_WORKERS)
+        known_hashes: Precomputed rel_path -> xxh3 hashes to use instead of reading files
         **config_overrides: Override values for the minimal config (data_dirs, ignored_paths, etc.)
     """
     # Default values
@@ -148,7 +184,10 @@ def scan_directory_no_cfg(root_path: Path, compute_hashes: bool = False,
         compute_hashes=compute_hashes,
         user_id=user_id,
         normalize_paths=normalize_paths,
-        include_dsg_files=include_dsg_files
+        include_dsg_files=include_dsg_files,
+        hash_cache=hash_cache,
+        hash_workers=hash_workers,
+        known_hashes=known_hashes
     )
 
 
@@ -160,26 +199,13 @@ def _should_ignore_path(
     ignored_names: set[str],
     ignored_suffixes: set[str]) -> bool:
 
-    logger.debug(f"  _should_ignore_path called with path: {posix_path}")
-    logger.debug(f"  ignored_exact set contains: {ignored_exact}")
-
-    # Debug logging for exact path comparison
-    for ignore_path in ignored_exact:
-        logger.debug(f"  Comparing path: '{posix_path}' with ignored path: '{ignore_path}'")
-        logger.debug(f"  Types: {type(posix_path)} vs {type(ignore_path)}")
-        if posix_path == ignore_path:
-            logger.debug(f"  MATCH: '{posix_path}' matches '{ignore_path}'")
-
-    result = (
+    return (
         posix_path in ignored_exact or
         filename in ignored_names or
         full_path.suffix in ignored_suffixes or
         BACKUP_FILE_REGEX.search(filename) is not None  # System-level backup file exclusion
     )
 
-    logger.debug(f"  _should_ignore_path result: {result}")
-    return result
-
 
 def _is_hidden_path(path: Path) -> bool:
     return any(part.startswith('.') for part in path.parts)
@@ -208,22 +234,68 @@ def _is_in_data_dir(path_parts, data_dirs) -> bool:
     return any(part in data_dirs for part in path_parts)
 
 
-def _process_file_path(full_path: Path, root_path: Path) -> ProcessedPath:
-    """Process a file path into its component parts for scanning."""
-    relative_path = full_path.relative_to(root_path)
-    path_parts = relative_path.parts
-    posix_path = PurePosixPath(relative_path)
-    str_path = str(posix_path)
+def _process_file_path(path_parts: tuple[str, ...]) -> ProcessedPath:
+    """Process the relative path parts of a walked file into its scanning components."""
+    posix_path = PurePosixPath(*path_parts)
     
     return ProcessedPath(
-        relative_path=relative_path,
+        relative_path=posix_path,
         path_parts=path_parts,
         posix_path=posix_path,
-        str_path=str_path
+        str_path="/".join(path_parts)
     )
 
 
-def _classify_path(relative_path: Path, path_parts: tuple, data_dirs: set, include_dsg_files: bool) -> PathClassification:
+def _walk_files(root_path: Path, include_dsg_files: bool) -> Iterator[tuple[os.DirEntry, tuple[str, ...]]]:
+    """
+    Lazily yield (DirEntry, relative path parts) for every file and symlink under root_path.
+
+    Each directory is read once with os.scandir, and the DirEntry is handed to the
+    caller so its cached lstat can be reused. Symlinked directories are reported as
+    entries but never followed. Entries come out top-down: a directory's files are
+    emitted together as soon as it is read, before those of any subdirectory, and
+    discovered directories are expanded last-in first-out. Within a directory the
+    order is whatever os.scandir returns.
+
+    Hidden subtrees are pruned, since nothing beneath them can pass _classify_path.
+    The exception is a .dsg directory when include_dsg_files is set; everything
+    inside it is walked. Directories outside data_dirs cannot be pruned, because a
+    file whose own name is in data_dirs is included wherever it sits.
+    """
+    def list_dir(dir_path: str, parts: tuple[str, ...], in_dsg: bool):
+        files, subdirs = [], []
+        try:
+            with os.scandir(dir_path) as it:
+                dir_entries = list(it)
+        except OSError as e:
+            logger.debug(f"Cannot scan {dir_path}: {e}")
+            return files, subdirs
+
+        for dir_entry in dir_entries:
+            entry_parts = parts + (dir_entry.name,)
+            try:
+                is_dir = dir_entry.is_dir(follow_symlinks=False)
+            except OSError:
+                is_dir = False
+            if is_dir:
+                entry_in_dsg = in_dsg or (include_dsg_files and dir_entry.name == '.dsg')
+                if entry_in_dsg or not dir_entry.name.startswith('.'):
+                    subdirs.append((dir_entry.path, entry_parts, entry_in_dsg))
+            elif dir_entry.is_symlink() or dir_entry.is_file():
+                files.append((dir_entry, entry_parts))
+        return files, subdirs
+
+    files, subdirs = list_dir(str(root_path), (), False)
+    yield from files
+    stack = [subdirs]
+    while stack:
+        for dir_path, parts, in_dsg in stack.pop():
+            files, subdirs = list_dir(dir_path, parts, in_dsg)
+            yield from files
+            stack.append(subdirs)
+
+
+def _classify_path(relative_path: PurePosixPath, path_parts: tuple, data_dirs: set, include_dsg_files: bool) -> PathClassification:
     """Classify a path to determine if it should be included in scanning."""
     is_dsg_file = _is_dsg_path(relative_path)
     is_in_data_dir = _is_in_data_dir(path_parts, data_dirs)
@@ -251,22 +323,27 @@ def _validate_path_and_collect_warnings(str_path: str, validation_warnings: list
 
 
 def _create_manifest_entry(full_path: Path, root_path: Path, normalize_paths: bool, 
-                          user_id: Optional[str], compute_hashes: bool) -> Optional[ManifestEntry]:
-    """Create and configure a manifest entry for a file."""
-    entry = Manifest.create_entry(full_path, root_path, normalize_paths)
+                          user_id: Optional[str], compute_hashes: bool,
+                          hash_cache: Optional[HashCache] = None,
+                          stat_info: Optional[os.stat_result] = None) -> Optional[ManifestEntry]:
+    """Create and configure a manifest entry for a file.
+
+    The scan loop passes compute_hashes=False and hashes all entries afterwards
+    through the worker pool; hashing here is for one-off entries.
+    """
+    entry = Manifest.create_entry(full_path, root_path, normalize_paths, stat_info)
     if not entry:
         return None
         
     # Set user attribution if provided
     if user_id and hasattr(entry, "user") and not entry.user:
         entry.user = user_id
-        logger.debug(f"  Setting user attribution for {entry.path}: {user_id}")
     
     # Handle hash computation for files
     is_hashable_file = isinstance(entry, FileRef) and not full_path.is_symlink()
     if compute_hashes and is_hashable_file:
         try:
-            entry.hash = hash_file(full_path)
+            entry.hash = hash_file(full_path, hash_cache)
             logger.debug(f"  Computed hash for {entry.path}: {entry.hash}")
         except Exception as e:  # pragma: no cover
             logger.error(f"Failed to compute hash for {entry.path}: {e}")
@@ -283,7 +360,10 @@ def _scan_directory_internal(
     compute_hashes: bool = False,
     user_id: Optional[str] = None,
     normalize_paths: bool = False,
-    include_dsg_files: bool = True) -> ScanResult:
+    include_dsg_files: bool = True,
+    hash_cache: Optional[HashCache] = None,
+    hash_workers: Optional[int] = None,
+    known_hashes: Optional[dict[str, str]] = None) -> ScanResult:
     """
     Internal implementation of directory scanning.
 
@@ -297,10 +377,16 @@ def _scan_directory_internal(
         user_id: Optional user ID to attribute to new entries
         normalize_paths: When True, normalizes invalid paths during scanning
         include_dsg_files: When False, excludes .dsg/ metadata files from results
+        hash_cache: Optional HashCache consulted when compute_hashes is True
+        hash_workers: Number of hashing threads used when compute_hashes is True
+        known_hashes: Precomputed rel_path -> xxh3 hashes to use instead of reading files
     """
     entries: OrderedDict[str, ManifestEntry] = OrderedDict()
     ignored: list[str] = []
     validation_warnings: list[dict[str, str]] = []
+    # Per-file logging is opt-in (DSG_TRACE=scanner); otherwise only per-directory totals
+    trace = trace_enabled("scanner")
+    dir_counts: Counter[tuple[str, str]] = Counter()
 
     logger.debug(f"Scanning directory: {root_path}")
     logger.debug(f"Data directories: {data_dirs}")
@@ -308,12 +394,10 @@ def _scan_directory_internal(
     logger.debug(f"Ignored suffixes: {ignored_suffixes}")
     logger.debug(f"Computing hashes: {compute_hashes}")
 
-    for full_path in [p for p in root_path.rglob('*') if p.is_file() or p.is_symlink()]:
+    for dir_entry, path_parts in _walk_files(root_path, include_dsg_files):
         # Process file path into structured components
-        processed_path = _process_file_path(full_path, root_path)
-        
-        logger.debug(f"Processing file: {processed_path.str_path}")
-        logger.debug(f"  Path parts: {processed_path.path_parts}")
+        processed_path = _process_file_path(path_parts)
+        top_dir = path_parts[0] if len(path_parts) > 1 else "."
 
         # Classify the path to determine if it should be included
         classification = _classify_path(
@@ -323,68 +407,104 @@ def _scan_directory_internal(
             include_dsg_files
         )
 
-        logger.debug(f"  Is DSG file: {classification.is_dsg_file}")
-        logger.debug(f"  Is in data dir: {classification.is_in_data_dir}")
-        logger.debug(f"  Is hidden: {classification.is_hidden}")
-        logger.debug(f"  Should include: {classification.should_include}")
+        if trace:
+            logger.debug(f"Processing file: {processed_path.str_path} {classification}")
 
         if not classification.should_include:
-            logger.debug("  Skipping file (not in data dir or hidden)")
+            dir_counts[top_dir, "skipped"] += 1
             continue
 
+        full_path = Path(dir_entry.path)
+
         # Check if file should be ignored based on patterns
-        should_ignore = _should_ignore_path(
+        if _should_ignore_path(
             processed_path.posix_path, full_path.name, full_path,
             ignored_exact, ignored_names, ignored_suffixes
-        )
-
-        logger.debug(f"  Should ignore: {should_ignore}")
-
-        if should_ignore:
+        ):
             ignored.append(processed_path.str_path)
-            logger.debug("  Adding to ignored list")
+            dir_counts[top_dir, "ignored"] += 1
+            if trace:
+                logger.debug(f"  Ignoring {processed_path.str_path}")
             continue
 
         # Validate path and collect warnings
         _validate_path_and_collect_warnings(processed_path.str_path, validation_warnings)
 
-        # Create and configure manifest entry
-        entry = _create_manifest_entry(full_path, root_path, normalize_paths, user_id, compute_hashes)
+        # Create and configure manifest entry; hashing happens after the walk
+        entry = _create_manifest_entry(full_path, root_path, normalize_paths, user_id,
+                                       compute_hashes=False,
+                                       stat_info=dir_entry.stat(follow_symlinks=False))
         if entry:
             # Use entry.path as the key to ensure normalized paths in manifest
             # entry.path will be NFC-normalized if normalize_paths=True
             entries[entry.path] = entry
-            logger.debug(f"  Adding to manifest with path: {entry.path}")
+            dir_counts[top_dir, "included"] += 1
+            if trace:
+                logger.debug(f"  Adding to manifest with path: {entry.path}")
 
+    _log_scan_summary(dir_counts)
     logger.debug(f"Found {len(entries)} included files and {len(ignored)} ignored files")
     logger.debug(f"Found {len(validation_warnings)} validation warnings")
+    manifest = Manifest(entries=entries)
+    if compute_hashes:
+        if known_hashes:
+            _apply_known_hashes(manifest, known_hashes)
+        compute_hashes_for_manifest(manifest, root_path, hash_cache, hash_workers)
     return ScanResult(
-        manifest=Manifest(entries=entries), 
+        manifest=manifest, 
         ignored=ignored,
         validation_warnings=validation_warnings
     )
 
 
-def compute_hashes_for_manifest(manifest: Manifest, root_path: Path) -> None:
+def _apply_known_hashes(manifest: Manifest, known_hashes: dict[str, str]) -> None:
+    """Fill in hashes the caller computed while writing the files itself."""
+    applied = 0
+    for path, file_hash in known_hashes.items():
+        entry = manifest.entries.get(path)
+        if isinstance(entry, FileRef) and not entry.hash:
+            entry.hash = file_hash
+            applied += 1
+    logger.debug(f"Reused {applied} of {len(known_hashes)} precomputed hashes")
+
+
+def _log_scan_summary(dir_counts: Counter[tuple[str, str]]) -> None:
+    """Log one aggregated line per top-level directory instead of one per file."""
+    top_dirs = sorted({top_dir for top_dir, _ in dir_counts})
+    for top_dir in top_dirs:
+        logger.debug(
+            f"  {top_dir}: {dir_counts[top_dir, 'included']} included, "
+            f"{dir_counts[top_dir, 'ignored']} ignored, "
+            f"{dir_counts[top_dir, 'skipped']} skipped"
+        )
+
+
+def compute_hashes_for_manifest(manifest: Manifest, root_path: Path,
+                                hash_cache: Optional[HashCache] = None,
+                                hash_workers: Optional[int] = None) -> None:
     """
     Compute and add hashes for file entries in a manifest.
 
     Args:
         manifest: The manifest to update with hash values
         root_path: The root path of the repository
+        hash_cache: Optional HashCache; only files whose stat tuple changed are read
+        hash_workers: Number of hashing threads (defaults to DEFAULT_HASH_WORKERS)
     """
+    pending: dict[str, Path] = {}
     for path, entry in manifest.entries.items():
         if isinstance(entry, FileRef) and not entry.hash:
             full_path = root_path / path
             # Check if the file is still a file and not a symlink (race condition protection)
-            is_hashable_file = full_path.is_file() and not full_path.is_symlink()
-            
-            if is_hashable_file:
-                try:
-                    entry.hash = hash_file(full_path)
-                    logger.debug(f"Computed hash for {path}: {entry.hash}")
-                except Exception as e:  # pragma: no cover
-                    logger.error(f"Failed to compute hash for {path}: {e}")
+            if full_path.is_file() and not full_path.is_symlink():
+                pending[path] = full_path
+
+    results = hash_files(pending.values(), hash_cache, hash_workers)
+    for path, full_path in pending.items():
+        if full_path in results.hashes:
+            manifest.entries[path].hash = results.hashes[full_path]
+        else:  # pragma: no cover
+            logger.error(f"Failed to compute hash for {path}: {results.errors[full_path]}")
 
 
 # done
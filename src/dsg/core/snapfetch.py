@@ -0,0 +1,226 @@
+# Author: PB & Claude
+# Maintainer: PB
+# Original date: 2026.10.16
+# License: (c) HRDAG, 2025, GPL-2 or newer
+#
+# ------
+# src/dsg/core/snapfetch.py
+
+"""
+Fetch one file as it was in a snapshot, straight from the remote repository.
+
+A ZFS repository exposes each snapshot read-only at
+<repo>/.zfs/snapshot/<snapshot_id>/. snapfetch streams one file out of it
+through the backend (for SSH repositories, an SFTP session on a pooled SSH
+connection) to a local file or stdout, a chunk at a time, so memory use does
+not depend on the file's size.
+
+dsg names the ZFS snapshot after the dsg snapshot when a sync or init
+commits. Snapshots committed before it did so have no such directory, and
+fetching from them fails with SnapshotUnavailableError.
+
+The bytes are checked against the file's entry in the snapshot's manifest,
+read from the local .dsg/archive: its size when the file is opened, and its
+xxh3 hash while streaming. A byte range reads only part of the file, which
+cannot be hashed against the whole-file entry, so ranges are checked by size
+only. Output files are written next to the destination and renamed into
+place once verified; a failed fetch leaves nothing behind.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import sys
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Final, Optional
+
+import loguru
+import xxhash
+
+from dsg.config.manager import Config
+from dsg.core.history import HistoryWalker
+from dsg.data.manifest import FileRef
+from dsg.storage.backends import Backend, _range_end
+from dsg.storage.factory import create_backend
+from dsg.system.exceptions import TransferIntegrityError
+
+logger = loguru.logger
+
+SNAPSHOT_DIR: Final[str] = ".zfs/snapshot"
+STDOUT: Final[str] = "-"
+
+_RANGE_RE = re.compile(r"^(\d+)-(\d*)$")
+
+
+class SnapshotUnavailableError(FileNotFoundError):
+    """The remote has no ZFS snapshot directory for a snapshot in the local history"""
+
+
+@dataclass
+class SnapshotFetch:
+    """What a fetch read and how it was checked"""
+    snapshot_id: str
+    path: str
+    output: str
+    start: int
+    bytes_written: int
+    file_size: int
+    expected_hash: Optional[str]
+    actual_hash: Optional[str] = None
+
+    @property
+    def verified(self) -> bool:
+        """True if the content was hashed and matched the manifest"""
+        return self.actual_hash is not None and self.actual_hash == self.expected_hash
+
+
+def parse_byte_range(text: str) -> tuple[int, Optional[int]]:
+    """Parse "START-END" (inclusive, as in HTTP and curl) or "START-" into (start, length)"""
+    match = _RANGE_RE.match(text.strip())
+    if not match:
+        raise ValueError(f"Invalid byte range '{text}': use START-END or START-")
+    start = int(match.group(1))
+    if not match.group(2):
+        return start, None
+    end = int(match.group(2))
+    if end < start:
+        raise ValueError(f"Invalid byte range '{text}': END is before START")
+    return start, end - start + 1
+
+
+def snapshot_file_path(snapshot_id: str, file_path: str) -> str:
+    """Where a file of a snapshot is, relative to the repository root"""
+    return f"{SNAPSHOT_DIR}/{snapshot_id}/{file_path}"
+
+
+def resolve_snapshot(walker: HistoryWalker, snapshot_id: Optional[str] = None, num: int = 1) -> str:
+    """The given snapshot id, or that of the num-th most recent snapshot (1 = latest)"""
+    if snapshot_id:
+        return snapshot_id
+    if num < 1:
+        raise ValueError(f"Snapshot number must be 1 or more, not {num}")
+    entries = list(walker.walk_history(limit=num))
+    if len(entries) < num:
+        raise ValueError(f"Snapshot number {num} is out of range: the repository has {len(entries)} snapshots")
+    return entries[-1].snapshot_id
+
+
+def _umask() -> int:
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+def _snapshot_entry(walker: HistoryWalker, snapshot_id: str, file_path: str) -> FileRef:
+    manifest_path = walker.snapshot_manifest_path(snapshot_id)
+    loaded = walker._load_file_entry(manifest_path, file_path)
+    if loaded is None:
+        raise ValueError(f"Could not read the manifest of snapshot {snapshot_id} ({manifest_path})")
+    entry = loaded[0].entries.get(file_path)
+    if entry is None:
+        raise FileNotFoundError(f"{file_path} is not in snapshot {snapshot_id}")
+    if not isinstance(entry, FileRef):
+        raise ValueError(f"{file_path} is a symlink in snapshot {snapshot_id} (to {entry.reference})")
+    return entry
+
+
+def _stream(backend: Backend, rel_path: str, entry: FileRef, start: int, length: Optional[int],
+            sink: BinaryIO) -> tuple[int, Optional[str]]:
+    """Copy the range to sink; returns (bytes written, xxh3 of the content if it was the whole file)"""
+    with backend.open_stream(rel_path, start, length) as stream:
+        if stream.size != entry.filesize:
+            raise TransferIntegrityError(
+                f"{rel_path} is {stream.size} bytes, but the snapshot's manifest records {entry.filesize}")
+        if start and start >= stream.size:
+            raise ValueError(f"Byte range starts at {start}, past the end of the {stream.size}-byte file")
+        whole = start == 0 and (length is None or length >= stream.size)
+        digest = xxhash.xxh3_64() if whole and entry.hash else None
+        written = 0
+        for chunk in stream.chunks:
+            if digest is not None:
+                digest.update(chunk)
+            sink.write(chunk)
+            written += len(chunk)
+        expected = _range_end(stream.size, start, length) - start
+    # Ranges and unhashed entries are not hashed, so a short read shows only here
+    if written != expected:
+        raise TransferIntegrityError(f"{rel_path} ended after {written} of {expected} bytes")
+    actual_hash = digest.hexdigest() if digest is not None else None
+    if actual_hash is not None and actual_hash != entry.hash:
+        raise TransferIntegrityError(f"{rel_path} does not match the snapshot's manifest",
+                                     expected_hash=entry.hash, actual_hash=actual_hash)
+    return written, actual_hash
+
+
+def fetch_snapshot_file(config: Config, file_path: str, snapshot_id: Optional[str] = None, num: int = 1,
+                        output: Optional[str] = None, byte_range: Optional[str] = None,
+                        force: bool = False, backend: Optional[Backend] = None) -> SnapshotFetch:
+    """Stream one file of a snapshot from the remote repository to a local file or stdout.
+
+    Args:
+        config: DSG configuration
+        file_path: Path of the file, relative to the repository root
+        snapshot_id: Snapshot to fetch from, e.g. "s3"; overrides num
+        num: Fetch from the num-th most recent snapshot (1 = latest)
+        output: Local file to write; "-" for stdout. Defaults to the file's
+            name in the current directory
+        byte_range: Only fetch these bytes, "START-END" (inclusive) or "START-"
+        force: Overwrite an existing output file
+        backend: Backend to read from (default: create_backend(config))
+
+    Returns:
+        SnapshotFetch describing what was read and whether its hash was verified
+
+    Raises:
+        FileNotFoundError: If the file is not in the snapshot's manifest
+        SnapshotUnavailableError: If the remote has no ZFS snapshot by that name
+        FileExistsError: If the output file exists and force is not set
+        TransferIntegrityError: If the remote file does not match the manifest
+        ValueError: For an unknown snapshot or an invalid byte range
+    """
+    walker = HistoryWalker(config.project_root)
+    snapshot_id = resolve_snapshot(walker, snapshot_id, num)
+    entry = _snapshot_entry(walker, snapshot_id, file_path)
+    start, length = parse_byte_range(byte_range) if byte_range else (0, None)
+    output = output or Path(file_path).name
+    if output != STDOUT and os.path.lexists(output) and not force:
+        raise FileExistsError(f"{output} already exists (use --force to overwrite)")
+
+    if backend is None:
+        backend = create_backend(config)
+    rel_path = snapshot_file_path(snapshot_id, file_path)
+    logger.debug(f"Fetching {rel_path} bytes {start}-{'' if length is None else start + length - 1} to {output}")
+
+    try:
+        if output == STDOUT:
+            written, actual_hash = _stream(backend, rel_path, entry, start, length, sys.stdout.buffer)
+            sys.stdout.buffer.flush()
+        else:
+            output_path = Path(output)
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            fd, temp_name = tempfile.mkstemp(prefix=f".{output_path.name}-", dir=output_path.parent)
+            try:
+                with os.fdopen(fd, "wb") as sink:
+                    os.fchmod(fd, 0o666 & ~_umask())  # mkstemp creates it 0600
+                    written, actual_hash = _stream(backend, rel_path, entry, start, length, sink)
+                os.replace(temp_name, output_path)
+            except BaseException:
+                Path(temp_name).unlink(missing_ok=True)
+                raise
+    except FileNotFoundError as e:
+        # The manifest has the file, so the remote is missing the ZFS snapshot itself
+        raise SnapshotUnavailableError(
+            f"Snapshot {snapshot_id} is not available on the remote: {rel_path} does not exist. "
+            f"dsg creates the ZFS snapshot {SNAPSHOT_DIR}/{snapshot_id} when a sync or init commits; "
+            f"snapshots committed before dsg named them, and repositories not on ZFS, "
+            f"cannot be fetched from") from e
+
+    return SnapshotFetch(snapshot_id=snapshot_id, path=file_path, output=output, start=start,
+                         bytes_written=written, file_size=entry.filesize,
+                         expected_hash=entry.hash or None, actual_hash=actual_hash)
+
+
+# done.
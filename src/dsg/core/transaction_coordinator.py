@@ -12,12 +12,33 @@ Transaction coordinator for atomic sync operations.
 This module implements the unified transaction layer that coordinates
 ClientFilesystem, RemoteFilesystem, and Transport components for atomic
 sync operations as defined in TRANSACTION_IMPLEMENTATION.md.
+
+File transfers run on a bounded pool of transfer_workers threads, so a sync of
+many small files is not serialized on per-file round trips. Each file is still
+transferred, verified and staged as one unit (with its own retries); the first
+failure stops new transfers, and the whole transaction rolls back as before.
+
+When both filesystems support it (send_pack/recv_pack), uploads of files below
+PackPolicy.threshold_bytes are grouped into packs: one tar stream per batch,
+carried by the transport like a single file and unpacked remotely in one step.
+Larger files, symlinks and anything that cannot be stat'ed go one at a time.
+Packing is skipped for zero-copy (localhost) transports.
+
+Modified files of at least DeltaPolicy.threshold_bytes are uploaded as rsync-style
+deltas when the remote filesystem can sign its current copy (block_signatures/
+recv_delta): only literal data and block references cross the transport, and the
+remote rebuilds the file in its clone or staging tree before commit.
 """
 
+import os
 import uuid
 import logging
+import threading
+import stat
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterator, Protocol
+from typing import Callable, Final, Iterator, Optional, Protocol, Union
 
 from dsg.system.exceptions import (
     TransactionError, TransactionCommitError,
@@ -41,7 +62,14 @@ class ContentStream(Protocol):
 
 
 class TempFile(Protocol):
-    """Protocol for temporary files with cleanup"""
+    """Protocol for temporary files with cleanup.
+
+    Transports that hash while streaming also set content_hash (xxh3 hex digest
+    of the bytes written) and size; both are None when not computed.
+    """
+    
+    content_hash: Optional[str]
+    size: Optional[int]
     
     @property
     def path(self) -> Path:
@@ -72,6 +100,10 @@ class ClientFilesystem(Protocol):
         """Stage file deletion (mark for removal on commit)"""
         ...
     
+    def move_file(self, old_path: str, new_path: str) -> None:
+        """Stage a rename without copying file content"""
+        ...
+    
     def commit_transaction(self, transaction_id: str) -> None:
         """Atomically move staged files to final locations"""
         ...
@@ -100,6 +132,10 @@ class RemoteFilesystem(Protocol):
         """Delete file from backend"""
         ...
     
+    def move_file(self, old_path: str, new_path: str) -> None:
+        """Rename a file server-side, without transferring data"""
+        ...
+    
     def commit_transaction(self, transaction_id: str) -> None:
         """Commit using backend-specific atomic operation"""
         ...
@@ -129,21 +165,81 @@ class Transport(Protocol):
         ...
 
 
+DEFAULT_TRANSFER_WORKERS: Final[int] = min(8, (os.cpu_count() or 1) * 2)
+
+
 def generate_transaction_id() -> str:
     """Generate unique transaction ID"""
     return f"tx-{uuid.uuid4().hex[:8]}"
 
 
+def resolve_transfer_workers(workers: Optional[int]) -> int:
+    """Return a usable transfer worker count, falling back to DEFAULT_TRANSFER_WORKERS"""
+    if workers is None:
+        return DEFAULT_TRANSFER_WORKERS
+    return max(1, workers)
+
+
+@dataclass(frozen=True)
+class PackPolicy:
+    """When to batch small uploads into packed transfers (threshold_bytes=0 disables)"""
+    threshold_bytes: int = 64 * 1024
+    batch_files: int = 1000
+    batch_bytes: int = 64 * 1024 * 1024
+
+
+@dataclass(frozen=True)
+class DeltaPolicy:
+    """When to upload modified large files as block deltas (threshold_bytes=0 disables)"""
+    threshold_bytes: int = 64 * 1024 * 1024
+    block_size: int = 128 * 1024
+
+
+# A transfer unit: one path, or a pack of small files sent as one stream
+TransferUnit = Union[str, list[str]]
+
+
+def plan_pack_batches(sized: list[tuple[str, int]], policy: PackPolicy) -> list[list[str]]:
+    """Group small files, in plan order, into packs bounded by file count and bytes"""
+    packs: list[list[str]] = []
+    current: list[str] = []
+    current_bytes = 0
+    for rel_path, size in sized:
+        if current and (len(current) >= policy.batch_files
+                        or current_bytes + size > policy.batch_bytes):
+            packs.append(current)
+            current, current_bytes = [], 0
+        current.append(rel_path)
+        current_bytes += size
+    if current:
+        packs.append(current)
+    return packs
+
+
 class Transaction:
     """Unified transaction coordinator for atomic sync operations"""
     
     def __init__(self, client_filesystem: ClientFilesystem, 
                  remote_filesystem: RemoteFilesystem, 
-                 transport: Transport):
+                 transport: Transport,
+                 transfer_workers: Optional[int] = None,
+                 pack_policy: Optional[PackPolicy] = None,
+                 delta_policy: Optional[DeltaPolicy] = None):
         self.client_fs = client_filesystem
         self.remote_fs = remote_filesystem
         self.transport = transport
         self.transaction_id = generate_transaction_id()
+        # Concurrent file transfers per batch (1 = strictly sequential)
+        self.transfer_workers = resolve_transfer_workers(transfer_workers)
+        self.pack_policy = pack_policy or PackPolicy()
+        self.delta_policy = delta_policy or DeltaPolicy()
+        self._hash_lock = threading.Lock()
+        # Expected xxh3 per path (from the manifests the sync plan came from)
+        self.expected_hashes: dict[str, str] = {}
+        # xxh3 of every file this transaction streamed, as computed in transit
+        self.transferred_hashes: dict[str, str] = {}
+        # Subset written into the local tree; safe to reuse for the new manifest
+        self.downloaded_hashes: dict[str, str] = {}
     
     def __enter__(self) -> 'Transaction':
         """Begin transaction on all components"""
@@ -221,8 +317,24 @@ class Transaction:
                 logging.error(f"Failed to cleanup transport session: {transport_exc}")
                 # Don't raise here - transport cleanup failure shouldn't override transaction result
     
-    def sync_files(self, sync_plan: dict[str, list[str]], console=None) -> None:
-        """Execute complete sync plan atomically"""
+    def sync_files(self, sync_plan: dict[str, list[str]], console=None,
+                   expected_hashes: Optional[dict[str, str]] = None) -> None:
+        """Execute complete sync plan atomically
+
+        Args:
+            sync_plan: Output of calculate_sync_plan()
+            console: Optional rich console for progress output
+            expected_hashes: Optional rel_path -> xxh3 map; transfers whose streamed
+                digest differs raise TransactionIntegrityError
+        """
+        if expected_hashes:
+            self.expected_hashes.update(expected_hashes)
+        
+        # Renames detected by content hash; no data is transferred
+        if sync_plan.get('move_remote'):
+            self.move_remote_files(sync_plan['move_remote'], console)
+        if sync_plan.get('move_local'):
+            self.move_local_files(sync_plan['move_local'], console)
         
         # File transfers
         if sync_plan.get('upload_files'):
@@ -256,23 +368,124 @@ class Transaction:
         """Upload batch of files with progress reporting"""
         if console:
             console.print(f"[dim]Uploading {len(file_list)} files...[/dim]")
+        units = self._plan_upload_units(file_list)
+        self._run_transfers(units, self._upload_unit, console)
+        logging.debug("Uploaded %d files in %d transfers in transaction %s",
+                      len(file_list), len(units), self.transaction_id)
+    
+    def _plan_upload_units(self, file_list: list[str]) -> list[TransferUnit]:
+        """Split uploads into packs of small regular files and single-file transfers"""
+        # Zero-copy transports gain nothing from packing: it would route every byte through tar
+        if (self.pack_policy.threshold_bytes <= 0
+                or getattr(self.transport, 'zero_copy', False) is True
+                or not hasattr(self.client_fs, 'send_pack')
+                or not hasattr(self.remote_fs, 'recv_pack')):
+            return list(file_list)
         
-        for i, rel_path in enumerate(file_list, 1):
-            if console:
-                console.print(f"  [{i}/{len(file_list)}] {rel_path}")
-            
-            # Check if the source file is a symlink (only if project_root is a real Path)
+        small: list[tuple[str, int]] = []
+        singles: list[str] = []
+        for rel_path in file_list:
+            try:
+                st = os.lstat(self.client_fs.project_root / rel_path)
+            except (TypeError, OSError):
+                singles.append(rel_path)
+                continue
+            if stat.S_ISREG(st.st_mode) and st.st_size < self.pack_policy.threshold_bytes:
+                small.append((rel_path, st.st_size))
+            else:
+                singles.append(rel_path)
+        
+        if len(small) < 2:
+            return list(file_list)
+        return [*plan_pack_batches(small, self.pack_policy), *singles]
+    
+    def _upload_unit(self, unit: TransferUnit) -> None:
+        if isinstance(unit, list):
+            self._upload_pack(unit)
+        else:
+            self._upload_one(unit)
+    
+    def _upload_one(self, rel_path: str) -> None:
+        """Upload one file, recreating symlinks rather than streaming them"""
+        # Check if the source file is a symlink (only if project_root is a real Path)
+        try:
+            source_path = self.client_fs.project_root / rel_path
+            is_symlink = hasattr(source_path, 'is_symlink') and source_path.is_symlink()
+        except (TypeError, AttributeError):
+            # Handle regular file if we can't do path operations (e.g., mocked tests)
+            is_symlink = False
+        if is_symlink:
+            self._upload_symlink(rel_path)
+            return
+        signatures = self._delta_basis(rel_path)
+        if signatures is not None:
+            self._upload_delta(rel_path, signatures)
+        else:
+            self._upload_regular_file(rel_path)
+    
+    def _run_transfers(self, units: list[TransferUnit],
+                       transfer_one: Callable[[TransferUnit], None], console=None) -> None:
+        """
+        Run transfer_one over units on up to transfer_workers threads.
+
+        After the first failure no new transfers are started; in-flight ones
+        are allowed to finish. Failures are re-raised in unit order: the
+        earliest failing unit's exception is raised, carrying the complete
+        ordered list of (path, exception) as its transfer_errors attribute
+        (a pack is reported by its first path). Nothing is committed here, so
+        the caller's __exit__ rolls the whole transaction back.
+        """
+        total = sum(len(unit) if isinstance(unit, list) else 1 for unit in units)
+        done = 0
+        
+        def report(unit: TransferUnit) -> None:
+            nonlocal done
+            for rel_path in (unit if isinstance(unit, list) else [unit]):
+                done += 1
+                if console:
+                    console.print(f"  [{done}/{total}] {rel_path}")
+        
+        workers = min(self.transfer_workers, len(units))
+        if workers <= 1:
+            for unit in units:
+                transfer_one(unit)
+                report(unit)
+            return
+        
+        stop = threading.Event()
+        
+        def run(unit: TransferUnit) -> bool:
+            if stop.is_set():
+                return False
             try:
-                source_path = self.client_fs.project_root / rel_path
-                if hasattr(source_path, 'is_symlink') and source_path.is_symlink():
-                    # Handle symlink specially
-                    self._upload_symlink(rel_path)
-                else:
-                    # Handle regular file
-                    self._upload_regular_file(rel_path)
-            except (TypeError, AttributeError):
-                # Handle regular file if we can't do path operations (e.g., mocked tests)
-                self._upload_regular_file(rel_path)
+                transfer_one(unit)
+            except BaseException:
+                stop.set()
+                raise
+            return True
+        
+        failures: list[tuple[int, str, BaseException]] = []
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="dsg-transfer") as pool:
+            futures = {pool.submit(run, unit): i for i, unit in enumerate(units)}
+            for future in as_completed(futures):
+                index = futures[future]
+                unit = units[index]
+                try:
+                    transferred = future.result()
+                except BaseException as e:
+                    failures.append((index, unit[0] if isinstance(unit, list) else unit, e))
+                    continue
+                if transferred:
+                    report(unit)
+        
+        if failures:
+            failures.sort(key=lambda failure: failure[0])
+            if len(failures) > 1:
+                logging.error("%d of %d transfers failed in transaction %s; first: %s",
+                              len(failures), len(units), self.transaction_id, failures[0][1])
+            first = failures[0][2]
+            first.transfer_errors = [(rel_path, e) for _, rel_path, e in failures]
+            raise first
     
     def _upload_regular_file(self, rel_path: str) -> None:
         """Upload a regular file using content streaming with integrity verification"""
@@ -280,7 +493,7 @@ class Transaction:
         try:
             # 1. Client provides content stream
             content_stream = self.client_fs.send_file(rel_path)
-            logging.debug(f"Starting upload of {rel_path} (size: {content_stream.size} bytes)")
+            logging.debug("Starting upload of %s (size: %s bytes)", rel_path, content_stream.size)
             
             # 2. Transport handles transfer with temp staging (with retry)
             temp_file = retry_transfer_operation(
@@ -288,19 +501,13 @@ class Transaction:
                 content_stream
             )
             
-            # 3. Verify transfer integrity (if supported)
-            if hasattr(content_stream, 'size') and hasattr(temp_file, 'path'):
-                actual_size = temp_file.path.stat().st_size if temp_file.path.exists() else 0
-                if actual_size != content_stream.size:
-                    raise TransactionIntegrityError(
-                        f"File transfer size mismatch for {rel_path}: expected {content_stream.size}, got {actual_size}",
-                        transaction_id=self.transaction_id,
-                        recovery_hint="Retry the upload operation"
-                    )
+            # 3. Verify transfer integrity (digest when known, size otherwise)
+            self._verify_transfer(rel_path, content_stream, temp_file,
+                                  recovery_hint="Retry the upload operation")
             
             # 4. Remote filesystem stages from temp
             self.remote_fs.recv_file(rel_path, temp_file)
-            logging.debug(f"Successfully uploaded {rel_path}")
+            logging.debug("Successfully uploaded %s", rel_path)
             
         except (TransportError, NetworkError) as e:
             logging.error(f"Transport error uploading {rel_path}: {e}")
@@ -326,6 +533,193 @@ class Transaction:
                 except Exception as cleanup_exc:
                     logging.warning(f"Failed to cleanup temp file for {rel_path}: {cleanup_exc}")
     
+    def _delta_basis(self, rel_path: str):
+        """Return the remote block signatures to diff rel_path against, if a delta is worthwhile"""
+        if (self.delta_policy.threshold_bytes <= 0
+                or getattr(self.transport, 'zero_copy', False) is True
+                or not hasattr(self.client_fs, 'send_delta')
+                or not hasattr(self.remote_fs, 'recv_delta')):
+            return None
+        try:
+            st = os.stat(self.client_fs.project_root / rel_path)
+        except (TypeError, OSError):
+            return None
+        if st.st_size < self.delta_policy.threshold_bytes:
+            return None
+        return self.remote_fs.block_signatures(rel_path, self.delta_policy.block_size)
+    
+    def _upload_delta(self, rel_path: str, signatures) -> None:
+        """Upload a modified file as literals and block references against the remote copy"""
+        temp_file = None
+        recovery_hint = "Retry the upload operation"
+        try:
+            content_stream = self.client_fs.send_delta(rel_path, signatures)
+            temp_file = retry_transfer_operation(
+                self.transport.transfer_to_remote,
+                content_stream
+            )
+            self._verify_pack(content_stream, temp_file, label="Delta")
+            
+            content_hash, size = self.remote_fs.recv_delta(rel_path, temp_file)
+            if size != content_stream.source_size or content_hash != content_stream.source_hash:
+                raise TransactionIntegrityError(
+                    f"Delta reconstruction mismatch for {rel_path}: expected "
+                    f"{content_stream.source_hash} ({content_stream.source_size} bytes), "
+                    f"got {content_hash} ({size} bytes)",
+                    transaction_id=self.transaction_id,
+                    recovery_hint=recovery_hint
+                )
+            expected_hash = self.expected_hashes.get(rel_path)
+            if expected_hash and content_hash != expected_hash:
+                raise TransactionIntegrityError(
+                    f"File transfer hash mismatch for {rel_path}: expected {expected_hash}, got {content_hash}",
+                    transaction_id=self.transaction_id,
+                    recovery_hint=recovery_hint
+                )
+            
+            with self._hash_lock:
+                self.transferred_hashes[rel_path] = content_hash
+                metrics = getattr(self.transport, 'metrics', None)
+                if hasattr(metrics, 'record_delta'):
+                    metrics.record_delta(size, content_stream.size)
+            logging.debug("Uploaded %s as delta: %d of %d bytes sent",
+                          rel_path, content_stream.size, size)
+            
+        except (TransportError, NetworkError) as e:
+            logging.error(f"Transport error uploading delta of {rel_path}: {e}")
+            if hasattr(e, 'transaction_id'):
+                e.transaction_id = self.transaction_id
+            raise
+        except (ClientFilesystemError, RemoteFilesystemError, TransactionIntegrityError) as e:
+            logging.error(f"Filesystem or integrity error uploading delta of {rel_path}: {e}")
+            raise
+        except Exception as e:
+            logging.error(f"Unexpected error uploading delta of {rel_path}: {e}")
+            raise TransactionError(
+                f"Failed to upload {rel_path}: {e}",
+                transaction_id=self.transaction_id,
+                recovery_hint="Check file permissions and disk space"
+            )
+        finally:
+            if temp_file:
+                try:
+                    temp_file.cleanup()
+                except Exception as cleanup_exc:
+                    logging.warning(f"Failed to cleanup temp file for {rel_path}: {cleanup_exc}")
+    
+    def _upload_pack(self, rel_paths: list[str]) -> None:
+        """Upload a batch of small files as one tar stream, unpacked remotely"""
+        temp_file = None
+        label = f"pack of {len(rel_paths)} files starting at {rel_paths[0]}"
+        try:
+            content_stream = self.client_fs.send_pack(rel_paths)
+            temp_file = retry_transfer_operation(
+                self.transport.transfer_to_remote,
+                content_stream
+            )
+            self._verify_pack(content_stream, temp_file)
+            self.remote_fs.recv_pack(rel_paths, temp_file)
+            logging.debug("Successfully uploaded %s", label)
+            
+        except (TransportError, NetworkError) as e:
+            logging.error(f"Transport error uploading {label}: {e}")
+            if hasattr(e, 'transaction_id'):
+                e.transaction_id = self.transaction_id
+            raise
+        except (ClientFilesystemError, RemoteFilesystemError, TransactionIntegrityError) as e:
+            logging.error(f"Filesystem or integrity error uploading {label}: {e}")
+            raise
+        except Exception as e:
+            logging.error(f"Unexpected error uploading {label}: {e}")
+            raise TransactionError(
+                f"Failed to upload {label}: {e}",
+                transaction_id=self.transaction_id,
+                recovery_hint="Check file permissions and disk space"
+            )
+        finally:
+            if temp_file:
+                try:
+                    temp_file.cleanup()
+                except Exception as cleanup_exc:
+                    logging.warning(f"Failed to cleanup temp file for {label}: {cleanup_exc}")
+    
+    def _verify_pack(self, content_stream, temp_file, label: str = "Pack") -> None:
+        """
+        Check a packed transfer: archive size and digest against what was
+        streamed, then each member's digest against the expected hashes.
+        Delta streams have no members and get only the first check.
+        """
+        recovery_hint = "Retry the upload operation"
+        reported_size = getattr(temp_file, 'size', None)
+        if isinstance(reported_size, int) and reported_size != content_stream.size:
+            raise TransactionIntegrityError(
+                f"{label} transfer size mismatch: expected {content_stream.size}, got {reported_size}",
+                transaction_id=self.transaction_id,
+                recovery_hint=recovery_hint
+            )
+        reported_hash = getattr(temp_file, 'content_hash', None)
+        if isinstance(reported_hash, str) and reported_hash != content_stream.content_hash:
+            raise TransactionIntegrityError(
+                f"{label} transfer hash mismatch: expected {content_stream.content_hash}, got {reported_hash}",
+                transaction_id=self.transaction_id,
+                recovery_hint=recovery_hint
+            )
+        
+        member_hashes = getattr(content_stream, 'member_hashes', {})
+        for rel_path, content_hash in member_hashes.items():
+            expected_hash = self.expected_hashes.get(rel_path)
+            if expected_hash and content_hash != expected_hash:
+                raise TransactionIntegrityError(
+                    f"File transfer hash mismatch for {rel_path}: expected {expected_hash}, got {content_hash}",
+                    transaction_id=self.transaction_id,
+                    recovery_hint=recovery_hint
+                )
+        with self._hash_lock:
+            self.transferred_hashes.update(member_hashes)
+    
+    def _verify_transfer(self, rel_path: str, content_stream, temp_file,
+                         recovery_hint: str) -> Optional[str]:
+        """
+        Check a completed transfer against the source size and expected digest.
+
+        Transports that hash in transit report size and content_hash on the temp
+        file; those are used directly. Otherwise fall back to stat'ing the temp
+        file. The digest, when there is one, is recorded in transferred_hashes
+        and returned.
+        """
+        if not hasattr(content_stream, 'size'):
+            return None
+
+        reported_size = getattr(temp_file, 'size', None)
+        if isinstance(reported_size, int):
+            actual_size = reported_size
+        elif hasattr(temp_file, 'path'):
+            actual_size = temp_file.path.stat().st_size if temp_file.path.exists() else 0
+        else:
+            return None
+
+        if actual_size != content_stream.size:
+            raise TransactionIntegrityError(
+                f"File transfer size mismatch for {rel_path}: expected {content_stream.size}, got {actual_size}",
+                transaction_id=self.transaction_id,
+                recovery_hint=recovery_hint
+            )
+
+        content_hash = getattr(temp_file, 'content_hash', None)
+        if not isinstance(content_hash, str):
+            return None
+
+        expected_hash = self.expected_hashes.get(rel_path)
+        if expected_hash and content_hash != expected_hash:
+            raise TransactionIntegrityError(
+                f"File transfer hash mismatch for {rel_path}: expected {expected_hash}, got {content_hash}",
+                transaction_id=self.transaction_id,
+                recovery_hint=recovery_hint
+            )
+        with self._hash_lock:
+            self.transferred_hashes[rel_path] = content_hash
+        return content_hash
+    
     def _upload_symlink(self, rel_path: str) -> None:
         """Upload a symlink by recreating it on the remote"""
         source_path = self.client_fs.project_root / rel_path
@@ -338,22 +732,21 @@ class Transaction:
         """Download batch of files with progress reporting"""
         if console:
             console.print(f"[dim]Downloading {len(file_list)} files...[/dim]")
-        
-        for i, rel_path in enumerate(file_list, 1):
-            if console:
-                console.print(f"  [{i}/{len(file_list)}] {rel_path}")
-            
-            # Check if the remote file is a symlink (only if remote filesystem supports it)
-            try:
-                if hasattr(self.remote_fs, 'is_symlink') and self.remote_fs.is_symlink(rel_path):
-                    # Handle symlink specially
-                    self._download_symlink(rel_path)
-                else:
-                    # Handle regular file
-                    self._download_regular_file(rel_path)
-            except (TypeError, AttributeError, RuntimeError, Exception):
-                # Handle regular file if we can't check symlinks (e.g., mocked tests)
-                self._download_regular_file(rel_path)
+        self._run_transfers(file_list, self._download_one, console)
+        logging.debug("Downloaded %d files in transaction %s", len(file_list), self.transaction_id)
+    
+    def _download_one(self, rel_path: str) -> None:
+        """Download one file, recreating symlinks rather than streaming them"""
+        # Check if the remote file is a symlink (only if remote filesystem supports it)
+        try:
+            is_symlink = hasattr(self.remote_fs, 'is_symlink') and self.remote_fs.is_symlink(rel_path)
+        except Exception:
+            # Handle regular file if we can't check symlinks (e.g., mocked tests)
+            is_symlink = False
+        if is_symlink:
+            self._download_symlink(rel_path)
+        else:
+            self._download_regular_file(rel_path)
     
     def _download_regular_file(self, rel_path: str) -> None:
         """Download a regular file using content streaming with integrity verification"""
@@ -361,7 +754,7 @@ class Transaction:
         try:
             # 1. Remote provides content stream
             content_stream = self.remote_fs.send_file(rel_path)
-            logging.debug(f"Starting download of {rel_path} (size: {content_stream.size} bytes)")
+            logging.debug("Starting download of %s (size: %s bytes)", rel_path, content_stream.size)
             
             # 2. Transport handles transfer with temp staging (with retry)
             temp_file = retry_transfer_operation(
@@ -369,19 +762,16 @@ class Transaction:
                 content_stream
             )
             
-            # 3. Verify transfer integrity (if supported)
-            if hasattr(content_stream, 'size') and hasattr(temp_file, 'path'):
-                actual_size = temp_file.path.stat().st_size if temp_file.path.exists() else 0
-                if actual_size != content_stream.size:
-                    raise TransactionIntegrityError(
-                        f"File transfer size mismatch for {rel_path}: expected {content_stream.size}, got {actual_size}",
-                        transaction_id=self.transaction_id,
-                        recovery_hint="Retry the download operation"
-                    )
+            # 3. Verify transfer integrity (digest when known, size otherwise)
+            content_hash = self._verify_transfer(rel_path, content_stream, temp_file,
+                                                 recovery_hint="Retry the download operation")
             
             # 4. Client filesystem stages from temp
             self.client_fs.recv_file(rel_path, temp_file)
-            logging.debug(f"Successfully downloaded {rel_path}")
+            if content_hash:
+                with self._hash_lock:
+                    self.downloaded_hashes[rel_path] = content_hash
+            logging.debug("Successfully downloaded %s", rel_path)
             
         except (TransportError, NetworkError) as e:
             logging.error(f"Transport error downloading {rel_path}: {e}")
@@ -414,6 +804,32 @@ class Transaction:
         # Tell client filesystem to create symlink instead of regular file
         self.client_fs.create_symlink(rel_path, symlink_target)
     
+    def move_remote_files(self, moves: list[tuple[str, str]], console=None) -> None:
+        """Apply local renames on the remote (falls back to upload + delete)"""
+        if console:
+            console.print(f"[dim]Moving {len(moves)} remote files...[/dim]")
+        for i, (old_path, new_path) in enumerate(moves, 1):
+            if console:
+                console.print(f"  [{i}/{len(moves)}] {old_path} → {new_path}")
+            if hasattr(self.remote_fs, 'move_file'):
+                self.remote_fs.move_file(old_path, new_path)
+            else:
+                self._upload_one(new_path)
+                self.remote_fs.delete_file(old_path)
+    
+    def move_local_files(self, moves: list[tuple[str, str]], console=None) -> None:
+        """Apply remote renames locally (falls back to download + delete)"""
+        if console:
+            console.print(f"[dim]Moving {len(moves)} local files...[/dim]")
+        for i, (old_path, new_path) in enumerate(moves, 1):
+            if console:
+                console.print(f"  [{i}/{len(moves)}] {old_path} → {new_path}")
+            if hasattr(self.client_fs, 'move_file'):
+                self.client_fs.move_file(old_path, new_path)
+            else:
+                self._download_one(new_path)
+                self.client_fs.delete_file(old_path)
+    
     def delete_local_files(self, file_list: list[str]) -> None:
         """Delete batch of local files"""
         for rel_path in file_list:
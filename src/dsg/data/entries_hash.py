@@ -0,0 +1,90 @@
+# Author: PB & Claude
+# Maintainer: PB
+# Original date: 2026.10.16
+# License: (c) HRDAG, 2025, GPL-2 or newer
+#
+# ------
+# src/dsg/data/entries_hash.py
+
+"""
+Versioned schemes for a manifest's entries_hash.
+
+Version 1 (every manifest written before entries_hash_version existed) is
+xxh3_64 over the concatenated orjson serialization of each entry, in manifest
+order. Any change means reserializing every entry.
+
+Version 2 gives each entry its own digest, xxh3_128 of the same serialization,
+and sums the digests modulo 2**128. The sum does not depend on order, and an
+entry can be added, removed or replaced by adjusting it with that one entry's
+digest, so ManifestEntries keeps it up to date as entries change. It is
+written as 32 hex digits.
+
+ManifestMetadata.entries_hash_version records the scheme, so existing
+snapshots keep verifying under version 1.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+import orjson
+import xxhash
+
+LEGACY_VERSION = 1
+CURRENT_VERSION = 2
+SUPPORTED_VERSIONS = (LEGACY_VERSION, CURRENT_VERSION)
+
+DIGEST_WIDTH = 16
+_MODULUS = 1 << 128
+
+
+def entry_digest(record: Mapping[str, Any]) -> int:
+    """The version 2 digest of one entry dict (as produced by model_dump)"""
+    return xxhash.xxh3_128_intdigest(orjson.dumps(record))
+
+
+def format_digest_sum(total: int) -> str:
+    """Render a sum of entry digests as a version 2 entries_hash"""
+    return f"{total % _MODULUS:032x}"
+
+
+class EntriesHasher:
+    """Accumulate entries_hash over entry dicts, in manifest order
+
+    Tracks every supported version at once, for readers that only learn which
+    one applies when they reach the metadata after the entries.
+    """
+
+    def __init__(self):
+        self._legacy = xxhash.xxh3_64()
+        self._total = 0
+        self.count = 0
+
+    def update(self, record: Mapping[str, Any]) -> None:
+        raw = orjson.dumps(record)
+        self._legacy.update(raw)
+        self._total += xxhash.xxh3_128_intdigest(raw)
+        self.count += 1
+
+    def hexdigest(self, version: int = CURRENT_VERSION) -> str:
+        if version == LEGACY_VERSION:
+            return self._legacy.hexdigest()
+        if version == CURRENT_VERSION:
+            return format_digest_sum(self._total)
+        raise ValueError(f"Unsupported entries_hash_version {version}")
+
+
+def compute_entries_hash(records: Iterable[Mapping[str, Any]], version: int = CURRENT_VERSION) -> str:
+    """entries_hash of entry dicts under the given scheme version"""
+    if version == LEGACY_VERSION:
+        h = xxhash.xxh3_64()
+        for record in records:
+            h.update(orjson.dumps(record))
+        return h.hexdigest()
+    if version == CURRENT_VERSION:
+        return format_digest_sum(sum(entry_digest(record) for record in records))
+    raise ValueError(f"Unsupported entries_hash_version {version}")
+
+
+# done.
@@ -8,12 +8,13 @@
 from __future__ import annotations
 
 # Standard library imports
-from collections import OrderedDict
 from datetime import datetime
 import importlib.metadata
 import os
 from pathlib import Path
-from typing import Annotated, Union, Literal, Optional
+import stat
+import threading
+from typing import Annotated, Any, Callable, Iterator, Mapping, Union, Literal, Optional, TYPE_CHECKING
 from zoneinfo import ZoneInfo
 
 # Third-party imports
@@ -22,6 +23,17 @@ import orjson
 from pydantic import BaseModel, Field, field_validator
 import xxhash
 
+from dsg.data.entries_hash import (
+    CURRENT_VERSION as ENTRIES_HASH_VERSION, DIGEST_WIDTH, LEGACY_VERSION, SUPPORTED_VERSIONS,
+    compute_entries_hash, entry_digest, format_digest_sum,
+)
+from dsg.data.manifest_binary import MAGIC as BINARY_MAGIC, ManifestIndex, encode_manifest, is_binary_manifest
+from dsg.data.manifest_store import ManifestEntries
+from dsg.data.manifest_stream import CHUNK_SIZE, ManifestReader, ManifestWriter, open_manifest_file
+
+if TYPE_CHECKING:
+    from dsg.core.hash_cache import HashCache
+
 # Get the package version from pyproject.toml
 try:
     PKG_VERSION = importlib.metadata.version("dsg")
@@ -57,7 +69,32 @@ def create_manifest_timestamp(tm: datetime | None = None) -> str:
     return _dt(tm)
 
 
-class FileRef(BaseModel):
+class _EntryModel(BaseModel):
+    """Common base of manifest entries; field writes reach the ManifestEntries holding them"""
+
+    # (ManifestEntries, path) pairs; a slot, so validation never touches it
+    __slots__ = ('_owners',)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if name in type(self).model_fields:
+            owners = getattr(self, '_owners', None)
+            if owners:
+                owners[:] = [(store, path) for store, path in owners
+                             if store._entry_changed(path, self)]
+
+    @classmethod
+    def _view(cls, record: dict[str, Any]):
+        """Build an entry from a record ManifestEntries already holds, skipping validation"""
+        entry = cls.__new__(cls)
+        object.__setattr__(entry, '__dict__', record)
+        object.__setattr__(entry, '__pydantic_fields_set__', set(record))
+        object.__setattr__(entry, '__pydantic_extra__', None)
+        object.__setattr__(entry, '__pydantic_private__', None)
+        return entry
+
+
+class FileRef(_EntryModel):
     """File reference representing a regular file in the manifest"""
 
     type: Literal["file"]
@@ -68,9 +105,11 @@ class FileRef(BaseModel):
     hash: str = ""
 
     @classmethod
-    def _from_path(cls, full_path: Path, path: str) -> FileRef:
-        """Create a FileRef from a filesystem path"""
-        stat_info = full_path.stat()
+    def _from_path(cls, full_path: Path, path: str,
+                   stat_info: Optional[os.stat_result] = None) -> FileRef:
+        """Create a FileRef from a filesystem path, reusing stat_info if the caller has it"""
+        if stat_info is None:
+            stat_info = full_path.stat()
         mtime_iso = _dt(datetime.fromtimestamp(stat_info.st_mtime, LA_TIMEZONE))
         return cls(
             type="file", path=path, filesize=stat_info.st_size, mtime=mtime_iso, hash=""
@@ -101,7 +140,7 @@ class FileRef(BaseModel):
         )
 
 
-class LinkRef(BaseModel):
+class LinkRef(_EntryModel):
     """Symlink reference representing a symbolic link in the manifest"""
 
     type: Literal["link"]
@@ -164,6 +203,23 @@ class LinkRef(BaseModel):
 ManifestEntry = Annotated[Union[FileRef, LinkRef], Field(discriminator="type")]
 
 
+def _entries_hash(entries: Mapping[str, ManifestEntry], version: int = ENTRIES_HASH_VERSION) -> str:
+    """entries_hash under the given scheme; version 2 on ManifestEntries reuses its digests"""
+    if version == ENTRIES_HASH_VERSION and isinstance(entries, ManifestEntries):
+        return entries.entries_hash()
+    return compute_entries_hash(_entry_records(entries), version)
+
+
+def _entry_records(entries: Mapping[str, ManifestEntry]) -> Iterator[dict[str, Any]]:
+    """Yield each entry's model_dump(), reading ManifestEntries columns directly"""
+    if isinstance(entries, ManifestEntries):
+        for _, record in entries.records():
+            yield record
+    else:
+        for entry in entries.values():
+            yield entry.model_dump()
+
+
 class ManifestMetadata(BaseModel):
     """Metadata about a manifest snapshot"""
 
@@ -172,6 +228,8 @@ class ManifestMetadata(BaseModel):
     created_at: str  # ISO format datetime string for consistency
     entry_count: int
     entries_hash: str
+    # Scheme used for entries_hash (see entries_hash.py); absent in older manifests
+    entries_hash_version: int = LEGACY_VERSION
     created_by: Optional[str] = None
 
     # Snapshot-specific fields (optional - only used for snapshot manifests)
@@ -186,37 +244,39 @@ class ManifestMetadata(BaseModel):
     @classmethod
     def _create(
         cls,
-        entries: OrderedDict[str, ManifestEntry],
+        entries: Mapping[str, ManifestEntry],
         snapshot_id: str = "",
         user_id: Optional[str] = None,
         timestamp: Optional[datetime] = None,
         project_config: Optional[dict] = None,
     ) -> ManifestMetadata:
         """Create metadata for a set of entries"""
-        # Generate entries hash using xxhash3_64
-        h = xxhash.xxh3_64()
-
-        # Use entries in their original order from the OrderedDict
-        for entry in entries.values():
-            h.update(orjson.dumps(entry.model_dump()))
-        entries_hash = h.hexdigest()
-
         return cls(
             snapshot_id=snapshot_id if snapshot_id else _dt(),
             created_at=_dt(timestamp),
             entry_count=len(entries),
-            entries_hash=entries_hash,
+            entries_hash=_entries_hash(entries),
+            entries_hash_version=ENTRIES_HASH_VERSION,
             created_by=user_id,
             project_config=project_config,
         )
 
 
 class Manifest(BaseModel):
-    """Core container for manifest entries and metadata"""
+    """Core container for manifest entries and metadata
+
+    entries accepts any ordered mapping of path -> FileRef/LinkRef and is
+    stored as a columnar ManifestEntries (see manifest_store).
+    """
     model_config = {"arbitrary_types_allowed": True}
-    entries: OrderedDict[str, ManifestEntry]
+    entries: ManifestEntries
     metadata: Optional[ManifestMetadata] = None
 
+    @field_validator("entries", mode="before")
+    @classmethod
+    def _store_entries(cls, value: Any) -> Any:
+        return ManifestEntries.coerce(value)
+
     @staticmethod
     def _normalize_path(full_path: Path, project_root: Path) -> tuple[Path, str, bool]:
         """
@@ -274,8 +334,13 @@ class Manifest(BaseModel):
             return full_path, rel_path, False
 
     @staticmethod
-    def create_entry(full_path: Path, project_root: Path, normalize_paths: bool = False) -> ManifestEntry:
-        """Create a manifest entry for a path"""
+    def create_entry(full_path: Path, project_root: Path, normalize_paths: bool = False,
+                     stat_info: Optional[os.stat_result] = None) -> ManifestEntry:
+        """Create a manifest entry for a path.
+
+        stat_info is an lstat() result the caller already holds (e.g. from
+        os.scandir); when given, no further stat calls are made for the path.
+        """
         # Calculate relative path
         try:
             rel_path = str(full_path.relative_to(project_root))
@@ -299,13 +364,23 @@ class Manifest(BaseModel):
                     logger.warning(f"Invalid path in manifest: {rel_path} - {message}")
                     # TODO: Add path sanitization for non-Unicode validation failures
 
-        if full_path.is_symlink():
+        if stat_info is not None:
+            if stat.S_ISLNK(stat_info.st_mode):
+                return LinkRef._from_path(full_path, rel_path, project_root)
+            elif stat.S_ISREG(stat_info.st_mode):
+                return FileRef._from_path(full_path, rel_path, stat_info)
+        elif full_path.is_symlink():
             return LinkRef._from_path(full_path, rel_path, project_root)
         elif full_path.is_file():
             return FileRef._from_path(full_path, rel_path)
         raise ValueError(f"Unsupported path type: {full_path}")
 
-    def recover_or_compute_metadata(self, other_manifest: 'Manifest', user_id: str, project_root: Path) -> None:
+    def recover_or_compute_metadata(self, other_manifest: 'Manifest', user_id: str, project_root: Path,
+                                    hash_cache: Optional['HashCache'] = None,
+                                    hash_workers: Optional[int] = None,
+                                    compute_hashes: bool = True,
+                                    progress: Optional[Callable[[int, int], None]] = None,
+                                    cancel: Optional[threading.Event] = None) -> list[str]:
         """
         Recover metadata for local from cache where possible, or compute new metadata.
 
@@ -316,9 +391,19 @@ class Manifest(BaseModel):
             other_manifest: The manifest to recover attribution from
             user_id: User ID to set for entries that need new attribution
             project_root: Path to project root for computing file hashes
+            hash_cache: Optional HashCache to skip rehashing files whose stat is unchanged
+            hash_workers: Number of hashing threads (defaults to DEFAULT_HASH_WORKERS)
+            compute_hashes: If False, leave unrecovered files unhashed; they then
+                compare by size and mtime only
+            progress: Optional callback(files_done, files_total) while hashing
+            cancel: Optional event that stops hashing with OperationCancelled
+
+        Returns:
+            Paths of the files that could not be recovered and needed hashing
         """
-        from dsg.core.scanner import hash_file
+        from dsg.core.hashing import hash_files
 
+        to_hash: dict[str, Path] = {}
         for path, entry in self.entries.items():
             other_entry = other_manifest.entries.get(path)
 
@@ -333,14 +418,20 @@ class Manifest(BaseModel):
             entry.user = user_id
 
             if isinstance(entry, FileRef):
-                try:
-                    full_path = project_root / path
-                    if full_path.is_file() and not full_path.is_symlink():
-                        entry.hash = hash_file(full_path)
-                    # else: file doesn't exist or is symlink - skip hash  # pragma: no cover
-                except Exception as e:
-                    logger.error(f"Failed to compute hash for {path}: {e}")
+                full_path = project_root / path
+                if full_path.is_file() and not full_path.is_symlink():
+                    to_hash[path] = full_path
+                # else: file doesn't exist or is symlink - skip hash  # pragma: no cover
+
+        if compute_hashes:
+            results = hash_files(to_hash.values(), hash_cache, hash_workers, progress, cancel)
+            for path, full_path in to_hash.items():
+                if full_path in results.hashes:
+                    self.entries[path].hash = results.hashes[full_path]
+                else:
+                    logger.error(f"Failed to compute hash for {path}: {results.errors[full_path]}")
         self.generate_metadata(user_id=user_id)
+        return list(to_hash)
 
     def _validate_symlinks(self) -> list[str]:
         """
@@ -353,17 +444,50 @@ class Manifest(BaseModel):
             List of paths with dangling symlinks
         """
         invalid_links = []
-        for path, entry in self.entries.items():
-            if isinstance(entry, LinkRef):
-                source_dir = os.path.dirname(path)
-                target_path = os.path.normpath(
-                    os.path.join(source_dir, entry.reference)
-                )
-                if target_path not in self.entries:
-                    invalid_links.append(path)
-                    logger.debug(f"Dangling symlink: {path} -> {entry.reference} (resolved to {target_path})")
+        for path, reference in self.entries.links():
+            source_dir = os.path.dirname(path)
+            target_path = os.path.normpath(
+                os.path.join(source_dir, reference)
+            )
+            if target_path not in self.entries:
+                invalid_links.append(path)
+                logger.debug(f"Dangling symlink: {path} -> {reference} (resolved to {target_path})")
         return invalid_links
 
+    def _export_metadata(
+        self,
+        include_metadata: bool,
+        snapshot_id: str,
+        user_id: Optional[str],
+        timestamp: Optional[datetime],
+        project_config: Optional[dict],
+    ) -> Optional[dict]:
+        """Check symlinks before writing and return the metadata dict to write (None if excluded)"""
+        # Validate symlinks before saving
+        invalid_links = self._validate_symlinks()
+        if invalid_links:
+            # Note: These are dangling symlinks (pointing to non-existent targets)
+            # not escaping symlinks (which would have been rejected during creation)
+            logger.warning(
+                f"Manifest contains {len(invalid_links)} dangling symlinks (targets don't exist): {', '.join(invalid_links)}"
+            )
+
+        if not include_metadata:  # pragma: no cover
+            return None
+        # Use existing metadata or create new
+        metadata = self.metadata
+        if metadata is None:
+            # Pass the entries mapping, not a list
+            # Pass timestamp if provided
+            metadata = ManifestMetadata._create(self.entries, snapshot_id, user_id, timestamp, project_config)
+            self.metadata = metadata  # Store for future use
+
+        # Update the manifest version to reflect the new structure
+        if hasattr(metadata, "manifest_version"):
+            metadata.manifest_version = PKG_VERSION  # Bump version for new structure
+        # else: metadata doesn't have manifest_version attribute  # pragma: no cover
+        return metadata.model_dump()
+
     def to_json(
         self,
         file_path: Path,
@@ -374,81 +498,130 @@ class Manifest(BaseModel):
         project_config: Optional[dict] = None,
     ) -> None:
         """Write manifest to disk as JSON"""
-        # Validate symlinks before saving
-        invalid_links = self._validate_symlinks()
-        if invalid_links:
-            # Note: These are dangling symlinks (pointing to non-existent targets)
-            # not escaping symlinks (which would have been rejected during creation)
-            logger.warning(
-                f"Manifest contains {len(invalid_links)} dangling symlinks (targets don't exist): {', '.join(invalid_links)}"
-            )
+        metadata = self._export_metadata(include_metadata, snapshot_id, user_id, timestamp, project_config)
+        with open(file_path, "wb", buffering=CHUNK_SIZE) as stream:
+            self._write_json(stream, metadata)
+
+    def to_compressed(
+        self,
+        file_path: Path,
+        include_metadata: bool = True,
+        snapshot_id: str = "",
+        user_id: Optional[str] = None,
+        timestamp: Optional[datetime] = None,
+        project_config: Optional[dict] = None,
+    ) -> None:
+        """Write manifest as compressed JSON (.lz4 or .gz), streaming entries into the compressor"""
+        if file_path.suffix not in (".lz4", ".gz"):
+            raise ValueError(f"Unsupported compression format: {file_path.suffix}")
+        metadata = self._export_metadata(include_metadata, snapshot_id, user_id, timestamp, project_config)
+        with open_manifest_file(file_path, "wb") as stream:
+            self._write_json(stream, metadata)
+
+    def _write_json(self, stream, metadata: Optional[dict]) -> None:
+        """Serialize entries keyed by path, then metadata, one entry at a time"""
+        writer = ManifestWriter(stream)
+        for record in _entry_records(self.entries):
+            writer.write(record)
+        # Metadata goes after the entries, as a nested object instead of flattened
+        writer.finish(metadata)
+
+    def to_binary(
+        self,
+        file_path: Path,
+        include_metadata: bool = True,
+        snapshot_id: str = "",
+        user_id: Optional[str] = None,
+        timestamp: Optional[datetime] = None,
+        project_config: Optional[dict] = None,
+    ) -> None:
+        """Write manifest to disk in the binary indexed format (see manifest_binary)
 
-        # Serialize entries as a dictionary with path as key to maintain consistency
-        entries_dict = {entry.path: entry.model_dump() for entry in self.entries.values()}
-        output = {"entries": entries_dict}
-        if include_metadata:
-            # Use existing metadata or create new
-            metadata = self.metadata
-            if metadata is None:
-                # Pass the actual OrderedDict, not a list
-                # Pass timestamp if provided
-                metadata = ManifestMetadata._create(self.entries, snapshot_id, user_id, timestamp, project_config)
-                self.metadata = metadata  # Store for future use
-
-            # Update the manifest version to reflect the new structure
-            if hasattr(metadata, "manifest_version"):
-                metadata.manifest_version = PKG_VERSION  # Bump version for new structure
-            # else: metadata doesn't have manifest_version attribute  # pragma: no cover
-
-            # Add metadata as a nested object instead of flattening
-            output["metadata"] = metadata.model_dump()
-        # else: no metadata requested  # pragma: no cover
-        json_bytes = orjson.dumps(output, option=orjson.OPT_INDENT_2)
-        file_path.write_bytes(json_bytes)
+        Same content and metadata as to_json; open the result with
+        ManifestIndex.open for single-path lookups, or load it whole with
+        from_json, which detects the format.
+        """
+        metadata = self._export_metadata(include_metadata, snapshot_id, user_id, timestamp, project_config)
+        file_path.write_bytes(encode_manifest(_entry_records(self.entries), metadata))
 
     @classmethod
-    def from_json(cls, file_path: Path) -> Manifest:
-        """Load manifest from a JSON file, with metadata if present"""
-        # Read with orjson
-        json_bytes = file_path.read_bytes()
-        data = orjson.loads(json_bytes)
-        return cls._from_data(data)
+    def from_json(cls, file_path: Path, trusted: bool = False) -> Manifest:
+        """Load manifest from a JSON file, with metadata if present
 
-    @classmethod
-    def from_bytes(cls, json_bytes: bytes) -> Manifest:
-        """Load manifest from JSON bytes (e.g., from network/backend)"""
-        data = orjson.loads(json_bytes)
-        return cls._from_data(data)
+        Files in the binary indexed format are detected and loaded too.
+        Pass trusted=True only for manifests dsg wrote itself (see _from_data).
+        """
+        return cls.from_bytes(file_path.read_bytes(), trusted=trusted)
 
     @classmethod
-    def from_compressed(cls, file_path: Path) -> Manifest:
-        """Load manifest from a compressed file (.gz or .lz4)"""
-        # FIXME: we will never, never need gzip. remove it from
-        # the docstring, the importa, and the if
-        import gzip
-
-        if file_path.suffix == '.gz':
-            with gzip.open(file_path, 'rb') as f:
-                data = orjson.loads(f.read())
-        elif file_path.suffix == '.lz4':
-            # FIXME: move import to the top
-            import lz4.frame
-            with open(file_path, 'rb') as f:
-                compressed_data = f.read()
-                decompressed_data = lz4.frame.decompress(compressed_data)
-                data = orjson.loads(decompressed_data)
+    def from_bytes(cls, json_bytes: bytes, trusted: bool = False) -> Manifest:
+        """Load manifest from JSON or binary manifest bytes (e.g., from network/backend)"""
+        if is_binary_manifest(json_bytes):
+            index = ManifestIndex(json_bytes)
+            data = {"entries": {record["path"]: record for record in index.records()}}
+            metadata = index.metadata
+            if metadata is not None:
+                data["metadata"] = metadata
+            index.close()
         else:
+            data = orjson.loads(json_bytes)
+        return cls._from_data(data, trusted=trusted)
+
+    @classmethod
+    def from_compressed(cls, file_path: Path, trusted: bool = False) -> Manifest:
+        """Load manifest from a compressed file (.gz or .lz4)
+
+        Entries are decompressed and parsed incrementally into the columnar
+        store, so the whole JSON document is never in memory at once.
+        """
+        if file_path.suffix not in ('.gz', '.lz4'):
             raise ValueError(f"Unsupported compression format: {file_path.suffix}")
+        return cls._from_stream(file_path, trusted=trusted)
 
-        return cls._from_data(data)
+    @classmethod
+    def _from_stream(cls, file_path: Path, trusted: bool = False) -> Manifest:
+        """Build a manifest from a file via ManifestReader (see _from_data for trusted)"""
+        entries = ManifestEntries()
+        with open_manifest_file(file_path) as stream:
+            if is_binary_manifest(stream.peek(len(BINARY_MAGIC))):
+                return cls.from_bytes(stream.read(), trusted=trusted)
+            reader = ManifestReader(stream)
+            try:
+                entries.extend_records(reader.records(trusted=trusted))
+            except ValueError:
+                if not trusted:
+                    raise
+                logger.debug("Manifest failed bulk integrity check; validating each entry")
+                return cls._from_stream(file_path, trusted=False)
+
+        manifest = cls.model_construct(entries=entries)
+        if reader.metadata is not None:
+            try:
+                manifest.metadata = ManifestMetadata.model_validate(reader.metadata)
+            except Exception as e:  # pragma: no cover - metadata validation failure
+                logger.warning(f"Failed to validate metadata: {e}")
+        return manifest
 
     @classmethod
-    def _from_data(cls, data: dict) -> Manifest:
-        """Create manifest from parsed JSON data"""
+    def _from_data(cls, data: dict, trusted: bool = False) -> Manifest:
+        """Create manifest from parsed JSON data
+
+        Every entry is validated as a FileRef/LinkRef, and invalid ones are
+        dropped with a warning. With trusted=True (manifests dsg wrote itself:
+        .dsg/last-sync.json, archived snapshots) the entries are first checked
+        in bulk against metadata.entry_count and entries_hash; if that holds
+        they are stored without per-entry validation. A manifest that fails
+        the check falls back to full validation.
+        """
+        if trusted:
+            manifest = cls._from_trusted_data(data)
+            if manifest is not None:
+                return manifest
+            logger.debug("Manifest failed bulk integrity check; validating each entry")
 
         # Extract entries as a dictionary
         entries_data = data.get("entries", {})
-        entries = OrderedDict()
+        entries = ManifestEntries()
 
         # Ensure entries is a dictionary
         if not isinstance(entries_data, dict):
@@ -461,20 +634,20 @@ class Manifest(BaseModel):
             if entry_type == "file":
                 try:
                     entry = FileRef.model_validate(entry_data)
-                    entries[path] = entry
+                    entries.add_record(path, entry.__dict__)
                 except Exception as e:
                     logger.warning(f"Failed to validate file entry for {path}: {e}")
             elif entry_type == "link":
                 try:
                     entry = LinkRef.model_validate(entry_data)
-                    entries[path] = entry
+                    entries.add_record(path, entry.__dict__)
                 except Exception as e:
                     logger.warning(f"Failed to validate link entry for {path}: {e}")
             else:
                 logger.warning(f"Unknown entry type '{entry_type}' for path {path}")
 
-        # Create manifest with entries in original order
-        manifest = cls(entries=entries)
+        # Create manifest with entries in original order (already columnar, so no copy)
+        manifest = cls.model_construct(entries=entries)
 
         # Check for metadata in the nested format
         if "metadata" in data:
@@ -487,6 +660,45 @@ class Manifest(BaseModel):
 
         return manifest
 
+    @classmethod
+    def _from_trusted_data(cls, data: dict) -> Optional[Manifest]:
+        """Build a manifest without per-entry validation, or None if the bulk check fails"""
+        entries_data = data.get("entries")
+        metadata_data = data.get("metadata")
+        if not isinstance(entries_data, dict) or not isinstance(metadata_data, dict):
+            return None
+        try:
+            metadata = ManifestMetadata.model_validate(metadata_data)
+        except Exception:
+            return None
+        if len(entries_data) != metadata.entry_count or metadata.entries_hash_version not in SUPPORTED_VERSIONS:
+            return None
+
+        # Same bytes ManifestMetadata._create hashed: to_json writes model_dump() verbatim
+        digests = None
+        try:
+            if metadata.entries_hash_version == LEGACY_VERSION:
+                entries_hash = compute_entries_hash(entries_data.values(), LEGACY_VERSION)
+            else:
+                # Keep the per-entry digests so the store need not compute them again
+                digests = bytearray()
+                total = 0
+                for entry_data in entries_data.values():
+                    digest = entry_digest(entry_data)
+                    digests += digest.to_bytes(DIGEST_WIDTH, "big")
+                    total += digest
+                entries_hash = format_digest_sum(total)
+        except TypeError:
+            return None
+        if entries_hash != metadata.entries_hash:
+            return None
+
+        entries = ManifestEntries.from_records(entries_data)
+        if digests is not None:
+            entries.seed_digests(digests, total)
+        logger.debug(f"Loaded {len(entries)} trusted entries (version {metadata.manifest_version})")
+        return cls.model_construct(entries=entries, metadata=metadata)
+
     def verify_integrity(self) -> bool:
         """Verify that the manifest matches its metadata"""
         if self.metadata is None:
@@ -500,11 +712,11 @@ class Manifest(BaseModel):
             )
             return False
 
-        h = xxhash.xxh3_64()
-        # Use entries in their original order
-        for entry in self.entries.values():
-            h.update(orjson.dumps(entry.model_dump()))
-        calculated_hash = h.hexdigest()
+        try:
+            calculated_hash = _entries_hash(self.entries, self.metadata.entries_hash_version)
+        except ValueError as e:
+            logger.warning(str(e))
+            return False
         if calculated_hash != self.metadata.entries_hash:
             logger.warning(
                 f"Hash mismatch: {calculated_hash} vs {self.metadata.entries_hash}"
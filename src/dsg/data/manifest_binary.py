@@ -0,0 +1,227 @@
+# Author: PB & Claude
+# Maintainer: PB
+# Original date: 2026.10.16
+# License: (c) HRDAG, 2025, GPL-2 or newer
+#
+# ------
+# src/dsg/data/manifest_binary.py
+
+"""
+Binary indexed manifest format, readable in place through mmap.
+
+JSON manifests have to be parsed whole to answer a question about one path.
+This format lays the same data out so a reader can binary-search it:
+
+    header    magic, version, entry count, section offsets (fixed size)
+    metadata  the ManifestMetadata as JSON (empty if the manifest has none)
+    records   one fixed-width record per entry, in manifest order
+    index     u32 record numbers sorted by UTF-8 path bytes
+    strings   deduplicated UTF-8 strings the records point into
+
+A record is (kind, filesize) plus (offset, length) pairs for path, user, mtime,
+hash and reference. Every string is stored verbatim, so entries read back
+exactly as written and a full load reproduces the JSON manifest's
+entries_hash. Records stay in manifest order for that reason; the index gives
+the sorted view used by lookups and prefix scans.
+
+JSON stays the interchange format; Manifest's loaders detect this format by
+its magic bytes.
+"""
+
+from __future__ import annotations
+
+import mmap
+import struct
+from collections.abc import Iterator, Mapping
+from pathlib import Path
+from typing import Any, Optional, Union
+
+import orjson
+
+from dsg.data.manifest_store import FILE_FIELDS, LINK_FIELDS
+
+MAGIC = b"DSGMANB1"
+VERSION = 1
+
+# magic, version, entry count, metadata off/len, records off, index off, strings off
+_HEADER = struct.Struct(">8sII2Q3Q")
+# kind, filesize, then (offset, length) for path, user, mtime, hash, reference
+_RECORD = struct.Struct(">B3xq" + "QI" * 5)
+_INDEX = struct.Struct(">I")
+_KINDS = {"file": 1, "link": 2}
+_KIND_NAMES = {1: "file", 2: "link"}
+_STRING_FIELDS = ("path", "user", "mtime", "hash", "reference")
+
+Buffer = Union[bytes, bytearray, memoryview, mmap.mmap]
+
+
+def is_binary_manifest(data: Buffer) -> bool:
+    """True if data starts with the binary manifest magic"""
+    return bytes(data[:len(MAGIC)]) == MAGIC
+
+
+def encode_manifest(records: Iterator[Mapping[str, Any]],
+                    metadata: Optional[Mapping[str, Any]] = None) -> bytes:
+    """Serialize entry records (model_dump() dicts, in order) and optional metadata"""
+    strings = bytearray()
+    string_offsets: dict[str, tuple[int, int]] = {}
+
+    def intern(value: str) -> tuple[int, int]:
+        ref = string_offsets.get(value)
+        if ref is None:
+            raw = value.encode("utf-8")
+            ref = string_offsets[value] = (len(strings), len(raw))
+            strings.extend(raw)
+        return ref
+
+    packed = bytearray()
+    sort_keys: list[bytes] = []
+    for record in records:
+        kind = _KINDS[record["type"]]
+        fields: list[int] = []
+        for name in _STRING_FIELDS:
+            fields.extend(intern(record.get(name, "")))
+        packed += _RECORD.pack(kind, record.get("filesize", 0), *fields)
+        sort_keys.append(record["path"].encode("utf-8"))
+
+    count = len(sort_keys)
+    order = sorted(range(count), key=sort_keys.__getitem__)
+    for prev, cur in zip(order, order[1:]):
+        if sort_keys[prev] == sort_keys[cur]:
+            raise ValueError(f"Duplicate manifest path {sort_keys[cur].decode()!r}")
+    index = struct.pack(f">{count}I", *order)
+
+    meta = orjson.dumps(metadata) if metadata is not None else b""
+    meta_off = _HEADER.size
+    records_off = meta_off + len(meta)
+    index_off = records_off + len(packed)
+    strings_off = index_off + len(index)
+    header = _HEADER.pack(MAGIC, VERSION, count, meta_off, len(meta),
+                          records_off, index_off, strings_off)
+    return b"".join((header, meta, bytes(packed), index, bytes(strings)))
+
+
+class ManifestIndex:
+    """Random access to a binary manifest without loading it
+
+    Open a file with ManifestIndex.open(path) (memory-mapped, use as a
+    context manager) or wrap bytes already in memory. Lookups and prefix
+    scans binary-search the sorted index: O(log n) record reads.
+    """
+
+    def __init__(self, data: Buffer):
+        if len(data) < _HEADER.size or not is_binary_manifest(data):
+            raise ValueError("Not a binary dsg manifest")
+        (_, version, self._count, meta_off, meta_len,
+         self._records_off, self._index_off, self._strings_off) = _HEADER.unpack_from(data, 0)
+        if version != VERSION:
+            raise ValueError(f"Unsupported binary manifest version {version}")
+        if self._strings_off > len(data) or self._index_off + 4 * self._count > len(data):
+            raise ValueError("Truncated binary manifest")
+        self._data = data
+        self._view = memoryview(data)
+        self._meta = bytes(self._view[meta_off:meta_off + meta_len])
+        self._mmap: Optional[mmap.mmap] = None
+
+    @classmethod
+    def open(cls, file_path: Path) -> ManifestIndex:
+        """Memory-map a binary manifest file"""
+        with open(file_path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            index = cls(mapped)
+        except ValueError:
+            mapped.close()
+            raise
+        index._mmap = mapped
+        return index
+
+    def close(self) -> None:
+        self._view.release()
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self) -> ManifestIndex:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, path: object) -> bool:
+        return isinstance(path, str) and self._find(path.encode("utf-8")) is not None
+
+    @property
+    def metadata(self) -> Optional[dict[str, Any]]:
+        """The manifest's metadata as a dict, or None if it was written without"""
+        return orjson.loads(self._meta) if self._meta else None
+
+    def _string(self, offset: int, length: int) -> bytes:
+        start = self._strings_off + offset
+        return bytes(self._view[start:start + length])
+
+    def _path_at(self, rank: int) -> bytes:
+        """Path bytes of the rank-th entry in sorted order"""
+        (record_no,) = _INDEX.unpack_from(self._data, self._index_off + 4 * rank)
+        offset, length = struct.unpack_from(
+            ">QI", self._data, self._records_off + record_no * _RECORD.size + 12)
+        return self._string(offset, length)
+
+    def _record(self, record_no: int) -> dict[str, Any]:
+        kind, filesize, *refs = _RECORD.unpack_from(
+            self._data, self._records_off + record_no * _RECORD.size)
+        values = {name: self._string(refs[2 * i], refs[2 * i + 1]).decode("utf-8")
+                  for i, name in enumerate(_STRING_FIELDS)}
+        values["type"] = type_name = _KIND_NAMES[kind]
+        values["filesize"] = filesize
+        fields = FILE_FIELDS if type_name == "file" else LINK_FIELDS
+        return {name: values[name] for name in fields}
+
+    def _lower_bound(self, key: bytes) -> int:
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._path_at(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _find(self, key: bytes) -> Optional[int]:
+        rank = self._lower_bound(key)
+        if rank < self._count and self._path_at(rank) == key:
+            return _INDEX.unpack_from(self._data, self._index_off + 4 * rank)[0]
+        return None
+
+    def record(self, path: str) -> Optional[dict[str, Any]]:
+        """The entry for path as a model_dump()-shaped dict, or None"""
+        record_no = self._find(path.encode("utf-8"))
+        return None if record_no is None else self._record(record_no)
+
+    def get(self, path: str):
+        """The FileRef/LinkRef for path, or None"""
+        record = self.record(path)
+        if record is None:
+            return None
+        from dsg.data.manifest import FileRef, LinkRef
+        return (FileRef if record["type"] == "file" else LinkRef)._view(record)
+
+    def scan_prefix(self, prefix: str) -> Iterator[dict[str, Any]]:
+        """Yield records whose path starts with prefix, in path order"""
+        key = prefix.encode("utf-8")
+        for rank in range(self._lower_bound(key), self._count):
+            if not self._path_at(rank).startswith(key):
+                break
+            (record_no,) = _INDEX.unpack_from(self._data, self._index_off + 4 * rank)
+            yield self._record(record_no)
+
+    def records(self) -> Iterator[dict[str, Any]]:
+        """Yield every record in manifest order"""
+        for record_no in range(self._count):
+            yield self._record(record_no)
+
+
+# done.
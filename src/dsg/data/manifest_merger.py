@@ -15,15 +15,40 @@ from a 3-bit presence pattern and equality comparisons. These states guide
 synchronization decisions such as upload, delete, conflict resolution, or no-op.
 
 See issue #13 for a full description of each SyncState.
+
+Hashing is a separate stage, recover_local_metadata(), which callers run
+before the comparison so it can report progress, be cancelled, or be skipped
+(metadata-only status). ManifestMerger runs it itself unless constructed
+with recover=False.
+
+Moves and renames are detected on top of the per-path states: a path that
+vanished on one side (while cache and the other side still agree on it) and a
+path that appeared only on that side are paired when their content hashes
+match. Such pairs are reported by get_moves() so a sync can rename the file
+on the other side instead of re-transferring it.
+
+Directories whose subtree digests (see manifest_tree) agree in all three
+manifests are not compared path by path: every path in them is
+sLCR__all_eq. The paths in directories that differ somewhere are merge-joined
+in sorted order: each step takes the comparison rows of the three manifests
+at the smallest path, packs presence and pairwise equality into a 6-bit state
+code, and _STATES turns the code into a SyncState only when it is stored.
 """
 # Standard library imports
-from collections import OrderedDict
+import heapq
+from collections import OrderedDict, defaultdict
+from collections.abc import Iterator
 from dataclasses import dataclass, field
 from enum import Enum
+from itertools import repeat
+import threading
+from typing import Callable, Literal, Optional
 
 # Local DSG imports
 from dsg.config.manager import Config
-from dsg.data.manifest import Manifest
+from dsg.core.hash_cache import HashCache
+from dsg.data.manifest import FileRef, Manifest
+from dsg.data.manifest_tree import DirectoryTree, compare_trees
 
 
 class SyncState(Enum):
@@ -47,39 +72,154 @@ class SyncState(Enum):
         return self.value
 
 
+# State codes: presence of local, cache, remote in bits 5-3, then whether
+# local == cache, local == remote and cache == remote in bits 2-0
+_L_EQ_C, _L_EQ_R, _C_EQ_R = 0b100, 0b010, 0b001
+_ALL_EQ = 0b111111
+
+
+def _state_for(code: int) -> SyncState:
+    """The SyncState of a state code, by the rules of the README SyncState table"""
+    present = code >> 3
+    if present == 0b111:
+        if code & _L_EQ_C and code & _L_EQ_R:
+            return SyncState.sLCR__all_eq
+        if code & _L_EQ_C:
+            return SyncState.sLCR__L_eq_C_ne_R
+        if code & _L_EQ_R:
+            return SyncState.sLCR__L_eq_R_ne_C
+        if code & _C_EQ_R:
+            return SyncState.sLCR__C_eq_R_ne_L
+        return SyncState.sLCR__all_ne
+    if present == 0b011:
+        return SyncState.sxLCR__C_eq_R if code & _C_EQ_R else SyncState.sxLCR__C_ne_R
+    if present == 0b101:
+        return SyncState.sLxCR__L_eq_R if code & _L_EQ_R else SyncState.sLxCR__L_ne_R
+    if present == 0b110:
+        return SyncState.sLCxR__L_eq_C if code & _L_EQ_C else SyncState.sLCxR__L_ne_C
+    return {
+        0b001: SyncState.sxLCxR__only_R,
+        0b010: SyncState.sxLCRx__only_C,
+        0b100: SyncState.sLxCxR__only_L,
+        0b000: SyncState.sxLxCxR__none,
+    }[present]
+
+
+_STATES = tuple(_state_for(code) for code in range(64))
+
+
+class _End:
+    """Sorts after every path; marks an exhausted row stream"""
+
+    def __lt__(self, other: object) -> bool:
+        return False
+
+    def __gt__(self, other: object) -> bool:
+        return other is not self
+
+
+_END = _End()
+_END_ROW = (_END, None)
+
+
+def _rows_equal(a: tuple, b: tuple) -> bool:
+    """FileRef/LinkRef.__eq__ on comparison rows (kind, path, hash, filesize, mtime or target)"""
+    if a == b:
+        return True
+    if a[0] != b[0] or a[1] != b[1]:
+        return False
+    if a[2] and b[2]:
+        return a[2] == b[2]
+    return a[3] == b[3] and a[4] == b[4]
+
+
+@dataclass(frozen=True)
+class FileMove:
+    """A file renamed on one side, identified by identical content hash"""
+    old_path: str
+    new_path: str
+    file_hash: str
+    moved_on: Literal["local", "remote"]
+
+
+def recover_local_metadata(
+        local: Manifest,
+        cache: Manifest,
+        config: Config,
+        metadata_only: bool = False,
+        progress: Optional[Callable[[int, int], None]] = None,
+        cancel: Optional[threading.Event] = None) -> list[str]:
+    """
+    Recover attribution and hashes for the local manifest from the cache, hashing the rest.
+
+    This is the expensive stage before a comparison: every local file that
+    doesn't match its cache entry by metadata is hashed (in parallel, through
+    the project's hash cache). With metadata_only those files are left
+    unhashed instead, so they compare by size and mtime and a touched but
+    unchanged file is reported as changed.
+
+    Args:
+        local: Scanned local manifest, updated in place
+        cache: Last-sync manifest to recover from
+        config: Config with user and project_root
+        metadata_only: Skip hashing entirely
+        progress: Optional callback(files_done, files_total) while hashing
+        cancel: Optional event that stops hashing with OperationCancelled
+
+    Returns:
+        Paths of the local files that did not match the cache (hashed unless metadata_only)
+    """
+    if not config.user or not config.project_root:
+        raise ValueError("ManifestMerger requires config with user and project_root")
+
+    hash_cache = None if metadata_only else HashCache.for_project(config.project_root)
+    try:
+        return local.recover_or_compute_metadata(
+            other_manifest=cache,
+            user_id=config.user.user_id,
+            project_root=config.project_root,
+            hash_cache=hash_cache,
+            hash_workers=getattr(config.user, 'hash_workers', None),
+            compute_hashes=not metadata_only,
+            progress=progress,
+            cancel=cancel,
+        )
+    finally:
+        # Hashes finished before a cancellation are kept for the next run
+        if hash_cache is not None:
+            try:
+                hash_cache.save()
+            except OSError:  # pragma: no cover
+                pass  # the cache is an optimization; never fail a comparison over it
+
+
 @dataclass
 class ManifestMerger:
     local: Manifest
     cache: Manifest
     remote: Manifest
     config: Config
+    recover: bool = True
     path_states: OrderedDict[str, SyncState] = field(init=False, default_factory=OrderedDict)
+    moves: list[FileMove] = field(init=False, default_factory=list)
 
     def __post_init__(self):
         self._merge()
 
     def _merge(self) -> None:
-        # Ensure we have the required config
-        if not self.config.user or not self.config.project_root:
-            raise ValueError("ManifestMerger requires config with user and project_root")
-        
-        user_id = self.config.user.user_id
-        project_root = self.config.project_root
-        
-        # Recover or compute metadata for local manifest
-        self.local.recover_or_compute_metadata(
-            other_manifest=self.cache,
-            user_id=user_id,
-            project_root=project_root
-        )
-        
-        # Get all paths from all manifests
-        all_paths = set(self.local.entries) | set(self.cache.entries) | set(self.remote.entries)
+        if self.recover:
+            recover_local_metadata(self.local, self.cache, self.config)
+
+        # Skip subtrees identical in all three manifests; merge-join the rest
+        trees = [DirectoryTree(m.entries) for m in (self.local, self.cache, self.remote)]
+        identical, candidates = compare_trees(trees)
+        identical.sort()
+        candidates.sort()
+        path_states = self.path_states
+        for path, code in heapq.merge(zip(identical, repeat(_ALL_EQ)), self._join(candidates)):
+            path_states[path] = _STATES[code]
 
-        # Process all known paths
-        for path in sorted(all_paths):
-            state = self._classify(path)
-            self.path_states[path] = state
+        self.moves = self._detect_moves()
 
         # Add a special entry for non-existent path to ensure it's
         # available for testing. This simulates looking up a path
@@ -94,45 +234,78 @@ class ManifestMerger:
         For a full list of possible sync states and their meanings, see:
         README.md: SyncState Table
         """
-        local_entry = self.local.entries.get(path)
-        cache_entry = self.cache.entries.get(path)
-        remote_entry = self.remote.entries.get(path)
+        return _STATES[next(self._join([path]), (path, 0))[1]]
 
-        ex = f"{int(bool(local_entry))}{int(bool(cache_entry))}{int(bool(remote_entry))}"
+    def _join(self, paths: list[str]) -> Iterator[tuple[str, int]]:
+        """
+        Yield (path, state code) for the sorted paths present in any manifest.
 
-        if ex == "111" and local_entry == cache_entry and local_entry == remote_entry:
-            return SyncState.sLCR__all_eq
-        if ex == "111" and local_entry == cache_entry:
-            return SyncState.sLCR__L_eq_C_ne_R
-        if ex == "111" and local_entry == remote_entry:
-            return SyncState.sLCR__L_eq_R_ne_C  # pragma: no cover - early return
-        if ex == "111" and cache_entry == remote_entry:
-            return SyncState.sLCR__C_eq_R_ne_L
-        if ex == "111":
-            return SyncState.sLCR__all_ne
-        if ex == "011" and cache_entry == remote_entry:
-            return SyncState.sxLCR__C_eq_R
-        if ex == "011" and cache_entry != remote_entry:
-            return SyncState.sxLCR__C_ne_R  # pragma: no cover - early return
-        if ex == "101" and local_entry == remote_entry:
-            return SyncState.sLxCR__L_eq_R  # pragma: no cover - early return
-        if ex == "101" and local_entry != remote_entry:
-            return SyncState.sLxCR__L_ne_R
-        if ex == "110" and local_entry == cache_entry:
-            return SyncState.sLCxR__L_eq_C
-        if ex == "110" and local_entry != cache_entry:
-            return SyncState.sLCxR__L_ne_C  # pragma: no cover - early return
-        if ex == "001":
-            return SyncState.sxLCxR__only_R
-        if ex == "010":
-            return SyncState.sxLCRx__only_C
-        if ex == "100":
-            return SyncState.sLxCxR__only_L
-        if ex == "000":
-            return SyncState.sxLxCxR__none
-
-        raise ValueError(f"Unexpected manifest state {ex}")  # pragma: no cover
+        One pass over the three manifests' comparison rows (see
+        ManifestEntries.comparison_rows) in path order, taking presence and
+        pairwise equality together; no FileRef/LinkRef objects are built.
+        """
+        local, cache, remote = (m.entries.comparison_rows(paths) for m in (self.local, self.cache, self.remote))
+        lpath, lrow = next(local, _END_ROW)
+        cpath, crow = next(cache, _END_ROW)
+        rpath, rrow = next(remote, _END_ROW)
+        while True:
+            path = min(lpath, cpath, rpath)
+            if path is _END:
+                return
+            in_l, in_c, in_r = lpath == path, cpath == path, rpath == path
+            code = in_l << 5 | in_c << 4 | in_r << 3
+            if in_l and in_c and _rows_equal(lrow, crow):
+                code |= _L_EQ_C
+            if in_l and in_r and _rows_equal(lrow, rrow):
+                code |= _L_EQ_R
+            if in_c and in_r and _rows_equal(crow, rrow):
+                code |= _C_EQ_R
+            yield path, code
+            if in_l:
+                lpath, lrow = next(local, _END_ROW)
+            if in_c:
+                cpath, crow = next(cache, _END_ROW)
+            if in_r:
+                rpath, rrow = next(remote, _END_ROW)
+
+    def _detect_moves(self) -> list[FileMove]:
+        """
+        Pair vanished and newly appeared paths on the same side by content hash.
+
+        A local move shows up as sxLCR__C_eq_R at the old path plus
+        sLxCxR__only_L at the new one; a remote move as sLCxR__L_eq_C plus
+        sxLCxR__only_R. Only hashed FileRefs are matched. When several
+        vanished and new paths share a hash they are paired in sorted order;
+        leftovers stay ordinary uploads/downloads and deletions.
+        """
+        moves: list[FileMove] = []
+        sides = (
+            ("local", SyncState.sxLCR__C_eq_R, SyncState.sLxCxR__only_L, self.remote, self.local),
+            ("remote", SyncState.sLCxR__L_eq_C, SyncState.sxLCxR__only_R, self.local, self.remote),
+        )
+        for moved_on, vanished_state, appeared_state, old_manifest, new_manifest in sides:
+            vanished = self._paths_by_hash(vanished_state, old_manifest)
+            if not vanished:
+                continue
+            appeared = self._paths_by_hash(appeared_state, new_manifest)
+            for file_hash in sorted(vanished.keys() & appeared.keys()):
+                for old_path, new_path in zip(sorted(vanished[file_hash]), sorted(appeared[file_hash])):
+                    moves.append(FileMove(old_path, new_path, file_hash, moved_on))
+        return moves
+
+    def _paths_by_hash(self, state: SyncState, manifest: Manifest) -> dict[str, list[str]]:
+        by_hash: dict[str, list[str]] = defaultdict(list)
+        for path, path_state in self.path_states.items():
+            if path_state != state:
+                continue
+            entry = manifest.entries.get(path)
+            if isinstance(entry, FileRef) and entry.hash:
+                by_hash[entry.hash].append(path)
+        return by_hash
 
     def get_sync_states(self) -> OrderedDict[str, SyncState]:
         return self.path_states
 
+    def get_moves(self) -> list[FileMove]:
+        return self.moves
+
@@ -0,0 +1,543 @@
+# Author: PB & Claude
+# Maintainer: PB
+# Original date: 2026.10.16
+# License: (c) HRDAG, 2025, GPL-2 or newer
+#
+# ------
+# src/dsg/data/manifest_store.py
+
+"""
+Columnar storage for manifest entries.
+
+A manifest of a few million files held as one pydantic model per entry costs
+gigabytes, and dsg status loads three of them. ManifestEntries keeps the same
+ordered path -> entry mapping as parallel columns instead: interned paths,
+int64 sizes, mtimes as int64 nanoseconds plus a UTC offset, xxh3 hashes as
+8-byte records, and users as indexes into a small string table.
+
+FileRef and LinkRef objects are built only when an entry is looked up. While
+such an object is alive the mapping hands out that same object, and assigning
+to its fields writes the change back into the columns, so code that does
+``manifest.entries[path].hash = h`` behaves as it did with a plain dict.
+
+Values that do not round-trip through the compact encoding (mtimes that are
+not in dsg's own ISO format, hashes that are not 16 lowercase hex digits) are
+kept verbatim in side tables, so every entry reads back exactly as written.
+
+entries_hash() returns the version 2 entries_hash (see entries_hash.py). The
+per-entry digests behind it (16 bytes each) are computed on first use, or
+taken over from a trusted load, and then adjusted as entries change, so
+hashing a manifest again after a few changes costs only those changes.
+"""
+
+from __future__ import annotations
+
+import sys
+import weakref
+from array import array
+from collections.abc import Iterable, Iterator, Mapping, MutableMapping
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+
+from dsg.data.entries_hash import DIGEST_WIDTH, entry_digest, format_digest_sum
+
+_GONE, _FILE, _LINK = 0, 1, 2
+_HASH_WIDTH = 8
+_NO_HASH = bytes(_HASH_WIDTH)
+_NO_DIGEST = bytes(DIGEST_WIDTH)
+
+FILE_FIELDS = ("type", "path", "user", "filesize", "mtime", "hash")
+LINK_FIELDS = ("type", "path", "user", "reference")
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MINUTE = timedelta(minutes=1)
+_MICROSECOND = timedelta(microseconds=1)
+_timezones: dict[int, timezone] = {}
+
+
+def _encode_mtime(mtime: str) -> Optional[tuple[int, int]]:
+    """Return (ns since epoch, UTC offset in minutes), or None if mtime won't round-trip"""
+    try:
+        dt = datetime.fromisoformat(mtime)
+    except (TypeError, ValueError):
+        return None
+    offset = dt.utcoffset()
+    if offset is None or offset % _MINUTE or dt.isoformat() != mtime:
+        return None
+    return (dt - _EPOCH) // _MICROSECOND * 1000, offset // _MINUTE
+
+
+def _decode_mtime(ns: int, minutes: int) -> str:
+    tz = _timezones.get(minutes)
+    if tz is None:
+        tz = _timezones[minutes] = timezone(timedelta(minutes=minutes))
+    seconds, rem = divmod(ns, 1_000_000_000)
+    dt = datetime.fromtimestamp(seconds, tz)
+    if rem:
+        return dt.replace(microsecond=rem // 1000).isoformat()
+    return dt.isoformat()
+
+
+def _encode_hash(value: str) -> Optional[bytes]:
+    """Return the 8 raw bytes of a 16-digit lowercase hex hash, or None"""
+    if len(value) != 2 * _HASH_WIDTH:
+        return None
+    try:
+        raw = bytes.fromhex(value)
+    except ValueError:
+        return None
+    return raw if raw.hex() == value else None
+
+
+def _entry_types():
+    from dsg.data.manifest import FileRef, LinkRef
+    return FileRef, LinkRef
+
+
+class ManifestEntries(MutableMapping):
+    """Ordered mapping of manifest path -> FileRef/LinkRef, stored as columns"""
+
+    def __init__(self, entries: Optional[Mapping[str, Any]] = None):
+        self._paths: list[Optional[str]] = []
+        self._index: dict[str, int] = {}
+        self._kinds = bytearray()
+        self._sizes = array('q')
+        self._mtimes = array('q')
+        self._offsets = array('h')
+        self._hashes = bytearray()
+        self._hashed = bytearray()
+        self._users = array('I')
+        self._user_table: list[str] = [""]
+        self._user_ids: dict[str, int] = {"": 0}
+        # slot -> value for links and for fields the columns can't hold exactly
+        self._references: dict[int, str] = {}
+        self._raw_paths: dict[int, str] = {}
+        self._raw_mtimes: dict[int, str] = {}
+        self._raw_hashes: dict[int, str] = {}
+        self._live: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
+        # Version 2 entries_hash digests, one per slot (zero when deleted); None until needed
+        self._digests: Optional[bytearray] = None
+        self._digest_sum = 0
+        if entries:
+            for path, entry in entries.items():
+                self[path] = entry
+
+    @classmethod
+    def coerce(cls, value: Any) -> Any:
+        """Turn any mapping into a ManifestEntries (copying an existing one)"""
+        if isinstance(value, ManifestEntries):
+            return value.copy()
+        if isinstance(value, Mapping):
+            return cls(value)
+        return value
+
+    # --- Mapping protocol -------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, path: object) -> bool:
+        return path in self._index
+
+    def __iter__(self) -> Iterator[str]:
+        for path in self._paths:
+            if path is not None:
+                yield path
+
+    def __getitem__(self, path: str):
+        slot = self._index[path]
+        entry = self._live.get(path)
+        if entry is None:
+            entry = self._materialize(slot)
+            self._bind(path, entry)
+        return entry
+
+    def __setitem__(self, path: str, entry) -> None:
+        slot = self._index.get(path)
+        if slot is None:
+            slot = self._new_slot(path)
+        self._pack(slot, entry.type, entry.path, entry.user,
+                   getattr(entry, 'filesize', 0), getattr(entry, 'mtime', ''),
+                   getattr(entry, 'hash', ''), getattr(entry, 'reference', ''))
+        self._bind(path, entry)
+
+    def __delitem__(self, path: str) -> None:
+        slot = self._index.pop(path)
+        if self._digests is not None:
+            self._set_digest(slot, 0)
+        self._paths[slot] = None
+        self._kinds[slot] = _GONE
+        self._references.pop(slot, None)
+        self._raw_paths.pop(slot, None)
+        self._raw_mtimes.pop(slot, None)
+        self._raw_hashes.pop(slot, None)
+        self._live.pop(path, None)
+        if len(self._paths) > 64 and len(self._index) < len(self._paths) // 2:
+            self._compact()
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, ManifestEntries):
+            return list(self._index) == list(other._index) and all(
+                self[path] == other[path] for path in self._index)
+        if isinstance(other, Mapping):
+            return list(self) == list(other) and all(
+                self[path] == other[path] for path in self._index)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"ManifestEntries({len(self)} entries)"
+
+    def copy(self) -> ManifestEntries:
+        """Copy the columns; live entry objects are shared with the copy"""
+        clone = ManifestEntries.__new__(ManifestEntries)
+        clone._paths = list(self._paths)
+        clone._index = dict(self._index)
+        clone._kinds = bytearray(self._kinds)
+        clone._sizes = array('q', self._sizes)
+        clone._mtimes = array('q', self._mtimes)
+        clone._offsets = array('h', self._offsets)
+        clone._hashes = bytearray(self._hashes)
+        clone._hashed = bytearray(self._hashed)
+        clone._users = array('I', self._users)
+        clone._user_table = list(self._user_table)
+        clone._user_ids = dict(self._user_ids)
+        clone._references = dict(self._references)
+        clone._raw_paths = dict(self._raw_paths)
+        clone._raw_mtimes = dict(self._raw_mtimes)
+        clone._raw_hashes = dict(self._raw_hashes)
+        clone._digests = bytearray(self._digests) if self._digests is not None else None
+        clone._digest_sum = self._digest_sum
+        clone._live = weakref.WeakValueDictionary()
+        for path, entry in list(self._live.items()):
+            clone._bind(path, entry)
+        return clone
+
+    __copy__ = copy
+
+    def __deepcopy__(self, memo) -> ManifestEntries:
+        clone = self.copy()
+        clone._live = weakref.WeakValueDictionary()
+        return clone
+
+    # --- Bulk access without building entry objects -----------------------
+
+    def add_record(self, path: str, record: Mapping[str, Any]) -> None:
+        """Store an already-validated entry dict (as produced by model_dump)"""
+        slot = self._index.get(path)
+        if slot is None:
+            slot = self._new_slot(path)
+        else:
+            self._live.pop(path, None)
+        self._pack(slot, record["type"], record["path"], record.get("user", ""),
+                   record.get("filesize", 0), record.get("mtime", ""),
+                   record.get("hash", ""), record.get("reference", ""))
+
+    @classmethod
+    def from_records(cls, records: Mapping[str, Mapping[str, Any]]) -> ManifestEntries:
+        """Build a store from path -> entry dict in one pass (the bulk form of add_record)"""
+        store = cls()
+        store.extend_records(records.items())
+        return store
+
+    def extend_records(self, records: Iterable[tuple[str, Mapping[str, Any]]]) -> None:
+        """add_record for each (path, entry dict), appending straight to the columns"""
+        # Digests, if any, are recomputed on the next entries_hash()
+        self._digests = None
+        paths, index, kinds = self._paths, self._index, self._kinds
+        sizes, mtimes, offsets = self._sizes, self._mtimes, self._offsets
+        hashes, hashed, users = self._hashes, self._hashed, self._users
+        user_ids, user_table = self._user_ids, self._user_table
+        references, raw_paths = self._references, self._raw_paths
+        raw_mtimes, raw_hashes = self._raw_mtimes, self._raw_hashes
+        intern = sys.intern
+
+        for path, record in records:
+            if path in index:
+                self.add_record(path, record)
+                continue
+            path = intern(path)
+            slot = len(paths)
+            paths.append(path)
+            index[path] = slot
+            if record["path"] != path:
+                raw_paths[slot] = record["path"]
+            user = record.get("user", "")
+            user_id = user_ids.get(user)
+            if user_id is None:
+                user_id = user_ids[user] = len(user_table)
+                user_table.append(user)
+            users.append(user_id)
+
+            if record["type"] == "link":
+                kinds.append(_LINK)
+                references[slot] = record["reference"]
+                sizes.append(0)
+                mtimes.append(0)
+                offsets.append(0)
+                hashes += _NO_HASH
+                hashed.append(0)
+                continue
+
+            kinds.append(_FILE)
+            sizes.append(record.get("filesize", 0))
+            mtime = record.get("mtime", "")
+            encoded = _encode_mtime(mtime)
+            if encoded is None:
+                raw_mtimes[slot] = mtime
+                mtimes.append(0)
+                offsets.append(0)
+            else:
+                mtimes.append(encoded[0])
+                offsets.append(encoded[1])
+            hash_ = record.get("hash", "")
+            raw = _encode_hash(hash_) if hash_ else None
+            if raw is None:
+                hashes += _NO_HASH
+                hashed.append(0)
+                if hash_:
+                    raw_hashes[slot] = hash_
+            else:
+                hashes += raw
+                hashed.append(1)
+
+    def records(self) -> Iterator[tuple[str, dict[str, Any]]]:
+        """Yield (path, entry dict) in order, equal to each entry's model_dump()"""
+        for path in self:
+            yield path, self._record(self._index[path])
+
+    def get_field(self, path: str, name: str) -> Any:
+        """Read one field of an entry without building the entry object"""
+        slot = self._index[path]
+        return self._field(slot, name)
+
+    def links(self) -> Iterator[tuple[str, str]]:
+        """Yield (path, reference) for every symlink entry, in order"""
+        for slot in sorted(self._references):
+            if self._kinds[slot] == _LINK:
+                yield self._paths[slot], self._references[slot]
+
+    def users(self) -> list[str]:
+        """Distinct user ids, in order of first appearance"""
+        return [user for user in self._user_table if user]
+
+    def comparison_keys(self) -> Iterator[tuple[str, bytes]]:
+        """Yield (path, key) in order; equal keys mean the entries compare equal
+
+        The key is the entry's path plus the fields FileRef/LinkRef.__eq__
+        compares, read from the columns (see manifest_tree).
+        """
+        kinds, hashed, hashes = self._kinds, self._hashed, self._hashes
+        raw_paths, raw_hashes = self._raw_paths, self._raw_hashes
+        for slot, path in enumerate(self._paths):
+            if path is None:
+                continue
+            prefix = raw_paths.get(slot, path).encode() + b"\0"
+            if kinds[slot] == _LINK:
+                yield path, prefix + b"L" + self._references[slot].encode()
+            elif hashed[slot]:
+                start = slot * _HASH_WIDTH
+                yield path, prefix + b"h" + hashes[start:start + _HASH_WIDTH].hex().encode()
+            elif slot in raw_hashes:
+                yield path, prefix + b"h" + raw_hashes[slot].encode()
+            else:
+                yield path, prefix + b"m" + f"{self._sizes[slot]}\0{self._field(slot, 'mtime')}".encode()
+
+    def comparison_rows(self, paths: Optional[Iterable[str]] = None) -> Iterator[tuple[str, tuple]]:
+        """Yield (path, row) for the given paths that are present (default: all, in order)
+
+        A row is (kind, entry path, hash, filesize, mtime or link target),
+        straight from the columns: the hash as raw bytes (or the verbatim
+        string, or None when unhashed), the mtime as (ns, offset) (or the
+        verbatim string). Equal values mean equal strings, so rows can stand
+        in for FileRef/LinkRef in __eq__ tests without building the objects.
+        """
+        index, kinds, hashed, hashes = self._index, self._kinds, self._hashed, self._hashes
+        raw_paths, raw_hashes, raw_mtimes = self._raw_paths, self._raw_hashes, self._raw_mtimes
+        for path in (self if paths is None else paths):
+            slot = index.get(path)
+            if slot is None:
+                continue
+            entry_path = raw_paths.get(slot, path)
+            if kinds[slot] == _LINK:
+                yield path, (_LINK, entry_path, None, 0, self._references[slot])
+                continue
+            if hashed[slot]:
+                start = slot * _HASH_WIDTH
+                hash_ = bytes(hashes[start:start + _HASH_WIDTH])
+            else:
+                hash_ = raw_hashes.get(slot)
+            mtime = raw_mtimes[slot] if slot in raw_mtimes else (self._mtimes[slot], self._offsets[slot])
+            yield path, (_FILE, entry_path, hash_, self._sizes[slot], mtime)
+
+    def entries_hash(self) -> str:
+        """The version 2 entries_hash of the current entries"""
+        if self._digests is None:
+            self._digests = bytearray(len(self._paths) * DIGEST_WIDTH)
+            self._digest_sum = 0
+            for path in self:
+                slot = self._index[path]
+                self._set_digest(slot, entry_digest(self._record(slot)))
+        return format_digest_sum(self._digest_sum)
+
+    def seed_digests(self, digests: bytes, total: int) -> None:
+        """Adopt per-entry digests computed while loading, one per entry in order
+
+        Only valid straight after from_records/extend_records on a new store,
+        where slots and entries line up; total is the sum of the digests.
+        """
+        if len(digests) != len(self._paths) * DIGEST_WIDTH or len(self._index) != len(self._paths):
+            raise ValueError("Digests do not line up with the stored entries")
+        self._digests = bytearray(digests)
+        self._digest_sum = total
+
+    # --- Internals --------------------------------------------------------
+
+    def _new_slot(self, path: str) -> int:
+        slot = len(self._paths)
+        self._paths.append(sys.intern(path))
+        self._index[self._paths[slot]] = slot
+        self._kinds.append(_GONE)
+        self._sizes.append(0)
+        self._mtimes.append(0)
+        self._offsets.append(0)
+        self._hashes += _NO_HASH
+        self._hashed.append(0)
+        self._users.append(0)
+        if self._digests is not None:
+            self._digests += _NO_DIGEST
+        return slot
+
+    def _set_digest(self, slot: int, digest: int) -> None:
+        start = slot * DIGEST_WIDTH
+        old = int.from_bytes(self._digests[start:start + DIGEST_WIDTH], "big")
+        self._digests[start:start + DIGEST_WIDTH] = digest.to_bytes(DIGEST_WIDTH, "big")
+        self._digest_sum += digest - old
+
+    def _pack(self, slot: int, kind: str, path: str, user: str, filesize: int,
+              mtime: str, hash_: str, reference: str) -> None:
+        self._pack_columns(slot, kind, path, user, filesize, mtime, hash_, reference)
+        if self._digests is not None:
+            if kind == "link":
+                record = {"type": kind, "path": path, "user": user, "reference": reference}
+            else:
+                record = {"type": kind, "path": path, "user": user, "filesize": filesize,
+                          "mtime": mtime, "hash": hash_}
+            self._set_digest(slot, entry_digest(record))
+
+    def _pack_columns(self, slot: int, kind: str, path: str, user: str, filesize: int,
+                      mtime: str, hash_: str, reference: str) -> None:
+        if path != self._paths[slot]:
+            # The entry's own path differs from its key; keep it verbatim
+            self._raw_paths[slot] = path
+        else:
+            self._raw_paths.pop(slot, None)
+        user_id = self._user_ids.get(user)
+        if user_id is None:
+            user_id = self._user_ids[user] = len(self._user_table)
+            self._user_table.append(user)
+        self._users[slot] = user_id
+        self._raw_mtimes.pop(slot, None)
+        self._raw_hashes.pop(slot, None)
+        self._references.pop(slot, None)
+
+        if kind == "link":
+            self._kinds[slot] = _LINK
+            self._sizes[slot] = 0
+            self._hashed[slot] = 0
+            self._references[slot] = reference
+            return
+
+        self._kinds[slot] = _FILE
+        self._sizes[slot] = filesize
+        encoded = _encode_mtime(mtime)
+        if encoded is None:
+            self._raw_mtimes[slot] = mtime
+        else:
+            self._mtimes[slot], self._offsets[slot] = encoded
+        start = slot * _HASH_WIDTH
+        raw = _encode_hash(hash_) if hash_ else None
+        if raw is not None:
+            self._hashes[start:start + _HASH_WIDTH] = raw
+            self._hashed[slot] = 1
+        else:
+            self._hashes[start:start + _HASH_WIDTH] = _NO_HASH
+            self._hashed[slot] = 0
+            if hash_:
+                self._raw_hashes[slot] = hash_
+
+    def _field(self, slot: int, name: str) -> Any:
+        if name == "type":
+            return "link" if self._kinds[slot] == _LINK else "file"
+        if name == "path":
+            return self._raw_paths.get(slot, self._paths[slot])
+        if name == "user":
+            return self._user_table[self._users[slot]]
+        if name == "filesize":
+            return self._sizes[slot]
+        if name == "mtime":
+            raw = self._raw_mtimes.get(slot)
+            return raw if raw is not None else _decode_mtime(self._mtimes[slot], self._offsets[slot])
+        if name == "hash":
+            if self._hashed[slot]:
+                start = slot * _HASH_WIDTH
+                return self._hashes[start:start + _HASH_WIDTH].hex()
+            return self._raw_hashes.get(slot, "")
+        if name == "reference":
+            return self._references[slot]
+        raise KeyError(name)
+
+    def _record(self, slot: int) -> dict[str, Any]:
+        fields = LINK_FIELDS if self._kinds[slot] == _LINK else FILE_FIELDS
+        return {name: self._field(slot, name) for name in fields}
+
+    def _materialize(self, slot: int):
+        file_cls, link_cls = _entry_types()
+        record = self._record(slot)
+        cls = link_cls if record["type"] == "link" else file_cls
+        return cls._view(record)
+
+    def _bind(self, path: str, entry) -> None:
+        """Make entry the live object for path, and route its field writes here"""
+        try:
+            self._live[path] = entry
+        except TypeError:
+            return
+        owners = getattr(entry, '_owners', None)
+        if owners is None:
+            try:
+                entry._owners = [(self, path)]
+            except (AttributeError, ValueError):
+                pass
+        else:
+            owners.append((self, path))
+
+    def _entry_changed(self, path: str, entry) -> bool:
+        """Write a live entry's fields back; False if entry is no longer ours"""
+        if self._live.get(path) is not entry:
+            return False
+        slot = self._index[path]
+        self._pack(slot, entry.type, entry.path, entry.user,
+                   getattr(entry, 'filesize', 0), getattr(entry, 'mtime', ''),
+                   getattr(entry, 'hash', ''), getattr(entry, 'reference', ''))
+        return True
+
+    def _compact(self) -> None:
+        """Drop deleted slots, keeping order"""
+        records = [(path, self._record(self._index[path])) for path in self]
+        live = list(self._live.items())
+        digests, total = self._digests, self._digest_sum
+        if digests is not None:
+            digests = b"".join(digests[slot * DIGEST_WIDTH:(slot + 1) * DIGEST_WIDTH]
+                               for slot in self._index.values())
+        self.__init__()
+        for path, record in records:
+            self.add_record(path, record)
+        for path, entry in live:
+            self._live[path] = entry
+        if digests is not None:
+            self.seed_digests(digests, total)
+
+
+# done.
@@ -0,0 +1,293 @@
+# Author: PB & Claude
+# Maintainer: PB
+# Original date: 2026.10.16
+# License: (c) HRDAG, 2025, GPL-2 or newer
+#
+# ------
+# src/dsg/data/manifest_stream.py
+
+"""
+Incremental reading and writing of JSON manifests.
+
+Manifest.from_json and friends parse a whole document at once, so peak memory
+is several times the file size. ManifestReader instead walks the top-level
+object and yields one (path, entry dict) pair at a time, decoding each value
+with json's raw_decode from a bounded text buffer. ManifestWriter produces the
+same bytes as Manifest.to_json one entry at a time, keeping entry_count and
+entries_hash as it goes.
+
+ManifestReader.records() and items() apply the same validation (or, for
+trusted manifests, the same entries_hash check) as the whole-document
+loaders. open_manifest_file picks plain, lz4-frame or gzip I/O from the file
+suffix, so archived snapshots stream through the same classes.
+
+sorted_records yields a manifest's entries in path order with bounded memory,
+for merge-joining two snapshots: binary manifests through their sorted index,
+JSON manifests by an external merge sort of spilled runs.
+"""
+
+from __future__ import annotations
+
+import codecs
+import gzip
+import heapq
+import json
+import re
+import tempfile
+from collections.abc import Iterator, Mapping
+from operator import itemgetter
+from pathlib import Path
+from typing import Any, BinaryIO, Optional
+
+import loguru
+import lz4.frame
+import orjson
+
+from dsg.data.entries_hash import LEGACY_VERSION, SUPPORTED_VERSIONS, EntriesHasher
+from dsg.data.manifest_binary import MAGIC, ManifestIndex, is_binary_manifest
+
+CHUNK_SIZE = 1 << 20
+SORT_RUN_ENTRIES = 200_000
+logger = loguru.logger
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_DECODER = json.JSONDecoder()
+
+
+def open_manifest_file(file_path: Path, mode: str = "rb") -> BinaryIO:
+    """Open a manifest for binary streaming, compressed according to its suffix"""
+    if file_path.suffix == ".lz4":
+        return lz4.frame.open(file_path, mode)
+    if file_path.suffix == ".gz":
+        return gzip.open(file_path, mode)
+    return open(file_path, mode, buffering=CHUNK_SIZE)
+
+
+class ManifestReader:
+    """Iterate the entries of a JSON manifest without loading the document
+
+    entries() yields (path, entry dict) in file order. metadata holds the
+    metadata dict once the reader has passed it: dsg writes it after the
+    entries, so it is set when entries() is exhausted (None if absent).
+    """
+
+    def __init__(self, stream: BinaryIO, chunk_size: int = CHUNK_SIZE):
+        self._stream = stream
+        self._chunk_size = chunk_size
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+        self.metadata: Optional[dict[str, Any]] = None
+
+    def _fill(self) -> bool:
+        """Append the next chunk to the buffer, dropping what has been consumed"""
+        if self._eof:
+            return False
+        chunk = self._stream.read(self._chunk_size)
+        text = self._decoder.decode(chunk, final=not chunk)
+        self._eof = not chunk
+        self._buf = self._buf[self._pos:] + text
+        self._pos = 0
+        return True
+
+    def _peek(self) -> str:
+        """Skip whitespace and return the next character ('' at end of input)"""
+        if self._pos < len(self._buf) and self._buf[self._pos] not in " \t\n\r":
+            return self._buf[self._pos]
+        while True:
+            self._pos = _WHITESPACE.match(self._buf, self._pos).end()
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                return ""
+
+    def _expect(self, char: str) -> None:
+        found = self._peek()
+        if found != char:
+            raise ValueError(f"Malformed manifest JSON: expected {char!r}, found {found or 'end of input'!r}")
+        self._pos += 1
+
+    def _value(self) -> Any:
+        """Decode the next JSON value, reading more input until it is complete"""
+        self._peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError as e:
+                if self._fill():
+                    continue
+                raise ValueError(f"Malformed manifest JSON: {e.msg}") from e
+            # A number at the end of the buffer may continue in the next chunk
+            if end == len(self._buf) and self._fill():
+                continue
+            self._pos = end
+            return value
+
+    def _members(self) -> Iterator[str]:
+        """Yield each key of the object at the current position, leaving the reader at its value"""
+        self._expect("{")
+        if self._peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            key = self._value()
+            if not isinstance(key, str):
+                raise ValueError("Malformed manifest JSON: object key is not a string")
+            self._expect(":")
+            yield key
+            if self._peek() == ",":
+                self._pos += 1
+            else:
+                self._expect("}")
+                return
+
+    def entries(self) -> Iterator[tuple[str, dict[str, Any]]]:
+        """Yield (path, entry dict) as stored, without validation"""
+        for key in self._members():
+            if key == "entries":
+                if self._peek() != "{":
+                    raise ValueError("Expected entries to be a dictionary")
+                for path in self._members():
+                    yield path, self._value()
+            elif key == "metadata":
+                self.metadata = self._value()
+            else:
+                self._value()
+
+    def records(self, trusted: bool = False) -> Iterator[tuple[str, dict[str, Any]]]:
+        """Yield (path, entry dict) for valid entries, checked like Manifest._from_data
+
+        Invalid entries are skipped with a warning. With trusted=True entries
+        are not validated one by one; instead entry_count and entries_hash are
+        checked against the metadata after the last entry, and a mismatch
+        raises ValueError (by then the entries have already been yielded).
+        """
+        from dsg.data.manifest import FileRef, LinkRef
+        entry_types = {"file": FileRef, "link": LinkRef}
+        hasher = EntriesHasher()
+        for path, record in self.entries():
+            entry_type = record.get("type") if isinstance(record, dict) else None
+            cls = entry_types.get(entry_type)
+            if cls is None:
+                logger.warning(f"Unknown entry type '{entry_type}' for path {path}")
+                continue
+            if trusted:
+                hasher.update(record)
+                yield path, record
+                continue
+            try:
+                entry = cls.model_validate(record)
+            except Exception as e:
+                logger.warning(f"Failed to validate {entry_type} entry for {path}: {e}")
+                continue
+            yield path, entry.__dict__
+
+        if trusted:
+            metadata = self.metadata or {}
+            version = metadata.get("entries_hash_version", LEGACY_VERSION)
+            if (metadata.get("entry_count") != hasher.count or version not in SUPPORTED_VERSIONS
+                    or metadata.get("entries_hash") != hasher.hexdigest(version)):
+                raise ValueError("Manifest entries do not match their metadata")
+
+    def items(self, trusted: bool = False) -> Iterator[tuple[str, Any]]:
+        """Yield (path, FileRef/LinkRef) for the entries records() yields"""
+        from dsg.data.manifest import FileRef, LinkRef
+        for path, record in self.records(trusted=trusted):
+            yield path, (FileRef if record["type"] == "file" else LinkRef)._view(record)
+
+
+def sorted_records(file_path: Path, prefix: str = "",
+                   run_entries: Optional[int] = None) -> Iterator[tuple[str, dict[str, Any]]]:
+    """Yield (path, entry dict) for entries whose path starts with prefix, in path order
+
+    At most run_entries (default SORT_RUN_ENTRIES) entries are held at once:
+    a JSON manifest with more is sorted in runs spilled to temporary files,
+    which are then merged. Entry dicts are as stored, without validation.
+    """
+    run_entries = run_entries or SORT_RUN_ENTRIES
+    with open_manifest_file(file_path) as stream:
+        if is_binary_manifest(stream.peek(len(MAGIC))):
+            compressed = file_path.suffix in (".lz4", ".gz")
+            with (ManifestIndex(stream.read()) if compressed else ManifestIndex.open(file_path)) as index:
+                for record in index.scan_prefix(prefix):
+                    yield record["path"], record
+            return
+
+        # Entries are buffered as their encoded run lines, a fraction of the size
+        # of the dicts. orjson returns bytes inside a larger working allocation,
+        # so each line is copied down to its size before it is kept.
+        with tempfile.TemporaryDirectory(prefix="dsg-sort-") as spill_dir:
+            runs: list[Path] = []
+            buffer: list[tuple[str, bytes]] = []
+            for path, entry_data in ManifestReader(stream).entries():
+                if not path.startswith(prefix):
+                    continue
+                buffer.append((path, bytes(memoryview(orjson.dumps((path, entry_data))))))
+                if len(buffer) >= run_entries:
+                    runs.append(_spill_run(buffer, Path(spill_dir) / f"run-{len(runs)}"))
+                    buffer = []
+            if not runs:
+                buffer.sort(key=itemgetter(0))
+                for _, line in buffer:
+                    yield tuple(orjson.loads(line))
+                return
+            runs.append(_spill_run(buffer, Path(spill_dir) / f"run-{len(runs)}"))
+            del buffer
+            yield from heapq.merge(*(_read_run(run) for run in runs), key=itemgetter(0))
+
+
+def _spill_run(buffer: list[tuple[str, bytes]], run_path: Path) -> Path:
+    buffer.sort(key=itemgetter(0))
+    with open(run_path, "wb", buffering=CHUNK_SIZE) as f:
+        for _, line in buffer:
+            f.write(line + b"\n")
+    return run_path
+
+
+def _read_run(run_path: Path) -> Iterator[tuple[str, dict[str, Any]]]:
+    with open(run_path, "rb", buffering=CHUNK_SIZE) as f:
+        for line in f:
+            path, entry_data = orjson.loads(line)
+            yield path, entry_data
+
+
+class ManifestWriter:
+    """Write a JSON manifest one entry at a time
+
+    The output is byte-for-byte what Manifest.to_json writes for the same
+    entries and metadata. entry_count and entries_hash cover the entries
+    written so far, so metadata can be built after the last entry.
+    """
+
+    def __init__(self, stream: BinaryIO):
+        self._stream = stream
+        self._hasher = EntriesHasher()
+        stream.write(b'{\n  "entries": {')
+
+    @property
+    def entry_count(self) -> int:
+        return self._hasher.count
+
+    @property
+    def entries_hash(self) -> str:
+        """Current-version entries_hash of the entries written so far"""
+        return self._hasher.hexdigest()
+
+    def write(self, record: Mapping[str, Any]) -> None:
+        """Append one entry, given as its model_dump() dict"""
+        separator = b",\n    " if self.entry_count else b"\n    "
+        self._hasher.update(record)
+        pretty = orjson.dumps(record, option=orjson.OPT_INDENT_2).replace(b"\n", b"\n    ")
+        self._stream.write(separator + orjson.dumps(record["path"]) + b": " + pretty)
+
+    def finish(self, metadata: Optional[Mapping[str, Any]] = None) -> None:
+        """Close the entries object and write metadata (if any); does not close the stream"""
+        self._stream.write(b"\n  }" if self.entry_count else b"}")
+        if metadata is not None:
+            pretty = orjson.dumps(metadata, option=orjson.OPT_INDENT_2).replace(b"\n", b"\n  ")
+            self._stream.write(b',\n  "metadata": ' + pretty)
+        self._stream.write(b"\n}")
+
+
+# done.
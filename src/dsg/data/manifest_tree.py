@@ -0,0 +1,141 @@
+# Author: PB & Claude
+# Maintainer: PB
+# Original date: 2026.10.16
+# License: (c) HRDAG, 2025, GPL-2 or newer
+#
+# ------
+# src/dsg/data/manifest_tree.py
+
+"""
+Per-directory digest tree over a manifest, for skipping identical subtrees.
+
+Each entry gets a comparison digest: xxh3_128 of its path plus exactly the
+fields FileRef/LinkRef.__eq__ looks at (the content hash when there is one,
+otherwise size and mtime; the target for links). Two entries with the same
+digest therefore compare equal. A directory's digest is the sum of the
+digests of every entry below it, so two manifests whose digests agree for a
+directory hold equal entries at the same paths throughout that subtree.
+
+Sums rather than nested hashes keep the tree cheap to build in one pass over
+the entries, and a changed entry moves the digest of every directory above it.
+
+compare_trees walks the trees of several manifests top-down and descends only
+into directories whose digests differ, so comparing manifests of a mostly
+unchanged repository touches the changed directories rather than every path.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator, Mapping, Sequence
+from typing import Any
+
+import xxhash
+
+from dsg.data.manifest_store import ManifestEntries
+
+
+def _parent(path: str) -> str:
+    cut = path.rfind("/")
+    return path[:cut] if cut > 0 else ""
+
+
+def _entry_key(entry: Any) -> bytes:
+    """Comparison key of an entry object (see ManifestEntries.comparison_keys)"""
+    if entry.type == "link":
+        return b"L" + entry.reference.encode()
+    if entry.hash:
+        return b"h" + entry.hash.encode()
+    return b"m" + f"{entry.filesize}\0{entry.mtime}".encode()
+
+
+def comparison_keys(entries: Mapping[str, Any]) -> Iterator[tuple[str, bytes]]:
+    """(path, comparison key) for every entry; equal keys mean the entries compare equal"""
+    if isinstance(entries, ManifestEntries):
+        return entries.comparison_keys()
+    return ((path, entry.path.encode() + b"\0" + _entry_key(entry)) for path, entry in entries.items())
+
+
+class DirectoryTree:
+    """Subtree digests, subdirectories and direct entries of every directory
+
+    The root directory is "". Only directories that contain entries (at any
+    depth) appear.
+    """
+
+    def __init__(self, entries: Mapping[str, Any]):
+        self.digests: dict[str, int] = {}
+        self.files: dict[str, list[str]] = {}
+        self.subdirs: dict[str, list[str]] = {}
+        files = self.files
+        digest_of = xxhash.xxh3_128_intdigest
+
+        # Entries come grouped by directory in practice (scans walk the tree),
+        # so sum each run of siblings and walk the ancestors once per run
+        current, listing, pending = None, None, 0
+        for path, key in comparison_keys(entries):
+            cut = path.rfind("/")
+            directory = path[:cut] if cut > 0 else ""
+            if directory != current:
+                if current is not None:
+                    self._add(current, pending)
+                current, pending = directory, 0
+                listing = files.get(directory)
+                if listing is None:
+                    listing = files[directory] = []
+            listing.append(path)
+            pending += digest_of(key)
+        if current is not None:
+            self._add(current, pending)
+
+    def _add(self, directory: str, digest: int) -> None:
+        """Add digest to directory and every ancestor, creating them as needed"""
+        digests, subdirs = self.digests, self.subdirs
+        while True:
+            known = digests.get(directory)
+            if known is None:
+                digests[directory] = digest
+                subdirs.setdefault(directory, [])
+                if directory:
+                    subdirs.setdefault(_parent(directory), []).append(directory)
+            else:
+                digests[directory] = known + digest
+            if not directory:
+                return
+            directory = _parent(directory)
+
+    def paths_under(self, directory: str) -> Iterator[str]:
+        """Every entry path in directory and below"""
+        stack = [directory]
+        while stack:
+            current = stack.pop()
+            yield from self.files.get(current, ())
+            stack.extend(self.subdirs.get(current, ()))
+
+
+def compare_trees(trees: Sequence[DirectoryTree]) -> tuple[list[str], list[str]]:
+    """Split all paths into (identical in every tree, needing a per-path comparison)
+
+    A directory whose digest is the same in every tree is skipped whole; its
+    paths are identical. Elsewhere the entries directly in the directory are
+    candidates, and subdirectories are examined in turn.
+    """
+    identical: list[str] = []
+    candidates: set[str] = set()
+    stack = [""]
+    seen = set(stack)
+    while stack:
+        directory = stack.pop()
+        digests = [tree.digests.get(directory) for tree in trees]
+        if digests[0] is not None and all(digest == digests[0] for digest in digests):
+            identical.extend(trees[0].paths_under(directory))
+            continue
+        for tree in trees:
+            candidates.update(tree.files.get(directory, ()))
+            for subdir in tree.subdirs.get(directory, ()):
+                if subdir not in seen:
+                    seen.add(subdir)
+                    stack.append(subdir)
+    return identical, list(candidates)
+
+
+# done.
@@ -19,7 +19,7 @@ This module provides abstractions for:
 from .client import ClientFilesystem
 from .remote import ZFSFilesystem, XFSFilesystem
 from .io_transports import LocalhostTransport, SSHTransport, create_transport
-from .transaction_factory import create_transaction, calculate_sync_plan
+from .transaction_factory import create_transaction, calculate_sync_plan, expected_transfer_hashes
 
 # Legacy ZFS operations (used by remote.py)
 from .snapshots import ZFSOperations, XFSOperations
@@ -57,6 +57,7 @@ __all__ = [
     'create_transport',
     'create_transaction',
     'calculate_sync_plan',
+    'expected_transfer_hashes',
     'ZFSOperations',
     'XFSOperations',
     # Legacy compatibility
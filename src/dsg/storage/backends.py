@@ -8,10 +8,14 @@
 
 """Core backend implementations for different storage systems."""
 
+import os
 import shutil
 import subprocess
 import re
 from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional
 
@@ -20,6 +24,7 @@ import paramiko
 from dsg.data.manifest import Manifest
 from dsg.core.protocols import FileOperations
 from dsg.system.execution import CommandExecutor as ce
+from .io_transports import get_global_connection_pool
 from .transports import LocalhostTransport
 from .snapshots import ZFSOperations
 from .utils import create_temp_file_list
@@ -33,6 +38,41 @@ except ImportError:
     ZFS_TEST_MOUNT_BASE = "/var/tmp/test"
 
 
+@dataclass(frozen=True)
+class FileProbe:
+    """Size, modification time and last bytes of a backend file, from one cheap round trip"""
+    size: int
+    mtime: float
+    tail: bytes
+
+
+# Bytes per read when streaming a file from a backend
+STREAM_CHUNK_SIZE = 1 << 20
+# Bytes requested ahead over SFTP: requests within a window are pipelined,
+# and at most one window is buffered
+SFTP_WINDOW_SIZE = 8 << 20
+
+
+@dataclass(frozen=True)
+class FileStream:
+    """An open backend file: its total size and the chunks of the requested byte range"""
+    size: int
+    chunks: Iterator[bytes]
+
+
+def _range_end(size: int, start: int, length: Optional[int]) -> int:
+    return size if length is None else min(size, start + length)
+
+
+def _read_chunks(f, remaining: int) -> Iterator[bytes]:
+    while remaining > 0:
+        chunk = f.read(min(STREAM_CHUNK_SIZE, remaining))
+        if not chunk:
+            break
+        remaining -= len(chunk)
+        yield chunk
+
+
 class Backend(ABC, FileOperations):
     """Base class for all repository backends
 
@@ -111,6 +151,26 @@ class Backend(ABC, FileOperations):
         """Check if a file exists in the backend."""
         raise NotImplementedError("file_exists() not implemented")
 
+    def probe_file(self, rel_path: str, tail_bytes: int) -> Optional[FileProbe]:
+        """Stat a file and read its last tail_bytes without fetching the whole file.
+
+        Returns None when the backend has no cheap way to do this; callers then
+        fall back to read_file(). Raises FileNotFoundError if the file is missing.
+        """
+        return None
+
+    @contextmanager
+    def open_stream(self, rel_path: str, start: int = 0, length: Optional[int] = None) -> Iterator[FileStream]:
+        """Open a file to stream bytes [start, start + length), or from start to the end.
+
+        This default reads the whole file with read_file(); backends override
+        it to read only the range, a chunk at a time. Raises FileNotFoundError
+        if the file is missing.
+        """
+        content = self.read_file(rel_path)
+        end = _range_end(len(content), start, length)
+        yield FileStream(len(content), iter([content[start:end]] if start < end else []))
+
     @abstractmethod
     def copy_file(self, source_path: Path, rel_dest_path: str) -> None:
         """Copy a file from local filesystem to the backend."""
@@ -201,6 +261,27 @@ class LocalhostBackend(Backend):
         """Check if a file exists in the local filesystem."""
         return (self.full_path / rel_path).is_file()
 
+    def probe_file(self, rel_path: str, tail_bytes: int) -> Optional[FileProbe]:
+        """Stat a local file and read its last tail_bytes."""
+        full_path = self.full_path / rel_path
+        if not full_path.is_file():
+            raise FileNotFoundError(f"File not found: {full_path}")
+        with open(full_path, 'rb') as f:
+            st = os.fstat(f.fileno())
+            f.seek(max(0, st.st_size - tail_bytes))
+            return FileProbe(st.st_size, st.st_mtime, f.read(tail_bytes))
+
+    @contextmanager
+    def open_stream(self, rel_path: str, start: int = 0, length: Optional[int] = None) -> Iterator[FileStream]:
+        """Open a local file to stream a byte range of it."""
+        full_path = self.full_path / rel_path
+        if not full_path.is_file():
+            raise FileNotFoundError(f"File not found: {full_path}")
+        with open(full_path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            f.seek(start)
+            yield FileStream(size, _read_chunks(f, _range_end(size, start, length) - start))
+
     def delete_file(self, rel_path: str) -> None:
         """Delete a file from the local filesystem."""
         full_path = self.full_path / rel_path
@@ -249,7 +330,7 @@ class LocalhostBackend(Backend):
                 progress_callback("no_files")
             return
 
-        manifest = Manifest.from_json(manifest_file)
+        manifest = Manifest.from_json(manifest_file, trusted=True)
 
         # Calculate total files and size for progress reporting
         total_files = len(manifest.entries)
@@ -566,6 +647,64 @@ class SSHBackend(Backend):
         exit_code, stdout, stderr = self._execute_ssh_command(f"test -f '{remote_path}'")
         return exit_code == 0
 
+    def probe_file(self, rel_path: str, tail_bytes: int) -> Optional[FileProbe]:
+        """Stat a remote file and read its last tail_bytes over one SFTP session."""
+        remote_path = f"{self.full_repo_path}/{rel_path}"
+        try:
+            with self._create_ssh_client() as client:
+                sftp = client.open_sftp()
+                try:
+                    with sftp.file(remote_path, 'rb') as remote_file:
+                        st = remote_file.stat()
+                        remote_file.seek(max(0, st.st_size - tail_bytes))
+                        return FileProbe(st.st_size, float(st.st_mtime), remote_file.read(tail_bytes))
+                except FileNotFoundError:
+                    raise FileNotFoundError(f"File not found: {remote_path}")
+                finally:
+                    sftp.close()
+        except Exception as e:
+            if isinstance(e, FileNotFoundError):
+                raise
+            raise ValueError(f"Failed to probe file {rel_path}: {e}")
+
+    @contextmanager
+    def _pooled_sftp(self) -> Iterator[paramiko.SFTPClient]:
+        """An SFTP session on a pooled SSH connection, shared with SSHTransport"""
+        pool = get_global_connection_pool()
+        host_key = f"{self.host}:22"
+        client = pool.get_connection(host_key, self._create_ssh_client)
+        try:
+            sftp = client.open_sftp()
+            try:
+                yield sftp
+            finally:
+                sftp.close()
+        finally:
+            pool.return_connection(host_key, client)
+
+    @staticmethod
+    def _sftp_chunks(remote_file: paramiko.SFTPFile, start: int, end: int) -> Iterator[bytes]:
+        """Read [start, end) a window at a time, with each window's requests in flight together"""
+        request_size = remote_file.MAX_REQUEST_SIZE
+        while start < end:
+            window_end = min(end, start + SFTP_WINDOW_SIZE)
+            yield from remote_file.readv([(offset, min(request_size, window_end - offset))
+                                          for offset in range(start, window_end, request_size)])
+            start = window_end
+
+    @contextmanager
+    def open_stream(self, rel_path: str, start: int = 0, length: Optional[int] = None) -> Iterator[FileStream]:
+        """Open a remote file over a pooled SFTP session to stream a byte range of it."""
+        remote_path = f"{self.full_repo_path}/{rel_path}"
+        with self._pooled_sftp() as sftp:
+            try:
+                remote_file = sftp.file(remote_path, 'rb')
+            except FileNotFoundError:
+                raise FileNotFoundError(f"File not found: {remote_path}")
+            with remote_file:
+                size = remote_file.stat().st_size
+                yield FileStream(size, self._sftp_chunks(remote_file, start, _range_end(size, start, length)))
+
     def copy_file(self, source_path: Path, rel_dest_path: str) -> None:
         """Copy a file from local filesystem to the SSH repository using rsync."""
         if not source_path.exists():
@@ -620,7 +759,7 @@ class SSHBackend(Backend):
             return None, 0, 0
 
         try:
-            manifest = Manifest.from_json(manifest_file)
+            manifest = Manifest.from_json(manifest_file, trusted=True)
         except Exception as e:
             raise ValueError(f"Failed to parse manifest: {e}")
 
@@ -13,13 +13,19 @@ Adapted from the excellent ClientTransaction implementation, this provides
 atomic file operations using the .pending-{transaction_id} staging pattern.
 """
 
+import os
 import shutil
 import logging
+import threading
 from datetime import datetime, UTC
 from pathlib import Path
-from typing import Iterator
+from typing import Iterator, Optional
 
+from dsg.core.hash_cache import HashCache, StatKey
 from dsg.core.transaction_coordinator import ContentStream, TempFile
+from dsg.storage.delta import BlockSignatures, DeltaContentStream
+from dsg.storage.packing import PackContentStream
+from dsg.storage.zerocopy import copy_file, place_file
 from dsg.system.exceptions import TransactionRollbackError
 
 
@@ -29,6 +35,9 @@ class FileContentStream:
     def __init__(self, file_path: Path):
         self.file_path = file_path
         self._size = file_path.stat().st_size if file_path.exists() else 0
+        # (stat key, hash) the scan recorded for the file, if any; lets
+        # zero-copy transports skip hashing an unchanged file
+        self.scanned: Optional[tuple[StatKey, str]] = None
     
     def read(self, chunk_size: int = 64*1024) -> Iterator[bytes]:
         with open(self.file_path, 'rb') as f:
@@ -48,6 +57,15 @@ class ClientFilesystem:
         self.staging_dir = None
         self.backup_dir = project_root / ".dsg" / "backup"
         self.transaction_id = None
+        self._hash_cache: Optional[HashCache] = None
+        self._hash_cache_lock = threading.Lock()
+    
+    def _scanned(self, rel_path: str) -> Optional[tuple[StatKey, str]]:
+        """What the scan recorded for a file in the hash cache, loaded on first use"""
+        with self._hash_cache_lock:
+            if self._hash_cache is None:
+                self._hash_cache = HashCache.for_project(self.project_root) or HashCache(self.project_root)
+        return self._hash_cache.recorded(rel_path)
     
     def begin_transaction(self, transaction_id: str) -> None:
         """Initialize client transaction with isolated staging"""
@@ -74,13 +92,23 @@ class ClientFilesystem:
     def send_file(self, rel_path: str) -> ContentStream:
         """Provide file content as stream for upload"""
         source_path = self.project_root / rel_path
-        return FileContentStream(source_path)
+        stream = FileContentStream(source_path)
+        stream.scanned = self._scanned(rel_path)
+        return stream
+    
+    def send_pack(self, rel_paths: list[str]) -> PackContentStream:
+        """Provide many small files as one tar stream for packed upload"""
+        return PackContentStream(self.project_root, rel_paths)
+    
+    def send_delta(self, rel_path: str, signatures: BlockSignatures) -> DeltaContentStream:
+        """Provide a file as a delta against the remote copy described by signatures"""
+        return DeltaContentStream(self.project_root / rel_path, signatures)
     
     def recv_file(self, rel_path: str, temp_file: TempFile) -> None:
         """Stage file from transport temp to client staging"""
         staged_path = self.staging_dir / rel_path
         staged_path.parent.mkdir(parents=True, exist_ok=True)
-        shutil.move(str(temp_file.path), staged_path)
+        place_file(temp_file, staged_path)
     
     def delete_file(self, rel_path: str) -> None:
         """Stage file deletion (mark for removal on commit)"""
@@ -90,6 +118,18 @@ class ClientFilesystem:
         deletion_marker.parent.mkdir(parents=True, exist_ok=True)
         deletion_marker.write_text(f"delete:{rel_path}")
     
+    def move_file(self, old_path: str, new_path: str) -> None:
+        """Stage a rename: hardlink (or clone) old into staging as new, delete old"""
+        source_path = self.project_root / old_path
+        staged_path = self.staging_dir / new_path
+        staged_path.parent.mkdir(parents=True, exist_ok=True)
+        staged_path.unlink(missing_ok=True)
+        try:
+            os.link(source_path, staged_path)
+        except OSError:
+            copy_file(source_path, staged_path)
+        self.delete_file(old_path)
+    
     def create_symlink(self, rel_path: str, target: str) -> None:
         """Stage symlink creation"""
         if not self.staging_dir:
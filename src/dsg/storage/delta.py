@@ -0,0 +1,310 @@
+# Author: PB & Claude
+# Maintainer: PB
+# Original date: 2026.10.16
+# License: (c) HRDAG, 2025, GPL-2 or newer
+#
+# ------
+# src/dsg/storage/delta.py
+
+"""
+Rsync-style delta transfers for large modified files.
+
+A large file that changed in one small region should not cost a full upload.
+The receiver describes the copy it already has (the basis) as a list of
+fixed-size block signatures: a weak rolling checksum (Adler-32) plus an xxh3
+digest per block. DeltaContentStream slides a window over the new file, looks
+each window up by weak checksum, reads and digests the window only when that
+finds candidates, and emits only block references and the literal bytes
+between them. apply_delta rebuilds the new
+file from the basis and that instruction stream.
+
+The delta is an ordinary ContentStream, so any transport can carry it. While
+scanning, the stream also computes the xxh3 of the new file, which the
+receiver's reconstruction must reproduce.
+
+Wire format (big-endian):
+    header   MAGIC, block size (u32), new file size (u64)
+    b'C'     first basis block (u64), block count (u32)
+    b'L'     literal length (u32), literal bytes
+    b'E'     end of delta
+"""
+
+import mmap
+import struct
+import zlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterator, Optional
+
+import xxhash
+
+MAGIC = b"DSGDELT1"
+_HEADER = struct.Struct(">8sIQ")
+_COPY = struct.Struct(">cQI")
+_LITERAL = struct.Struct(">cI")
+_END = b"E"
+
+# Literal runs are flushed at this size so the stream stays chunked
+_MAX_LITERAL = 1024 * 1024
+
+# Adler-32 modulus; both halves of the weak checksum are reduced by it
+ADLER_MOD = 65521
+
+
+def weak_checksum(block) -> tuple[int, int]:
+    """Return the (a, b) halves of the Adler-32 rolling checksum of block"""
+    key = zlib.adler32(block)
+    return key & 0xffff, key >> 16
+
+
+def _weak_key(block) -> int:
+    return zlib.adler32(block)
+
+
+@dataclass
+class BlockSignatures:
+    """Per-block signatures of a basis file, indexed by weak checksum"""
+    block_size: int
+    basis_size: int
+    # Adler-32 (b << 16 | a) -> {xxh3 intdigest: block index}
+    blocks: dict[int, dict[int, int]] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return sum(len(strong) for strong in self.blocks.values())
+
+    def lookup(self, weak: int, block) -> Optional[int]:
+        """Return the basis block index matching block, if any"""
+        candidates = self.blocks.get(weak)
+        if not candidates:
+            return None
+        return candidates.get(xxhash.xxh3_64_intdigest(block))
+
+
+def compute_signatures(basis_path: Path, block_size: int) -> BlockSignatures:
+    """Read basis_path once and build its block signatures"""
+    signatures = BlockSignatures(block_size=block_size, basis_size=0)
+    index = 0
+    with open(basis_path, 'rb') as f:
+        while block := f.read(block_size):
+            strong = xxhash.xxh3_64_intdigest(block)
+            signatures.blocks.setdefault(_weak_key(block), {}).setdefault(strong, index)
+            signatures.basis_size += len(block)
+            index += 1
+    return signatures
+
+
+def _roll_to_candidate(data, pos: int, stop: int, block_size: int, a: int, b: int,
+                       blocks: dict) -> tuple[int, int, int]:
+    """Roll the weak checksum forward from pos to the first window with candidates, or to stop.
+
+    Returns (pos, a, b) for that window. Windows are never read whole here.
+    """
+    mod = ADLER_MOD
+    leaving = data[pos:stop]
+    entering = data[pos + block_size:stop + block_size]
+    for step, (out, new) in enumerate(zip(leaving, entering, strict=True), 1):
+        a = (a - out + new) % mod
+        b = (b - block_size * out + a - 1) % mod
+        if (b << 16) | a in blocks:
+            return pos + step, a, b
+    return stop, a, b
+
+
+class DeltaContentStream:
+    """
+    ContentStream of the delta that turns the signed basis into source_path.
+
+    After a complete read(): size and content_hash describe the encoded delta
+    (what the transport carries), source_size and source_hash describe the new
+    file, and literal_bytes counts the file data that had to be sent. All are
+    None until the stream has been read once; a retry recomputes them.
+    """
+
+    def __init__(self, source_path: Path, signatures: BlockSignatures):
+        self.file_path = source_path
+        self.signatures = signatures
+        self.content_hash: Optional[str] = None
+        self.source_hash: Optional[str] = None
+        self.source_size: Optional[int] = None
+        self.literal_bytes: Optional[int] = None
+        self._size: Optional[int] = None
+
+    def read(self, chunk_size: int = 64*1024) -> Iterator[bytes]:
+        self._size = None
+        self.content_hash = None
+        self.source_hash = None
+        self.literal_bytes = None
+        delta_digest = xxhash.xxh3_64()
+        total = 0
+        literal_total = 0
+
+        for chunk in self._encode():
+            delta_digest.update(chunk)
+            total += len(chunk)
+            if chunk[:1] == b"L":
+                literal_total += len(chunk) - _LITERAL.size
+            yield chunk
+
+        self.content_hash = delta_digest.hexdigest()
+        self.literal_bytes = literal_total
+        self._size = total
+
+    def _encode(self) -> Iterator[bytes]:
+        sigs = self.signatures
+        block_size = sigs.block_size
+        with open(self.file_path, 'rb') as f:
+            n = self.source_size = f.seek(0, 2)
+            yield _HEADER.pack(MAGIC, block_size, n)
+            if n == 0:
+                self.source_hash = xxhash.xxh3_64().hexdigest()
+                yield _END
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                self.source_hash = xxhash.xxh3_64(data).hexdigest()
+                yield from self._match(data, n, block_size)
+        yield _END
+
+    def _match(self, data, n: int, block_size: int) -> Iterator[bytes]:
+        """Emit copy and literal records for data against the signatures"""
+        sigs = self.signatures
+        blocks = sigs.blocks
+        mod = ADLER_MOD
+        last_block = (sigs.basis_size - 1) // block_size if sigs.basis_size else -1
+        tail_size = sigs.basis_size - last_block * block_size if sigs.basis_size else 0
+        run_start, run_count = -1, 0
+        literal_start = pos = 0
+        a = b = -1
+
+        def flush_run() -> Iterator[bytes]:
+            nonlocal run_start, run_count
+            if run_count:
+                yield _COPY.pack(b"C", run_start, run_count)
+            run_start, run_count = -1, 0
+
+        def flush_literal(end: int) -> Iterator[bytes]:
+            for start in range(literal_start, end, _MAX_LITERAL):
+                stop = min(start + _MAX_LITERAL, end)
+                yield _LITERAL.pack(b"L", stop - start) + data[start:stop]
+
+        while pos + block_size <= n:
+            if a < 0:
+                key = zlib.adler32(data[pos:pos + block_size])
+                a, b = key & 0xffff, key >> 16
+            # Most windows have no weak candidates: roll past them without
+            # reading the block, stopping where a literal run must be flushed
+            stop = min(n - block_size, literal_start + _MAX_LITERAL)
+            if pos < stop and (b << 16) | a not in blocks:
+                pos, a, b = _roll_to_candidate(data, pos, stop, block_size, a, b, blocks)
+            candidates = blocks.get((b << 16) | a)
+            index = None
+            if candidates:
+                index = candidates.get(xxhash.xxh3_64_intdigest(data[pos:pos + block_size]))
+            if index is not None and index * block_size + block_size <= sigs.basis_size:
+                if literal_start < pos:
+                    yield from flush_run()
+                    yield from flush_literal(pos)
+                if run_count and index == run_start + run_count:
+                    run_count += 1
+                else:
+                    yield from flush_run()
+                    run_start, run_count = index, 1
+                pos += block_size
+                literal_start = pos
+                a = b = -1
+                continue
+            if pos - literal_start >= _MAX_LITERAL:
+                yield from flush_run()
+                yield from flush_literal(pos)
+                literal_start = pos
+            if pos + block_size < n:
+                out = data[pos]
+                a = (a - out + data[pos + block_size]) % mod
+                b = (b - block_size * out + a - 1) % mod
+            pos += 1
+
+        # A short final basis block can still match the end of the new file
+        if 0 < tail_size < block_size and n - literal_start >= tail_size:
+            tail_start = n - tail_size
+            tail = data[tail_start:n]
+            if sigs.lookup(_weak_key(tail), tail) == last_block:
+                if literal_start < tail_start:
+                    yield from flush_run()
+                    yield from flush_literal(tail_start)
+                if run_count and last_block == run_start + run_count:
+                    run_count += 1
+                else:
+                    yield from flush_run()
+                    run_start, run_count = last_block, 1
+                literal_start = n
+
+        yield from flush_run()
+        yield from flush_literal(n)
+
+    @property
+    def size(self) -> Optional[int]:
+        return self._size
+
+
+def apply_delta(delta_path: Path, basis_path: Path, dest_path: Path) -> tuple[str, int]:
+    """
+    Rebuild the new file at dest_path from basis_path and a delta.
+
+    dest_path must not be basis_path. Returns the xxh3 hex digest and size of
+    what was written.
+
+    Raises:
+        ValueError: If the delta is malformed or refers past the end of the basis
+    """
+    digest = xxhash.xxh3_64()
+    written = 0
+    with open(delta_path, 'rb') as delta, open(dest_path, 'wb') as out:
+        header = delta.read(_HEADER.size)
+        if len(header) != _HEADER.size:
+            raise ValueError("Truncated delta header")
+        magic, block_size, expected_size = _HEADER.unpack(header)
+        if magic != MAGIC or block_size <= 0:
+            raise ValueError(f"Not a delta stream: {magic!r}")
+
+        with open(basis_path, 'rb') as basis:
+            basis_size = basis.seek(0, 2)
+            while True:
+                op = delta.read(1)
+                if op == _END:
+                    break
+                if op == b"C":
+                    first, count = struct.unpack(">QI", _read_exact(delta, _COPY.size - 1))
+                    offset = first * block_size
+                    length = min(count * block_size, basis_size - offset)
+                    if length <= 0:
+                        raise ValueError(f"Delta copies block {first} beyond end of basis")
+                    basis.seek(offset)
+                    while length > 0:
+                        chunk = basis.read(min(length, _MAX_LITERAL))
+                        if not chunk:
+                            raise ValueError("Basis file shrank while applying delta")
+                        out.write(chunk)
+                        digest.update(chunk)
+                        written += len(chunk)
+                        length -= len(chunk)
+                elif op == b"L":
+                    (length,) = struct.unpack(">I", _read_exact(delta, _LITERAL.size - 1))
+                    chunk = _read_exact(delta, length)
+                    out.write(chunk)
+                    digest.update(chunk)
+                    written += length
+                else:
+                    raise ValueError(f"Unknown delta record {op!r}")
+
+    if written != expected_size:
+        raise ValueError(f"Delta rebuilt {written} bytes, expected {expected_size}")
+    return digest.hexdigest(), written
+
+
+def _read_exact(f, size: int) -> bytes:
+    data = f.read(size)
+    if len(data) != size:
+        raise ValueError("Truncated delta stream")
+    return data
+
+
+# done.
@@ -14,19 +14,40 @@ streams to temporary files for staging by filesystem implementations.
 
 Phase 3 enhancements: SSH connection pooling, streaming optimization, 
 performance monitoring, and production-grade reliability.
+
+Every transfer computes the xxh3 digest of the chunks it streams and records
+it (with the byte count) on the returned temp file, so callers can verify
+content and reuse the hash without reading the file again.
+
+LocalhostTransport does not copy file-backed streams by default when the scan
+recorded the source and it is unchanged since: it returns a BorrowedFile
+pointing at the source, carrying the hash the scan recorded, and the receiving
+filesystem copies it into place with a reflink or in-kernel copy (see
+storage/zerocopy.py). Other streams are copied and hashed in transit.
+
+Both transports may be called from several threads at once (see
+Transaction.transfer_workers). SSHTransport gives each concurrent transfer its
+own SFTP channel, multiplexed over the one pooled SSH connection, so per-file
+open/close round trips overlap instead of queueing.
 """
 
+import stat
 import uuid
 import tempfile
 import logging
 import time
 import threading
 from collections import defaultdict
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from dataclasses import dataclass
 
+import xxhash
+
+from dsg.core.hash_cache import stat_key
 from dsg.core.transaction_coordinator import ContentStream, TempFile
+from dsg.storage.zerocopy import BorrowedFile
 from dsg.system.exceptions import TransportError, NetworkError
 from dsg.core.retry import retry_network_operation
 
@@ -39,6 +60,9 @@ class TransferMetrics:
     chunk_count: int = 0
     retry_count: int = 0
     connection_time: float = 0.0
+    # Files sent as deltas, and file bytes they kept off the wire
+    delta_files: int = 0
+    delta_bytes_saved: int = 0
     
     @property
     def transfer_rate(self) -> float:
@@ -53,6 +77,17 @@ class TransferMetrics:
         if self.chunk_count > 0:
             return self.bytes_transferred / self.chunk_count
         return 0.0
+    
+    def record(self, bytes_transferred: int, transfer_time: float, chunk_count: int) -> None:
+        """Add one completed transfer to the totals"""
+        self.bytes_transferred += bytes_transferred
+        self.transfer_time += transfer_time
+        self.chunk_count += chunk_count
+    
+    def record_delta(self, file_size: int, wire_bytes: int) -> None:
+        """Count one delta transfer of a file_size file that cost wire_bytes"""
+        self.delta_files += 1
+        self.delta_bytes_saved += max(0, file_size - wire_bytes)
 
 
 class ConnectionPool:
@@ -90,7 +125,7 @@ class ConnectionPool:
             # Try to reuse existing connection
             if pool:
                 connection = pool.pop(0)
-                logging.debug(f"Reusing pooled connection for {host_key}")
+                logging.debug("Reusing pooled connection for %s", host_key)
                 return connection
             
             # Create new connection if under limit
@@ -127,7 +162,7 @@ class ConnectionPool:
             pool = self._pools[host_key]
             if len(pool) < self.max_connections:
                 pool.append(connection)
-                logging.debug(f"Returned connection to pool for {host_key}")
+                logging.debug("Returned connection to pool for %s", host_key)
             else:
                 # Pool is full, close connection
                 try:
@@ -162,6 +197,9 @@ class TempFileImpl:
         self.temp_dir = temp_dir
         self.path = temp_dir / f"transfer-{uuid.uuid4().hex[:8]}"
         self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Filled in by the transport once the stream has been written
+        self.content_hash: Optional[str] = None
+        self.size: Optional[int] = None
     
     def cleanup(self) -> None:
         """Remove temporary file"""
@@ -178,12 +216,16 @@ class TempFileImpl:
 class LocalhostTransport:
     """Local filesystem transport with performance monitoring"""
     
-    def __init__(self, temp_dir: Path = None, chunk_size: int = 64*1024):
+    def __init__(self, temp_dir: Path = None, chunk_size: int = 64*1024,
+                 zero_copy: bool = True):
         if temp_dir is None:
             temp_dir = Path(tempfile.gettempdir()) / "dsg-transfers"
         self.temp_dir = temp_dir
         self.chunk_size = chunk_size
+        # Hand receivers the source file itself instead of a streamed copy
+        self.zero_copy = zero_copy
         self.metrics = TransferMetrics()
+        self._metrics_lock = threading.Lock()
     
     def begin_session(self) -> None:
         """Initialize transport session"""
@@ -200,6 +242,9 @@ class LocalhostTransport:
                 f"{self.metrics.transfer_rate:.1f} bytes/sec, "
                 f"{self.metrics.chunk_count} chunks"
             )
+        if self.metrics.delta_files:
+            logging.info(f"Delta transfers: {self.metrics.delta_files} files, "
+                         f"{self.metrics.delta_bytes_saved} bytes saved")
         
         # Clean up any remaining temp files
         if self.temp_dir.exists():
@@ -216,15 +261,22 @@ class LocalhostTransport:
     
     def transfer_to_remote(self, content_stream: ContentStream) -> TempFile:
         """Create temp file from stream with performance monitoring"""
+        if self.zero_copy:
+            borrowed = self._borrow_source(content_stream)
+            if borrowed is not None:
+                return borrowed
+        
         start_time = time.time()
         temp_file = TempFileImpl(self.temp_dir)
         bytes_written = 0
         chunk_count = 0
+        digest = xxhash.xxh3_64()
         
         try:
             with open(temp_file.path, 'wb') as f:
                 for chunk in content_stream.read(self.chunk_size):
                     f.write(chunk)
+                    digest.update(chunk)
                     bytes_written += len(chunk)
                     chunk_count += 1
                     
@@ -232,18 +284,16 @@ class LocalhostTransport:
                     if chunk_count % 100 == 0:
                         elapsed = time.time() - start_time
                         rate = bytes_written / elapsed if elapsed > 0 else 0
-                        logging.debug(f"Transfer progress: {bytes_written} bytes, {rate:.1f} bytes/sec")
+                        logging.debug("Transfer progress: %d bytes, %.1f bytes/sec", bytes_written, rate)
             
             # Update metrics
             transfer_time = time.time() - start_time
-            self.metrics.bytes_transferred += bytes_written
-            self.metrics.transfer_time += transfer_time
-            self.metrics.chunk_count += chunk_count
+            with self._metrics_lock:
+                self.metrics.record(bytes_written, transfer_time, chunk_count)
+            temp_file.content_hash = digest.hexdigest()
+            temp_file.size = bytes_written
             
-            logging.debug(
-                f"Localhost transfer complete: {bytes_written} bytes in {transfer_time:.3f}s "
-                f"({bytes_written/transfer_time:.1f} bytes/sec)"
-            )
+            logging.debug("Localhost transfer complete: %d bytes in %.3fs", bytes_written, transfer_time)
             
             return temp_file
             
@@ -259,6 +309,28 @@ class LocalhostTransport:
     def transfer_to_local(self, content_stream: ContentStream) -> TempFile:
         """Same as transfer_to_remote for localhost"""
         return self.transfer_to_remote(content_stream)
+    
+    def _borrow_source(self, content_stream: ContentStream) -> Optional[BorrowedFile]:
+        """Return a BorrowedFile for a local regular file unchanged since the scan recorded it"""
+        source_path = getattr(content_stream, 'file_path', None)
+        scanned = getattr(content_stream, 'scanned', None)
+        if not isinstance(source_path, Path) or scanned is None:
+            return None
+        try:
+            st = source_path.stat()
+        except OSError:
+            return None
+        if not stat.S_ISREG(st.st_mode):
+            return None
+        scanned_stat, scanned_hash = scanned
+        if stat_key(st) != tuple(scanned_stat):
+            logging.debug("%s changed since it was scanned; streaming it", source_path)
+            return None
+        
+        with self._metrics_lock:
+            self.metrics.record(st.st_size, 0.0, 0)
+        logging.debug("Localhost zero-copy transfer of %s (%d bytes)", source_path, st.st_size)
+        return BorrowedFile(source_path, st.st_size, source_stat=stat_key(st), content_hash=scanned_hash)
 
 
 class RemoteTempFile:
@@ -272,12 +344,15 @@ class RemoteTempFile:
         self.path = local_temp_dir / f"remote-ref-{uuid.uuid4().hex[:8]}"
         # Store remote path info for cleanup
         self._remote_path = remote_path
+        # Filled in by SSHTransport once the upload has been written
+        self.content_hash: Optional[str] = None
+        self.size: Optional[int] = None
     
     def cleanup(self) -> None:
         """Remove remote temporary file"""
         try:
             self.sftp_client.remove(self._remote_path)
-            logging.debug(f"Cleaned up remote temp file: {self._remote_path}")
+            logging.debug("Cleaned up remote temp file: %s", self._remote_path)
         except Exception as e:
             logging.warning(f"Failed to cleanup remote temp file {self._remote_path}: {e}")
         
@@ -292,7 +367,8 @@ class RemoteTempFile:
 class SSHTransport:
     """Production SSH transport with connection pooling and SFTP streaming"""
     
-    def __init__(self, ssh_config: dict, temp_dir: Path = None, chunk_size: int = 64*1024):
+    def __init__(self, ssh_config: dict, temp_dir: Path = None, chunk_size: int = 64*1024,
+                 max_channels: int = 4):
         self.ssh_config = ssh_config
         self.host = ssh_config.get('hostname', ssh_config.get('host', 'unknown'))
         self.chunk_size = chunk_size
@@ -306,6 +382,13 @@ class SSHTransport:
         self.sftp_client = None
         self.host_key = f"{self.host}:{ssh_config.get('port', 22)}"
         self.metrics = TransferMetrics()
+        self._metrics_lock = threading.Lock()
+        
+        # SFTP channels on ssh_client; sftp_client is the first of them
+        self.max_channels = max(1, max_channels)
+        self._channels: list = []
+        self._idle_channels: list = []
+        self._channel_cond = threading.Condition()
         
         # Remote temp directory
         self.remote_temp_dir = f"/tmp/dsg-transfers-{uuid.uuid4().hex[:8]}"
@@ -350,6 +433,8 @@ class SSHTransport:
             
             # Create SFTP client
             self.sftp_client = self.ssh_client.open_sftp()
+            self._channels = [self.sftp_client]
+            self._idle_channels = [self.sftp_client]
             
             # Set up local and remote temp directories
             self.temp_dir.mkdir(parents=True, exist_ok=True)
@@ -380,6 +465,9 @@ class SSHTransport:
                     f"{self.metrics.transfer_rate:.1f} bytes/sec, "
                     f"{self.metrics.retry_count} retries"
                 )
+            if self.metrics.delta_files:
+                logging.info(f"Delta transfers: {self.metrics.delta_files} files, "
+                             f"{self.metrics.delta_bytes_saved} bytes saved")
             
             # Clean up remote temp directory
             if self.sftp_client and self.remote_temp_dir:
@@ -397,7 +485,15 @@ class SSHTransport:
                 except Exception as e:
                     logging.debug(f"Remote temp cleanup: {e}")
             
-            # Close SFTP client
+            # Close extra SFTP channels, then the primary SFTP client
+            for channel in self._channels:
+                if channel is not self.sftp_client:
+                    try:
+                        channel.close()
+                    except Exception:
+                        pass
+            self._channels = []
+            self._idle_channels = []
             if self.sftp_client:
                 self.sftp_client.close()
                 self.sftp_client = None
@@ -423,6 +519,36 @@ class SSHTransport:
         except Exception as e:
             logging.error(f"Error during SSH session cleanup: {e}")
     
+    @contextmanager
+    def _sftp_channel(self):
+        """
+        Check out an SFTP channel for one transfer.
+
+        Opens up to max_channels channels on the session's SSH connection and
+        blocks when all of them are busy.
+        """
+        if not self._channels:
+            # Session set up without channel bookkeeping; share the one client
+            yield self.sftp_client
+            return
+        
+        with self._channel_cond:
+            while not self._idle_channels and len(self._channels) >= self.max_channels:
+                self._channel_cond.wait()
+            if self._idle_channels:
+                channel = self._idle_channels.pop()
+            else:
+                channel = self.ssh_client.open_sftp()
+                self._channels.append(channel)
+                logging.debug("Opened SFTP channel %d/%d to %s",
+                              len(self._channels), self.max_channels, self.host_key)
+        try:
+            yield channel
+        finally:
+            with self._channel_cond:
+                self._idle_channels.append(channel)
+                self._channel_cond.notify()
+    
     def transfer_to_remote(self, content_stream: ContentStream) -> TempFile:
         """Stream content to remote system via SFTP"""
         if not self.sftp_client:
@@ -435,11 +561,16 @@ class SSHTransport:
         
         def do_transfer():
             nonlocal bytes_transferred, chunk_count
+            # Restart counters and digest on retry; the stream is re-read from the start
+            bytes_transferred = 0
+            chunk_count = 0
+            digest = xxhash.xxh3_64()
             
             # Stream directly to remote file via SFTP
-            with self.sftp_client.open(remote_temp_path, 'wb') as remote_file:
+            with self._sftp_channel() as sftp, sftp.open(remote_temp_path, 'wb') as remote_file:
                 for chunk in content_stream.read(self.chunk_size):
                     remote_file.write(chunk)
+                    digest.update(chunk)
                     bytes_transferred += len(chunk)
                     chunk_count += 1
                     
@@ -447,9 +578,12 @@ class SSHTransport:
                     if chunk_count % 200 == 0:
                         elapsed = time.time() - start_time
                         rate = bytes_transferred / elapsed if elapsed > 0 else 0
-                        logging.debug(f"SFTP upload progress: {bytes_transferred} bytes, {rate:.1f} bytes/sec")
+                        logging.debug("SFTP upload progress: %d bytes, %.1f bytes/sec", bytes_transferred, rate)
             
-            return RemoteTempFile(self.sftp_client, remote_temp_path, self.temp_dir)
+            remote_temp = RemoteTempFile(self.sftp_client, remote_temp_path, self.temp_dir)
+            remote_temp.content_hash = digest.hexdigest()
+            remote_temp.size = bytes_transferred
+            return remote_temp
         
         try:
             # Use retry mechanism for network resilience
@@ -457,14 +591,10 @@ class SSHTransport:
             
             # Update metrics
             transfer_time = time.time() - start_time
-            self.metrics.bytes_transferred += bytes_transferred
-            self.metrics.transfer_time += transfer_time
-            self.metrics.chunk_count += chunk_count
+            with self._metrics_lock:
+                self.metrics.record(bytes_transferred, transfer_time, chunk_count)
             
-            logging.info(
-                f"SFTP upload complete: {bytes_transferred} bytes in {transfer_time:.3f}s "
-                f"({bytes_transferred/transfer_time:.1f} bytes/sec)"
-            )
+            logging.debug("SFTP upload complete: %d bytes in %.3fs", bytes_transferred, transfer_time)
             
             return temp_file
             
@@ -489,12 +619,16 @@ class SSHTransport:
         
         def do_transfer():
             nonlocal bytes_transferred, chunk_count
+            bytes_transferred = 0
+            chunk_count = 0
+            digest = xxhash.xxh3_64()
             
             # For download, the content_stream is typically from remote filesystem
             # We stream it to a local temp file
             with open(temp_file.path, 'wb') as local_file:
                 for chunk in content_stream.read(self.chunk_size):
                     local_file.write(chunk)
+                    digest.update(chunk)
                     bytes_transferred += len(chunk)
                     chunk_count += 1
                     
@@ -502,8 +636,10 @@ class SSHTransport:
                     if chunk_count % 200 == 0:
                         elapsed = time.time() - start_time
                         rate = bytes_transferred / elapsed if elapsed > 0 else 0
-                        logging.debug(f"SFTP download progress: {bytes_transferred} bytes, {rate:.1f} bytes/sec")
+                        logging.debug("SFTP download progress: %d bytes, %.1f bytes/sec", bytes_transferred, rate)
             
+            temp_file.content_hash = digest.hexdigest()
+            temp_file.size = bytes_transferred
             return temp_file
         
         try:
@@ -512,14 +648,10 @@ class SSHTransport:
             
             # Update metrics
             transfer_time = time.time() - start_time
-            self.metrics.bytes_transferred += bytes_transferred
-            self.metrics.transfer_time += transfer_time
-            self.metrics.chunk_count += chunk_count
+            with self._metrics_lock:
+                self.metrics.record(bytes_transferred, transfer_time, chunk_count)
             
-            logging.info(
-                f"SFTP download complete: {bytes_transferred} bytes in {transfer_time:.3f}s "
-                f"({bytes_transferred/transfer_time:.1f} bytes/sec)"
-            )
+            logging.debug("SFTP download complete: %d bytes in %.3fs", bytes_transferred, transfer_time)
             
             return result_temp_file
             
@@ -13,12 +13,16 @@ This wraps the existing snapshot operations to implement the RemoteFilesystem
 protocol for the transaction coordinator.
 """
 
+import os
 import shutil
 import logging
 from pathlib import Path
-from typing import Iterator
+from typing import Iterator, Optional
 
 from dsg.core.transaction_coordinator import ContentStream, TempFile
+from dsg.storage.delta import BlockSignatures, apply_delta, compute_signatures
+from dsg.storage.packing import extract_pack
+from dsg.storage.zerocopy import place_file
 from dsg.system.exceptions import (
     ZFSOperationError, TransactionCommitError
 )
@@ -42,11 +46,40 @@ class FileContentStream:
         return self._size
 
 
+def _block_signatures(root: Path, rel_path: str, block_size: int) -> Optional[BlockSignatures]:
+    """Sign root/rel_path as a delta basis; None unless it is a non-empty regular file"""
+    basis_path = root / rel_path
+    if basis_path.is_symlink() or not basis_path.is_file() or basis_path.stat().st_size == 0:
+        return None
+    return compute_signatures(basis_path, block_size)
+
+
+def _apply_delta_within(root: Path, rel_path: str, temp_file: TempFile) -> tuple[str, int]:
+    """Rebuild root/rel_path from its current content and a delta, replacing it atomically"""
+    dest_path = root / rel_path
+    partial_path = dest_path.with_name(f".{dest_path.name}.dsg-delta")
+    try:
+        result = apply_delta(temp_file.path, dest_path, partial_path)
+        os.replace(partial_path, dest_path)
+    finally:
+        partial_path.unlink(missing_ok=True)
+    return result
+
+
+def _rename_within(root: Path, old_path: str, new_path: str) -> None:
+    """Rename root/old_path to root/new_path, creating parent directories"""
+    dest_path = root / new_path
+    dest_path.parent.mkdir(parents=True, exist_ok=True)
+    os.replace(root / old_path, dest_path)
+    logging.debug("Renamed %s -> %s", old_path, new_path)
+
+
 class ZFSFilesystem:
     """ZFS-specific implementation using clone/promote"""
     
-    def __init__(self, zfs_operations: ZFSOperations):
+    def __init__(self, zfs_operations: ZFSOperations, snapshot_id: Optional[str] = None):
         self.zfs_ops = zfs_operations
+        self.snapshot_id = snapshot_id  # DSG snapshot the commit creates, if known
         self.clone_path = None
         self.transaction_id = None
     
@@ -70,7 +103,28 @@ class ZFSFilesystem:
         
         dest_path = Path(self.clone_path) / rel_path
         dest_path.parent.mkdir(parents=True, exist_ok=True)
-        shutil.move(str(temp_file.path), dest_path)
+        place_file(temp_file, dest_path)
+    
+    def recv_pack(self, rel_paths: list[str], temp_file: TempFile) -> None:
+        """Unpack a packed upload straight into the ZFS clone"""
+        if not self.clone_path:
+            raise RuntimeError("Transaction not started - call begin_transaction first")
+        
+        extract_pack(temp_file.path, Path(self.clone_path), rel_paths)
+    
+    def block_signatures(self, rel_path: str, block_size: int) -> Optional[BlockSignatures]:
+        """Sign the clone's copy of rel_path as the basis for a delta upload"""
+        if not self.clone_path:
+            raise RuntimeError("Transaction not started - call begin_transaction first")
+        
+        return _block_signatures(Path(self.clone_path), rel_path, block_size)
+    
+    def recv_delta(self, rel_path: str, temp_file: TempFile) -> tuple[str, int]:
+        """Rebuild rel_path in the ZFS clone from a delta; returns (xxh3, size)"""
+        if not self.clone_path:
+            raise RuntimeError("Transaction not started - call begin_transaction first")
+        
+        return _apply_delta_within(Path(self.clone_path), rel_path, temp_file)
     
     def delete_file(self, rel_path: str) -> None:
         """Delete file from ZFS clone"""
@@ -81,6 +135,13 @@ class ZFSFilesystem:
         if target_path.exists():
             target_path.unlink()
     
+    def move_file(self, old_path: str, new_path: str) -> None:
+        """Rename a file inside the ZFS clone"""
+        if not self.clone_path:
+            raise RuntimeError("Transaction not started - call begin_transaction first")
+        
+        _rename_within(Path(self.clone_path), old_path, new_path)
+    
     def create_symlink(self, rel_path: str, target: str) -> None:
         """Create symlink in ZFS clone"""
         if not self.clone_path:
@@ -126,7 +187,7 @@ class ZFSFilesystem:
                 )
             
             logging.info(f"Committing ZFS transaction {transaction_id}")
-            self.zfs_ops.commit(transaction_id)
+            self.zfs_ops.commit(transaction_id, snapshot_id=self.snapshot_id)
             logging.info(f"Successfully committed ZFS transaction {transaction_id}")
             
         except Exception as e:
@@ -213,7 +274,28 @@ class XFSFilesystem:
         
         dest_path = self.staging_dir / rel_path
         dest_path.parent.mkdir(parents=True, exist_ok=True)
-        shutil.move(str(temp_file.path), dest_path)
+        place_file(temp_file, dest_path)
+    
+    def recv_pack(self, rel_paths: list[str], temp_file: TempFile) -> None:
+        """Unpack a packed upload into the staging directory"""
+        if not self.staging_dir:
+            raise RuntimeError("Transaction not started - call begin_transaction first")
+        
+        extract_pack(temp_file.path, self.staging_dir, rel_paths)
+    
+    def block_signatures(self, rel_path: str, block_size: int) -> Optional[BlockSignatures]:
+        """Sign the staged copy of rel_path as the basis for a delta upload"""
+        if not self.staging_dir:
+            raise RuntimeError("Transaction not started - call begin_transaction first")
+        
+        return _block_signatures(self.staging_dir, rel_path, block_size)
+    
+    def recv_delta(self, rel_path: str, temp_file: TempFile) -> tuple[str, int]:
+        """Rebuild rel_path in the staging directory from a delta; returns (xxh3, size)"""
+        if not self.staging_dir:
+            raise RuntimeError("Transaction not started - call begin_transaction first")
+        
+        return _apply_delta_within(self.staging_dir, rel_path, temp_file)
     
     def delete_file(self, rel_path: str) -> None:
         """Delete file from staging directory"""
@@ -224,6 +306,13 @@ class XFSFilesystem:
         if target_path.exists():
             target_path.unlink()
     
+    def move_file(self, old_path: str, new_path: str) -> None:
+        """Rename a file inside the staging directory"""
+        if not self.staging_dir:
+            raise RuntimeError("Transaction not started - call begin_transaction first")
+        
+        _rename_within(self.staging_dir, old_path, new_path)
+    
     def create_symlink(self, rel_path: str, target: str) -> None:
         """Create symlink in staging directory"""
         if not self.staging_dir:
@@ -13,7 +13,7 @@ import pwd
 
 from dsg.system.execution import CommandExecutor as ce
 from .protocols import SnapshotOperations
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
 if TYPE_CHECKING:
     from .transports import Transport
@@ -395,14 +395,34 @@ class ZFSOperations(SnapshotOperations):
         else:
             return self._begin_sync_transaction(transaction_id)
 
-    def commit(self, transaction_id: str) -> None:
-        """Commit transaction using appropriate pattern."""
+    def commit(self, transaction_id: str, snapshot_id: Optional[str] = None) -> None:
+        """Commit transaction using appropriate pattern.
+
+        Args:
+            transaction_id: Unique identifier for this operation
+            snapshot_id: DSG snapshot the commit creates (e.g. "s3"); if given, the
+                committed dataset is snapshotted as @<snapshot_id>, which is where
+                snapfetch reads it (.zfs/snapshot/<snapshot_id>). Naming it is
+                best-effort: the data is committed by then, so a failure is only
+                logged
+        """
         operation_type = self._detect_operation_type()  # Could cache from begin
         
         if operation_type == "init":
             self._commit_init_transaction(transaction_id)
         else:
             self._commit_sync_transaction(transaction_id)
+        
+        # Earlier @<snapshot_id> snapshots move with the promoted clone, so the
+        # dataset keeps one per synced DSG snapshot
+        if snapshot_id:
+            try:
+                self._create_snapshot(snapshot_id)
+            except Exception as e:
+                # e.g. @<snapshot_id> exists from a sync whose metadata update failed;
+                # only snapfetch needs the name, so it must not fail a committed sync
+                import loguru
+                loguru.logger.warning(f"Could not create ZFS snapshot {self.dataset_name}@{snapshot_id}: {e}")
 
     def rollback(self, transaction_id: str) -> None:
         """Rollback transaction (same logic for both patterns)."""
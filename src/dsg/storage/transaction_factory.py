@@ -16,9 +16,9 @@ on the project configuration.
 
 import subprocess
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
-from dsg.core.transaction_coordinator import Transaction
+from dsg.core.transaction_coordinator import PackPolicy, Transaction, resolve_transfer_workers
 from dsg.storage.client import ClientFilesystem
 from dsg.storage.remote import ZFSFilesystem, XFSFilesystem
 from dsg.storage.io_transports import LocalhostTransport, SSHTransport
@@ -35,6 +35,7 @@ except ImportError:
 
 if TYPE_CHECKING:
     from dsg.config.manager import Config
+    from dsg.data.manifest import Manifest
 
 
 def _get_zfs_pool_name_for_path(mount_base: str) -> str:
@@ -97,12 +98,14 @@ def _get_zfs_pool_name_for_path(mount_base: str) -> str:
         return Path(mount_base).name
 
 
-def create_transaction(config: 'Config') -> Transaction:
+def create_transaction(config: 'Config', snapshot_id: Optional[str] = None) -> Transaction:
     """
     Create Transaction with appropriate components based on config.
     
     Args:
         config: DSG configuration with project and user settings
+        snapshot_id: DSG snapshot this transaction creates; ZFS repositories
+            snapshot the committed dataset under this name
         
     Returns:
         Transaction instance ready for atomic sync operations
@@ -115,20 +118,40 @@ def create_transaction(config: 'Config') -> Transaction:
     client_fs = ClientFilesystem(config.project_root)
     
     # Create remote filesystem based on backend type
-    remote_fs = create_remote_filesystem(config)
+    remote_fs = create_remote_filesystem(config, snapshot_id=snapshot_id)
     
     # Create transport based on configuration
     transport = create_transport(config)
     
-    return Transaction(client_fs, remote_fs, transport)
+    return Transaction(client_fs, remote_fs, transport,
+                       transfer_workers=_configured_transfer_workers(config),
+                       pack_policy=_configured_pack_policy(config))
 
 
-def create_remote_filesystem(config: 'Config'):
+def _configured_transfer_workers(config: 'Config') -> int:
+    """Transfer concurrency from user config, or the default"""
+    workers = getattr(config.user, 'transfer_workers', None)
+    return resolve_transfer_workers(workers if isinstance(workers, int) else None)
+
+
+def _configured_pack_policy(config: 'Config') -> PackPolicy:
+    """Small-file packing thresholds from user config, defaults for anything unset"""
+    overrides = {}
+    for field, setting in (('threshold_bytes', 'pack_threshold_bytes'),
+                           ('batch_files', 'pack_batch_files')):
+        value = getattr(config.user, setting, None)
+        if isinstance(value, int):
+            overrides[field] = value
+    return PackPolicy(**overrides)
+
+
+def create_remote_filesystem(config: 'Config', snapshot_id: Optional[str] = None):
     """
     Create appropriate RemoteFilesystem implementation based on config.
     
     Args:
         config: DSG configuration
+        snapshot_id: DSG snapshot the commit creates, named as a ZFS snapshot
         
     Returns:
         RemoteFilesystem implementation (ZFSFilesystem or XFSFilesystem)
@@ -202,7 +225,7 @@ def create_remote_filesystem(config: 'Config'):
             mount_base=mount_base
         )
         
-        return ZFSFilesystem(zfs_ops)
+        return ZFSFilesystem(zfs_ops, snapshot_id=snapshot_id)
     
     elif backend_type == "xfs":
         # For XFS, mount_base + dataset_path gives us the full repository path
@@ -245,7 +268,8 @@ def create_transport(config: 'Config'):
                 # TODO: Add SSH key, password, port configuration as needed
             }
             temp_dir = config.project_root / ".dsg" / "tmp"
-            return SSHTransport(ssh_params, temp_dir)
+            return SSHTransport(ssh_params, temp_dir,
+                                max_channels=_configured_transfer_workers(config))
         else:
             raise NotImplementedError(f"Transport type '{transport_type}' not yet implemented in create_transport")
     
@@ -268,7 +292,8 @@ def create_transport(config: 'Config'):
                 # TODO: Add SSH key, password, port configuration as needed
             }
             temp_dir = config.project_root / ".dsg" / "tmp"
-            return SSHTransport(ssh_params, temp_dir)
+            return SSHTransport(ssh_params, temp_dir,
+                                max_channels=_configured_transfer_workers(config))
     
     elif config.project.transport == "localhost":
         temp_dir = config.project_root / ".dsg" / "tmp"
@@ -295,6 +320,8 @@ def calculate_sync_plan(status, config=None) -> dict[str, list[str]]:
         - delete_remote: List of files to delete from remote
         - upload_archive: List of archive files to upload
         - download_archive: List of archive files to download
+        - move_remote: (old, new) pairs renamed locally, to rename on the remote
+        - move_local: (old, new) pairs renamed remotely, to rename locally
     """
     from dsg.data.manifest_merger import SyncState
     
@@ -303,8 +330,17 @@ def calculate_sync_plan(status, config=None) -> dict[str, list[str]]:
     delete_local = []
     delete_remote = []
     
+    # Detected renames replace an upload+delete (or download+delete) pair
+    moves = getattr(status, 'moves', None)
+    moves = moves if isinstance(moves, list) else []
+    move_remote = [(m.old_path, m.new_path) for m in moves if m.moved_on == "local"]
+    move_local = [(m.old_path, m.new_path) for m in moves if m.moved_on == "remote"]
+    moved_paths = {path for pair in move_remote + move_local for path in pair}
+    
     # Process sync states to determine operations
     for file_path, sync_state in status.sync_states.items():
+        if file_path in moved_paths:
+            continue
         if sync_state == SyncState.sLxCxR__only_L:
             # File only exists locally - upload it
             upload_files.append(file_path)
@@ -345,9 +381,33 @@ def calculate_sync_plan(status, config=None) -> dict[str, list[str]]:
         'delete_local': delete_local,
         'delete_remote': delete_remote,
         'upload_archive': upload_archive,
-        'download_archive': download_archive
+        'download_archive': download_archive,
+        'move_remote': move_remote,
+        'move_local': move_local
     }
 
+
+def expected_transfer_hashes(sync_plan: dict[str, list[str]],
+                             local_manifest: "Manifest | None",
+                             remote_manifest: "Manifest | None") -> dict[str, str]:
+    """
+    Collect the xxh3 each transferred file should have, for in-transit verification.
+
+    Uploads are checked against the local manifest and downloads against the
+    remote manifest. Paths without a hashed FileRef (symlinks, .dsg metadata)
+    are left out and fall back to size verification.
+    """
+    expected: dict[str, str] = {}
+    for key, manifest in (('upload_files', local_manifest), ('download_files', remote_manifest)):
+        if manifest is None:
+            continue
+        for rel_path in sync_plan.get(key, []):
+            entry = manifest.entries.get(rel_path)
+            if getattr(entry, 'hash', None):
+                expected[rel_path] = entry.hash
+    return expected
+
+
 def _raise_transport_not_supported_error(transport_type: str) -> None:
     """Raise helpful error for unsupported transport types."""
     if transport_type in ["rclone", "ipfs"]:
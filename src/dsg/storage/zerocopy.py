@@ -0,0 +1,172 @@
+# Author: PB & Claude
+# Maintainer: PB
+# Original date: 2026.10.16
+# License: (c) HRDAG, 2025, GPL-2 or newer
+#
+# ------
+# src/dsg/storage/zerocopy.py
+
+"""
+Zero-copy file placement for localhost transfers.
+
+When source and destination are both local, streaming bytes through Python
+into a temp file and then moving that temp file (often across filesystems)
+copies every byte twice. Instead, LocalhostTransport hands the receiver a
+BorrowedFile that points at the source itself, and the receiver copies it
+straight to its destination with the cheapest mechanism the kernel offers:
+
+1. FICLONE reflink (XFS, Btrfs; shares extents, no data copied)
+2. os.copy_file_range (in-kernel copy; block cloning on OpenZFS >= 2.2)
+3. os.sendfile (in-kernel copy)
+4. a plain buffered copy, if none of the above is available
+
+A source is only borrowed when the scan recorded it: its stat key and xxh3
+in the hash cache (see ClientFilesystem.send_file), and its current stat
+still matches. The BorrowedFile then reports that hash, which the transaction
+checks against the manifest like any streamed digest. place_file stats the
+source again after copying and fails if it changed meanwhile; the buffered
+copy, which reads every byte anyway, also hashes them. Anything else is
+streamed and hashed in transit.
+
+Ordinary transport temp files are still moved with shutil.move, which is a
+rename when the temp file is on the destination's filesystem.
+"""
+
+import errno
+import logging
+import os
+import shutil
+from pathlib import Path
+from typing import Final, Optional
+
+import xxhash
+
+from dsg.core.hash_cache import StatKey, stat_key
+from dsg.system.exceptions import TransferIntegrityError
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX
+    fcntl = None
+
+# linux/fs.h: _IOW(0x94, 9, int)
+FICLONE: Final[int] = 0x40049409
+COPY_BUFFER_BYTES: Final[int] = 1024 * 1024
+
+# errnos meaning "this mechanism is not available here", not "the copy failed"
+_UNSUPPORTED: Final[frozenset[int]] = frozenset({
+    errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.ENOTTY,
+    errno.EBADF, errno.EPERM,
+})
+
+
+class BorrowedFile:
+    """
+    TempFile that refers to the original source file instead of a copy.
+
+    Receivers must copy from it (see place_file), never move it, and
+    cleanup() is a no-op so the source is never removed. source_stat and
+    content_hash are the stat key and hash the scan recorded for the source.
+    """
+
+    borrowed = True
+
+    def __init__(self, path: Path, size: int, source_stat: Optional[StatKey] = None,
+                 content_hash: Optional[str] = None):
+        self.path = path
+        self.size: Optional[int] = size
+        self.source_stat = source_stat
+        self.content_hash = content_hash
+
+    def cleanup(self) -> None:
+        pass
+
+
+def _copy_range(src_fd: int, dst_fd: int, size: int) -> None:
+    offset = 0
+    while offset < size:
+        n = os.copy_file_range(src_fd, dst_fd, size - offset,
+                               offset_src=offset, offset_dst=offset)
+        if n == 0:
+            break
+        offset += n
+
+
+def _sendfile(src_fd: int, dst_fd: int, size: int) -> None:
+    offset = 0
+    while offset < size:
+        n = os.sendfile(dst_fd, src_fd, offset, size - offset)
+        if n == 0:
+            break
+        offset += n
+
+
+def copy_file(src: Path, dst: Path, digest=None) -> str:
+    """
+    Copy src to dst (created or truncated) without routing data through Python.
+
+    If no in-kernel mechanism works, the bytes are copied in Python and, when
+    digest (an xxhash object) is given, fed to it on the way.
+
+    Returns:
+        The mechanism used: "reflink", "copy_file_range", "sendfile" or "copy"
+    """
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        src_fd, dst_fd = fsrc.fileno(), fdst.fileno()
+        size = os.fstat(src_fd).st_size
+
+        if fcntl is not None:
+            try:
+                fcntl.ioctl(dst_fd, FICLONE, src_fd)
+                return "reflink"
+            except OSError as e:
+                if e.errno not in _UNSUPPORTED:
+                    raise
+
+        for method, copier in (("copy_file_range", _copy_range), ("sendfile", _sendfile)):
+            if not hasattr(os, method):
+                continue
+            try:
+                copier(src_fd, dst_fd, size)
+                return method
+            except OSError as e:
+                if e.errno not in _UNSUPPORTED:
+                    raise
+                os.ftruncate(dst_fd, 0)
+
+        os.lseek(dst_fd, 0, os.SEEK_SET)
+        while chunk := fsrc.read(COPY_BUFFER_BYTES):
+            fdst.write(chunk)
+            if digest is not None:
+                digest.update(chunk)
+        return "copy"
+
+
+def place_file(temp_file, dest_path: Path) -> None:
+    """
+    Put a transport temp file at dest_path, replacing whatever is there.
+
+    BorrowedFile sources are copied (reflinked where possible) into a sibling
+    temp name and renamed into place; anything else is moved.
+    """
+    if getattr(temp_file, 'borrowed', False) is not True:
+        shutil.move(str(temp_file.path), dest_path)
+        return
+
+    partial_path = dest_path.with_name(f".{dest_path.name}.dsg-copy")
+    try:
+        digest = xxhash.xxh3_64()
+        method = copy_file(temp_file.path, partial_path, digest)
+        if temp_file.source_stat is not None and stat_key(os.stat(temp_file.path)) != temp_file.source_stat:
+            raise TransferIntegrityError(f"{temp_file.path} changed since it was scanned")
+        if method == "copy" and temp_file.content_hash is not None and digest.hexdigest() != temp_file.content_hash:
+            raise TransferIntegrityError(f"{temp_file.path} does not match its scanned hash",
+                                         expected_hash=temp_file.content_hash, actual_hash=digest.hexdigest())
+        os.replace(partial_path, dest_path)
+    except BaseException:
+        partial_path.unlink(missing_ok=True)
+        raise
+    logging.debug("Placed %s via %s", dest_path, method)
+
+
+# done.
@@ -471,8 +471,8 @@ def _suggest_filename_fix(path: str) -> str:
     return suggestion
 
 
-def display_sync_status(console: Console, status_result, quiet: bool = False) -> None:
-    """Display sync status results in user-friendly format."""
+def display_sync_status(console: Console, status_result, quiet: bool = False, verbose: bool = False) -> None:
+    """Display sync status results in user-friendly format (with stage timings if verbose)."""
     from dsg.core.operations import SyncStatusResult
     from dsg.data.manifest_merger import SyncState
     from dsg.data.manifest_comparison import SyncStateLabels
@@ -558,6 +558,16 @@ def display_sync_status(console: Console, status_result, quiet: bool = False) ->
         else:
             console.print("Resolve conflicts before syncing")
 
+    if status_result.metadata_only and status_result.unhashed and not quiet:
+        count = len(status_result.unhashed)
+        file_word = "file was" if count == 1 else "files were"
+        console.print(f"[dim]Metadata-only status: {count} {file_word} compared by size and "
+                      f"modification time without hashing; some may be unchanged[/dim]")
+
+    if verbose and status_result.timings and not quiet:
+        stages = ", ".join(f"{name} {seconds:.2f}s" for name, seconds in status_result.timings.items())
+        console.print(f"[dim]Stage timings: {stages}[/dim]")
+
 
 def display_sync_dry_run_preview(console: Console) -> None:
     """Display what operations would be performed in a dry-run sync."""
@@ -34,6 +34,11 @@ class SyncError(DSGError):
     pass
 
 
+class OperationCancelled(DSGError):
+    """Raised when a long-running operation is cancelled before it completes."""
+    pass
+
+
 # === TRANSACTION SYSTEM EXCEPTIONS (Phase 2) ===
 
 class TransactionError(DSGError):
@@ -6,14 +6,33 @@
 # ------
 # src/dsg/logging_setup.py
 
+import os
 import sys
 from pathlib import Path
-from typing import Optional
+from typing import Final, Optional
 
 from loguru import logger
 
 from dsg.config.manager import load_merged_user_config
 
+# Per-file tracing in hot loops is opt-in: DSG_TRACE=scanner,transaction (or "all")
+TRACE_ENV_VAR: Final[str] = "DSG_TRACE"
+
+
+def trace_enabled(area: str) -> bool:
+    """Return True if per-item debug tracing was requested for a subsystem.
+
+    Hot loops (the scanner's per-file classification, per-file transfers) check
+    this once per run and otherwise only log aggregated summaries, so a DEBUG
+    file sink costs nothing per file unless tracing is asked for explicitly.
+
+    Args:
+        area: Subsystem name, e.g. "scanner" or "transaction"
+    """
+    requested = os.environ.get(TRACE_ENV_VAR, "")
+    areas = {a.strip().lower() for a in requested.split(",") if a.strip()}
+    return "all" in areas or area.lower() in areas
+
 
 def detect_repo_name() -> Optional[str]:
     """Detect current repository name from .dsgconfig.yml or directory name.
@@ -42,7 +61,8 @@ def setup_logging() -> None:
 
     Configures:
     - Console output: WARNING+ only (clean CLI output)
-    - File output: DEBUG+ if local_log is configured in user config
+    - File output: DEBUG+ if local_log is configured in user config, written
+      from a background thread (enqueue=True) so callers never block on disk
     """
     logger.remove()
 
@@ -73,7 +93,8 @@ def setup_logging() -> None:
                 format="{time:YYYY-MM-DD HH:mm:ss.SSS} | {level: <8} | {name}:{function}:{line} - {message}",
                 rotation="10 MB",
                 retention="30 days",
-                compression="gz"
+                compression="gz",
+                enqueue=True
             )
             logger.debug(f"File logging enabled: {log_file}")
 
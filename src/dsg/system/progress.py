@@ -10,11 +10,15 @@
 Progress reporting utilities for repository operations.
 
 Provides Rich-based progress reporting for long-running operations
-like clone, init, and sync.
+like clone, init, sync, and the hashing stage of status.
 """
 
+from typing import Optional
+
 from rich.console import Console
-from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn, TimeRemainingColumn
+from rich.progress import (
+    Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn, TimeRemainingColumn, MofNCompleteColumn,
+)
 
 
 class RepositoryProgressReporter:
@@ -101,4 +105,46 @@ class RepositoryProgressReporter:
             if size_bytes < 1024.0:
                 return f"{size_bytes:.1f} {unit}"
             size_bytes /= 1024.0
-        return f"{size_bytes:.1f} TB"
\ No newline at end of file
+        return f"{size_bytes:.1f} TB"
+
+
+class HashProgressReporter:
+    """Transient progress bar for hashing changed files, as a hash_files progress callback.
+
+    Nothing is drawn until there are files to hash, so a status run with no
+    changes prints no bar at all.
+    """
+
+    def __init__(self, console: Console, quiet: bool = False) -> None:
+        self.console = console
+        self.quiet = quiet
+        self.progress: Optional[Progress] = None
+        self.task = None
+
+    def __call__(self, done: int, total: int) -> None:
+        if self.quiet or not total:
+            return
+        if self.progress is None:
+            self.progress = Progress(
+                TextColumn("[dim]Hashing changed files[/dim]"),
+                BarColumn(),
+                MofNCompleteColumn(),
+                TimeRemainingColumn(),
+                console=self.console,
+                transient=True
+            )
+            self.progress.start()
+            self.task = self.progress.add_task("hash", total=total)
+        self.progress.update(self.task, completed=done, total=total)
+
+    def stop(self) -> None:
+        """Remove the bar, if one was shown."""
+        if self.progress:
+            self.progress.stop()
+            self.progress = None
+
+    def __enter__(self) -> "HashProgressReporter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
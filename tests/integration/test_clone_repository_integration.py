@@ -85,6 +85,7 @@ class TestCloneRepositoryBasic:
         # Mock the transaction system for now to test the logic
         with patch('dsg.core.lifecycle.create_transaction') as mock_transaction:
             mock_tx = MagicMock()
+            mock_tx.downloaded_hashes = {}
             mock_transaction.return_value.__enter__ = MagicMock(return_value=mock_tx)
             mock_transaction.return_value.__exit__ = MagicMock(return_value=None)
             
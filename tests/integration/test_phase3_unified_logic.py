@@ -60,6 +60,7 @@ class TestUnifiedSyncLogic:
         # Mock transaction system
         with patch('dsg.core.lifecycle.create_transaction') as mock_create_transaction:
             mock_transaction = MagicMock()
+            mock_transaction.downloaded_hashes = {}
             mock_create_transaction.return_value.__enter__ = MagicMock(return_value=mock_transaction)
             mock_create_transaction.return_value.__exit__ = MagicMock(return_value=None)
             
@@ -81,7 +82,7 @@ class TestUnifiedSyncLogic:
             assert result["status"] == "success"
             
             # Verify: Transaction was created and used
-            mock_create_transaction.assert_called_once_with(config)
+            mock_create_transaction.assert_called_once_with(config, snapshot_id="s1")
             mock_transaction.sync_files.assert_called_once()
             
             # Verify: Sync plan had upload operations (init scenario)
@@ -123,6 +124,7 @@ class TestUnifiedSyncLogic:
         # Mock transaction system
         with patch('dsg.core.lifecycle.create_transaction') as mock_create_transaction:
             mock_transaction = MagicMock()
+            mock_transaction.downloaded_hashes = {}
             mock_create_transaction.return_value.__enter__ = MagicMock(return_value=mock_transaction)
             mock_create_transaction.return_value.__exit__ = MagicMock(return_value=None)
             
@@ -144,7 +146,7 @@ class TestUnifiedSyncLogic:
             assert result["status"] == "success"
             
             # Verify: Transaction was created and used
-            mock_create_transaction.assert_called_once_with(config)
+            mock_create_transaction.assert_called_once_with(config, snapshot_id=None)
             mock_transaction.sync_files.assert_called_once()
             
             # Verify: Sync plan had download operations (clone scenario) 
@@ -211,6 +213,7 @@ class TestUnifiedSyncLogic:
         # Mock transaction system
         with patch('dsg.core.lifecycle.create_transaction') as mock_create_transaction:
             mock_transaction = MagicMock()
+            mock_transaction.downloaded_hashes = {}
             mock_create_transaction.return_value.__enter__ = MagicMock(return_value=mock_transaction)
             mock_create_transaction.return_value.__exit__ = MagicMock(return_value=None)
             
@@ -232,7 +235,7 @@ class TestUnifiedSyncLogic:
             assert result["status"] == "success"
             
             # Verify: Transaction was created and used
-            mock_create_transaction.assert_called_once_with(config)
+            mock_create_transaction.assert_called_once_with(config, snapshot_id="s1")
             mock_transaction.sync_files.assert_called_once()
             
             # Verify: Sync plan had both upload and download operations
@@ -562,4 +562,27 @@ def test_version_option_in_help():
     
     assert result.exit_code == 0
     assert "--version" in result.stdout
-    assert "Show version and exit" in result.stdout 
\ No newline at end of file
+    assert "Show version and exit" in result.stdout 
+
+def test_snapfetch_rejects_json_with_stdout_output():
+    """Test snapfetch refuses --json with -o -, which would mix JSON into the file's bytes"""
+    from unittest.mock import patch
+
+    with patch('dsg.cli.commands.actions.snapfetch') as mock_snapfetch:
+        result = runner.invoke(app, ["snapfetch", "data/big.bin", "-o", "-", "--json"])
+
+    assert result.exit_code == 2
+    assert "--json cannot be used with --output -" in result.output
+    mock_snapfetch.assert_not_called()
+
+
+def test_diff_rejects_json_with_ndjson():
+    """Test diff refuses --json with --ndjson, which would append a JSON document to the NDJSON lines"""
+    from unittest.mock import patch
+
+    with patch('dsg.cli.commands.info.diff') as mock_diff:
+        result = runner.invoke(app, ["diff", "s1", "s2", "--ndjson", "--json"])
+
+    assert result.exit_code == 2
+    assert "--json cannot be used with --ndjson" in result.output
+    mock_diff.assert_not_called()
@@ -15,7 +15,7 @@ These tests validate that the command handlers work correctly:
 - actions.py: State-changing operation commands
 """
 
-from unittest.mock import Mock, patch
+from unittest.mock import ANY, Mock, patch
 from pathlib import Path
 from rich.console import Console
 
@@ -45,7 +45,7 @@ class TestInfoCommandHandlers:
             assert 'config' in result
             assert 'sync_status' in result
             assert result['sync_status'] == mock_sync_status
-            mock_get_status.assert_called_once_with(config, verbose=False)
+            mock_get_status.assert_called_once_with(config, verbose=False, metadata_only=False, progress=ANY)
             mock_display.assert_called_once()
     
     def test_log_command_returns_structured_data(self):
@@ -348,26 +348,29 @@ class TestActionCommandHandlers:
         assert 'force' in result
         assert result['force'] is True
     
-    def test_snapfetch_command_placeholder_functionality(self):
-        """Test that snapfetch command placeholder works correctly."""
+    def test_snapfetch_command_functionality(self):
+        """Test that snapfetch passes its parameters through and reports the fetch."""
+        from dsg.core.snapfetch import SnapshotFetch
         console = Mock(spec=Console)
         config = Mock(spec=Config)
+        fetched = SnapshotFetch(snapshot_id="s7", path="data/test.csv", output="/tmp/test.csv", start=0,
+                                bytes_written=5, file_size=5, expected_hash="abc", actual_hash="abc")
         
-        result = action_commands.snapfetch(
-            console, config, num=3, file="data/test.csv", output="/tmp/test.csv",
-            dry_run=False, force=False, normalize=False,
-            verbose=False, quiet=False
-        )
+        with patch('dsg.cli.commands.actions.fetch_snapshot_file', return_value=fetched) as mock_fetch:
+            result = action_commands.snapfetch(
+                console, config, num=3, file="data/test.csv", output="/tmp/test.csv",
+                dry_run=False, force=False, normalize=False,
+                verbose=False, quiet=False
+            )
         
-        # Verify placeholder structure
-        assert 'operation' in result
+        mock_fetch.assert_called_once_with(config, "data/test.csv", snapshot_id=None, num=3,
+                                           output="/tmp/test.csv", byte_range=None, force=False)
         assert result['operation'] == 'snapfetch'
-        assert 'snapshot_num' in result
         assert result['snapshot_num'] == 3
-        assert 'file' in result
+        assert result['snapshot_id'] == "s7"
         assert result['file'] == "data/test.csv"
-        assert 'output' in result
         assert result['output'] == "/tmp/test.csv"
+        assert result['verified'] is True
 
 
 class TestCommandHandlerIntegration:
@@ -436,5 +439,5 @@ class TestCommandHandlerIntegration:
             result = info_commands.status(console, config, verbose=True, quiet=False)
             
             # Verify verbose flag was passed through
-            mock_status.assert_called_once_with(config, verbose=True)
+            mock_status.assert_called_once_with(config, verbose=True, metadata_only=False, progress=ANY)
             assert isinstance(result, dict)
\ No newline at end of file
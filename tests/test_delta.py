@@ -0,0 +1,156 @@
+# Author: PB & Claude
+# Maintainer: PB
+# Original date: 2026.10.16
+# License: (c) HRDAG, 2025, GPL-2 or newer
+#
+# ------
+# tests/test_delta.py
+
+import os
+import random
+import time
+
+import pytest
+import xxhash
+
+from dsg.core.transaction_coordinator import DeltaPolicy, Transaction
+from dsg.storage.client import ClientFilesystem
+from dsg.storage.delta import (
+    ADLER_MOD, DeltaContentStream, apply_delta, compute_signatures, weak_checksum,
+)
+from dsg.storage.io_transports import LocalhostTransport
+from dsg.storage.remote import XFSFilesystem
+from dsg.system.exceptions import TransactionIntegrityError
+
+BLOCK = 4096
+
+
+@pytest.fixture
+def basis():
+    return random.Random(7).randbytes(200_003)
+
+
+def _roundtrip(tmp_path, old: bytes, new: bytes):
+    (tmp_path / "basis").write_bytes(old)
+    (tmp_path / "new").write_bytes(new)
+    stream = DeltaContentStream(tmp_path / "new", compute_signatures(tmp_path / "basis", BLOCK))
+    with open(tmp_path / "delta", 'wb') as f:
+        for chunk in stream.read():
+            f.write(chunk)
+    content_hash, size = apply_delta(tmp_path / "delta", tmp_path / "basis", tmp_path / "out")
+    assert (tmp_path / "out").read_bytes() == new
+    assert content_hash == stream.source_hash == xxhash.xxh3_64(new).hexdigest()
+    assert size == stream.source_size == len(new)
+    assert stream.size == (tmp_path / "delta").stat().st_size
+    return stream
+
+
+def test_rolling_checksum_matches_recomputation(basis):
+    a, b = weak_checksum(basis[:BLOCK])
+    for pos in range(1, 50):
+        out, new = basis[pos - 1], basis[pos - 1 + BLOCK]
+        a = (a - out + new) % ADLER_MOD
+        b = (b - BLOCK * out + a - 1) % ADLER_MOD
+        assert (a, b) == weak_checksum(basis[pos:pos + BLOCK])
+
+
+@pytest.mark.parametrize("edit", [
+    lambda d: d[:100_000] + b"X" * 64 + d[100_064:],    # overwrite in place
+    lambda d: d[:1234] + b"inserted" + d[1234:],        # shifts every later block
+    lambda d: d[5000:],                                 # truncated head
+    lambda d: d + b"appended",
+])
+def test_small_edits_send_little_literal_data(tmp_path, basis, edit):
+    stream = _roundtrip(tmp_path, basis, edit(basis))
+
+    assert stream.literal_bytes <= 2 * BLOCK
+    assert stream.size < len(basis) // 10
+
+
+def test_identical_file_is_all_block_references(tmp_path, basis):
+    stream = _roundtrip(tmp_path, basis, basis)
+
+    assert stream.literal_bytes == 0
+
+
+def test_unrelated_and_empty_files_roundtrip(tmp_path, basis):
+    assert _roundtrip(tmp_path, basis, os.urandom(10_000)).literal_bytes == 10_000
+    assert _roundtrip(tmp_path, basis, b"").size < 32
+
+
+def test_unmatched_regions_are_not_read_block_by_block(tmp_path):
+    # A rewritten file: several MiB with no block of a production-sized basis.
+    # Reading and digesting a whole block at every byte took ~10 s per MiB.
+    (tmp_path / "basis").write_bytes(random.Random(1).randbytes(8 << 20))
+    (tmp_path / "new").write_bytes(random.Random(2).randbytes(4 << 20))
+    signatures = compute_signatures(tmp_path / "basis", 128 * 1024)
+    stream = DeltaContentStream(tmp_path / "new", signatures)
+
+    started = time.perf_counter()
+    size = sum(len(chunk) for chunk in stream.read())
+    elapsed = time.perf_counter() - started
+
+    assert stream.literal_bytes == 4 << 20 and size == stream.size
+    assert elapsed < 10, f"delta of 4 MiB of unmatched data took {elapsed:.1f}s"
+
+
+def test_apply_rejects_foreign_stream(tmp_path, basis):
+    (tmp_path / "basis").write_bytes(basis)
+    (tmp_path / "delta").write_bytes(b"this is not a delta stream at all")
+
+    with pytest.raises(ValueError, match="Not a delta stream"):
+        apply_delta(tmp_path / "delta", tmp_path / "basis", tmp_path / "out")
+
+
+class TestDeltaUpload:
+
+    @pytest.fixture
+    def transaction_parts(self, tmp_path, basis):
+        root = tmp_path / "project"
+        (root / ".dsg").mkdir(parents=True)
+        (root / "input").mkdir()
+        repo = tmp_path / "remote" / "repo"
+        (repo / "input").mkdir(parents=True)
+        (repo / "input" / "big.bin").write_bytes(basis)
+        modified = basis[:150_000] + b"changed" + basis[150_007:]
+        (root / "input" / "big.bin").write_bytes(modified)
+        (root / "input" / "new.bin").write_bytes(basis[:60_000])
+        return (root, repo, modified, ClientFilesystem(root), XFSFilesystem(str(repo)),
+                LocalhostTransport(tmp_path / "transfers", zero_copy=False))
+
+    def test_modified_file_is_sent_as_delta(self, transaction_parts):
+        root, repo, modified, client_fs, remote_fs, transport = transaction_parts
+        policy = DeltaPolicy(threshold_bytes=50_000, block_size=BLOCK)
+
+        with Transaction(client_fs, remote_fs, transport, delta_policy=policy) as tx:
+            tx.upload_files(["input/big.bin", "input/new.bin"])
+
+        assert (repo / "input" / "big.bin").read_bytes() == modified
+        assert (repo / "input" / "new.bin").read_bytes() == (root / "input" / "new.bin").read_bytes()
+        assert tx.transferred_hashes["input/big.bin"] == xxhash.xxh3_64(modified).hexdigest()
+        # new.bin has no remote basis, so only big.bin went as a delta
+        assert transport.metrics.delta_files == 1
+        assert transport.metrics.delta_bytes_saved > len(modified) - 3 * BLOCK
+
+    def test_below_threshold_sends_whole_file(self, transaction_parts):
+        root, repo, modified, client_fs, remote_fs, transport = transaction_parts
+
+        with Transaction(client_fs, remote_fs, transport) as tx:
+            tx.upload_files(["input/big.bin"])
+
+        assert (repo / "input" / "big.bin").read_bytes() == modified
+        assert transport.metrics.delta_files == 0
+
+    def test_expected_hash_mismatch_rolls_back(self, transaction_parts, basis):
+        root, repo, modified, client_fs, remote_fs, transport = transaction_parts
+        policy = DeltaPolicy(threshold_bytes=50_000, block_size=BLOCK)
+
+        with pytest.raises(TransactionIntegrityError, match="input/big.bin"):
+            with Transaction(client_fs, remote_fs, transport, delta_policy=policy) as tx:
+                tx.sync_files({'upload_files': ["input/big.bin"]},
+                              expected_hashes={"input/big.bin": "0000000000000000"})
+
+        assert (repo / "input" / "big.bin").read_bytes() == basis
+
+
+# done.
@@ -0,0 +1,113 @@
+# Author: PB & Claude
+# Maintainer: PB
+# Original date: 2026.10.16
+# License: (c) HRDAG, 2025, GPL-2 or newer
+#
+# ------
+# tests/test_entries_hash.py
+
+import orjson
+import pytest
+import xxhash
+
+from dsg.data.entries_hash import CURRENT_VERSION, LEGACY_VERSION, compute_entries_hash
+from dsg.data.manifest import FileRef, LinkRef, Manifest
+from dsg.data.manifest_store import ManifestEntries
+
+
+def _file(path, hash="0123456789abcdef"):
+    return FileRef(type="file", path=path, user="alice", filesize=42,
+                   mtime="2025-06-01T12:30:00-07:00", hash=hash)
+
+
+def _fresh_hash(store):
+    """Full recomputation, for comparison with the incrementally kept value"""
+    return compute_entries_hash([record for _, record in store.records()], CURRENT_VERSION)
+
+
+@pytest.fixture
+def manifest():
+    entries = {f"input/f{i:03d}.csv": _file(f"input/f{i:03d}.csv") for i in range(100)}
+    entries["input/link.csv"] = LinkRef(type="link", path="input/link.csv", user="bob", reference="f000.csv")
+    manifest = Manifest(entries=entries)
+    manifest.generate_metadata(snapshot_id="s1", user_id="alice")
+    return manifest
+
+
+def test_new_metadata_uses_current_scheme(manifest):
+    assert manifest.metadata.entries_hash_version == CURRENT_VERSION
+    assert manifest.metadata.entries_hash == _fresh_hash(manifest.entries)
+    assert len(manifest.metadata.entries_hash) == 32
+    assert manifest.verify_integrity()
+
+
+def test_hash_follows_every_kind_of_change(manifest):
+    entries = manifest.entries
+    entries.entries_hash()
+
+    entries["input/f001.csv"].hash = "00000000000000ff"
+    entries["input/f002.csv"] = _file("input/f002.csv", hash="fedcba9876543210")
+    entries.add_record("input/new.csv", _file("input/new.csv").model_dump())
+    del entries["input/link.csv"]
+    for i in range(3, 90):  # enough deletions to trigger compaction
+        del entries[f"input/f{i:03d}.csv"]
+
+    assert entries.entries_hash() == _fresh_hash(entries)
+    assert not manifest.verify_integrity()
+    manifest.generate_metadata(snapshot_id="s2")
+    assert manifest.verify_integrity()
+
+
+def test_copies_keep_their_own_digests(manifest):
+    original = manifest.entries.entries_hash()
+    clone = manifest.entries.copy()
+
+    del clone["input/f000.csv"]
+
+    assert manifest.entries.entries_hash() == original
+    assert clone.entries_hash() == _fresh_hash(clone)
+
+
+def test_trusted_load_seeds_digests(manifest, tmp_path):
+    manifest.to_json(tmp_path / "m.json")
+
+    loaded = Manifest.from_json(tmp_path / "m.json", trusted=True)
+
+    assert loaded.entries._digests is not None
+    assert loaded.verify_integrity()
+    loaded.entries["input/f005.csv"].hash = "1111111111111111"
+    assert loaded.entries.entries_hash() == _fresh_hash(loaded.entries)
+
+
+def test_legacy_manifests_still_verify(manifest, tmp_path):
+    records = {path: entry.model_dump() for path, entry in manifest.entries.items()}
+    h = xxhash.xxh3_64()
+    for record in records.values():
+        h.update(orjson.dumps(record))
+    metadata = manifest.metadata.model_dump(exclude={"entries_hash_version"})
+    metadata["entries_hash"] = h.hexdigest()
+    (tmp_path / "old.json").write_bytes(orjson.dumps({"entries": records, "metadata": metadata}))
+
+    for trusted in (False, True):
+        loaded = Manifest.from_json(tmp_path / "old.json", trusted=trusted)
+        assert loaded.metadata.entries_hash_version == LEGACY_VERSION
+        assert loaded.verify_integrity()
+    assert compute_entries_hash(records.values(), LEGACY_VERSION) == h.hexdigest()
+
+
+def test_unknown_scheme_fails_verification(manifest):
+    manifest.metadata.entries_hash_version = 99
+
+    assert not manifest.verify_integrity()
+    with pytest.raises(ValueError):
+        compute_entries_hash([], 99)
+
+
+def test_hash_is_independent_of_order():
+    a = ManifestEntries({"x": _file("x"), "y": _file("y")})
+    b = ManifestEntries({"y": _file("y"), "x": _file("x")})
+
+    assert a.entries_hash() == b.entries_hash()
+
+
+# done.
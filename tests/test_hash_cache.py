@@ -0,0 +1,179 @@
+# Author: PB & Claude
+# Maintainer: PB
+# Original date: 2026.10.16
+# License: (c) HRDAG, 2025, GPL-2 or newer
+#
+# ------
+# tests/test_hash_cache.py
+
+import os
+import time
+from pathlib import Path
+
+import orjson
+import pytest
+
+from dsg.core.hash_cache import (
+    HASH_CACHE_RELPATH,
+    HASH_CACHE_VERSION,
+    HashCache,
+    stat_key,
+)
+from dsg.core.scanner import hash_file, scan_directory_no_cfg, compute_hashes_for_manifest
+from dsg.data.manifest import FileRef
+
+
+def _age(path: Path, seconds: int = 3600) -> None:
+    """Push a file's mtime out of the racy window so its hash can be cached"""
+    past = time.time() - seconds
+    os.utime(path, (past, past))
+
+
+@pytest.fixture
+def project(tmp_path):
+    root = tmp_path / "project"
+    (root / ".dsg").mkdir(parents=True)
+    (root / "input").mkdir()
+    for name, content in [("a.txt", "alpha"), ("b.txt", "bravo")]:
+        path = root / "input" / name
+        path.write_text(content)
+        _age(path)
+    return root
+
+
+class CountingHasher:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, path: Path) -> str:
+        self.calls.append(path)
+        return hash_file(path)
+
+
+class TestHashCache:
+
+    def test_miss_then_hit(self, project):
+        cache = HashCache(project)
+        hasher = CountingHasher()
+        path = project / "input" / "a.txt"
+
+        first = cache.get_or_compute(path, hasher)
+        second = cache.get_or_compute(path, hasher)
+
+        assert first == second == hash_file(path)
+        assert len(hasher.calls) == 1
+        assert cache.stats.misses == 1
+        assert cache.stats.hits == 1
+        assert "input/a.txt" in cache
+
+    def test_modified_file_is_stale(self, project):
+        cache = HashCache(project)
+        path = project / "input" / "a.txt"
+        cache.get_or_compute(path, hash_file)
+
+        path.write_text("alpha, changed")
+        _age(path, 60)
+        new_hash = cache.get_or_compute(path, hash_file)
+
+        assert new_hash == hash_file(path)
+        assert cache.stats.stale == 1
+        assert cache.stats.hits == 0
+
+    def test_racy_file_not_stored(self, project):
+        cache = HashCache(project)
+        path = project / "input" / "fresh.txt"
+        path.write_text("just written")
+
+        cache.get_or_compute(path, hash_file)
+
+        assert "input/fresh.txt" not in cache
+        assert cache.stats.racy == 1
+
+    def test_save_and_load_roundtrip(self, project):
+        cache = HashCache(project)
+        path = project / "input" / "a.txt"
+        expected = cache.get_or_compute(path, hash_file)
+        cache.save()
+
+        cache_file = project / HASH_CACHE_RELPATH
+        assert cache_file.exists()
+
+        reloaded = HashCache.load(project)
+        assert len(reloaded) == 1
+        assert reloaded.lookup("input/a.txt", path.stat()) == expected
+
+    def test_incompatible_version_discarded(self, project):
+        cache_file = project / HASH_CACHE_RELPATH
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        cache_file.write_bytes(orjson.dumps({
+            "version": HASH_CACHE_VERSION + 1,
+            "entries": {"input/a.txt": [0, 0, 0, 0, 0, "deadbeef"]},
+        }))
+
+        assert len(HashCache.load(project)) == 0
+
+    def test_corrupt_cache_discarded(self, project):
+        cache_file = project / HASH_CACHE_RELPATH
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        cache_file.write_text("{not json")
+
+        assert len(HashCache.load(project)) == 0
+
+    def test_compact_drops_deleted_and_changed(self, project):
+        cache = HashCache(project)
+        a = project / "input" / "a.txt"
+        b = project / "input" / "b.txt"
+        cache.get_or_compute(a, hash_file)
+        cache.get_or_compute(b, hash_file)
+
+        a.unlink()
+        b.write_text("bravo, changed")
+
+        assert cache.compact() == 2
+        assert len(cache) == 0
+        assert cache.stats.compacted == 2
+
+    def test_for_project_requires_dsg_dir(self, tmp_path):
+        assert HashCache.for_project(tmp_path) is None
+
+    def test_stat_key_fields(self, project):
+        st = (project / "input" / "a.txt").stat()
+        assert stat_key(st) == (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns, st.st_ctime_ns)
+
+
+class TestScannerIntegration:
+
+    def test_hash_file_uses_cache(self, project):
+        cache = HashCache(project)
+        path = project / "input" / "a.txt"
+
+        assert hash_file(path, cache) == hash_file(path)
+        assert hash_file(path, cache) == hash_file(path)
+        assert cache.stats.hits == 1
+
+    def test_scan_hashes_match_with_and_without_cache(self, project):
+        uncached = scan_directory_no_cfg(project, compute_hashes=True, data_dirs={"input"})
+        cache = HashCache(project)
+        cached = scan_directory_no_cfg(
+            project, compute_hashes=True, data_dirs={"input"}, hash_cache=cache)
+        rescanned = scan_directory_no_cfg(
+            project, compute_hashes=True, data_dirs={"input"}, hash_cache=cache)
+
+        for path, entry in uncached.manifest.entries.items():
+            assert cached.manifest.entries[path].hash == entry.hash
+            assert rescanned.manifest.entries[path].hash == entry.hash
+        assert cache.stats.hits == 2
+        assert cache.stats.misses == 2
+
+    def test_compute_hashes_for_manifest_uses_cache(self, project):
+        result = scan_directory_no_cfg(project, data_dirs={"input"})
+        cache = HashCache(project)
+        compute_hashes_for_manifest(result.manifest, project, cache)
+
+        for entry in result.manifest.entries.values():
+            assert isinstance(entry, FileRef)
+            assert entry.hash == hash_file(project / entry.path)
+        assert len(cache) == 2
+
+
+# done.
@@ -0,0 +1,176 @@
+# Author: PB & Claude
+# Maintainer: PB
+# Original date: 2026.10.16
+# License: (c) HRDAG, 2025, GPL-2 or newer
+#
+# ------
+# tests/test_hashing.py
+
+import threading
+
+import xxhash
+import pytest
+
+from dsg.core import hashing
+from dsg.core.hashing import (
+    SMALL_FILE_BYTES,
+    _plan_batches,
+    hash_file_contents,
+    hash_files,
+    resolve_hash_workers,
+)
+from dsg.core.scanner import scan_directory_no_cfg
+from dsg.data.manifest import FileRef, Manifest
+from dsg.system.exceptions import OperationCancelled
+
+
+@pytest.fixture
+def many_files(tmp_path):
+    root = tmp_path / "project"
+    data = root / "input"
+    data.mkdir(parents=True)
+    paths = []
+    for i in range(40):
+        path = data / f"file_{i:02d}.txt"
+        path.write_bytes(f"content {i}\n".encode() * (i + 1))
+        paths.append(path)
+    big = data / "big.bin"
+    big.write_bytes(b"x" * (SMALL_FILE_BYTES + 17))
+    paths.append(big)
+    return root, paths
+
+
+def test_hash_file_contents_matches_xxh3(tmp_path):
+    path = tmp_path / "f.bin"
+    payload = b"abc" * 500_000
+    path.write_bytes(payload)
+    assert hash_file_contents(path) == xxhash.xxh3_64(payload).hexdigest()
+
+
+def test_hash_file_contents_empty_file(tmp_path):
+    path = tmp_path / "empty"
+    path.touch()
+    assert hash_file_contents(path) == xxhash.xxh3_64(b"").hexdigest()
+
+
+@pytest.mark.parametrize("workers", [1, 2, 4])
+def test_hash_files_matches_sequential(many_files, workers):
+    _, paths = many_files
+    results = hash_files(paths, workers=workers)
+
+    assert not results.errors
+    assert results.hashes == {p: hash_file_contents(p) for p in paths}
+
+
+def test_hash_files_reports_errors_per_path(many_files):
+    root, paths = many_files
+    missing = root / "input" / "missing.txt"
+    results = hash_files([*paths, missing], workers=3)
+
+    assert missing in results.errors
+    assert len(results.hashes) == len(paths)
+
+
+def test_plan_batches_small_first_then_large_descending(tmp_path, monkeypatch):
+    monkeypatch.setattr(hashing, "SMALL_BATCH_FILES", 2)
+    sized = [
+        (tmp_path / "a", 10),
+        (tmp_path / "huge", SMALL_FILE_BYTES * 4),
+        (tmp_path / "b", 10),
+        (tmp_path / "large", SMALL_FILE_BYTES),
+        (tmp_path / "c", 10),
+    ]
+    batches = _plan_batches(sized)
+
+    assert batches == [
+        [tmp_path / "a", tmp_path / "b"],
+        [tmp_path / "c"],
+        [tmp_path / "huge"],
+        [tmp_path / "large"],
+    ]
+
+
+def test_resolve_hash_workers():
+    assert resolve_hash_workers(None) == hashing.DEFAULT_HASH_WORKERS
+    assert resolve_hash_workers(0) == 1
+    assert resolve_hash_workers(6) == 6
+
+
+def test_scan_is_deterministic_across_worker_counts(many_files):
+    root, _ = many_files
+    one = scan_directory_no_cfg(root, compute_hashes=True, hash_workers=1).manifest
+    four = scan_directory_no_cfg(root, compute_hashes=True, hash_workers=4).manifest
+
+    assert list(one.entries) == list(four.entries)
+    assert one.entries == four.entries
+    assert all(isinstance(e, FileRef) and e.hash for e in four.entries.values())
+
+
+def test_recover_or_compute_metadata_uses_pool(many_files):
+    root, _ = many_files
+    manifest = scan_directory_no_cfg(root).manifest
+    manifest.recover_or_compute_metadata(Manifest(entries={}), "user@example.com", root,
+                                         hash_workers=3)
+
+    for path, entry in manifest.entries.items():
+        assert entry.user == "user@example.com"
+        assert entry.hash == hash_file_contents(root / path)
+
+
+def test_scan_uses_known_hashes_instead_of_reading(many_files, monkeypatch):
+    root, _ = many_files
+    read = []
+    real = hashing.hash_file_contents
+    monkeypatch.setattr(hashing, "hash_file_contents", lambda p: read.append(p) or real(p))
+
+    result = scan_directory_no_cfg(root, compute_hashes=True, hash_workers=1,
+                                   known_hashes={"input/big.bin": "precomputed"})
+
+    assert result.manifest.entries["input/big.bin"].hash == "precomputed"
+    assert root / "input" / "big.bin" not in read
+    assert len(read) == len(result.manifest.entries) - 1
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_hash_files_reports_progress(many_files, workers):
+    _, paths = many_files
+    calls = []
+
+    hash_files(paths, workers=workers, progress=lambda done, total: calls.append((done, total)))
+
+    assert calls[-1] == (len(paths), len(paths))
+    assert [done for done, _ in calls] == sorted(done for done, _ in calls)
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_hash_files_can_be_cancelled(many_files, monkeypatch, workers):
+    monkeypatch.setattr(hashing, "SMALL_BATCH_FILES", 2)
+    _, paths = many_files
+    cancel = threading.Event()
+    read = []
+    real = hashing.hash_file_contents
+
+    def hash_then_cancel(path):
+        read.append(path)
+        cancel.set()
+        return real(path)
+
+    monkeypatch.setattr(hashing, "hash_file_contents", hash_then_cancel)
+
+    with pytest.raises(OperationCancelled):
+        hash_files(paths, workers=workers, cancel=cancel)
+    assert len(read) <= workers
+
+
+def test_recover_can_skip_hashing(many_files):
+    root, _ = many_files
+    manifest = scan_directory_no_cfg(root).manifest
+
+    unhashed = manifest.recover_or_compute_metadata(Manifest(entries={}), "user@example.com", root,
+                                                    compute_hashes=False)
+
+    assert sorted(unhashed) == sorted(manifest.entries)
+    assert not any(entry.hash for entry in manifest.entries.values())
+
+
+# done.
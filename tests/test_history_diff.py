@@ -0,0 +1,170 @@
+# Author: PB & Claude
+# Maintainer: PB
+# Original date: 2026.10.16
+# License: (c) HRDAG, 2025, GPL-2 or newer
+#
+# ------
+# tests/test_history_diff.py
+
+import random
+from unittest.mock import Mock
+
+import orjson
+import pytest
+from rich.console import Console
+
+from dsg.cli.commands import info as info_commands
+from dsg.config.manager import Config
+from dsg.core.history import HistoryWalker, diff_manifests, diff_snapshots
+from dsg.data.manifest import FileRef, LinkRef, Manifest
+from dsg.data.manifest_comparison import ManifestComparator, SyncStateLabels, TemporalSyncState
+from dsg.data.manifest_stream import sorted_records
+
+MTIME = "2025-06-01T12:30:00-07:00"
+
+
+def _file(path, size=10, file_hash="", mtime=MTIME, user="alice"):
+    return FileRef(type="file", path=path, user=user, filesize=size, mtime=mtime, hash=file_hash)
+
+
+def _random_pair(seed, n=300):
+    """Two manifests with every kind of difference, in scan (unsorted) order"""
+    rnd = random.Random(seed)
+    old, new = {}, {}
+    for i in range(n):
+        path = f"d{rnd.randrange(6)}/{'sub/' if i % 3 else ''}f{i}.csv"
+        entry = _file(path, size=i, file_hash=rnd.choice(["", f"{i:016x}"]))
+        roll = rnd.random()
+        if roll < 0.1:
+            old[path] = entry
+        elif roll < 0.2:
+            new[path] = entry
+        elif roll < 0.3:
+            old[path] = entry
+            new[path] = _file(path, size=i + rnd.randrange(1, 5), file_hash=entry.hash,
+                              mtime=rnd.choice([MTIME, "2025-06-02T12:30:00-07:00"]))
+        elif roll < 0.35:
+            old[path] = LinkRef(type="link", path=path, user="alice", reference="f0.csv")
+            new[path] = LinkRef(type="link", path=path, user="bob", reference=rnd.choice(["f0.csv", "f1.csv"]))
+        elif roll < 0.4:
+            old[path] = entry
+            new[path] = _file(path, size=i, file_hash=entry.hash, user="bob")
+        else:
+            old[path] = new[path] = entry
+    return Manifest(entries=old), Manifest(entries=new)
+
+
+def _reference(old, new, prefix=""):
+    """Per-path classification by ManifestComparator, as blame does it"""
+    events = {"add": "added", "delete": "removed", "modify": "modified"}
+    changes = []
+    for path in sorted(set(old.entries) | set(new.entries)):
+        if not path.startswith(prefix):
+            continue
+        state = TemporalSyncState.from_comparison(ManifestComparator.classify_2way(old, new, path))
+        event = SyncStateLabels.temporal_to_blame_event(state)
+        if event:
+            changes.append((events[event], path))
+    return changes
+
+
+def _write(manifest, path):
+    if path.suffix == ".lz4":
+        manifest.to_compressed(path, include_metadata=True)
+    elif path.suffix == ".bin":
+        manifest.to_binary(path, include_metadata=True)
+    else:
+        manifest.to_json(path, include_metadata=True)
+    return path
+
+
+@pytest.mark.parametrize("seed", range(3))
+@pytest.mark.parametrize("formats", [(".lz4", ".json"), (".bin", ".lz4")])
+@pytest.mark.parametrize("prefix", ["", "d1/", "d2/sub"])
+def test_diff_matches_comparator(tmp_path, monkeypatch, seed, formats, prefix):
+    monkeypatch.setattr("dsg.data.manifest_stream.SORT_RUN_ENTRIES", 17)  # force spilled runs
+    old, new = _random_pair(seed)
+    old_path = _write(old, tmp_path / f"old{formats[0]}")
+    new_path = _write(new, tmp_path / f"new{formats[1]}")
+
+    changes = list(diff_manifests(old_path, new_path, prefix=prefix, detect_moves=False))
+
+    assert [(change.change, change.path) for change in changes] == _reference(old, new, prefix)
+    for change in changes:
+        before, after = old.entries.get(change.path), new.entries.get(change.path)
+        assert change.old_size == getattr(before, "filesize", None)
+        assert change.new_size == getattr(after, "filesize", None)
+        assert change.size_delta == (change.new_size or 0) - (change.old_size or 0)
+
+
+def test_sorted_records_spills_and_merges(tmp_path):
+    old, _ = _random_pair(0)
+    path = _write(old, tmp_path / "m.json.lz4")
+
+    streamed = list(sorted_records(path, run_entries=10))
+
+    assert [p for p, _ in streamed] == sorted(old.entries)
+    assert all(record["path"] == p for p, record in streamed)
+    assert [p for p, _ in sorted_records(path, "d3/")] == sorted(p for p in old.entries if p.startswith("d3/"))
+
+
+def test_moves_pair_hashed_files(tmp_path):
+    old = Manifest(entries={"a/x.csv": _file("a/x.csv", 100, "h1"), "a/y.csv": _file("a/y.csv", 5, "h2"),
+                            "a/z.csv": _file("a/z.csv", 7), "keep.csv": _file("keep.csv", 1, "h3")})
+    new = Manifest(entries={"b/x.csv": _file("b/x.csv", 100, "h1"), "b/y.csv": _file("b/y.csv", 6, "h9"),
+                            "b/z.csv": _file("b/z.csv", 7), "keep.csv": _file("keep.csv", 1, "h3")})
+    old_path, new_path = _write(old, tmp_path / "old.json"), _write(new, tmp_path / "new.json")
+
+    changes = [(c.change, c.old_path, c.path, c.size_delta) for c in diff_manifests(old_path, new_path)]
+
+    # Unhashed changes stream in path order; hashed adds/removes are paired afterwards
+    assert changes == [
+        ("removed", None, "a/z.csv", -7),
+        ("added", None, "b/z.csv", 7),
+        ("moved", "a/x.csv", "b/x.csv", 0),
+        ("removed", None, "a/y.csv", -5),
+        ("added", None, "b/y.csv", 6),
+    ]
+    assert [c.change for c in diff_manifests(old_path, new_path, detect_moves=False)].count("moved") == 0
+
+
+@pytest.fixture
+def project(tmp_path):
+    dsg_dir = tmp_path / ".dsg"
+    (dsg_dir / "archive").mkdir(parents=True)
+    for number in (1, 2, 3):
+        manifest = Manifest(entries={f"f{i}.csv": _file(f"f{i}.csv", size=i, file_hash=f"{i:016x}")
+                                     for i in range(number * 2)})
+        manifest.generate_metadata(snapshot_id=f"s{number}", user_id="alice")
+        if number < 3:
+            manifest.to_compressed(dsg_dir / "archive" / f"s{number}-sync.json.lz4", include_metadata=True)
+        else:
+            manifest.to_json(dsg_dir / "last-sync.json", include_metadata=True)
+    config = Mock(spec=Config)
+    config.project_root = tmp_path
+    return config
+
+
+def test_snapshots_resolve_to_their_manifests(project):
+    walker = HistoryWalker(project.project_root)
+
+    assert walker.snapshot_manifest_path("s1").name == "s1-sync.json.lz4"
+    assert walker.snapshot_manifest_path("s3") == walker.current_manifest_path
+    with pytest.raises(ValueError, match="s9"):
+        walker.snapshot_manifest_path("s9")
+    assert [c.path for c in diff_snapshots(project, "s1", "s3")] == ["f2.csv", "f3.csv", "f4.csv", "f5.csv"]
+
+
+def test_diff_command_writes_ndjson(project, capsys):
+    console = Mock(spec=Console)
+
+    result = info_commands.diff(console, project, "s1", "s2", ndjson=True)
+
+    lines = [orjson.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [(line["change"], line["path"], line["size_delta"]) for line in lines] == [
+        ("added", "f2.csv", 2), ("added", "f3.csv", 3)]
+    assert result["counts"]["added"] == 2 and result["size_delta"] == 5
+    console.print.assert_not_called()
+
+
+# done.
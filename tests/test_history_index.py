@@ -0,0 +1,171 @@
+# Author: PB & Claude
+# Maintainer: PB
+# Original date: 2026.10.16
+# License: (c) HRDAG, 2025, GPL-2 or newer
+#
+# ------
+# tests/test_history_index.py
+
+import threading
+import time
+
+import pytest
+
+from dsg.core.history import HistoryWalker, load_in_order
+from dsg.core.history_index import HISTORY_INDEX_RELPATH, HistoryIndex
+from dsg.core.lifecycle import _archive_previous_snapshots, _extend_history_index, _indexed_manifest_paths
+from dsg.data.manifest import FileRef, LinkRef, Manifest
+
+MTIME = "2025-06-01T12:30:00-07:00"
+
+
+def _file(path, size=10, file_hash="", mtime=MTIME):
+    return FileRef(type="file", path=path, user="alice", filesize=size, mtime=mtime, hash=file_hash)
+
+
+def _link(path, reference):
+    return LinkRef(type="link", path=path, user="alice", reference=reference)
+
+
+# Each snapshot exercises a different kind of change; "stable/" never changes
+HISTORY = [
+    {"a.csv": _file("a.csv", file_hash="h1"), "b.csv": _file("b.csv"), "c": _link("c", "a.csv")},
+    {"a.csv": _file("a.csv", file_hash="h2"), "b.csv": _file("b.csv", size=11), "c": _link("c", "a.csv")},
+    {"a.csv": _file("a.csv", size=99, file_hash="h2"), "c": _link("c", "b.csv")},
+    {"a.csv": _file("a.csv", file_hash="h2", mtime="2025-06-02T12:30:00-07:00"), "b.csv": _file("b.csv")},
+]
+STABLE = {f"stable/{i}.csv": _file(f"stable/{i}.csv", file_hash=f"s{i}") for i in range(5)}
+PATHS = ["a.csv", "b.csv", "c", "stable/0.csv", "missing.csv"]
+
+
+def _sync(project, entries, snapshot_id):
+    """The snapshot bookkeeping of _update_manifests_after_sync"""
+    walker = HistoryWalker(project)
+    indexed_paths = _indexed_manifest_paths(walker)
+    prev_manifest = None
+    if walker.current_manifest_path.exists():
+        prev_manifest = Manifest.from_json(walker.current_manifest_path, trusted=True)
+    walker.archive_dir.mkdir(exist_ok=True)
+    archive_path = _archive_previous_snapshots(walker.archive_dir, snapshot_id, prev_manifest)
+    manifest = Manifest(entries={**entries, **STABLE})
+    manifest.generate_metadata(snapshot_id=snapshot_id, user_id="alice")
+    manifest.metadata.snapshot_message = f"sync {snapshot_id}"
+    manifest.to_json(walker.current_manifest_path, include_metadata=True)
+    _extend_history_index(walker, indexed_paths, archive_path, prev_manifest, manifest)
+
+
+def _walk_blame(project, path):
+    index_path = project / HISTORY_INDEX_RELPATH
+    saved = index_path.read_bytes() if index_path.exists() else None
+    index_path.unlink(missing_ok=True)
+    try:
+        return HistoryWalker(project).get_file_blame(path)
+    finally:
+        if saved is not None:
+            index_path.write_bytes(saved)
+
+
+@pytest.fixture
+def project(tmp_path):
+    (tmp_path / ".dsg").mkdir()
+    for number, entries in enumerate(HISTORY, start=1):
+        _sync(tmp_path, entries, f"s{number}")
+    return tmp_path
+
+
+def test_synced_index_matches_walk(project):
+    walker = HistoryWalker(project)
+    with HistoryIndex.for_project(project) as index:
+        assert len(index) == len(HISTORY)
+        assert index.is_current(walker.manifest_paths())
+
+    for path in PATHS:
+        assert walker._indexed_blame(path, walker.manifest_paths()) == _walk_blame(project, path)
+
+    events = [(entry.snapshot_id, entry.event_type, entry.file_hash) for entry in walker.get_file_blame("a.csv")]
+    assert events == [("s1", "add", "h1"), ("s2", "modify", "h2")]
+    assert [entry.event_type for entry in walker.get_file_blame("b.csv")] == ["add", "modify", "delete", "add"]
+    assert [entry.event_type for entry in walker.get_file_blame("c")] == ["add", "modify", "delete"]
+    assert [entry.snapshot_id for entry in walker.get_file_blame("stable/0.csv")] == ["s1"]
+    assert walker.get_file_blame("b.csv")[0].snapshot_message == "sync s1"
+
+
+def test_stale_index_falls_back_to_walk(project, monkeypatch):
+    walker = HistoryWalker(project)
+    expected = walker.get_file_blame("b.csv")
+
+    # A sync by a dsg without the index: the snapshot files change, the index does not
+    manifest = Manifest.from_json(walker.current_manifest_path, trusted=True)
+    manifest.metadata.snapshot_message = "touched"
+    manifest.to_json(walker.current_manifest_path, include_metadata=True)
+
+    assert walker._indexed_blame("b.csv", walker.manifest_paths()) is None
+    monkeypatch.setattr(HistoryIndex, "file_events", lambda self, path: pytest.fail("stale index used"))
+    assert walker.get_file_blame("b.csv")[-1].snapshot_message == "touched"
+    assert [entry.event_type for entry in walker.get_file_blame("b.csv")] == [e.event_type for e in expected]
+
+    # ...and later syncs leave it stale rather than extending it wrongly
+    _sync(project, HISTORY[0], "s5")
+    assert walker._indexed_blame("b.csv", walker.manifest_paths()) is None
+
+
+def test_rebuild_restores_index(project):
+    walker = HistoryWalker(project)
+    (project / HISTORY_INDEX_RELPATH).unlink()
+    _sync(project, HISTORY[0], "s5")
+    assert not HistoryIndex.exists(project)
+
+    assert walker.rebuild_history_index() == len(HISTORY) + 1
+    for path in PATHS:
+        assert walker._indexed_blame(path, walker.manifest_paths()) == _walk_blame(project, path)
+
+    _sync(project, HISTORY[1], "s6")
+    with HistoryIndex.for_project(project) as index:
+        assert len(index) == len(HISTORY) + 2
+    assert [entry.snapshot_id for entry in walker.get_file_blame("a.csv")] == ["s1", "s2", "s5", "s6"]
+    assert walker.get_file_blame("a.csv") == _walk_blame(project, "a.csv")
+
+
+def test_unreadable_snapshot_is_skipped_like_the_walk(project):
+    walker = HistoryWalker(project)
+    _, second = walker.get_archive_files()[1]
+    second.write_bytes(b"not a manifest")
+
+    walker.rebuild_history_index()
+    for path in PATHS:
+        assert walker._indexed_blame(path, walker.manifest_paths()) == _walk_blame(project, path)
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_walk_is_the_same_with_any_workers(project, workers):
+    (project / HISTORY_INDEX_RELPATH).unlink()
+    serial = HistoryWalker(project, workers=1)
+    parallel = HistoryWalker(project, workers=workers)
+    for path in PATHS:
+        assert parallel.get_file_blame(path) == serial.get_file_blame(path)
+
+
+def test_load_in_order_is_ordered_and_bounded():
+    lock = threading.Lock()
+    started, active, peak = [], [0], [0]
+
+    def load(n):
+        with lock:
+            started.append(n)
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.01 * (n % 3))  # finish out of order
+        with lock:
+            active[0] -= 1
+        return n * n
+
+    results = load_in_order(load, list(range(12)), workers=3)
+    assert [next(results) for _ in range(4)] == [0, 1, 4, 9]
+    results.close()
+
+    assert peak[0] <= 3
+    assert len(started) <= 4 + 3  # nothing loaded beyond the look-ahead
+    assert list(load_in_order(load, list(range(12)), workers=3)) == [n * n for n in range(12)]
+
+
+# done.
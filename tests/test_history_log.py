@@ -0,0 +1,97 @@
+# Author: PB & Claude
+# Maintainer: PB
+# Original date: 2026.10.16
+# License: (c) HRDAG, 2025, GPL-2 or newer
+#
+# ------
+# tests/test_history_log.py
+
+import orjson
+import pytest
+
+from dsg.core import history
+from dsg.core.history import HistoryWalker
+from dsg.core.lifecycle import _build_sync_messages_file
+from dsg.data.manifest import FileRef, Manifest
+
+SNAPSHOTS = 6
+
+
+def _manifest(number):
+    entries = {f"f{i}.csv": FileRef(type="file", path=f"f{i}.csv", user="alice", filesize=i + number,
+                                    mtime="2025-06-01T12:30:00-07:00", hash=f"{i + number:016x}")
+               for i in range(10)}
+    manifest = Manifest(entries=entries)
+    manifest.generate_metadata(snapshot_id=f"s{number}", user_id="bob" if number % 2 else "alice")
+    manifest.metadata.snapshot_message = f"message {number}"
+    return manifest
+
+
+@pytest.fixture
+def project(tmp_path):
+    """Snapshots s1..s6 as syncs leave them: s1-s5 archived, s6 current"""
+    dsg_dir = tmp_path / ".dsg"
+    (dsg_dir / "archive").mkdir(parents=True)
+    for number in range(1, SNAPSHOTS + 1):
+        manifest = _manifest(number)
+        _build_sync_messages_file(manifest, dsg_dir, f"s{number}")
+        if number < SNAPSHOTS:
+            manifest.to_compressed(dsg_dir / "archive" / f"s{number}-sync.json.lz4", include_metadata=True)
+        else:
+            manifest.to_json(dsg_dir / "last-sync.json", include_metadata=True)
+    return tmp_path
+
+
+def _ids(entries):
+    return [entry.snapshot_id for entry in entries]
+
+
+def _read_manifests(project):
+    (project / ".dsg" / "sync-messages.json").unlink()
+    return list(HistoryWalker(project).walk_history())
+
+
+def test_log_reads_no_manifest(project, monkeypatch):
+    monkeypatch.setattr(history, "open_manifest_file", lambda path: pytest.fail(f"opened {path}"))
+    monkeypatch.setattr(Manifest, "from_compressed", lambda *args, **kwargs: pytest.fail("loaded archive"))
+
+    entries = list(HistoryWalker(project).walk_history())
+
+    assert _ids(entries) == [f"s{number}" for number in range(SNAPSHOTS, 0, -1)]
+    assert entries[0].snapshot_message == f"message {SNAPSHOTS}"
+    assert _ids(HistoryWalker(project).walk_history(limit=2)) == ["s6", "s5"]
+    assert _ids(HistoryWalker(project).walk_history(author="alice")) == ["s6", "s4", "s2"]
+
+
+def test_recorded_metadata_matches_manifests(project):
+    recorded = list(HistoryWalker(project).walk_history())
+
+    assert _read_manifests(project) == recorded
+
+
+def test_unrecorded_snapshots_fall_back_to_their_manifest(project):
+    sync_messages_path = project / ".dsg" / "sync-messages.json"
+    sync_messages = orjson.loads(sync_messages_path.read_bytes())
+    del sync_messages["snapshots"]["s3"]
+    sync_messages["snapshots"]["s6"] = {"snapshot_id": "s6"}  # not valid metadata
+    sync_messages_path.write_bytes(orjson.dumps(sync_messages))
+
+    entries = list(HistoryWalker(project).walk_history())
+
+    assert entries == _read_manifests(project)
+    assert _ids(entries) == [f"s{number}" for number in range(SNAPSHOTS, 0, -1)]
+
+
+def test_archived_latest_is_not_taken_for_current(project):
+    # sync-messages.json lost the current snapshot: its latest entry, s5, is archived
+    sync_messages_path = project / ".dsg" / "sync-messages.json"
+    sync_messages = orjson.loads(sync_messages_path.read_bytes())
+    del sync_messages["snapshots"]["s6"]
+    sync_messages_path.write_bytes(orjson.dumps(sync_messages))
+
+    entries = list(HistoryWalker(project).walk_history())
+
+    assert _ids(entries) == [f"s{number}" for number in range(SNAPSHOTS, 0, -1)]
+
+
+# done.
@@ -20,7 +20,7 @@ This module tests:
 import pytest
 import datetime
 from pathlib import Path
-from unittest.mock import patch, MagicMock
+from unittest.mock import ANY, patch, MagicMock
 
 from dsg.core.lifecycle import (
     SnapshotInfo, 
@@ -529,8 +529,9 @@ class TestSyncOperations:
         # Verify transaction workflow
         mock_get_sync_status.assert_called_once_with(mock_config, include_remote=True, verbose=False)
         mock_calculate_sync_plan.assert_called_once_with(mock_sync_status, mock_config)
-        mock_create_transaction.assert_called_once_with(mock_config)
-        mock_transaction.sync_files.assert_called_once_with(mock_sync_plan, console)
+        mock_create_transaction.assert_called_once_with(mock_config, snapshot_id="s1")
+        mock_transaction.sync_files.assert_called_once_with(mock_sync_plan, console,
+                                                             expected_hashes=ANY)
         
     @patch('dsg.core.lifecycle._update_manifests_after_sync')
     @patch('dsg.storage.create_transaction')
@@ -575,8 +576,9 @@ class TestSyncOperations:
         # Verify transaction workflow
         mock_get_sync_status.assert_called_once_with(mock_config, include_remote=True, verbose=False)
         mock_calculate_sync_plan.assert_called_once_with(mock_sync_status, mock_config)
-        mock_create_transaction.assert_called_once_with(mock_config)
-        mock_transaction.sync_files.assert_called_once_with(mock_sync_plan, console)
+        mock_create_transaction.assert_called_once_with(mock_config, snapshot_id="s1")
+        mock_transaction.sync_files.assert_called_once_with(mock_sync_plan, console,
+                                                             expected_hashes=ANY)
 
     @patch('dsg.core.lifecycle._update_manifests_after_sync')
     @patch('dsg.storage.create_transaction')
@@ -622,8 +624,9 @@ class TestSyncOperations:
         # Verify transaction workflow
         mock_get_sync_status.assert_called_once_with(mock_config, include_remote=True, verbose=False)
         mock_calculate_sync_plan.assert_called_once_with(mock_sync_status, mock_config)
-        mock_create_transaction.assert_called_once_with(mock_config)
-        mock_transaction.sync_files.assert_called_once_with(mock_sync_plan, console)
+        mock_create_transaction.assert_called_once_with(mock_config, snapshot_id="s1")
+        mock_transaction.sync_files.assert_called_once_with(mock_sync_plan, console,
+                                                             expected_hashes=ANY)
 
     def test_determine_sync_operation_type_init_like(self):
         """Test manifest-level sync type detection for init-like scenario"""
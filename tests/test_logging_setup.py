@@ -13,7 +13,7 @@ from unittest.mock import patch, MagicMock
 import yaml
 from loguru import logger
 
-from dsg.system.logging_setup import detect_repo_name, setup_logging
+from dsg.system.logging_setup import TRACE_ENV_VAR, detect_repo_name, setup_logging, trace_enabled
 
 
 class TestDetectRepoName:
@@ -320,4 +320,49 @@ project:
             if original_env is not None:
                 os.environ["DSG_CONFIG_HOME"] = original_env
             elif "DSG_CONFIG_HOME" in os.environ:
-                del os.environ["DSG_CONFIG_HOME"]
\ No newline at end of file
+                del os.environ["DSG_CONFIG_HOME"]
+
+
+class TestTraceEnabled:
+    def test_trace_disabled_by_default(self, monkeypatch):
+        monkeypatch.delenv(TRACE_ENV_VAR, raising=False)
+        assert not trace_enabled("scanner")
+
+    def test_trace_selected_areas(self, monkeypatch):
+        monkeypatch.setenv(TRACE_ENV_VAR, "Scanner, transaction")
+        assert trace_enabled("scanner")
+        assert trace_enabled("transaction")
+        assert not trace_enabled("history")
+
+    def test_trace_all(self, monkeypatch):
+        monkeypatch.setenv(TRACE_ENV_VAR, "all")
+        assert trace_enabled("history")
+
+
+class TestScannerLogVolume:
+    """The scanner's DEBUG output should not grow with the number of files unless traced."""
+
+    @staticmethod
+    def _debug_lines_for_scan(tmp_path, n_files):
+        from dsg.core.scanner import scan_directory_no_cfg
+
+        root = tmp_path / f"tree-{n_files}"
+        (root / "input").mkdir(parents=True)
+        for i in range(n_files):
+            (root / "input" / f"f{i}.csv").write_text("x")
+
+        messages = []
+        handler_id = logger.add(messages.append, level="DEBUG", format="{message}")
+        try:
+            scan_directory_no_cfg(root)
+        finally:
+            logger.remove(handler_id)
+        return len(messages)
+
+    def test_untraced_scan_logs_constant_lines(self, tmp_path, monkeypatch):
+        monkeypatch.delenv(TRACE_ENV_VAR, raising=False)
+        assert self._debug_lines_for_scan(tmp_path, 5) == self._debug_lines_for_scan(tmp_path, 50)
+
+    def test_traced_scan_logs_per_file(self, tmp_path, monkeypatch):
+        monkeypatch.setenv(TRACE_ENV_VAR, "scanner")
+        assert self._debug_lines_for_scan(tmp_path, 50) > 50
@@ -892,3 +892,52 @@ class TestManifest:
         finally:
             # Remove the handler
             logger.remove(handler_id)
+
+
+class TestTrustedLoad:
+    def test_trusted_load_matches_validated_load(self, sample_manifest, tmp_path):
+        path = tmp_path / "last-sync.json"
+        sample_manifest.to_json(path)
+
+        validated = Manifest.from_json(path)
+        trusted = Manifest.from_json(path, trusted=True)
+
+        assert list(trusted.entries) == list(validated.entries)
+        assert [e.model_dump() for e in trusted.entries.values()] == \
+            [e.model_dump() for e in validated.entries.values()]
+        assert trusted.metadata == validated.metadata
+        assert trusted.verify_integrity()
+
+    def test_trusted_load_skips_per_entry_validation(self, sample_manifest, tmp_path):
+        path = tmp_path / "last-sync.json"
+        sample_manifest.to_json(path)
+
+        with patch.object(FileRef, "model_validate") as file_validate, \
+                patch.object(LinkRef, "model_validate") as link_validate:
+            Manifest.from_json(path, trusted=True)
+
+        file_validate.assert_not_called()
+        link_validate.assert_not_called()
+
+    def test_tampered_manifest_falls_back_to_validation(self, sample_manifest, tmp_path):
+        path = tmp_path / "last-sync.json"
+        sample_manifest.to_json(path)
+        data = orjson.loads(path.read_bytes())
+        # An escaping symlink that would never pass LinkRef validation
+        data["entries"]["link/escape"] = {
+            "type": "link", "path": "link/escape", "user": "", "reference": "../../../etc/passwd"}
+        data["metadata"]["entry_count"] += 1
+
+        loaded = Manifest.from_bytes(orjson.dumps(data), trusted=True)
+
+        assert "link/escape" not in loaded.entries
+        assert len(loaded.entries) == len(sample_manifest.entries)
+
+    def test_manifest_without_metadata_is_validated(self, sample_manifest_entries):
+        data = {"entries": {p: e.model_dump() for p, e in sample_manifest_entries.items()}}
+
+        with patch.object(FileRef, "model_validate", wraps=FileRef.model_validate) as file_validate:
+            loaded = Manifest.from_bytes(orjson.dumps(data), trusted=True)
+
+        assert file_validate.called
+        assert list(loaded.entries) == list(sample_manifest_entries)
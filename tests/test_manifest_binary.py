@@ -0,0 +1,82 @@
+# Author: PB & Claude
+# Maintainer: PB
+# Original date: 2026.10.16
+# License: (c) HRDAG, 2025, GPL-2 or newer
+#
+# ------
+# tests/test_manifest_binary.py
+
+import lz4.frame
+import pytest
+
+from dsg.data.manifest import FileRef, LinkRef, Manifest
+from dsg.data.manifest_binary import ManifestIndex, encode_manifest, is_binary_manifest
+
+
+def _file(path, hash="0123456789abcdef", mtime="2025-06-01T12:30:00-07:00"):
+    return FileRef(type="file", path=path, user="alice", filesize=len(path), mtime=mtime, hash=hash)
+
+
+@pytest.fixture
+def manifest():
+    entries = {path: _file(path) for path in ["zeta/b.csv", "input/ü.csv", "input/a.csv", "inputs.csv"]}
+    entries["input/link.csv"] = LinkRef(type="link", path="input/link.csv", user="bob", reference="a.csv")
+    entries["odd.csv"] = _file("odd.csv", hash="", mtime="2025-06-01T12:30:00Z")
+    manifest = Manifest(entries=entries)
+    manifest.generate_metadata(snapshot_id="s1", user_id="alice")
+    return manifest
+
+
+def test_binary_round_trip_keeps_order_and_entries_hash(manifest, tmp_path):
+    manifest.to_binary(tmp_path / "m.bin")
+    manifest.to_json(tmp_path / "m.json")
+
+    from_binary = Manifest.from_json(tmp_path / "m.bin", trusted=True)
+    from_json = Manifest.from_json(tmp_path / "m.json")
+
+    assert list(from_binary.entries) == list(manifest.entries)
+    assert from_binary.entries == from_json.entries
+    assert from_binary.metadata == from_json.metadata
+    assert from_binary.verify_integrity()
+
+
+def test_index_lookups_and_prefix_scans(manifest, tmp_path):
+    manifest.to_binary(tmp_path / "m.bin")
+
+    with ManifestIndex.open(tmp_path / "m.bin") as index:
+        assert len(index) == 6
+        assert index.get("input/a.csv") == manifest.entries["input/a.csv"]
+        assert index.get("input/link.csv").reference == "a.csv"
+        assert index.record("odd.csv")["mtime"] == "2025-06-01T12:30:00Z"
+        assert index.get("input/missing.csv") is None
+        assert "zeta/b.csv" in index and "zeta" not in index
+        assert [r["path"] for r in index.scan_prefix("input/")] == \
+            ["input/a.csv", "input/link.csv", "input/ü.csv"]
+        assert list(index.scan_prefix("nothing/")) == []
+        assert index.metadata["entry_count"] == 6
+
+
+def test_binary_manifest_without_metadata():
+    data = encode_manifest(iter([_file("a").model_dump()]))
+
+    assert is_binary_manifest(data)
+    assert ManifestIndex(data).metadata is None
+    assert Manifest.from_bytes(data).metadata is None
+
+
+def test_compressed_binary_manifest_is_detected(manifest, tmp_path):
+    manifest.to_binary(tmp_path / "m.bin")
+    archive = tmp_path / "s1-sync.bin.lz4"
+    archive.write_bytes(lz4.frame.compress((tmp_path / "m.bin").read_bytes()))
+
+    assert Manifest.from_compressed(archive).entries == manifest.entries
+
+
+def test_rejects_bad_input():
+    with pytest.raises(ValueError):
+        ManifestIndex(b"{\"entries\": {}}")
+    with pytest.raises(ValueError):
+        encode_manifest(iter([_file("a").model_dump(), _file("a").model_dump()]))
+
+
+# done.
@@ -0,0 +1,137 @@
+# Author: PB & Claude
+# Maintainer: PB
+# Original date: 2026.10.16
+# License: (c) HRDAG, 2025, GPL-2 or newer
+#
+# ------
+# tests/test_manifest_store.py
+
+import copy
+from collections import OrderedDict
+
+import pytest
+
+from dsg.data.manifest import FileRef, LinkRef, Manifest
+from dsg.data.manifest_store import ManifestEntries
+
+
+def _file(path, mtime="2025-06-01T12:30:00-07:00", hash="0123456789abcdef", user="alice"):
+    return FileRef(type="file", path=path, user=user, filesize=42, mtime=mtime, hash=hash)
+
+
+@pytest.fixture
+def entries():
+    return OrderedDict([
+        ("input/a.csv", _file("input/a.csv")),
+        ("input/b.csv", _file("input/b.csv", hash="")),
+        ("input/link.csv", LinkRef(type="link", path="input/link.csv", user="bob", reference="a.csv")),
+    ])
+
+
+@pytest.mark.parametrize("mtime", [
+    "2025-06-01T12:30:00-07:00",
+    "2025-06-01T12:30:00.123456+05:30",
+    "1969-12-31T23:59:59+00:00",
+    "2025-06-01T12:30:00Z",          # not dsg's own format: kept verbatim
+    "2025-06-01T12:30:00",           # naive
+    "",
+])
+def test_fields_round_trip_exactly(mtime):
+    store = ManifestEntries({"f": _file("f", mtime=mtime, hash="NOT-A-HASH")})
+
+    assert store["f"].model_dump() == _file("f", mtime=mtime, hash="NOT-A-HASH").model_dump()
+    assert dict(store.records())["f"]["mtime"] == mtime
+
+
+def test_mapping_behaves_like_ordered_dict(entries):
+    store = ManifestEntries(entries)
+
+    assert list(store) == list(entries)
+    assert store == entries
+    assert "input/a.csv" in store and "missing" not in store
+    assert [e.model_dump() for e in store.values()] == [e.model_dump() for e in entries.values()]
+
+    del store["input/a.csv"]
+    store["input/a.csv"] = _file("input/a.csv")
+    store["input/b.csv"] = _file("input/b.csv", hash="fedcba9876543210")
+    assert list(store) == ["input/b.csv", "input/link.csv", "input/a.csv"]
+    assert store["input/b.csv"].hash == "fedcba9876543210"
+
+
+def test_field_writes_on_entries_reach_the_columns(entries):
+    store = ManifestEntries(entries)
+
+    store["input/b.csv"].hash = "00000000000000ff"
+    store["input/link.csv"].user = "carol"
+
+    records = dict(store.records())
+    assert records["input/b.csv"]["hash"] == "00000000000000ff"
+    assert records["input/link.csv"]["user"] == "carol"
+    # The original objects were inserted, so writes through them land too
+    entries["input/a.csv"].user = "dave"
+    assert store.get_field("input/a.csv", "user") == "dave"
+
+
+def test_live_entry_identity_and_detachment(entries):
+    store = ManifestEntries(entries)
+    entry = store["input/a.csv"]
+    assert store["input/a.csv"] is entry
+
+    store["input/a.csv"] = _file("input/a.csv", hash="1111111111111111")
+    entry.hash = "2222222222222222"  # no longer in the store
+
+    assert store["input/a.csv"].hash == "1111111111111111"
+
+
+def test_copies_are_independent_mappings(entries):
+    store = ManifestEntries(entries)
+    clone = store.copy()
+    deep = copy.deepcopy(store)
+
+    del clone["input/a.csv"]
+    deep["input/b.csv"].hash = "00000000000000aa"
+
+    assert "input/a.csv" in store
+    assert store.get_field("input/b.csv", "hash") == ""
+
+
+def test_compaction_keeps_order_and_values():
+    store = ManifestEntries({f"f{i:03d}": _file(f"f{i:03d}") for i in range(200)})
+    for i in range(0, 200, 3):
+        del store[f"f{i:03d}"]
+    for i in range(1, 200, 3):
+        del store[f"f{i:03d}"]
+
+    assert list(store) == [f"f{i:03d}" for i in range(2, 200, 3)]
+    assert store["f002"].model_dump() == _file("f002").model_dump()
+    assert len(store._paths) < 200
+
+
+def test_from_records_matches_add_record(entries):
+    records = {path: entry.model_dump() for path, entry in entries.items()}
+    records["odd"] = _file("odd", mtime="2025-06-01T12:30:00Z", hash="NOT-A-HASH").model_dump()
+    one_by_one = ManifestEntries()
+    for path, record in records.items():
+        one_by_one.add_record(path, record)
+
+    bulk = ManifestEntries.from_records(records)
+
+    assert list(bulk.records()) == list(one_by_one.records())
+    assert bulk.users() == one_by_one.users()
+
+
+def test_manifest_stores_entries_in_columns(entries, tmp_path):
+    manifest = Manifest(entries=entries)
+    assert isinstance(manifest.entries, ManifestEntries)
+
+    manifest.to_json(tmp_path / "m.json", user_id="alice")
+    loaded = Manifest.from_json(tmp_path / "m.json")
+
+    assert isinstance(loaded.entries, ManifestEntries)
+    assert loaded.entries == manifest.entries
+    assert loaded.verify_integrity()
+    assert loaded.entries.users() == ["alice", "bob"]
+    assert list(loaded.entries.links()) == [("input/link.csv", "a.csv")]
+
+
+# done.
@@ -0,0 +1,113 @@
+# Author: PB & Claude
+# Maintainer: PB
+# Original date: 2026.10.16
+# License: (c) HRDAG, 2025, GPL-2 or newer
+#
+# ------
+# tests/test_manifest_stream.py
+
+import io
+
+import orjson
+import pytest
+
+from dsg.core.history import HistoryWalker
+from dsg.data.manifest import FileRef, LinkRef, Manifest
+from dsg.data.manifest_stream import ManifestReader, ManifestWriter
+
+
+def _file(path, hash="0123456789abcdef"):
+    return FileRef(type="file", path=path, user="alice", filesize=123456789,
+                   mtime="2025-06-01T12:30:00-07:00", hash=hash)
+
+
+@pytest.fixture
+def manifest():
+    entries = {path: _file(path) for path in ["input/a.csv", "input/é \"quoted\".csv", "zeta/b.csv"]}
+    entries["input/link.csv"] = LinkRef(type="link", path="input/link.csv", user="bob", reference="a.csv")
+    manifest = Manifest(entries=entries)
+    manifest.generate_metadata(snapshot_id="s1", user_id="alice")
+    return manifest
+
+
+def test_writer_matches_whole_document_serialization(manifest, tmp_path):
+    manifest.to_json(tmp_path / "m.json")
+    records = {path: entry.model_dump() for path, entry in manifest.entries.items()}
+    expected = orjson.dumps({"entries": records, "metadata": manifest.metadata.model_dump()},
+                            option=orjson.OPT_INDENT_2)
+
+    assert (tmp_path / "m.json").read_bytes() == expected
+
+    empty = io.BytesIO()
+    ManifestWriter(empty).finish()
+    assert empty.getvalue() == orjson.dumps({"entries": {}}, option=orjson.OPT_INDENT_2)
+
+
+def test_writer_tracks_count_and_hash(manifest):
+    writer = ManifestWriter(io.BytesIO())
+    for entry in manifest.entries.values():
+        writer.write(entry.model_dump())
+
+    assert writer.entry_count == manifest.metadata.entry_count
+    assert writer.entries_hash == manifest.metadata.entries_hash
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 1 << 20])
+def test_reader_yields_entries_across_chunk_boundaries(manifest, tmp_path, chunk_size):
+    manifest.to_json(tmp_path / "m.json")
+
+    with open(tmp_path / "m.json", "rb") as f:
+        reader = ManifestReader(f, chunk_size=chunk_size)
+        items = list(reader.items(trusted=True))
+
+    assert [path for path, _ in items] == list(manifest.entries)
+    assert dict(items) == dict(manifest.entries)
+    assert reader.metadata == manifest.metadata.model_dump()
+
+
+def test_reader_validates_and_checks_integrity():
+    data = {"entries": {"a": _file("a").model_dump(), "bad": {"type": "file", "path": "bad"},
+                        "odd": {"type": "dir"}},
+            "extra": [1, {"x": 2}]}
+    reader = ManifestReader(io.BytesIO(orjson.dumps(data)), chunk_size=5)
+    assert [path for path, _ in reader.items()] == ["a"]
+
+    tampered = ManifestReader(io.BytesIO(orjson.dumps(
+        {"entries": {"a": _file("a").model_dump()}, "metadata": {"entry_count": 1, "entries_hash": "0"}})))
+    with pytest.raises(ValueError):
+        list(tampered.items(trusted=True))
+
+    with pytest.raises(ValueError):
+        list(ManifestReader(io.BytesIO(b'{"entries": {"a": {"type": ')).entries())
+
+
+@pytest.mark.parametrize("suffix", [".lz4", ".gz"])
+def test_compressed_round_trip(manifest, tmp_path, suffix):
+    archive = tmp_path / f"s1-sync.json{suffix}"
+    manifest.to_compressed(archive)
+
+    loaded = Manifest.from_compressed(archive, trusted=True)
+
+    assert list(loaded.entries) == list(manifest.entries)
+    assert loaded.entries == manifest.entries
+    assert loaded.verify_integrity()
+
+
+def test_blame_streams_each_snapshot(tmp_path):
+    archive_dir = tmp_path / ".dsg" / "archive"
+    archive_dir.mkdir(parents=True)
+    history = [("s1", {"a.csv": _file("a.csv", "1111111111111111")}),
+               ("s2", {"a.csv": _file("a.csv", "2222222222222222"), "b.csv": _file("b.csv")}),
+               ("s3", {"b.csv": _file("b.csv")})]
+    for snapshot_id, entries in history:
+        snapshot = Manifest(entries=entries)
+        snapshot.generate_metadata(snapshot_id=snapshot_id, user_id="alice")
+        snapshot.to_compressed(archive_dir / f"{snapshot_id}-sync.json.lz4")
+
+    blame = HistoryWalker(tmp_path).get_file_blame("a.csv")
+
+    assert [(b.snapshot_id, b.event_type) for b in blame] == [("s1", "add"), ("s2", "modify"), ("s3", "delete")]
+    assert blame[1].file_hash == "2222222222222222"
+
+
+# done.
@@ -0,0 +1,106 @@
+# Author: PB & Claude
+# Maintainer: PB
+# Original date: 2026.10.16
+# License: (c) HRDAG, 2025, GPL-2 or newer
+#
+# ------
+# tests/test_manifest_tree.py
+
+import random
+from collections import OrderedDict
+from types import SimpleNamespace
+
+from dsg.data.manifest import FileRef, LinkRef, Manifest
+from dsg.data.manifest_merger import ManifestMerger, SyncState
+from dsg.data.manifest_tree import DirectoryTree, compare_trees, comparison_keys
+
+
+def _file(path, hash="0123456789abcdef", mtime="2025-06-01T12:30:00-07:00", user="alice"):
+    return FileRef(type="file", path=path, user=user, filesize=42, mtime=mtime, hash=hash)
+
+
+def test_digest_covers_only_what_equality_compares():
+    a = Manifest(entries={"d/x": _file("d/x"), "d/y": _file("d/y", hash="", mtime="2025-01-01T00:00:00+00:00")})
+    b = Manifest(entries={"d/y": _file("d/y", hash="", mtime="2025-01-01T00:00:00+00:00", user="bob"),
+                          "d/x": _file("d/x", mtime="2026-01-01T00:00:00+00:00", user="bob")})
+    c = Manifest(entries={"d/x": _file("d/x"), "d/y": _file("d/y", hash="", mtime="2025-01-01T00:00:01+00:00")})
+
+    assert DirectoryTree(a.entries).digests[""] == DirectoryTree(b.entries).digests[""]
+    assert DirectoryTree(a.entries).digests["d"] != DirectoryTree(c.entries).digests["d"]
+
+
+def test_store_and_plain_mappings_give_the_same_keys():
+    entries = OrderedDict([("a/x", _file("a/x")), ("a/raw", _file("a/raw", hash="NOT-HEX")),
+                           ("a/new", _file("a/new", hash="")),
+                           ("l", LinkRef(type="link", path="l", reference="a/x"))])
+
+    assert list(comparison_keys(entries)) == list(comparison_keys(Manifest(entries=entries).entries))
+
+
+def test_tree_structure_and_subtree_listing():
+    tree = DirectoryTree(Manifest(entries={p: _file(p) for p in ["top", "a/b/c/deep", "a/one", "a/b/two"]}).entries)
+
+    assert sorted(tree.digests) == ["", "a", "a/b", "a/b/c"]
+    assert sorted(tree.paths_under("a/b")) == ["a/b/c/deep", "a/b/two"]
+    assert tree.subdirs[""] == ["a"]
+
+
+def test_compare_trees_descends_only_into_differences():
+    base = {f"{d}/f{i}": _file(f"{d}/f{i}") for d in ("same", "changed") for i in range(3)}
+    other = dict(base, **{"changed/f1": _file("changed/f1", hash="00000000000000ff")})
+
+    identical, candidates = compare_trees([DirectoryTree(base), DirectoryTree(other), DirectoryTree(base)])
+
+    assert sorted(identical) == ["same/f0", "same/f1", "same/f2"]
+    assert sorted(candidates) == ["changed/f0", "changed/f1", "changed/f2"]
+
+
+def _reference_state(local, cache, remote):
+    """SyncState from entry objects and __eq__, as the README SyncState table lists them"""
+    ex = "".join("1" if entry is not None else "0" for entry in (local, cache, remote))
+    if ex == "111":
+        if local == cache and local == remote:
+            return SyncState.sLCR__all_eq
+        if local == cache:
+            return SyncState.sLCR__L_eq_C_ne_R
+        if local == remote:
+            return SyncState.sLCR__L_eq_R_ne_C
+        if cache == remote:
+            return SyncState.sLCR__C_eq_R_ne_L
+        return SyncState.sLCR__all_ne
+    pairs = {"011": (cache, remote, SyncState.sxLCR__C_eq_R, SyncState.sxLCR__C_ne_R),
+             "101": (local, remote, SyncState.sLxCR__L_eq_R, SyncState.sLxCR__L_ne_R),
+             "110": (local, cache, SyncState.sLCxR__L_eq_C, SyncState.sLCxR__L_ne_C)}
+    if ex in pairs:
+        a, b, same, different = pairs[ex]
+        return same if a == b else different
+    return {"001": SyncState.sxLCxR__only_R, "010": SyncState.sxLCRx__only_C,
+            "100": SyncState.sLxCxR__only_L, "000": SyncState.sxLxCxR__none}[ex]
+
+
+def test_merger_states_match_per_path_classification(tmp_path):
+    rng = random.Random(16)
+    paths = [f"{rng.choice(['a', 'a/b', 'c', 'c/d/e', ''])}/f{i}".lstrip("/") for i in range(300)]
+    hashes = ["", "1111111111111111", "2222222222222222", "NOT-HEX"]
+    mtimes = ["2025-06-01T12:30:00-07:00", "2025-06-01T19:30:00+00:00", "yesterday"]
+
+    def entry(path):
+        if rng.random() < 0.05:
+            return LinkRef(type="link", path=path, reference=rng.choice(["x", "y"]))
+        hash = rng.choice(hashes) if rng.random() < 0.3 else hashes[1]
+        return _file(path, hash=hash, mtime=rng.choice(mtimes))
+
+    def manifest():
+        return Manifest(entries={path: entry(path) for path in paths if rng.random() < 0.85})
+
+    config = SimpleNamespace(user=SimpleNamespace(user_id="alice", hash_workers=1), project_root=tmp_path)
+    merger = ManifestMerger(manifest(), manifest(), manifest(), config)
+
+    for path, state in merger.get_sync_states().items():
+        expected = _reference_state(*(m.entries.get(path) for m in (merger.local, merger.cache, merger.remote)))
+        assert state == expected == merger._classify(path), path
+    assert list(merger.get_sync_states())[:-1] == sorted(
+        set(merger.local.entries) | set(merger.cache.entries) | set(merger.remote.entries))
+
+
+# done.
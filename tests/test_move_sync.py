@@ -0,0 +1,67 @@
+# Author: PB & Claude
+# Maintainer: PB
+# Original date: 2026.10.16
+# License: (c) HRDAG, 2025, GPL-2 or newer
+#
+# ------
+# tests/test_move_sync.py
+
+import pytest
+
+from dsg.core.transaction_coordinator import Transaction
+from dsg.storage.client import ClientFilesystem
+from dsg.storage.io_transports import LocalhostTransport
+from dsg.storage.remote import XFSFilesystem
+
+
+@pytest.fixture
+def sides(tmp_path):
+    root = tmp_path / "project"
+    (root / ".dsg").mkdir(parents=True)
+    repo = tmp_path / "repo"
+    for base in (root, repo):
+        (base / "input").mkdir(parents=True)
+        (base / "input" / "big.bin").write_bytes(b"b" * 50_000)
+    return root, repo
+
+
+def test_remote_move_renames_in_staging(sides, tmp_path):
+    root, repo = sides
+    remote_fs = XFSFilesystem(str(repo))
+
+    with Transaction(ClientFilesystem(root), remote_fs, LocalhostTransport(tmp_path / "t")) as tx:
+        tx.sync_files({'move_remote': [("input/big.bin", "input/renamed/big.bin")]})
+
+    assert not (repo / "input" / "big.bin").exists()
+    assert (repo / "input" / "renamed" / "big.bin").read_bytes() == b"b" * 50_000
+
+
+def test_local_move_is_staged_as_hardlink(sides, tmp_path):
+    root, repo = sides
+    original = root / "input" / "big.bin"
+    inode = original.stat().st_ino
+
+    with Transaction(ClientFilesystem(root), XFSFilesystem(str(repo)),
+                     LocalhostTransport(tmp_path / "t")) as tx:
+        tx.sync_files({'move_local': [("input/big.bin", "output/big.bin")]})
+
+    moved = root / "output" / "big.bin"
+    assert not original.exists()
+    assert moved.read_bytes() == b"b" * 50_000
+    assert moved.stat().st_ino == inode
+
+
+def test_local_move_rolled_back_on_failure(sides, tmp_path):
+    root, repo = sides
+
+    with pytest.raises(RuntimeError):
+        with Transaction(ClientFilesystem(root), XFSFilesystem(str(repo)),
+                         LocalhostTransport(tmp_path / "t")) as tx:
+            tx.sync_files({'move_local': [("input/big.bin", "output/big.bin")]})
+            raise RuntimeError("abort")
+
+    assert (root / "input" / "big.bin").exists()
+    assert not (root / "output" / "big.bin").exists()
+
+
+# done.
@@ -6,8 +6,14 @@
 # ------
 # dsg/tests/test_operations.py
 
+import threading
+from types import SimpleNamespace
+
 import pytest
-from dsg.core.operations import list_directory, parse_cli_overrides
+from dsg.core import operations
+from dsg.core.operations import get_sync_status, list_directory, parse_cli_overrides
+from dsg.core.scanner import ScanResult
+from dsg.data.manifest import FileRef, Manifest
 
 @pytest.fixture
 def test_data_directory(tmp_path):
@@ -181,4 +187,61 @@ def test_list_directory_with_debug(test_data_directory, capsys):
     # Verify we still got results using the minimal config
     # Should find the file in the input directory
     assert len(result.manifest.entries) > 0
-    assert "input/test.txt" in [str(p) for p in result.manifest.entries.keys()]
\ No newline at end of file
+    assert "input/test.txt" in [str(p) for p in result.manifest.entries.keys()]
+
+
+def test_get_sync_status_fetches_remote_during_scan(tmp_path, monkeypatch):
+    remote = Manifest(entries={"a.csv": FileRef(type="file", path="a.csv", filesize=1,
+                                                mtime="2025-06-01T12:30:00-07:00", hash="0123456789abcdef")})
+    # Each side waits for the other to start: run one after the other, they time out
+    scanning, fetching = threading.Event(), threading.Event()
+    overlapped = []
+
+    def slow_scan(config, include_dsg_files):
+        scanning.set()
+        overlapped.append(fetching.wait(timeout=5))
+        return ScanResult(manifest=Manifest(entries={}))
+
+    remote.to_json(tmp_path / "remote.json")
+
+    class SlowBackend:
+        def read_file(self, path):
+            fetching.set()
+            overlapped.append(scanning.wait(timeout=5))
+            return (tmp_path / "remote.json").read_bytes()
+
+    monkeypatch.setattr(operations, "scan_directory", slow_scan)
+    monkeypatch.setattr(operations, "create_backend", lambda config: SlowBackend())
+    config = SimpleNamespace(user=SimpleNamespace(user_id="alice", hash_workers=1), project_root=tmp_path)
+
+    result = get_sync_status(config)
+
+    assert list(result.remote_manifest.entries) == ["a.csv"]
+    assert overlapped == [True, True]
+    assert set(result.timings) == {"scan", "cache", "remote", "remote_wait", "recover", "merge", "total"}
+
+
+def test_get_sync_status_local_error_does_not_wait_for_remote(tmp_path, monkeypatch):
+    fetching, release, fetched = threading.Event(), threading.Event(), threading.Event()
+
+    def failing_scan(config, include_dsg_files):
+        fetching.wait(timeout=5)
+        raise PermissionError("cannot read input/")
+
+    class HungBackend:
+        def read_file(self, path):
+            fetching.set()
+            release.wait(timeout=5)  # a remote that is slow to answer
+            fetched.set()
+            raise FileNotFoundError(path)
+
+    monkeypatch.setattr(operations, "scan_directory", failing_scan)
+    monkeypatch.setattr(operations, "create_backend", lambda config: HungBackend())
+    config = SimpleNamespace(user=SimpleNamespace(user_id="alice", hash_workers=1), project_root=tmp_path)
+
+    try:
+        with pytest.raises(PermissionError, match="cannot read"):
+            get_sync_status(config)
+        assert not fetched.is_set()
+    finally:
+        release.set()
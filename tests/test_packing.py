@@ -0,0 +1,172 @@
+# Author: PB & Claude
+# Maintainer: PB
+# Original date: 2026.10.16
+# License: (c) HRDAG, 2025, GPL-2 or newer
+#
+# ------
+# tests/test_packing.py
+
+import io
+import tarfile
+
+import pytest
+import xxhash
+
+from dsg.core.transaction_coordinator import PackPolicy, Transaction, plan_pack_batches
+from dsg.storage.client import ClientFilesystem
+from dsg.storage.io_transports import LocalhostTransport
+from dsg.storage.packing import PackContentStream, extract_pack
+from dsg.storage.remote import XFSFilesystem
+from dsg.system.exceptions import TransactionIntegrityError
+
+
+@pytest.fixture
+def project(tmp_path):
+    root = tmp_path / "project"
+    (root / ".dsg").mkdir(parents=True)
+    files = {
+        "input/a.csv": b"alpha\n",
+        "input/nested/b.csv": b"bravo\n" * 10,
+        "input/empty.txt": b"",
+        "input/big.bin": b"x" * 200_000,
+    }
+    for rel_path, content in files.items():
+        path = root / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(content)
+    return root, files
+
+
+def _write_stream(stream, path):
+    with open(path, 'wb') as f:
+        for chunk in stream.read():
+            f.write(chunk)
+
+
+def test_pack_roundtrip_with_member_hashes(project, tmp_path):
+    root, files = project
+    small = ["input/a.csv", "input/nested/b.csv", "input/empty.txt"]
+    stream = PackContentStream(root, small)
+    archive = tmp_path / "pack.tar"
+    _write_stream(stream, archive)
+
+    assert stream.size == archive.stat().st_size
+    assert stream.content_hash == xxhash.xxh3_64(archive.read_bytes()).hexdigest()
+    assert stream.member_hashes == {p: xxhash.xxh3_64(files[p]).hexdigest() for p in small}
+
+    dest = tmp_path / "dest"
+    extract_pack(archive, dest, small)
+    for rel_path in small:
+        assert (dest / rel_path).read_bytes() == files[rel_path]
+
+
+def test_extract_replaces_existing_symlink(project, tmp_path):
+    root, files = project
+    archive = tmp_path / "pack.tar"
+    _write_stream(PackContentStream(root, ["input/a.csv"]), archive)
+    dest = tmp_path / "dest"
+    (dest / "input").mkdir(parents=True)
+    target = tmp_path / "outside.txt"
+    target.write_text("untouched")
+    (dest / "input" / "a.csv").symlink_to(target)
+
+    extract_pack(archive, dest, ["input/a.csv"])
+
+    assert not (dest / "input" / "a.csv").is_symlink()
+    assert (dest / "input" / "a.csv").read_bytes() == files["input/a.csv"]
+    assert target.read_text() == "untouched"
+
+
+def test_extract_rejects_unexpected_members(tmp_path):
+    archive = tmp_path / "evil.tar"
+    with tarfile.open(archive, 'w') as tar:
+        info = tarfile.TarInfo("../escape.txt")
+        info.size = 3
+        tar.addfile(info, io.BytesIO(b"bad"))
+
+    with pytest.raises(ValueError, match="Unexpected member"):
+        extract_pack(archive, tmp_path / "dest", ["input/a.csv"])
+    assert not (tmp_path / "escape.txt").exists()
+
+
+def test_extract_requires_every_expected_member(project, tmp_path):
+    root, _ = project
+    archive = tmp_path / "pack.tar"
+    _write_stream(PackContentStream(root, ["input/a.csv"]), archive)
+
+    with pytest.raises(ValueError, match="missing 1 files"):
+        extract_pack(archive, tmp_path / "dest", ["input/a.csv", "input/empty.txt"])
+
+
+def test_plan_pack_batches_respects_limits():
+    policy = PackPolicy(threshold_bytes=100, batch_files=2, batch_bytes=50)
+    sized = [("a", 10), ("b", 10), ("c", 10), ("d", 45), ("e", 1)]
+
+    assert plan_pack_batches(sized, policy) == [["a", "b"], ["c"], ["d", "e"]]
+
+
+class TestPackedUpload:
+
+    @pytest.fixture
+    def transaction_parts(self, project, tmp_path):
+        root, files = project
+        repo = tmp_path / "remote" / "repo"
+        repo.mkdir(parents=True)
+        return (root, files, repo, ClientFilesystem(root), XFSFilesystem(str(repo)),
+                LocalhostTransport(tmp_path / "transfers", zero_copy=False))
+
+    def test_small_files_are_packed_large_sent_alone(self, transaction_parts, monkeypatch):
+        root, files, repo, client_fs, remote_fs, transport = transaction_parts
+        packs, singles = [], []
+        monkeypatch.setattr(remote_fs, "recv_pack", _spy(remote_fs.recv_pack, packs))
+        monkeypatch.setattr(remote_fs, "recv_file", _spy(remote_fs.recv_file, singles))
+
+        with Transaction(client_fs, remote_fs, transport, transfer_workers=2,
+                         pack_policy=PackPolicy(threshold_bytes=64 * 1024)) as tx:
+            tx.upload_files(list(files))
+
+        assert [sorted(args[0]) for args in packs] == [
+            ["input/a.csv", "input/empty.txt", "input/nested/b.csv"]]
+        assert [args[0] for args in singles] == ["input/big.bin"]
+        for rel_path, content in files.items():
+            assert (repo / rel_path).read_bytes() == content
+        assert tx.transferred_hashes == {p: xxhash.xxh3_64(c).hexdigest() for p, c in files.items()}
+
+    def test_packing_disabled_sends_files_individually(self, transaction_parts, monkeypatch):
+        root, files, repo, client_fs, remote_fs, transport = transaction_parts
+        packs = []
+        monkeypatch.setattr(remote_fs, "recv_pack", _spy(remote_fs.recv_pack, packs))
+
+        with Transaction(client_fs, remote_fs, transport,
+                         pack_policy=PackPolicy(threshold_bytes=0)) as tx:
+            tx.upload_files(list(files))
+
+        assert packs == []
+        for rel_path, content in files.items():
+            assert (repo / rel_path).read_bytes() == content
+
+    def test_zero_copy_transport_is_not_packed(self, transaction_parts, tmp_path):
+        root, files, repo, client_fs, remote_fs, _ = transaction_parts
+        tx = Transaction(client_fs, remote_fs, LocalhostTransport(tmp_path / "zc"))
+
+        assert tx._plan_upload_units(list(files)) == list(files)
+
+    def test_member_hash_mismatch_rolls_back(self, transaction_parts):
+        root, files, repo, client_fs, remote_fs, transport = transaction_parts
+
+        with pytest.raises(TransactionIntegrityError, match="input/a.csv"):
+            with Transaction(client_fs, remote_fs, transport, transfer_workers=1) as tx:
+                tx.sync_files({'upload_files': ["input/a.csv", "input/empty.txt"]},
+                              expected_hashes={"input/a.csv": "0000000000000000"})
+
+        assert not (repo / "input" / "a.csv").exists()
+
+
+def _spy(func, calls):
+    def wrapper(*args):
+        calls.append(args)
+        return func(*args)
+    return wrapper
+
+
+# done.
@@ -0,0 +1,111 @@
+# Author: PB & Claude
+# Maintainer: PB
+# Original date: 2026.10.16
+# License: (c) HRDAG, 2025, GPL-2 or newer
+#
+# ------
+# tests/test_remote_manifest_cache.py
+
+import pytest
+
+from dsg.core.remote_manifest_cache import (
+    REMOTE_CACHE_RELPATH,
+    REMOTE_SIDECAR_RELPATH,
+    fetch_remote_manifest,
+)
+from dsg.data.manifest import FileRef, Manifest
+from dsg.storage.backends import LocalhostBackend
+
+
+def _write_remote(remote_root, snapshot_id, n=20):
+    entries = {f"input/f{i}.csv": FileRef(type="file", path=f"input/f{i}.csv", user="alice", filesize=i,
+                                          mtime="2025-06-01T12:30:00-07:00", hash=f"{i:016x}")
+               for i in range(n)}
+    manifest = Manifest(entries=entries)
+    manifest.generate_metadata(snapshot_id=snapshot_id, user_id="alice")
+    manifest.to_json(remote_root / ".dsg" / "last-sync.json", include_metadata=True)
+
+
+@pytest.fixture
+def setup(tmp_path, monkeypatch):
+    remote_root = tmp_path / "remote" / "repo"
+    (remote_root / ".dsg").mkdir(parents=True)
+    project = tmp_path / "local"
+    (project / ".dsg").mkdir(parents=True)
+    backend = LocalhostBackend(tmp_path / "remote", "repo")
+    reads = []
+    real_read = backend.read_file
+    monkeypatch.setattr(backend, "read_file", lambda rel_path: reads.append(rel_path) or real_read(rel_path))
+    return remote_root, project, backend, reads
+
+
+def test_unchanged_remote_is_served_from_cache(setup):
+    remote_root, project, backend, reads = setup
+    _write_remote(remote_root, "s1")
+
+    first = fetch_remote_manifest(backend, project)
+    second = fetch_remote_manifest(backend, project)
+
+    assert len(reads) == 1
+    assert second.entries == first.entries
+    assert second.metadata.snapshot_id == "s1"
+    assert (project / REMOTE_CACHE_RELPATH).exists()
+
+
+def test_new_snapshot_is_fetched(setup):
+    remote_root, project, backend, reads = setup
+    _write_remote(remote_root, "s1")
+    fetch_remote_manifest(backend, project)
+
+    _write_remote(remote_root, "s2")  # same size, likely the same mtime tick
+    manifest = fetch_remote_manifest(backend, project)
+
+    assert len(reads) == 2
+    assert manifest.metadata.snapshot_id == "s2"
+
+
+def test_damaged_cache_is_refetched(setup):
+    remote_root, project, backend, reads = setup
+    _write_remote(remote_root, "s1")
+    fetch_remote_manifest(backend, project)
+
+    (project / REMOTE_CACHE_RELPATH).write_bytes(b"{not json")
+    assert fetch_remote_manifest(backend, project).metadata.snapshot_id == "s1"
+    (project / REMOTE_SIDECAR_RELPATH).write_bytes(b"[]")
+    assert fetch_remote_manifest(backend, project).metadata.snapshot_id == "s1"
+
+    assert len(reads) == 3
+
+
+def test_nothing_cached_without_project(setup, tmp_path):
+    remote_root, _, backend, reads = setup
+    _write_remote(remote_root, "s1")
+
+    fetch_remote_manifest(backend, None)
+    fetch_remote_manifest(backend, tmp_path / "uninitialized")
+
+    assert len(reads) == 2
+
+
+def test_failed_probe_falls_back_to_full_fetch(setup, monkeypatch):
+    remote_root, project, backend, reads = setup
+    _write_remote(remote_root, "s1")
+
+    def broken_probe(rel_path, tail_bytes):
+        raise ValueError("Failed to probe file .dsg/last-sync.json: subsystem request failed")
+
+    monkeypatch.setattr(backend, "probe_file", broken_probe)
+    assert fetch_remote_manifest(backend, project).metadata.snapshot_id == "s1"
+
+    assert len(reads) == 1
+    assert not (project / REMOTE_CACHE_RELPATH).exists()
+
+
+def test_missing_remote_manifest_raises(setup):
+    _, project, backend, _ = setup
+
+    with pytest.raises(FileNotFoundError):
+        fetch_remote_manifest(backend, project)
+
+
+# done.
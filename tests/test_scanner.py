@@ -23,7 +23,8 @@ from dsg.core.scanner import (
     manifest_from_scan_result,
     compute_hashes_for_manifest,
     hash_file,
-    ScanResult
+    ScanResult,
+    _walk_files,
 )
 from dsg.data.manifest import FileRef, LinkRef, Manifest
 from dsg.config.manager import Config, UserConfig, ProjectConfig, SSHRepositoryConfig, IgnoreSettings
@@ -681,4 +682,71 @@ class TestHashing:
         # Verify the path normalization is working (stripping trailing slashes)
         # This exercises lines 100-101 in scanner.py
 
+
+class TestWalkFiles:
+    """Tests for the scandir-based walker behind _scan_directory_internal"""
+
+    @pytest.fixture
+    def walk_tree(self, tmp_path):
+        root = tmp_path / "walk"
+        for rel in ["a/b/1.txt", "a/2.txt", "a/c/3.txt", "4.txt", "d/5.txt",
+                    "d/e/f/6.txt", "input/7.txt", ".git/objects/8",
+                    ".dsg/last-sync.json", ".dsg/.hidden/9", "a/.cache/10"]:
+            path = root / rel
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(rel)
+        (root / "a" / "link_to_d").symlink_to("../d")
+        (root / "a" / "link_to_2").symlink_to("2.txt")
+        return root
+
+    @staticmethod
+    def _rglob_files(root):
+        return [p.relative_to(root).parts for p in root.rglob('*')
+                if p.is_file() or p.is_symlink()]
+
+    @staticmethod
+    def _assert_top_down(walked):
+        """Each directory's files form one run, which comes before the runs of its subdirectories"""
+        runs = [parts[:-1] for i, parts in enumerate(walked) if i == 0 or walked[i - 1][:-1] != parts[:-1]]
+        assert len(runs) == len(set(runs)), f"a directory's files are split: {runs}"
+        for i, directory in enumerate(runs):
+            assert not any(directory[:len(earlier)] == earlier and directory != earlier
+                           for earlier in runs[i + 1:]), f"{directory} walked before its parent"
+
+    def test_matches_rglob_files(self, walk_tree):
+        expected = [parts for parts in self._rglob_files(walk_tree)
+                    if not any(part.startswith('.') for part in parts[:-1])
+                    or parts[0] == '.dsg']
+        walked = [parts for _, parts in _walk_files(walk_tree, include_dsg_files=True)]
+        assert sorted(walked) == sorted(expected)
+        assert len(walked) == len(set(walked))
+        self._assert_top_down(walked)
+
+    def test_prunes_hidden_and_dsg(self, walk_tree):
+        walked = ["/".join(parts) for _, parts in _walk_files(walk_tree, include_dsg_files=False)]
+        assert not any(path.startswith((".git", ".dsg")) for path in walked)
+        assert "a/.cache/10" not in walked
+        assert "d/e/f/6.txt" in walked
+
+    def test_keeps_everything_inside_dsg(self, walk_tree):
+        walked = ["/".join(parts) for _, parts in _walk_files(walk_tree, include_dsg_files=True)]
+        assert ".dsg/last-sync.json" in walked
+        assert ".dsg/.hidden/9" in walked
+        assert not any(path.startswith(".git") for path in walked)
+
+    def test_symlinked_dirs_not_followed(self, walk_tree):
+        walked = {"/".join(parts): entry for entry, parts in _walk_files(walk_tree, True)}
+        assert walked["a/link_to_d"].is_symlink()
+        assert not any(path.startswith("a/link_to_d/") for path in walked)
+
+    def test_scan_results_match_rglob_filter(self, walk_tree):
+        result = scan_directory_no_cfg(walk_tree, data_dirs={"*"}, compute_hashes=True)
+        expected = ["/".join(parts) for parts in self._rglob_files(walk_tree)
+                    if '.dsg' in parts or not any(part.startswith('.') for part in parts)]
+        assert sorted(result.manifest.entries) == sorted(expected)
+        self._assert_top_down([tuple(path.split("/")) for path in result.manifest.entries])
+        assert isinstance(result.manifest.entries["a/link_to_d"], LinkRef)
+        assert result.manifest.entries["a/2.txt"].filesize == len("a/2.txt")
+
+
 # done.
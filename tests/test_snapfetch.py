@@ -0,0 +1,212 @@
+# Author: PB & Claude
+# Maintainer: PB
+# Original date: 2026.10.16
+# License: (c) HRDAG, 2025, GPL-2 or newer
+#
+# ------
+# tests/test_snapfetch.py
+
+import io
+from contextlib import contextmanager
+from unittest.mock import Mock
+
+import pytest
+import xxhash
+
+from dsg.config.manager import Config
+from dsg.core import snapfetch
+from dsg.core.lifecycle import _build_sync_messages_file
+from dsg.core.snapfetch import SnapshotUnavailableError, fetch_snapshot_file, parse_byte_range
+from dsg.data.manifest import FileRef, LinkRef, Manifest
+from dsg.storage import backends
+from dsg.storage.backends import FileStream, LocalhostBackend, SSHBackend
+from dsg.storage.io_transports import ConnectionPool
+from dsg.system.exceptions import TransferIntegrityError
+
+CONTENT = {
+    "s1": {"data/big.bin": bytes(range(256)) * 50, "data/old.csv": b"a,b\n1,2\n"},
+    "s2": {"data/big.bin": bytes(range(255, -1, -1)) * 60},
+}
+
+
+def _file(path, content):
+    return FileRef(type="file", path=path, user="alice", filesize=len(content),
+                   mtime="2025-06-01T12:30:00-07:00", hash=xxhash.xxh3_64(content).hexdigest())
+
+
+@pytest.fixture
+def project(tmp_path):
+    """A clone with snapshots s1 (archived) and s2 (current), and the remote's .zfs/snapshot"""
+    dsg_dir = tmp_path / "clone" / ".dsg"
+    (dsg_dir / "archive").mkdir(parents=True)
+    remote = tmp_path / "repos" / "proj"
+    for snapshot_id, files in CONTENT.items():
+        entries = {path: _file(path, content) for path, content in files.items()}
+        if snapshot_id == "s2":
+            entries["data/link"] = LinkRef(type="link", path="data/link", user="alice", reference="big.bin")
+        manifest = Manifest(entries=entries)
+        manifest.generate_metadata(snapshot_id=snapshot_id, user_id="alice")
+        _build_sync_messages_file(manifest, dsg_dir, snapshot_id)
+        if snapshot_id == "s1":
+            manifest.to_compressed(dsg_dir / "archive" / "s1-sync.json.lz4", include_metadata=True)
+        else:
+            manifest.to_json(dsg_dir / "last-sync.json", include_metadata=True)
+        for path, content in files.items():
+            remote_file = remote / ".zfs" / "snapshot" / snapshot_id / path
+            remote_file.parent.mkdir(parents=True, exist_ok=True)
+            remote_file.write_bytes(content)
+    config = Mock(spec=Config)
+    config.project_root = tmp_path / "clone"
+    return config, LocalhostBackend(tmp_path / "repos", "proj"), remote
+
+
+def test_fetch_verifies_the_whole_file(project, tmp_path):
+    config, backend, _ = project
+    output = tmp_path / "out" / "big.bin"
+
+    latest = fetch_snapshot_file(config, "data/big.bin", output=str(output), backend=backend)
+    assert (latest.snapshot_id, latest.verified) == ("s2", True)
+    assert output.read_bytes() == CONTENT["s2"]["data/big.bin"]
+
+    with pytest.raises(FileExistsError):
+        fetch_snapshot_file(config, "data/big.bin", num=2, output=str(output), backend=backend)
+    older = fetch_snapshot_file(config, "data/big.bin", num=2, output=str(output), force=True, backend=backend)
+    assert (older.snapshot_id, older.verified) == ("s1", True)
+    assert output.read_bytes() == CONTENT["s1"]["data/big.bin"]
+    assert fetch_snapshot_file(config, "data/old.csv", snapshot_id="s1", output=str(tmp_path / "old.csv"),
+                               backend=backend).bytes_written == 8
+
+
+def test_mismatch_leaves_no_output(project, tmp_path):
+    config, backend, remote = project
+    remote_file = remote / ".zfs/snapshot/s2/data/big.bin"
+    remote_file.write_bytes(remote_file.read_bytes()[::-1])  # same size, different bytes
+    output = tmp_path / "out.bin"
+
+    with pytest.raises(TransferIntegrityError) as excinfo:
+        fetch_snapshot_file(config, "data/big.bin", output=str(output), backend=backend)
+    assert excinfo.value.expected_hash != excinfo.value.actual_hash
+    assert list(tmp_path.glob("*out.bin*")) == []
+
+    remote_file.write_bytes(b"truncated")
+    with pytest.raises(TransferIntegrityError, match="bytes"):
+        fetch_snapshot_file(config, "data/big.bin", output=str(output), byte_range="0-3", backend=backend)
+
+
+def test_byte_ranges_read_part_of_the_file(project, capsysbinary):
+    config, backend, _ = project
+    content = CONTENT["s2"]["data/big.bin"]
+
+    part = fetch_snapshot_file(config, "data/big.bin", output="-", byte_range="1000-1099", backend=backend)
+    assert capsysbinary.readouterr().out == content[1000:1100]
+    assert (part.bytes_written, part.verified) == (100, False)
+
+    tail = fetch_snapshot_file(config, "data/big.bin", output="-", byte_range=f"{len(content) - 10}-",
+                               backend=backend)
+    assert capsysbinary.readouterr().out == content[-10:] and tail.bytes_written == 10
+    # A range covering the whole file is hashed like a full fetch
+    assert fetch_snapshot_file(config, "data/big.bin", output="-", byte_range="0-", backend=backend).verified
+
+    with pytest.raises(ValueError, match="past the end"):
+        fetch_snapshot_file(config, "data/big.bin", output="-", byte_range=f"{len(content)}-", backend=backend)
+
+
+@pytest.mark.parametrize("byte_range", ["1000-1099", None])
+def test_short_read_leaves_no_output(project, tmp_path, monkeypatch, byte_range):
+    config, backend, _ = project
+    real_open_stream = backend.open_stream
+
+    @contextmanager
+    def dropped_connection(rel_path, start=0, length=None):
+        with real_open_stream(rel_path, start, length) as stream:
+            yield FileStream(stream.size, iter([next(stream.chunks)[:10]]))
+
+    monkeypatch.setattr(backend, "open_stream", dropped_connection)
+    # Without a recorded hash, nothing but the byte count catches a whole-file short read
+    real_entry = snapfetch._snapshot_entry
+    monkeypatch.setattr(snapfetch, "_snapshot_entry",
+                        lambda *args: real_entry(*args).model_copy(update={"hash": ""}))
+    output = tmp_path / "part.bin"
+
+    with pytest.raises(TransferIntegrityError, match="ended after 10 of"):
+        fetch_snapshot_file(config, "data/big.bin", output=str(output), byte_range=byte_range, backend=backend)
+    assert list(tmp_path.glob("*part.bin*")) == []
+
+
+@pytest.mark.parametrize("path, snapshot_id, error", [
+    ("data/old.csv", None, FileNotFoundError),  # deleted before s2
+    ("data/link", None, ValueError),
+    ("data/big.bin", "s9", ValueError),
+])
+def test_unfetchable_files(project, path, snapshot_id, error):
+    config, backend, _ = project
+    with pytest.raises(error):
+        fetch_snapshot_file(config, path, snapshot_id=snapshot_id, output="-", backend=backend)
+    with pytest.raises(ValueError, match="out of range"):
+        fetch_snapshot_file(config, "data/big.bin", num=3, output="-", backend=backend)
+
+
+def test_missing_zfs_snapshot_is_reported(project, tmp_path):
+    config, backend, remote = project
+    (remote / ".zfs/snapshot/s2/data/big.bin").unlink()
+    (remote / ".zfs/snapshot/s2/data").rmdir()
+    (remote / ".zfs/snapshot/s2").rmdir()  # synced before dsg named ZFS snapshots
+
+    with pytest.raises(SnapshotUnavailableError, match="Snapshot s2 is not available"):
+        fetch_snapshot_file(config, "data/big.bin", output=str(tmp_path / "big.bin"), backend=backend)
+    assert list(tmp_path.glob("*big.bin*")) == []
+
+
+def test_parse_byte_range():
+    assert parse_byte_range("0-99") == (0, 100)
+    assert parse_byte_range("10-") == (10, None)
+    for text in ("99-0", "-10", "a-b", ""):
+        with pytest.raises(ValueError):
+            parse_byte_range(text)
+
+
+class _FakeRemoteFile(io.BytesIO):
+    MAX_REQUEST_SIZE = 7
+
+    def __init__(self, content, windows):
+        super().__init__(content)
+        self.windows = windows
+
+    def stat(self):
+        return Mock(st_size=len(self.getvalue()))
+
+    def readv(self, chunks):
+        chunks = list(chunks)
+        assert all(size <= self.MAX_REQUEST_SIZE for _, size in chunks)
+        self.windows.append(sum(size for _, size in chunks))
+        for offset, size in chunks:
+            yield self.getvalue()[offset:offset + size]
+
+
+def test_ssh_streams_in_windows_over_a_pooled_connection(monkeypatch):
+    content = bytes(range(100))
+    windows = []
+    sftp = Mock()
+    sftp.file.side_effect = lambda path, mode: _FakeRemoteFile(content, windows)
+    client = Mock(spec=["open_sftp", "close"], open_sftp=Mock(return_value=sftp))
+    create_client = Mock(return_value=client)
+    pool = ConnectionPool()
+    monkeypatch.setattr(backends, "get_global_connection_pool", lambda: pool)
+    monkeypatch.setattr(backends, "SFTP_WINDOW_SIZE", 20)
+    ssh_config = type("SSHConfig", (), {"host": "example.org", "path": "/var/repos"})()
+    backend = SSHBackend(ssh_config, None, "proj")
+    monkeypatch.setattr(backend, "_create_ssh_client", create_client)
+
+    for start, length in [(0, None), (5, 50)]:
+        windows.clear()
+        with backend.open_stream(".zfs/snapshot/s1/f", start, length) as stream:
+            assert stream.size == 100
+            assert b"".join(stream.chunks) == content[start:None if length is None else start + length]
+        assert max(windows) <= 20
+
+    sftp.file.assert_called_with("/var/repos/proj/.zfs/snapshot/s1/f", "rb")
+    assert create_client.call_count == 1
+    assert sftp.close.call_count == 2
+
+
+# done.
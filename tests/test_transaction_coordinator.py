@@ -357,5 +357,182 @@ class TestTransactionFileOperations:
         transaction.remote_fs.send_file.assert_called_once()
 
 
+
+class TestTransferVerification:
+    """Digest verification and hash reuse for in-transit hashing"""
+    
+    @staticmethod
+    def _hashing_temp_file(content_stream, digest="abc123"):
+        temp_file = MockTempFile(size=content_stream.size)
+        temp_file.size = content_stream.size
+        temp_file.content_hash = digest
+        return temp_file
+    
+    def test_matching_digest_is_recorded(self, transaction):
+        transaction.transport.transfer_to_local.side_effect = (
+            lambda stream: self._hashing_temp_file(stream, "feedface"))
+        
+        with transaction as tx:
+            tx.sync_files({'download_files': ['data.csv']},
+                          expected_hashes={'data.csv': 'feedface'})
+        
+        assert transaction.transferred_hashes == {'data.csv': 'feedface'}
+        assert transaction.downloaded_hashes == {'data.csv': 'feedface'}
+    
+    def test_digest_mismatch_raises_and_rolls_back(self, transaction):
+        from dsg.system.exceptions import TransactionIntegrityError
+        transaction.transport.transfer_to_remote.side_effect = (
+            lambda stream: self._hashing_temp_file(stream, "deadbeef"))
+        
+        with pytest.raises(TransactionIntegrityError, match="hash mismatch"):
+            with transaction as tx:
+                tx.sync_files({'upload_files': ['data.csv']},
+                              expected_hashes={'data.csv': 'feedface'})
+        
+        transaction.remote_fs.rollback_transaction.assert_called_once()
+        transaction.remote_fs.recv_file.assert_not_called()
+    
+    def test_uploads_not_reported_as_downloaded(self, transaction):
+        transaction.transport.transfer_to_remote.side_effect = self._hashing_temp_file
+        
+        with transaction as tx:
+            tx.upload_files(['data.csv'])
+        
+        assert transaction.transferred_hashes == {'data.csv': 'abc123'}
+        assert transaction.downloaded_hashes == {}
+    
+    def test_expected_transfer_hashes(self):
+        from dsg.data.manifest import FileRef, LinkRef, Manifest
+        from dsg.storage.transaction_factory import expected_transfer_hashes
+        
+        def file_ref(path, file_hash):
+            return FileRef(type="file", path=path, filesize=1,
+                           mtime="2025-05-10T12:00:00-07:00", hash=file_hash)
+        
+        local = Manifest(entries={"up.csv": file_ref("up.csv", "aaa"),
+                                  "link": LinkRef(type="link", path="link", reference="up.csv")})
+        remote = Manifest(entries={"down.csv": file_ref("down.csv", "bbb")})
+        plan = {'upload_files': ['up.csv', 'link', '.dsg/last-sync.json'],
+                'download_files': ['down.csv']}
+        
+        assert expected_transfer_hashes(plan, local, remote) == {"up.csv": "aaa", "down.csv": "bbb"}
+        assert expected_transfer_hashes(plan, local, None) == {"up.csv": "aaa"}
+
+
+
+class TestConcurrentTransfers:
+    """Transfer worker pool: overlap, ordered errors, all-or-nothing"""
+    
+    @staticmethod
+    def _tracking_transport(mock_transport, delay=0.02, fail=()):
+        import threading
+        import time
+        state = {'active': 0, 'peak': 0, 'started': []}
+        lock = threading.Lock()
+        
+        def transfer(content_stream):
+            with lock:
+                state['active'] += 1
+                state['peak'] = max(state['peak'], state['active'])
+                state['started'].append(content_stream.rel_path)
+            try:
+                time.sleep(delay)
+                if content_stream.rel_path in fail:
+                    from dsg.system.exceptions import TransportError
+                    raise TransportError(f"lost {content_stream.rel_path}")
+                return MockTempFile(size=content_stream.size)
+            finally:
+                with lock:
+                    state['active'] -= 1
+        
+        mock_transport.transfer_to_remote.side_effect = transfer
+        return state
+    
+    @pytest.fixture
+    def named_client_fs(self, mock_client_fs):
+        def send_file(rel_path):
+            stream = MockContentStream(b"test content")
+            stream.rel_path = rel_path
+            return stream
+        mock_client_fs.send_file.side_effect = send_file
+        return mock_client_fs
+    
+    def test_transfers_overlap(self, named_client_fs, mock_remote_fs, mock_transport):
+        state = self._tracking_transport(mock_transport)
+        files = [f"f{i}.csv" for i in range(8)]
+        
+        with Transaction(named_client_fs, mock_remote_fs, mock_transport, transfer_workers=4) as tx:
+            tx.upload_files(files)
+        
+        assert 1 < state['peak'] <= 4
+        assert sorted(c.args[0] for c in mock_remote_fs.recv_file.call_args_list) == files
+        mock_remote_fs.commit_transaction.assert_called_once()
+    
+    def test_single_worker_is_sequential(self, named_client_fs, mock_remote_fs, mock_transport):
+        state = self._tracking_transport(mock_transport, delay=0)
+        files = [f"f{i}.csv" for i in range(5)]
+        
+        with Transaction(named_client_fs, mock_remote_fs, mock_transport, transfer_workers=1) as tx:
+            tx.upload_files(files)
+        
+        assert state['peak'] == 1
+        assert state['started'] == files
+    
+    def test_errors_raised_in_plan_order(self, named_client_fs, mock_remote_fs, mock_transport):
+        from dsg.system.exceptions import TransportError
+        self._tracking_transport(mock_transport, fail=("a.csv", "b.csv"))
+        
+        with pytest.raises(TransportError, match="lost a.csv") as exc_info:
+            with Transaction(named_client_fs, mock_remote_fs, mock_transport,
+                             transfer_workers=2) as tx:
+                tx.upload_files(["a.csv", "b.csv"])
+        
+        assert [path for path, _ in exc_info.value.transfer_errors] == ["a.csv", "b.csv"]
+        mock_remote_fs.rollback_transaction.assert_called_once()
+        mock_remote_fs.commit_transaction.assert_not_called()
+    
+    def test_failure_stops_new_transfers(self, named_client_fs, mock_remote_fs, mock_transport):
+        from dsg.system.exceptions import TransportError
+        state = self._tracking_transport(mock_transport, delay=0.01, fail=("f0.csv",))
+        files = [f"f{i}.csv" for i in range(50)]
+        
+        with pytest.raises(TransportError):
+            with Transaction(named_client_fs, mock_remote_fs, mock_transport,
+                             transfer_workers=2) as tx:
+                tx.upload_files(files)
+        
+        assert len(state['started']) < len(files)
+        named_client_fs.rollback_transaction.assert_called_once()
+    
+    def test_default_worker_count(self, transaction):
+        from dsg.core.transaction_coordinator import DEFAULT_TRANSFER_WORKERS
+        assert transaction.transfer_workers == DEFAULT_TRANSFER_WORKERS
+
+
+
+class TestMoveOperations:
+    """Server-side renames for detected moves"""
+    
+    def test_moves_use_filesystem_rename(self, transaction, mock_remote_fs, mock_client_fs):
+        with transaction as tx:
+            tx.sync_files({'move_remote': [('old.csv', 'new.csv')],
+                           'move_local': [('a.csv', 'b.csv')]})
+        
+        mock_remote_fs.move_file.assert_called_once_with('old.csv', 'new.csv')
+        mock_client_fs.move_file.assert_called_once_with('a.csv', 'b.csv')
+        transaction.transport.transfer_to_remote.assert_not_called()
+        transaction.transport.transfer_to_local.assert_not_called()
+    
+    def test_move_falls_back_to_transfer(self, mock_client_fs, mock_remote_fs, mock_transport):
+        del mock_remote_fs.move_file
+        
+        with Transaction(mock_client_fs, mock_remote_fs, mock_transport) as tx:
+            tx.move_remote_files([('old.csv', 'new.csv')])
+        
+        mock_remote_fs.recv_file.assert_called_once()
+        assert mock_remote_fs.recv_file.call_args.args[0] == 'new.csv'
+        mock_remote_fs.delete_file.assert_called_once_with('old.csv')
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
\ No newline at end of file
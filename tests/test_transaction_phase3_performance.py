@@ -269,6 +269,21 @@ class TestLocalhostTransport:
         finally:
             transport.end_session()
     
+    def test_transfer_records_digest_and_size(self, transport):
+        """The xxh3 digest is computed over the streamed chunks"""
+        import xxhash
+        content = b"hash me while you copy me" * 100
+        stream = MockContentStream(content, chunk_size=97)
+        
+        transport.begin_session()
+        try:
+            temp_file = transport.transfer_to_remote(stream)
+            assert temp_file.content_hash == xxhash.xxh3_64(content).hexdigest()
+            assert temp_file.size == len(content)
+            temp_file.cleanup()
+        finally:
+            transport.end_session()
+    
     def test_transfer_error_handling(self, transport):
         """Test error handling during transfer"""
         # Create a mock stream that raises an exception
@@ -393,6 +408,26 @@ class TestSSHTransport:
         finally:
             transport.end_session()
     
+    @patch('dsg.storage.io_transports._connection_pool')
+    def test_concurrent_transfers_use_separate_channels(self, mock_pool, transport):
+        """Each concurrent transfer gets its own SFTP channel, up to max_channels"""
+        mock_ssh_client = Mock()
+        channels = [Mock(name=f"sftp{i}") for i in range(3)]
+        mock_ssh_client.open_sftp.side_effect = channels
+        mock_pool.get_connection.return_value = mock_ssh_client
+        transport.max_channels = 2
+        
+        transport.begin_session()
+        with transport._sftp_channel() as first, transport._sftp_channel() as second:
+            assert first is not second
+        with transport._sftp_channel() as reused:
+            assert reused in (first, second)
+        assert mock_ssh_client.open_sftp.call_count == 2
+        
+        transport.end_session()
+        channels[0].close.assert_called_once()
+        channels[1].close.assert_called_once()
+    
     def test_transfer_without_session_fails(self, transport):
         """Test that transfer fails without active session"""
         stream = MockContentStream(b"test")
@@ -0,0 +1,219 @@
+# Author: PB & Claude
+# Maintainer: PB
+# Original date: 2026.10.16
+# License: (c) HRDAG, 2025, GPL-2 or newer
+#
+# ------
+# tests/test_zerocopy.py
+
+import errno
+import os
+import time
+
+import pytest
+import xxhash
+
+from dsg.core.hash_cache import HashCache, stat_key
+from dsg.core.transaction_coordinator import Transaction
+from dsg.system.exceptions import TransactionIntegrityError, TransferIntegrityError
+from dsg.storage import zerocopy
+from dsg.storage.client import ClientFilesystem, FileContentStream
+from dsg.storage.io_transports import LocalhostTransport, TempFileImpl
+from dsg.storage.remote import XFSFilesystem
+from dsg.storage.zerocopy import BorrowedFile, copy_file, place_file
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "src.bin"
+    path.write_bytes(os.urandom(300_000))
+    return path
+
+
+def _unsupported(*args, **kwargs):
+    raise OSError(errno.EOPNOTSUPP, "not supported here")
+
+
+def _disable_kernel_copies(monkeypatch):
+    if zerocopy.fcntl is not None:
+        monkeypatch.setattr(zerocopy.fcntl, "ioctl", _unsupported)
+    for name in ("copy_file_range", "sendfile"):
+        monkeypatch.setattr(zerocopy.os, name, _unsupported, raising=False)
+
+
+def _scanned_stream(path):
+    """A stream the scan recorded, as ClientFilesystem.send_file makes it"""
+    stream = FileContentStream(path)
+    stream.scanned = (stat_key(path.stat()), xxhash.xxh3_64(path.read_bytes()).hexdigest())
+    return stream
+
+
+def _scan(root, rel_path):
+    """Hash a file into the project's hash cache, as a scan does"""
+    path = root / rel_path
+    past = time.time() - 60  # older than the cache's racy window
+    os.utime(path, (past, past))
+    cache = HashCache.load(root)
+    cache.get_or_compute(path, lambda p: xxhash.xxh3_64(p.read_bytes()).hexdigest())
+    cache.save()
+
+
+def test_copy_file_copies_content(source, tmp_path):
+    dst = tmp_path / "dst.bin"
+    method = copy_file(source, dst)
+
+    assert method in ("reflink", "copy_file_range", "sendfile", "copy")
+    assert dst.read_bytes() == source.read_bytes()
+
+
+@pytest.mark.parametrize("disabled, expected", [
+    (("ioctl",), "copy_file_range"),
+    (("ioctl", "copy_file_range"), "sendfile"),
+    (("ioctl", "copy_file_range", "sendfile"), "copy"),
+])
+def test_copy_file_falls_back(source, tmp_path, monkeypatch, disabled, expected):
+    if expected != "copy" and not hasattr(os, expected):
+        pytest.skip(f"os.{expected} not available")
+    if "ioctl" in disabled and zerocopy.fcntl is not None:
+        monkeypatch.setattr(zerocopy.fcntl, "ioctl", _unsupported)
+    for name in disabled[1:]:
+        monkeypatch.setattr(zerocopy.os, name, _unsupported, raising=False)
+    dst = tmp_path / "dst.bin"
+    dst.write_bytes(b"stale content that must not survive")
+
+    assert copy_file(source, dst) == expected
+    assert dst.read_bytes() == source.read_bytes()
+
+
+def test_copy_file_propagates_real_errors(source, tmp_path, monkeypatch):
+    def failing(*args, **kwargs):
+        raise OSError(errno.EIO, "disk on fire")
+    if zerocopy.fcntl is not None:
+        monkeypatch.setattr(zerocopy.fcntl, "ioctl", failing)
+    monkeypatch.setattr(zerocopy.os, "copy_file_range", failing, raising=False)
+
+    with pytest.raises(OSError, match="disk on fire"):
+        copy_file(source, tmp_path / "dst.bin")
+
+
+def test_place_borrowed_file_keeps_source(source, tmp_path):
+    dest = tmp_path / "out" / "data.bin"
+    dest.parent.mkdir()
+    dest.write_text("old")
+    borrowed = BorrowedFile(source, source.stat().st_size)
+
+    place_file(borrowed, dest)
+    borrowed.cleanup()
+
+    assert source.exists()
+    assert dest.read_bytes() == source.read_bytes()
+    assert list(dest.parent.iterdir()) == [dest]
+
+
+@pytest.mark.parametrize("buffered", [False, True])
+def test_place_fails_if_source_changed_since_scan(source, tmp_path, monkeypatch, buffered):
+    if buffered:
+        _disable_kernel_copies(monkeypatch)
+    borrowed = LocalhostTransport(tmp_path / "transfers").transfer_to_remote(_scanned_stream(source))
+    source.write_bytes(source.read_bytes()[::-1])  # edited after the transport borrowed it
+    dest = tmp_path / "dest.bin"
+
+    with pytest.raises(TransferIntegrityError, match="changed"):
+        place_file(borrowed, dest)
+    assert list(tmp_path.glob("*dest.bin*")) == []
+
+
+def test_buffered_copy_is_hashed(source, tmp_path, monkeypatch):
+    _disable_kernel_copies(monkeypatch)
+    borrowed = BorrowedFile(source, source.stat().st_size, content_hash="0" * 16)
+
+    with pytest.raises(TransferIntegrityError, match="hash"):
+        place_file(borrowed, tmp_path / "dest.bin")
+
+
+def test_place_temp_file_moves_it(tmp_path):
+    temp_file = TempFileImpl(tmp_path / "transfers")
+    temp_file.path.write_text("payload")
+    dest = tmp_path / "dest.txt"
+
+    place_file(temp_file, dest)
+
+    assert dest.read_text() == "payload"
+    assert not temp_file.path.exists()
+
+
+class TestLocalhostZeroCopy:
+
+    def test_scanned_stream_is_borrowed(self, source, tmp_path):
+        transport = LocalhostTransport(tmp_path / "transfers")
+        stream = _scanned_stream(source)
+        temp_file = transport.transfer_to_remote(stream)
+
+        assert isinstance(temp_file, BorrowedFile)
+        assert temp_file.path == source
+        assert temp_file.size == source.stat().st_size
+        assert temp_file.content_hash == stream.scanned[1]
+        assert transport.metrics.bytes_transferred == temp_file.size
+
+    def test_unscanned_or_changed_stream_is_hashed(self, source, tmp_path):
+        transport = LocalhostTransport(tmp_path / "transfers")
+        changed = _scanned_stream(source)
+        source.write_bytes(b"edited after the scan")
+
+        for stream in (FileContentStream(source), changed):
+            temp_file = transport.transfer_to_remote(stream)
+            assert not isinstance(temp_file, BorrowedFile)
+            assert temp_file.content_hash == xxhash.xxh3_64(b"edited after the scan").hexdigest()
+            temp_file.cleanup()
+
+    def test_zero_copy_disabled_streams(self, source, tmp_path):
+        transport = LocalhostTransport(tmp_path / "transfers", zero_copy=False)
+        temp_file = transport.transfer_to_remote(FileContentStream(source))
+
+        assert not isinstance(temp_file, BorrowedFile)
+        assert temp_file.content_hash is not None
+        temp_file.cleanup()
+
+    def test_upload_and_download_roundtrip(self, tmp_path):
+        root = tmp_path / "project"
+        (root / ".dsg").mkdir(parents=True)
+        (root / "input").mkdir()
+        (root / "input" / "a.csv").write_bytes(b"alpha" * 1000)
+        _scan(root, "input/a.csv")
+        repo = tmp_path / "repo"
+        repo.mkdir()
+        transport = LocalhostTransport(tmp_path / "transfers")
+        client = ClientFilesystem(root)
+        assert client.send_file("input/a.csv").scanned is not None
+
+        with Transaction(client, XFSFilesystem(str(repo)), transport) as tx:
+            tx.upload_files(["input/a.csv"])
+        assert tx.transferred_hashes["input/a.csv"] == xxhash.xxh3_64(b"alpha" * 1000).hexdigest()
+        assert (repo / "input" / "a.csv").read_bytes() == b"alpha" * 1000
+        assert (root / "input" / "a.csv").exists()
+
+        (root / "input" / "a.csv").unlink()
+        with Transaction(ClientFilesystem(root), XFSFilesystem(str(repo)), transport) as tx:
+            tx.download_files(["input/a.csv"])
+        assert (root / "input" / "a.csv").read_bytes() == b"alpha" * 1000
+        assert (repo / "input" / "a.csv").exists()
+
+    def test_file_edited_after_scan_fails_the_upload(self, tmp_path):
+        root = tmp_path / "project"
+        (root / ".dsg").mkdir(parents=True)
+        (root / "input").mkdir()
+        (root / "input" / "a.csv").write_bytes(b"alpha" * 1000)
+        _scan(root, "input/a.csv")
+        scanned_hash = xxhash.xxh3_64(b"alpha" * 1000).hexdigest()
+        (root / "input" / "a.csv").write_bytes(b"gamma" * 1000)  # same size, new bytes
+        repo = tmp_path / "repo"
+        repo.mkdir()
+
+        with pytest.raises(TransactionIntegrityError, match="hash mismatch"):
+            with Transaction(ClientFilesystem(root), XFSFilesystem(str(repo)),
+                             LocalhostTransport(tmp_path / "transfers")) as tx:
+                tx.sync_files({"upload_files": ["input/a.csv"]}, expected_hashes={"input/a.csv": scanned_hash})
+        assert not (repo / "input" / "a.csv").exists()
+
+
+# done.
@@ -104,7 +104,7 @@ class TestRemoteFilesystemTransactionSupport:
             
             # Commit transaction
             remote_fs.commit_transaction(tx_id)
-            mock_commit.assert_called_once_with(tx_id)
+            mock_commit.assert_called_once_with(tx_id, snapshot_id=None)
 
     def test_zfs_filesystem_transaction_rollback_cleans_up_clone(self, dsg_repository_factory):
         """Test that ZFS transaction rollback properly cleans up clones."""
@@ -266,7 +266,7 @@ class TestSyncOperationFlow:
             remote_fs.commit_transaction(tx_id)
             
             # Verify ZFS commit was called (which does clone→promote atomically)
-            mock_commit.assert_called_once_with(tx_id)
+            mock_commit.assert_called_once_with(tx_id, snapshot_id=None)
 
 
 class TestZFSIntegrationEndToEnd:
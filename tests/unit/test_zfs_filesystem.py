@@ -43,10 +43,19 @@ class TestZFSFilesystemInterface:
         
         zfs_filesystem.commit(transaction_id)
         
-        mock_zfs_ops.commit.assert_called_once_with(transaction_id)
+        mock_zfs_ops.commit.assert_called_once_with(transaction_id, snapshot_id=None)
         assert zfs_filesystem.transaction_id is None
         assert zfs_filesystem.clone_path is None
     
+    def test_commit_passes_snapshot_id(self, mock_zfs_ops):
+        """Test that commit() names the ZFS snapshot after the DSG snapshot it was created for."""
+        zfs_filesystem = ZFSFilesystem(mock_zfs_ops, snapshot_id="s4")
+        zfs_filesystem.begin("tx-test-123")
+        
+        zfs_filesystem.commit("tx-test-123")
+        
+        mock_zfs_ops.commit.assert_called_once_with("tx-test-123", snapshot_id="s4")
+    
     def test_rollback_calls_unified_interface(self, zfs_filesystem, mock_zfs_ops):
         """Test that rollback() calls the new unified ZFSOperations.rollback()."""
         transaction_id = "tx-test-123"
@@ -335,7 +344,7 @@ class TestZFSFilesystemTransactionFlow:
         
         # Verify ZFS operations were called
         mock_zfs_ops.begin.assert_called_once_with(transaction_id)
-        mock_zfs_ops.commit.assert_called_once_with(transaction_id)
+        mock_zfs_ops.commit.assert_called_once_with(transaction_id, snapshot_id=None)
     
     def test_rollback_transaction_flow(self, zfs_filesystem, mock_zfs_ops):
         """Test transaction flow with rollback: begin -> file operations -> rollback."""
@@ -256,6 +256,29 @@ class TestUnifiedInterface:
                 
                 mock_sync.assert_called_once_with(transaction_id)
     
+    @pytest.mark.parametrize("operation_type", ["init", "sync"])
+    def test_commit_names_snapshot_after_dsg_snapshot(self, zfs_ops, operation_type):
+        """Test commit() snapshots the committed dataset as @<snapshot_id>, where snapfetch reads it."""
+        with patch.object(zfs_ops, '_detect_operation_type', return_value=operation_type), \
+             patch.object(zfs_ops, f'_commit_{operation_type}_transaction'), \
+             patch('dsg.system.execution.CommandExecutor.run_sudo') as mock_run:
+            
+            zfs_ops.commit("tx-123", snapshot_id="s4")
+            
+            mock_run.assert_called_once_with(["zfs", "snapshot", f"{ZFS_TEST_POOL}/test-repo@s4"])
+    
+    def test_commit_survives_failed_snapshot_naming(self, zfs_ops):
+        """Test a failure to name the snapshot does not fail the already committed sync."""
+        with patch.object(zfs_ops, '_detect_operation_type', return_value="sync"), \
+             patch.object(zfs_ops, '_commit_sync_transaction') as mock_sync, \
+             patch.object(zfs_ops, '_create_snapshot', side_effect=ValueError("dataset already exists")), \
+             patch.object(zfs_ops, 'rollback') as mock_rollback:
+            
+            zfs_ops.commit("tx-123", snapshot_id="s4")
+            
+            mock_sync.assert_called_once_with("tx-123")
+            mock_rollback.assert_not_called()
+    
     def test_rollback_handles_both_patterns(self, zfs_ops):
         """Test unified rollback() works for both patterns."""
         transaction_id = "tx-123"